@@ -12,7 +12,6 @@
 __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
-import yaml
 import collections
 
 """Default timeout value in seconds"""
@@ -54,6 +53,7 @@ class Config(object):
         self._store_content(content)
 
     def _store_content(self, content_list):
+        import yaml
         result = []
         for content in content_list:
             if content:
@@ -96,6 +96,27 @@ class Config(object):
     def as_dict(self):
         return self.config
     
+class BaseEnumMeta(type):
+    """
+    Metaclass of BaseEnum. The members of an enum are cached on first use,
+    setting or deleting an attribute of an enum clears the cache of the enum
+    and of every enum derived from it.
+    """
+    def __setattr__(cls, name, value):
+        type.__setattr__(cls, name, value)
+        cls._clear_members()
+
+    def __delattr__(cls, name):
+        type.__delattr__(cls, name)
+        cls._clear_members()
+
+    def _clear_members(cls):
+        if '__enum_members__' in cls.__dict__:
+            type.__delattr__(cls, '__enum_members__')
+        for subclass in type.__subclasses__(cls):
+            subclass._clear_members()
+
+
 class BaseEnum(object):
     """Base class for enums.
     
@@ -114,22 +135,43 @@ class BaseEnum(object):
     coupled with what the drivers can do. By putting the values here, they
     are quicker to execute and more compartmentalized so that code can be
     re-used more easily outside of a capability container as needed.
+
+    The members are found once per class and cached, see BaseEnumMeta.
     """
-    
+    __metaclass__ = BaseEnumMeta
+
+    @classmethod
+    def _members(cls):
+        """
+        Return the cached (list of values, dict of name to value, frozenset
+        of values) of this class, building them on first use. The frozenset
+        is None if any value is unhashable.
+        """
+        # looked up in the class itself, a subclass must not use its base's members
+        members = cls.__dict__.get('__enum_members__')
+        if members is None:
+            result = {}
+            for attr in dir(cls):
+                if not callable(getattr(cls,attr)) and not attr.startswith('__'):
+                    result[attr] = getattr(cls,attr)
+            values = [result[attr] for attr in sorted(result)]
+            try:
+                value_set = frozenset(values)
+            except TypeError:
+                value_set = None
+            members = (values, result, value_set)
+            type.__setattr__(cls, '__enum_members__', members)
+        return members
+
     @classmethod
     def list(cls):
         """List the values of this enum."""
-        return [getattr(cls,attr) for attr in dir(cls) if\
-                not callable(getattr(cls,attr)) and not attr.startswith('__')]
+        return list(cls._members()[0])
 
     @classmethod
     def dict(cls):
         """Return a dict representation of this enum."""
-        result = {}
-        for attr in dir(cls):
-            if not callable(getattr(cls,attr)) and not attr.startswith('__'):
-                result[attr] = getattr(cls,attr)
-        return result
+        return dict(cls._members()[1])
 
     @classmethod
     def has(cls, item):
@@ -144,7 +186,14 @@ class BaseEnum(object):
         @retval True if one of the class attributes has value item, false
         otherwise.
         """
-        return item in cls.list()
+        (values, _, value_set) = cls._members()
+        if value_set is not None:
+            try:
+                return item in value_set
+            except TypeError:
+                # unhashable items are compared with each value
+                pass
+        return item in values
 
 class EventKey(BaseEnum):
     """Keys to the event dictionary fields as used by the InstrumentProtocol
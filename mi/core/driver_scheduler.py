@@ -5,8 +5,10 @@
 @file mi/core/driver_scheduler.py
 @author Bill French
 @brief Provides task/event scheduling for drivers
-uses the PolledScheduler and provides a common, simplified interface
-for instrument and platform drivers.
+uses the process wide SharedScheduler and provides a common, simplified
+interface for instrument and platform drivers.  Each DriverScheduler
+only tracks its own jobs, the timer thread and the threads running the
+jobs are shared by every driver in the process.
 
 The scheduler is configured by passing a configuration dictionary
 to the constructor or my calling add_config.  Calling add_config
@@ -117,17 +119,20 @@ try:
 except LookupError:
     log.error("No job found with that name")
 
+# Remove all jobs of this scheduler, e.g. when the protocol is replaced
+scheduler.shutdown()
+
 """
 
 __author__ = 'Bill French'
 __license__ = 'Apache 2.0'
 
 import inspect
+from datetime import timedelta
 
 from mi.core.log import get_logger; log = get_logger()
 
 from mi.core.common import BaseEnum
-from mi.core.scheduler import PolledScheduler
 from mi.core.exceptions import SchedulerException
 
 class TriggerType(BaseEnum):
@@ -176,7 +181,7 @@ class DriverScheduler(object):
     jobs.
     """
 
-    def __init__(self, config = None):
+    def __init__(self, config = None, scheduler = None):
         """
         config structure:
         {
@@ -186,8 +191,14 @@ class DriverScheduler(object):
             }
         }
         @param config: job configuration structure.
+        @param scheduler: SharedScheduler to add jobs to, defaults to the
+                          scheduler shared by the process.
         """
-        self._scheduler = PolledScheduler()
+        # apscheduler is only imported once a driver uses a scheduler
+        from mi.core.scheduler import get_shared_scheduler
+        self._scheduler = scheduler or get_shared_scheduler()
+        self._jobs = []
+        self._polled_jobs = {}
         if(config):
             self.add_config(config)
 
@@ -198,7 +209,11 @@ class DriverScheduler(object):
         @param name: name of the job
         @raise LookupError if we fail to find the job
         """
-        return self._scheduler.run_polled_job(name)
+        job = self._polled_jobs.get(name)
+        if(not job):
+            raise LookupError("no PolledIntervalJob found named '%s'" % name)
+
+        return self._scheduler.run_polled_job(job)
 
     def add_config(self, config):
         """
@@ -227,11 +242,52 @@ class DriverScheduler(object):
             except TypeError as e:
                 raise SchedulerException("failed to schedule job: %s" % e)
 
-        if(not self._scheduler.running):
-            self._scheduler.start()
-
     def remove_job(self, callback):
-        self._scheduler.unschedule_func(callback)
+        """
+        Remove all jobs running the callback
+        @param callback: callback of the jobs
+        @raise KeyError if no job runs the callback
+        """
+        jobs = [job for job in self._jobs if job.func == callback and job.scheduled]
+        if(not jobs):
+            raise KeyError('The given function is not scheduled in this scheduler')
+
+        for job in jobs:
+            self._remove(job)
+
+    def shutdown(self):
+        """
+        Remove all jobs of this scheduler.  The shared scheduler keeps
+        running the jobs of other drivers.
+        """
+        for job in self._jobs:
+            if(job.scheduled):
+                self._remove(job)
+
+    def _add(self, trigger, callback, name=None):
+        """
+        Add a job to the shared scheduler and track it
+        @param trigger: trigger of the job
+        @param callback: callback of the job
+        @param name: name of a polled job
+        @raise ValueError if the job would never run or a polled job by
+                          that name exists
+        """
+        from mi.core.scheduler import PolledIntervalTrigger
+        if(isinstance(trigger, PolledIntervalTrigger) and self._polled_jobs.get(name)):
+            raise ValueError("Not adding job since a job named '%s' already exists" % name)
+
+        job = self._scheduler.add_job(trigger, callback, name=name)
+        self._jobs = [j for j in self._jobs if j.scheduled]
+        self._jobs.append(job)
+        if(job.polled):
+            self._polled_jobs[name] = job
+
+    def _remove(self, job):
+        self._scheduler.remove_job(job)
+        self._jobs.remove(job)
+        if(self._polled_jobs.get(job.name) is job):
+            del self._polled_jobs[job.name]
     
     def _add_job(self, name, config):
         """
@@ -240,7 +296,7 @@ class DriverScheduler(object):
         @param config: job configuration
         @raise SchedulerError if we fail to add the job
         """
-        log.debug(" Config name: %s value: %s" % (name, config))
+        log.debug(" Config name: %s value: %s", name, config)
 
         if(config == None):
             raise SchedulerException("job config empty")
@@ -310,7 +366,8 @@ class DriverScheduler(object):
         if(dt == None):
             raise SchedulerException("trigger missing parameter: %s" % DriverSchedulerConfigKey.DATE)
 
-        self._scheduler.add_date_job(callback, dt)
+        from mi.core.scheduler import SimpleTrigger
+        self._add(SimpleTrigger(dt), callback)
 
     def _add_job_cron(self, name, config):
         """
@@ -338,8 +395,9 @@ class DriverScheduler(object):
            day_of_week==None and hour==None and minute==None and second==None):
             raise SchedulerException("at least one cron parameter required!")
 
-        self._scheduler.add_cron_job(callback, year=year, month=month, day=day, week=week,
-                                     day_of_week=day_of_week, hour=hour, minute=minute, second=second)
+        from mi.core.scheduler import CronTrigger
+        self._add(CronTrigger(year=year, month=month, day=day, week=week,
+                              day_of_week=day_of_week, hour=hour, minute=minute, second=second), callback)
 
     def _add_job_interval(self, name, config):
         """
@@ -363,8 +421,9 @@ class DriverScheduler(object):
         if(not (weeks or days or hours or minutes or seconds)):
             raise SchedulerException("at least interval parameter required!")
 
-        self._scheduler.add_interval_job(callback, weeks=weeks, days=days, hours=hours,
-                                                   minutes=minutes, seconds=seconds)
+        from mi.core.scheduler import IntervalTrigger
+        interval = timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+        self._add(IntervalTrigger(interval), callback)
 
     def _add_job_polled_interval(self, name, config):
         """
@@ -396,7 +455,8 @@ class DriverScheduler(object):
         if(not (min_weeks or min_days or min_hours or min_minutes or min_seconds)):
             raise SchedulerException("at least interval parameter required!")
 
-        min_interval_obj = self._scheduler.interval(min_weeks, min_days, min_hours, min_minutes, min_seconds)
+        min_interval_obj = timedelta(weeks=min_weeks, days=min_days, hours=min_hours,
+                                     minutes=min_minutes, seconds=min_seconds)
 
         max_interval_obj = None
         if(max_interval != None):
@@ -410,9 +470,11 @@ class DriverScheduler(object):
             max_seconds = max_interval.get(DriverSchedulerConfigKey.SECONDS, 0)
 
             if(max_weeks or max_days or max_hours or max_minutes or max_seconds):
-                max_interval_obj = self._scheduler.interval(max_weeks, max_days, max_hours, max_minutes, max_seconds)
+                max_interval_obj = timedelta(weeks=max_weeks, days=max_days, hours=max_hours,
+                                             minutes=max_minutes, seconds=max_seconds)
 
-        self._scheduler.add_polled_job(callback, name, min_interval_obj, max_interval_obj)
+        from mi.core.scheduler import PolledIntervalTrigger
+        self._add(PolledIntervalTrigger(min_interval_obj, max_interval_obj), callback, name)
 
 
 
@@ -11,7 +11,7 @@
 __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
-from mi.core.log import get_logger ; log = get_logger()
+from mi.core.log import get_guarded_logger ; log = get_guarded_logger()
 
 from mi.core.exceptions import SampleException
 
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.driver_codec
+@file mi/core/instrument/driver_codec.py
+@author Ronald Ronquillo
+@brief Serialization of driver process command, reply and event messages.
+
+A codec turns a message into a list of ZMQ frames and back.  Pickle is the
+default and is wire compatible with send_pyobj/recv_pyobj.  The JSON and
+msgpack codecs are faster, but only carry basic types: tuples arrive as
+lists, and with JSON strings arrive as unicode.
+
+Sample events carry a particle which DataParticle.generate has already
+encoded as a JSON string.  The JSON and msgpack codecs send that string
+as a frame of its own rather than encoding it a second time.
+
+The codec is chosen by name when the driver process is launched, see
+ZmqDriverProcess.launch_process, and the same name is given to the
+ZmqDriverClient.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import cPickle as pickle
+try:
+    import simplejson as json
+except ImportError:
+    import json
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from mi.core.common import BaseEnum
+from mi.core.exceptions import ConfigurationException
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
+
+
+class DriverCodecName(BaseEnum):
+    PICKLE = 'pickle'
+    JSON = 'json'
+    MSGPACK = 'msgpack'
+
+DEFAULT_CODEC = DriverCodecName.PICKLE
+
+
+class DriverCodec(object):
+    """
+    Base class for driver message codecs.  Subclasses provide dumps and
+    loads for a single object.
+    """
+    name = None
+
+    # send pre-encoded sample payloads as a separate frame
+    multipart = True
+
+    def dumps(self, obj):
+        raise NotImplementedError('dumps() not implemented in %s' % self.__class__.__name__)
+
+    def loads(self, data):
+        raise NotImplementedError('loads() not implemented in %s' % self.__class__.__name__)
+
+    def encode(self, msg):
+        """
+        Encode a message into ZMQ frames.
+        @param msg command, reply or event message
+        @retval list of frames
+        """
+        if self.multipart and isinstance(msg, dict) and msg.get('type') == DriverAsyncEvent.SAMPLE:
+            payload = msg.get('value')
+            if isinstance(payload, unicode):
+                payload = payload.encode('utf-8')
+            if isinstance(payload, str):
+                header = dict(msg)
+                del header['value']
+                return [self.dumps(header), payload]
+        return [self.dumps(msg)]
+
+    def decode(self, frames):
+        """
+        Decode ZMQ frames produced by encode.
+        @param frames list of frames
+        @retval the message
+        """
+        msg = self.loads(frames[0])
+        if len(frames) > 1:
+            msg['value'] = frames[1]
+        return msg
+
+
+class PickleCodec(DriverCodec):
+    """
+    Pickle codec, a single frame compatible with send_pyobj/recv_pyobj.
+    """
+    name = DriverCodecName.PICKLE
+    multipart = False
+
+    def dumps(self, obj):
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+class JsonCodec(DriverCodec):
+    """
+    JSON codec.
+    """
+    name = DriverCodecName.JSON
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class MsgpackCodec(DriverCodec):
+    """
+    msgpack codec.
+    """
+    name = DriverCodecName.MSGPACK
+
+    def dumps(self, obj):
+        return msgpack.packb(obj)
+
+    def loads(self, data):
+        return msgpack.unpackb(data)
+
+
+CODECS = {
+    DriverCodecName.PICKLE: PickleCodec,
+    DriverCodecName.JSON: JsonCodec,
+    DriverCodecName.MSGPACK: MsgpackCodec,
+}
+
+
+def available_codecs():
+    """
+    @retval list of the codec names usable in this interpreter
+    """
+    return sorted(name for name in CODECS if name != DriverCodecName.MSGPACK or msgpack is not None)
+
+
+def get_codec(name=None):
+    """
+    Construct a codec by name.
+    @param name codec name, DEFAULT_CODEC if None
+    @retval DriverCodec
+    @raise ConfigurationException if the codec is unknown or its module is not installed
+    """
+    if name is None:
+        name = DEFAULT_CODEC
+    if name not in CODECS:
+        raise ConfigurationException('Unknown driver codec %r, expected one of %s' % (name, sorted(CODECS)))
+    if name not in available_codecs():
+        raise ConfigurationException('Driver codec %r is not available, its module is not installed' % name)
+    return CODECS[name]()
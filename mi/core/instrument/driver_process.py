@@ -19,11 +19,19 @@ import os
 import sys
 import time
 import traceback
+from Queue import Queue
 from mi.core.exceptions import InstrumentException, InstrumentCommandException
 from mi.core.instrument.instrument_driver import DriverAsyncEvent
+import mi.core.instrument.startup_profiler as startup_profiler
 
 from ooi.logging import log
 
+# interpreter used to launch driver processes
+PYTHON = 'bin/python'
+
+# run first in a driver process so the startup profiler sees every import
+STARTUP_PROFILER_CMD = 'import mi.core.instrument.startup_profiler as sp; sp.install(); '
+
 class DriverProcess(object):
     """
     Base class for messaging enabled OS-level driver processes. Provides
@@ -44,8 +52,8 @@ class DriverProcess(object):
 
         # Launch a separate python interpreter, executing the calling
         # class command string.
-        spawnargs = ['bin/python', '-c', cmd_str]
-        return Popen(spawnargs, close_fds=True)
+        spawnargs = [PYTHON, '-c', STARTUP_PROFILER_CMD + cmd_str]
+        return Popen(spawnargs, close_fds=True, env=startup_profiler.launch_environment())
         
     def __init__(self, driver_module, driver_class, ppid):
         """
@@ -56,8 +64,10 @@ class DriverProcess(object):
         self.driver_class = driver_class
         self.ppid = ppid
         self.driver = None
-        self.events = []
+        self.events = Queue()
         self.messaging_started = False
+        # set when started with MI_DRIVER_STARTUP_PROFILE, see startup_profiler
+        self.startup_profile = startup_profiler.get_profile()
         
     def construct_driver(self):
         """
@@ -69,14 +79,15 @@ class DriverProcess(object):
         ctor_str = 'driver = dvr_mod.%s(self.send_event)' % self.driver_class
         try:
             exec import_str
-            log.info('Imported driver module %s' % self.driver_module)
+            log.info('Imported driver module %s', self.driver_module)
+            self._mark_startup('driver_imported')
             exec ctor_str
-            log.info('Constructed driver %s' % self.driver_class)
+            log.info('Constructed driver %s', self.driver_class)
+            self._mark_startup('driver_constructed')
             
         except (ImportError, NameError, AttributeError) as e:
-            log.error('Could not import/construct driver module %s, class %s.' %
-                      (self.driver_module, self.driver_class))
-            log.error('%s' % str(e))
+            log.error('Could not import/construct driver module %s, class %s.', self.driver_module, self.driver_class)
+            log.error('%s', e)
             return False
 
         else:
@@ -107,6 +118,22 @@ class DriverProcess(object):
         self.driver_class = None
         self.driver = None
 
+    def _mark_startup(self, name):
+        """
+        Record a start up point when profiling start up.
+        """
+        if self.startup_profile:
+            self.startup_profile.mark(name)
+
+    def _first_command(self):
+        """
+        Finish profiling start up when the first command arrives and log
+        the report.
+        """
+        self.startup_profile.mark('first_command')
+        self.startup_profile.import_profiler.uninstall()
+        log.info('Driver process start up profile:\n%s', '\n'.join(self.startup_profile.format_report()))
+
     def check_parent(self):
         """
         Test for existence of original parent process, if ppid specified.
@@ -130,22 +157,28 @@ class DriverProcess(object):
         'stop_driver_process' - signal to close messaging and terminate.
         'test_events' - populate event queue with test data.
         'process_echo' - echos the message back.
+        'startup_profile' - the start up profile report, None if the process
+        was not started with MI_DRIVER_STARTUP_PROFILE.
         If the command is not found in the driver, an echo message is
         replied to the client.
         @param msg A driver command message.
         @retval The driver command result.
         """
+        if self.startup_profile and not self.startup_profile.has('first_command'):
+            self._first_command()
+
         cmd = msg.get('cmd', None)
         args = msg.get('args', None)
         kwargs = msg.get('kwargs', None)
         cmd_func = getattr(self.driver, cmd, None)
-        log.debug("DriverProcess.cmd_driver(): cmd=%s, cmd_func=%s" %(cmd, cmd_func))
+        log.debug("DriverProcess.cmd_driver(): cmd=%s, cmd_func=%s", cmd, cmd_func)
         if cmd == 'stop_driver_process':
             self.stop_messaging()
             return'stop_driver_process'
         elif cmd == 'test_events':
             events = kwargs['events']
-            self.events += events
+            for evt in events:
+                self.send_event(evt)
             reply = 'test_events'
         elif cmd == 'process_echo':
             reply = 'ping from resource ppid:%s, resource:%s' % (str(self.ppid), str(self.driver))
@@ -154,6 +187,8 @@ class DriverProcess(object):
             #except IndexError:
             #    msg = 'no message to echo'
             # reply = 'process_echo: %s' % msg
+        elif cmd == 'startup_profile':
+            reply = self.startup_profile.get_report() if self.startup_profile else None
         elif cmd_func:
             try:
                 reply = cmd_func(*args, **kwargs)
@@ -169,7 +204,7 @@ class DriverProcess(object):
                 #self.send_event(event)
                 if not isinstance(e, InstrumentException):
                     trace = traceback.format_exc()
-                    log.critical("Python error, Trace follows: \n%s" %trace)
+                    log.critical("Python error, Trace follows: \n%s", trace)
                 
                 
         else:
@@ -187,9 +222,9 @@ class DriverProcess(object):
             
     def send_event(self, evt):
         """
-        Append an event to the list to be sent by the event threaed.
+        Queue an event to be sent by the event thread.
         """
-        self.events.append(evt)
+        self.events.put(evt)
             
     def run(self):
         """
@@ -209,6 +244,7 @@ class DriverProcess(object):
 
         if self.construct_driver():
             self.start_messaging()
+            self._mark_startup('messaging_started')
             while self.messaging_started:
                 if self.check_parent():
                     time.sleep(2)
@@ -12,9 +12,9 @@ protocol classes.
 __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
-import yaml
+import copy
+import os
 import sys
-import pkg_resources
 from mi.core.common import BaseEnum
 from mi.core.exceptions import InstrumentParameterException
 
@@ -24,6 +24,20 @@ MODULE = "res"
 EGG_PATH = "config"
 DEFAULT_FILENAME = "strings.yml"
 
+# Parsed metadata by source. The parameter, command and driver dictionaries
+# of a driver each load the same strings file, it is only parsed once.
+_metadata_cache = {}
+
+def _cached_metadata(key, load):
+    """
+    Return a copy of the metadata for key, loading and caching it on first use.
+    @param key cache key identifying the source and its version
+    @param load function returning the parsed metadata
+    """
+    if key not in _metadata_cache:
+        _metadata_cache[key] = load()
+    return copy.deepcopy(_metadata_cache[key])
+
 class InstrumentDict(object):
     """
     A package for classes that provides some base behavior for manages
@@ -35,8 +49,12 @@ class InstrumentDict(object):
     def load_metadata_from_file(filename):
         log.debug("Attempting to load instrument dictionary metadata from file %s",
                       filename)
-        file = open("%s" % filename, "r")
-        return yaml.safe_load(file)
+        with open(filename, "r") as f:
+            def load():
+                import yaml
+                return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+            stat = os.fstat(f.fileno())
+            return _cached_metadata(('file', os.path.abspath(filename), stat.st_mtime, stat.st_size), load)
         
     @staticmethod
     def load_metadata_from_egg():
@@ -49,11 +67,15 @@ class InstrumentDict(object):
         resource_base = "res"
         log.debug("Attempting to load instrument dictionary metadata from egg with path %s, base %s",
                   resource_name, resource_base)
+        import pkg_resources
         if pkg_resources.resource_exists(resource_base, resource_name):
-            yml = pkg_resources.resource_string(resource_base, resource_name)
             log.debug("Found resource in the %s, %s base",
                       resource_base, resource_name)
-            return yaml.load(yml)
+            def load():
+                import yaml
+                yml = pkg_resources.resource_string(resource_base, resource_name)
+                return yaml.load(yml, Loader=getattr(yaml, 'CLoader', yaml.Loader))
+            return _cached_metadata(('egg', resource_base, resource_name), load)
         else:
             return False
     
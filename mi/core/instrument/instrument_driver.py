@@ -470,6 +470,9 @@ class SingleConnectionInstrumentDriver(InstrumentDriver):
         # This set to false when a connection is established to
         # allow for lost callback to become activated.
         self._connection_lost = True
+
+        # Record FSM handler and state timing, see set_fsm_timing.
+        self._fsm_timing = False
         
     #############################################################
     # Device connection interface.
@@ -628,7 +631,7 @@ class SingleConnectionInstrumentDriver(InstrumentDriver):
         for param in da_params:
             vals[param] = config[param]
 
-        log.debug("Restore DA Parameters: %s" % vals)
+        log.debug("Restore DA Parameters: %s", vals)
         self.set_resource(vals, True)
         
     #############################################################
@@ -677,6 +680,31 @@ class SingleConnectionInstrumentDriver(InstrumentDriver):
         else:
             return connection_state
 
+    def set_fsm_timing(self, enabled=True, *args, **kwargs):
+        """
+        Enable or disable timing of the connection and protocol FSM handlers
+        and states. Enabling starts from zero. A protocol built later, on
+        connect, is timed as well.
+        @param enabled True to enable timing.
+        """
+        self._fsm_timing = enabled
+        self._connection_fsm.set_timing(enabled)
+        protocol_fsm = getattr(self._protocol, '_protocol_fsm', None)
+        if protocol_fsm:
+            protocol_fsm.set_timing(enabled)
+
+    def get_fsm_timing(self, *args, **kwargs):
+        """
+        Return the FSM timing recorded since set_fsm_timing.
+        @retval dict of 'connection' and 'protocol' to the timing of each FSM
+        as returned by InstrumentFSM.get_timing, None for an FSM not timed.
+        """
+        protocol_fsm = getattr(self._protocol, '_protocol_fsm', None)
+        return {
+            'connection': self._connection_fsm.get_timing(),
+            'protocol': protocol_fsm.get_timing() if protocol_fsm else None,
+        }
+
     def get_resource(self, *args, **kwargs):
         """
         Retrieve device parameters.
@@ -902,6 +930,8 @@ class SingleConnectionInstrumentDriver(InstrumentDriver):
         next_state = None
         result = None
         self._build_protocol()
+        if self._fsm_timing:
+            self._protocol._protocol_fsm.set_timing(True)
         try:
             self._connection.init_comms(self._protocol.got_data, 
                                         self._protocol.got_raw,
@@ -10,6 +10,7 @@
 __author__ = 'Edward Hunter'
 __license__ = 'Apache 2.0'
 
+import time
 from threading import RLock
 
 from mi.core.exceptions import InstrumentStateException
@@ -17,9 +18,69 @@ from mi.core.exceptions import InstrumentStateException
 from mi.core.log import get_logger,LoggerManager
 log = get_logger()
 
+# handlers of a state without any
+_NO_HANDLERS = {}
+
+
+class FSMTiming(object):
+    """
+    Time spent in each event handler and in each state of an InstrumentFSM.
+    """
+
+    def __init__(self, state=None):
+        # (state, event) : [count, total secs, max secs]
+        self.handlers = {}
+        # state : [entries, total secs]
+        self.states = {}
+        self.state = None
+        self.entered = None
+        if state is not None:
+            self.enter(state)
+
+    def handled(self, state, event, elapsed):
+        stats = self.handlers.get((state, event))
+        if stats is None:
+            self.handlers[(state, event)] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+    def enter(self, state):
+        now = time.time()
+        if self.state is not None:
+            self.states[self.state][1] += now - self.entered
+        self.states.setdefault(state, [0, 0.0])[0] += 1
+        self.state = state
+        self.entered = now
+
+    def get_timing(self):
+        """
+        @retval dict with 'handlers', state : event : {count, total, max}
+        in seconds, and 'states', state : {entries, total} in seconds
+        including the time so far in the current state.
+        """
+        handlers = {}
+        for ((state, event), (count, total, maximum)) in self.handlers.items():
+            handlers.setdefault(state, {})[event] = {'count': count, 'total': total, 'max': maximum}
+        states = {}
+        for (state, (entries, total)) in self.states.items():
+            if state == self.state:
+                total += time.time() - self.entered
+            states[state] = {'entries': entries, 'total': total}
+        return {'handlers': handlers, 'states': states}
+
+
 class InstrumentFSM(object):
     """
     Simple state mahcine for driver and agent classes.
+
+    Handlers are kept in a dispatch dict per state, and the events handled
+    in each state are cached as they are asked for, so on_event and
+    get_events do not walk every handler. Reading the current state and the
+    events does not take a lock. Handler and state timing is recorded once
+    enabled with set_timing.
     """
 
     def __init__(self, states, events, enter_event, exit_event):
@@ -39,6 +100,11 @@ class InstrumentFSM(object):
         self.previous_state = None
         self.enter_event = enter_event
         self.exit_event = exit_event
+        # state : event : handler
+        self._dispatch = {}
+        # state : tuple of the events handled, None for all states
+        self._capabilities = {}
+        self._timing = None
 
     def get_current_state(self):
         """
@@ -63,6 +129,8 @@ class InstrumentFSM(object):
             return False
 
         self.state_handlers[(state,event)] = handler
+        self._dispatch.setdefault(state, {})[event] = handler
+        self._capabilities = {}
         return True
         
     def start(self, state, *args, **kwargs):
@@ -79,8 +147,11 @@ class InstrumentFSM(object):
         if not self.states.has(state):
             return False
                 
+        self._capabilities = dict((s, self._build_capabilities(s)) for s in self._dispatch)
         self.current_state = state
-        handler = self.state_handlers.get((state, self.enter_event), None)
+        if self._timing:
+            self._timing.enter(state)
+        handler = self._dispatch.get(state, _NO_HANDLERS).get(self.enter_event)
         if handler:
             handler(*args, **kwargs)
         return True
@@ -97,22 +168,26 @@ class InstrumentFSM(object):
         @raises Any exception raised by the handlers.
         """
 
-        next_state = None
-        result = None
+        state = self.current_state
+        handler = self._dispatch.get(state, _NO_HANDLERS).get(event)
+        if handler is None:
+            # only events of the events enum can have handlers
+            if self.events.has(event):
+                raise InstrumentStateException('Command (%s) not handled in current state (%s).' % (event, state))
+            raise InstrumentStateException(str(event) + " was not handled by InstrumentFSM.on_event()")
 
-        if self.events.has(event):
-            handler = self.state_handlers.get((self.current_state, event), None)
-            if handler:
-                (next_state, result) = handler(*args, **kwargs)
-            else:
-                raise InstrumentStateException('Command (%s) not handled in current state (%s).' % (event, self.current_state))
+        timing = self._timing
+        if timing:
+            start = time.time()
+            (next_state, result) = handler(*args, **kwargs)
+            timing.handled(state, event, time.time() - start)
         else:
-            raise InstrumentStateException(str(event) + " was not handled by InstrumentFSM.on_event()")
+            (next_state, result) = handler(*args, **kwargs)
 
         if self.states.has(next_state):
             self._on_transition(next_state, *args, **kwargs)
         else:
-            log.debug("No next state'" + repr(next_state) + "', remaining in current_state.")
+            log.debug("No next state %r, remaining in current_state.", next_state)
                 
         return result
             
@@ -126,34 +201,60 @@ class InstrumentFSM(object):
         @raises Any exception raised by the handlers.
         """
 
-        handler = self.state_handlers.get((self.current_state, self.exit_event), None)
+        handler = self._dispatch.get(self.current_state, _NO_HANDLERS).get(self.exit_event)
         if handler:
             handler(*args, **kwargs)
         self.previous_state = self.current_state
         self.current_state = next_state
-        handler = self.state_handlers.get((self.current_state, self.enter_event), None)
+        if self._timing:
+            self._timing.enter(next_state)
+        handler = self._dispatch.get(next_state, _NO_HANDLERS).get(self.enter_event)
         if handler:
             handler(*args, **kwargs)
 
+    def _build_capabilities(self, state):
+        """
+        @param state a state, None for all states
+        @retval tuple of the events handled in the state, other than enter and exit
+        """
+        if state is None:
+            handlers = [self._dispatch[s] for s in sorted(self._dispatch)]
+        else:
+            handlers = [self._dispatch.get(state, _NO_HANDLERS)]
+        events = []
+        for state_handlers in handlers:
+            for event in state_handlers:
+                if event != self.enter_event and event != self.exit_event and event not in events:
+                    events.append(event)
+        return tuple(events)
+
     def get_events(self, current_state=True):
         """
         Return a list of events handled.
         @param current_state if true, return events handled in the current state only.
         @retval list of events handled.
         """
-        events = []
-        for (key, handler) in self.state_handlers.iteritems():
-            state = key[0]
-            event = key[1]
-            if not ((event == self.enter_event) or (event == self.exit_event)):
-                if current_state:
-                    if (self.current_state==state):
-                        if event not in events:
-                            events.append(event)
-                else:
-                    if event not in events:
-                        events.append(event)
-        return events
+        state = self.current_state if current_state else None
+        capabilities = self._capabilities
+        events = capabilities.get(state)
+        if events is None:
+            events = capabilities[state] = self._build_capabilities(state)
+        return list(events)
+
+    def set_timing(self, enabled=True):
+        """
+        Enable or disable handler and state timing. Enabling starts from zero.
+        """
+        self._timing = FSMTiming(self.current_state) if enabled else None
+
+    def get_timing(self):
+        """
+        @retval timing as returned by FSMTiming.get_timing, None if timing is
+        not enabled.
+        """
+        if self._timing:
+            return self._timing.get_timing()
+        return None
 
 
 class ThreadSafeFSM(InstrumentFSM):
@@ -172,21 +273,5 @@ class ThreadSafeFSM(InstrumentFSM):
     def on_event(self, event, *args, **kwargs):
         """
         """
-        
-        self._lock.acquire(True)
-        ex = None
-        
-        try:
-            result = super(ThreadSafeFSM, self).on_event(event, *args, **kwargs)
-        
-        except Exception as ex:
-            pass
-        
-        finally:
-            self._lock.release()
-        
-        if ex:
-            raise ex
-        
-        return result
-    
+        with self._lock:
+            return super(ThreadSafeFSM, self).on_event(event, *args, **kwargs)
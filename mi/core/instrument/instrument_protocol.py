@@ -18,9 +18,9 @@ import time
 import json
 from functools import partial
 
-from mi.core.log import get_logger ; log = get_logger()
+from mi.core.log import get_guarded_logger ; log = get_guarded_logger()
 
-from threading import Thread
+from threading import Thread, Condition
 
 from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.common import BaseEnum, InstErrorCode
@@ -334,7 +334,7 @@ class InstrumentProtocol(object):
         if(not self._scheduler_callback.get(name)):
             raise KeyError("scheduler does not exist for '%s'" % name)
 
-        log.debug("removing scheduler: %s" % name)
+        log.debug("removing scheduler: %s", name)
         callback = self._scheduler_callback.get(name)
         try:
             self._scheduler.remove_job(callback)
@@ -355,7 +355,7 @@ class InstrumentProtocol(object):
         if(self._scheduler_callback.get(name)):
             raise KeyError("duplicate scheduler exists for '%s'" % name)
 
-        log.debug("Add scheduler callback: %s" % name)
+        log.debug("Add scheduler callback: %s", name)
         self._scheduler_callback[name] = callback
         self._add_scheduler_job(name)
 
@@ -370,7 +370,7 @@ class InstrumentProtocol(object):
         """
         # Create a callback for the scheduler to raise an event
         def event_callback(self, event):
-            log.info("driver job triggered, raise event: %s" % event)
+            log.info("driver job triggered, raise event: %s", event)
             self._protocol_fsm.on_event(event)
 
         # Dynamically create the method and add it
@@ -397,7 +397,7 @@ class InstrumentProtocol(object):
             raise KeyError("scheduler job already configured '%s'" % name)
 
         scheduler_config = self._get_scheduler_config()
-        log.debug("Scheduler config: %s" % scheduler_config)
+        log.debug("Scheduler config: %s", scheduler_config)
 
         # No config?  Nothing to do then.
         if(scheduler_config == None):
@@ -412,7 +412,7 @@ class InstrumentProtocol(object):
                 DriverSchedulerConfigKey.CALLBACK: callback
             }
             config = {name: self._scheduler_config[name]}
-            log.debug("Scheduler job with config: %s" % config)
+            log.debug("Scheduler job with config: %s", config)
 
             # start the job.  Note, this lazily starts the scheduler too :)
             self._scheduler.add_config(config)
@@ -440,11 +440,16 @@ class InstrumentProtocol(object):
         Activate all configured schedulers added using _add_scheduler.
         Timers start when the job is activated.
         """
-        log.debug("Scheduler config: %s" % self._get_scheduler_config())
-        log.debug("Scheduler callbacks: %s" % self._scheduler_callback)
+        log.debug("Scheduler config: %s", self._get_scheduler_config())
+        log.debug("Scheduler callbacks: %s", self._scheduler_callback)
+        # Drop the jobs of an earlier initialization, the shared scheduler
+        # would otherwise keep running them.
+        if(self._scheduler):
+            self._scheduler.shutdown()
+            self._scheduler_config = {}
         self._scheduler = DriverScheduler()
         for name in self._scheduler_callback.keys():
-            log.debug("Add job for callback: %s" % name)
+            log.debug("Add job for callback: %s", name)
             self._add_scheduler_job(name)
 
     #############################################################
@@ -1035,7 +1040,7 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         
         build_handler = self._build_handlers.get(cmd, None)
         if not build_handler:
-            log.error('_do_cmd_no_resp: no handler for command: %s' % (cmd))
+            log.error('_do_cmd_no_resp: no handler for command: %s', cmd)
             raise InstrumentProtocolException(error_code=InstErrorCode.BAD_DRIVER_COMMAND)
         cmd_line = build_handler(cmd, *args)
         
@@ -1048,7 +1053,7 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         self._promptbuf = ''
 
         # Send command.
-        log.debug('_do_cmd_no_resp: %s, timeout=%s' % (repr(cmd_line), timeout))
+        log.debug('_do_cmd_no_resp: %r, timeout=%s', cmd_line, timeout)
         if (write_delay == 0):
             self._connection.send(cmd_line)
         else:
@@ -1065,7 +1070,7 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         """
 
         # Send command.
-        log.debug('_do_cmd_direct: <%s>' % cmd)
+        log.debug('_do_cmd_direct: <%s>', cmd)
         self._connection.send(cmd)
  
     ########################################################################
@@ -1084,8 +1089,8 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         data = port_agent_packet.get_data()
         timestamp = port_agent_packet.get_timestamp()
 
-        log.debug("Got Data: %r" % data)
-        log.debug("Add Port Agent Timestamp: %s" % timestamp)
+        log.debug("Got Data: %r", data)
+        log.debug("Add Port Agent Timestamp: %s", timestamp)
 
         if data_length > 0:
             if self.get_current_state() == DriverProtocolState.DIRECT_ACCESS:
@@ -1141,8 +1146,8 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         if(len(self._promptbuf) > self._max_buffer_size()):
             self._promptbuf = self._linebuf[self._max_buffer_size()*-1:]
 
-        log.debug("LINE BUF: %s", self._linebuf)
-        log.debug("PROMPT BUF: %s", self._promptbuf)
+        log.trace("LINE BUF: %r", self._linebuf)
+        log.trace("PROMPT BUF: %r", self._promptbuf)
 
     def _max_buffer_size(self):
         return MAX_BUFFER_SIZE
@@ -1217,8 +1222,519 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
                 count += 1
                 if count >= no_tries:
                     raise InstrumentProtocolException('Incorrect prompt.')
-                    
-                
+
+
+class ProtocolConnection(object):
+    """
+    State kept for one named port agent connection of a
+    MultiConnectionInstrumentProtocol: the connection itself, its line and
+    prompt buffers, its chunker and the handler for the chunks it produces.
+
+    Threads waiting for a response block on a condition which is notified
+    each time data is added to the buffers, so a response is seen as soon
+    as the port agent listener delivers it.
+    """
+    def __init__(self, name, chunker=None, got_chunk=None, raw_particle_class=RawDataParticle):
+        """
+        @param name The name of the connection, usually the key of the
+        connection in the comms config.
+        @param chunker Chunker used to frame data from this connection.
+        @param got_chunk Callable taking (chunk, timestamp) for each chunk.
+        @param raw_particle_class Particle class used to publish raw data.
+        """
+        self.name = name
+        self.connection = None
+        self.chunker = chunker
+        self.got_chunk = got_chunk
+        self.raw_particle_class = raw_particle_class
+
+        self.linebuf = ''
+        self.promptbuf = ''
+        self.last_data_timestamp = None
+
+        self._data_ready = Condition()
+
+    def add_to_buffer(self, data, max_size=MAX_BUFFER_SIZE):
+        """
+        Add data to the line and prompt buffers and wake any waiters.
+        @param data bytes to add to the buffers
+        @param max_size leading bytes beyond this size are dropped
+        """
+        with self._data_ready:
+            self.linebuf += data
+            self.promptbuf += data
+            self.last_data_timestamp = time.time()
+
+            if len(self.linebuf) > max_size:
+                self.linebuf = self.linebuf[-max_size:]
+
+            if len(self.promptbuf) > max_size:
+                self.promptbuf = self.promptbuf[-max_size:]
+
+            self._data_ready.notify_all()
+
+    def clear_buffers(self):
+        """
+        Clear the line and prompt buffers.
+        """
+        with self._data_ready:
+            self.linebuf = ''
+            self.promptbuf = ''
+
+    def clear_prompt_buffer(self):
+        """
+        Clear only the prompt buffer.
+        """
+        with self._data_ready:
+            self.promptbuf = ''
+
+    def wait_for(self, match, timeout):
+        """
+        Block until match returns something other than None.  match is
+        called with this connection while the buffer lock is held, first
+        immediately and then each time new data arrives.
+        @param match callable taking this connection
+        @param timeout seconds to wait
+        @retval the value returned by match
+        @raise InstrumentTimeoutException if nothing matched in time
+        """
+        end_time = time.time() + timeout
+
+        with self._data_ready:
+            while True:
+                result = match(self)
+                if result is not None:
+                    return result
+
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    raise InstrumentTimeoutException("timeout waiting on connection %s" % self.name)
+
+                self._data_ready.wait(remaining)
+
+
+class MultiConnectionInstrumentProtocol(CommandResponseInstrumentProtocol):
+    """
+    Base class for command-response instruments reached through more than
+    one port agent connection, e.g. a master and slave instrument driven by
+    one state machine.
+
+    The primary connection is still handled by CommandResponseInstrumentProtocol
+    (self._connection, self._linebuf, self._chunker).  Each additional
+    connection is registered by name with _add_connection and has its own
+    buffers, chunker and response waiter.  The *_on methods mirror the
+    single connection command/response helpers for a named connection, and
+    _run_concurrently lets commands be issued to several instruments at
+    once since every connection is serviced by its own listener thread.
+    """
+
+    def __init__(self, prompts, newline, driver_event):
+        """
+        Constructor.
+        @param prompts Enum class containing possible device prompts used for
+        command response logic.
+        @param newline The device newline.
+        @driver_event The callback for asynchronous driver events.
+        """
+        CommandResponseInstrumentProtocol.__init__(self, prompts, newline, driver_event)
+        self._init_connections()
+
+    def _init_connections(self):
+        """
+        Reset the named connections.  Split from the constructor so protocols
+        which also derive from another CommandResponseInstrumentProtocol
+        subclass can call it after that class's constructor.
+        """
+        self._connections = {}
+
+    def _add_connection(self, name, chunker=None, got_chunk=None, raw_particle_class=RawDataParticle):
+        """
+        Register a named connection.
+        @param name connection name
+        @param chunker chunker for data from this connection
+        @param got_chunk callable taking (chunk, timestamp)
+        @param raw_particle_class particle class for raw data
+        @raise KeyError if the connection is already registered
+        """
+        if name in self._connections:
+            raise KeyError("duplicate connection '%s'" % name)
+
+        self._connections[name] = ProtocolConnection(name, chunker, got_chunk, raw_particle_class)
+
+    def _get_connection(self, name):
+        """
+        @param name connection name
+        @retval the ProtocolConnection registered under name
+        @raise InstrumentProtocolException for an unknown connection
+        """
+        try:
+            return self._connections[name]
+        except KeyError:
+            raise InstrumentProtocolException('Unknown connection: %s' % name)
+
+    def set_connection(self, name, connection):
+        """
+        Attach a port agent client to a named connection.  Called by the
+        driver once the client has been initialized.
+        @param name connection name
+        @param connection port agent client
+        """
+        self._get_connection(name).connection = connection
+
+    def get_connection_callbacks(self, name):
+        """
+        Return the data and raw callbacks to pass to the port agent
+        client's init_comms for a named connection.
+        @param name connection name
+        @retval (got_data, got_raw) tuple of callables
+        """
+        self._get_connection(name)
+        return partial(self.got_data_on, name), partial(self.got_raw_on, name)
+
+    ########################################################################
+    # Incoming data callbacks.
+    ########################################################################
+    def got_data_on(self, name, port_agent_packet):
+        """
+        Called by the port agent client of a named connection when data is
+        available.  Append the line and prompt buffers, then pass the data
+        through the connection's chunker.
+        @param name connection name
+        @param port_agent_packet packet received
+        """
+        conn = self._get_connection(name)
+
+        data_length = port_agent_packet.get_data_length()
+        data = port_agent_packet.get_data()
+        timestamp = port_agent_packet.get_timestamp()
+
+        log.trace("Got Data (%s): %r", name, data)
+
+        if data_length > 0:
+            if self.get_current_state() == DriverProtocolState.DIRECT_ACCESS:
+                self._driver_event(DriverAsyncEvent.DIRECT_ACCESS, data)
+
+            conn.add_to_buffer(data, self._max_buffer_size())
+
+            if conn.chunker:
+                conn.chunker.add_chunk(data, timestamp)
+                (timestamp, chunk) = conn.chunker.get_next_data()
+                while chunk:
+                    conn.got_chunk(chunk, timestamp)
+                    (timestamp, chunk) = conn.chunker.get_next_data()
+
+    def got_raw_on(self, name, port_agent_packet):
+        """
+        Called by the port agent client of a named connection when raw data
+        is available.  Publish it using the connection's raw particle class.
+        @param name connection name
+        @param port_agent_packet packet received
+        """
+        conn = self._get_connection(name)
+        particle = conn.raw_particle_class(port_agent_packet.get_as_dict(),
+                                           port_timestamp=port_agent_packet.get_timestamp())
+
+        if self._driver_event:
+            self._driver_event(DriverAsyncEvent.SAMPLE, particle.generate())
+
+    ########################################################################
+    # Command/response on a named connection.
+    ########################################################################
+    def _send_on(self, name, cmd_line, write_delay=DEFAULT_WRITE_DELAY):
+        """
+        Send a string on a named connection, optionally a character at a time.
+        @param name connection name
+        @param cmd_line string to send
+        @param write_delay delay in seconds between characters
+        """
+        connection = self._get_connection(name).connection
+
+        if write_delay == 0:
+            connection.send(cmd_line)
+        else:
+            for char in cmd_line:
+                connection.send(char)
+                time.sleep(write_delay)
+
+    def _send_wakeup_on(self, name):
+        """
+        Send a wakeup to the device on a named connection.  Sends a newline
+        by default, overridden by device specific subclasses.
+        @param name connection name
+        """
+        self._send_on(name, self._newline)
+
+    def _wakeup_on(self, name, timeout, delay=1):
+        """
+        Clear the prompt buffer and send wakeups on a named connection until
+        a prompt is seen.  Returns as soon as a prompt arrives.
+        @param name connection name
+        @param timeout The timeout to wake the device.
+        @param delay The time to wait between consecutive wakeups.
+        @retval the prompt found
+        @throw InstrumentTimeoutException if the device could not be woken.
+        """
+        conn = self._get_connection(name)
+        conn.clear_prompt_buffer()
+        prompts = self._get_prompts()
+
+        def find_prompt(c):
+            for item in prompts:
+                if c.promptbuf.find(item) >= 0:
+                    return item
+
+        end_time = time.time() + timeout
+
+        while True:
+            log.trace('Sending wakeup on %s. timeout=%s', name, timeout)
+            self._send_wakeup_on(name)
+
+            remaining = end_time - time.time()
+            try:
+                return conn.wait_for(find_prompt, min(delay, max(remaining, 0)))
+            except InstrumentTimeoutException:
+                if time.time() >= end_time:
+                    raise InstrumentTimeoutException("in _wakeup_on(%s)" % name)
+
+    def _wakeup_until_on(self, name, timeout, desired_prompt, delay=1, no_tries=5):
+        """
+        Continue waking the device on a named connection until a specific
+        prompt appears or a number of tries has occurred.
+        @param name connection name
+        @param timeout The timeout to wake the device.
+        @param desired_prompt Continue waking until this prompt is seen.
+        @param delay Time to wake between consecutive wakeups.
+        @param no_tries Maximum number of wakeup tries to see desired prompt.
+        @raises InstrumentTimeoutException if device could not be woken.
+        @raises InstrumentProtocolException if the desired prompt is not seen in the
+        maximum number of attempts.
+        """
+        for _ in xrange(no_tries):
+            if self._wakeup_on(name, timeout, delay) == desired_prompt:
+                return
+            time.sleep(delay)
+
+        raise InstrumentProtocolException('Incorrect prompt.')
+
+    def _get_response_on(self, name, timeout=10, expected_prompt=None, response_regex=None):
+        """
+        Get a response from the instrument on a named connection.  Same
+        semantics as CommandResponseInstrumentProtocol._get_response, but
+        blocks on the connection's response waiter instead of polling.
+        @param name connection name
+        @param timeout The timeout in seconds
+        @param expected_prompt Only consider the specific expected prompt(s)
+        @param response_regex compiled regex to match against the line buffer
+        @retval match groups if a regex is supplied, otherwise (prompt, response)
+        @throw InstrumentProtocolException if both regex and expected prompt are
+        passed in or regex is not a compiled pattern.
+        @throw InstrumentTimeoutException on timeout
+        """
+        if response_regex and not isinstance(response_regex, RE_PATTERN):
+            raise InstrumentProtocolException('Response regex is not a compiled pattern!')
+
+        if expected_prompt and response_regex:
+            raise InstrumentProtocolException('Cannot supply both regex and expected prompt!')
+
+        if expected_prompt is None:
+            prompt_list = self._get_prompts()
+        elif isinstance(expected_prompt, str):
+            prompt_list = [expected_prompt]
+        else:
+            prompt_list = expected_prompt
+
+        def find_response(conn):
+            if response_regex:
+                match = response_regex.search(conn.linebuf)
+                if match:
+                    return match.groups()
+            else:
+                for item in prompt_list:
+                    index = conn.promptbuf.find(item)
+                    if index >= 0:
+                        return item, conn.promptbuf[0:index+len(item)]
+
+        try:
+            return self._get_connection(name).wait_for(find_response, timeout)
+        except InstrumentTimeoutException:
+            raise InstrumentTimeoutException("in _get_response_on(%s)" % name)
+
+    def _get_raw_response_on(self, name, timeout=10, expected_prompt=None):
+        """
+        Get a response from the instrument on a named connection without
+        trimming whitespace.
+        @param name connection name
+        @param timeout The timeout in seconds
+        @param expected_prompt Only consider the specific expected prompt(s)
+        @retval (prompt, line buffer)
+        @throw InstrumentTimeoutException on timeout
+        """
+        strip_chars = "\t "
+
+        if expected_prompt is None:
+            prompt_list = self._get_prompts()
+        elif isinstance(expected_prompt, str):
+            prompt_list = [expected_prompt]
+        else:
+            prompt_list = expected_prompt
+
+        def find_response(conn):
+            for item in prompt_list:
+                if conn.promptbuf.rstrip(strip_chars).endswith(item.rstrip(strip_chars)):
+                    return item, conn.linebuf
+
+        try:
+            return self._get_connection(name).wait_for(find_response, timeout)
+        except InstrumentTimeoutException:
+            raise InstrumentTimeoutException("in _get_raw_response_on(%s)" % name)
+
+    def _build_command_line(self, cmd, *args):
+        """
+        Build a command using its registered build handler.
+        @raise InstrumentProtocolException if there is no build handler
+        """
+        build_handler = self._build_handlers.get(cmd, None)
+        if not build_handler:
+            raise InstrumentProtocolException('Cannot build command: %s' % cmd)
+
+        return build_handler(cmd, *args)
+
+    def _do_cmd_resp_on(self, name, cmd, *args, **kwargs):
+        """
+        Perform a command-response on a named connection.  Takes the same
+        kwargs as CommandResponseInstrumentProtocol._do_cmd_resp.
+        @param name connection name
+        @param cmd The command to execute.
+        @param args positional arguments to pass to the build handler.
+        @retval resp_result The (possibly parsed) response result.
+        @raises InstrumentTimeoutException if the response did not occur in time.
+        @raises InstrumentProtocolException if command could not be built or if response
+        was not recognized.
+        """
+        timeout = kwargs.get('timeout', DEFAULT_CMD_TIMEOUT)
+        expected_prompt = kwargs.get('expected_prompt', None)
+        response_regex = kwargs.get('response_regex', None)
+        write_delay = kwargs.get('write_delay', DEFAULT_WRITE_DELAY)
+
+        if response_regex and not isinstance(response_regex, RE_PATTERN):
+            raise InstrumentProtocolException('Response regex is not a compiled pattern!')
+
+        if expected_prompt and response_regex:
+            raise InstrumentProtocolException('Cannot supply both regex and expected prompt!')
+
+        cmd_line = self._build_command_line(cmd, *args)
+
+        # Wakeup the device, pass up exception if timeout
+        self._wakeup_on(name, timeout)
+
+        # Clear line and prompt buffers for result.
+        self._get_connection(name).clear_buffers()
+
+        log.debug('_do_cmd_resp_on(%s): %r, timeout=%s, write_delay=%s, expected_prompt=%s, response_regex=%s',
+                  name, cmd_line, timeout, write_delay, expected_prompt, response_regex)
+        self._send_on(name, cmd_line, write_delay)
+
+        # Wait for the prompt, prepare result and return, timeout exception
+        if response_regex:
+            prompt = ""
+            result_tuple = self._get_response_on(name, timeout, response_regex=response_regex)
+            result = "".join(result_tuple)
+        else:
+            (prompt, result) = self._get_response_on(name, timeout, expected_prompt=expected_prompt)
+
+        resp_handler = self._response_handlers.get((self.get_current_state(), cmd), None) or \
+            self._response_handlers.get(cmd, None)
+        resp_result = None
+        if resp_handler:
+            resp_result = resp_handler(result, prompt)
+
+        return resp_result
+
+    def _do_cmd_no_resp_on(self, name, cmd, *args, **kwargs):
+        """
+        Issue a command on a named connection after a wake up and clearing
+        of buffers. No response is handled as a result of the command.
+        @param name connection name
+        @param cmd The command to execute.
+        @param args positional arguments to pass to the build handler.
+        @raises InstrumentTimeoutException if the device could not be woken.
+        @raises InstrumentProtocolException if command could not be built.
+        """
+        timeout = kwargs.get('timeout', DEFAULT_CMD_TIMEOUT)
+        write_delay = kwargs.get('write_delay', DEFAULT_WRITE_DELAY)
+
+        cmd_line = self._build_command_line(cmd, *args)
+
+        self._wakeup_on(name, timeout)
+        self._get_connection(name).clear_buffers()
+
+        log.debug('_do_cmd_no_resp_on(%s): %r, timeout=%s', name, cmd_line, timeout)
+        self._send_on(name, cmd_line, write_delay)
+
+    def _do_cmd_direct_on(self, name, cmd):
+        """
+        Issue an untranslated command on a named connection.
+        @param name connection name
+        @param cmd The command to issue
+        """
+        log.debug('_do_cmd_direct_on(%s): <%s>', name, cmd)
+        self._send_on(name, cmd)
+
+    ########################################################################
+    # Concurrent commands.
+    ########################################################################
+    def _run_concurrently(self, *calls):
+        """
+        Run each callable in its own thread and wait for all of them.  Used
+        to talk to several instruments at once, e.g.
+
+            result, result2 = self._run_concurrently(
+                partial(self._do_cmd_resp, cmd),
+                partial(self._do_cmd_resp_on, SLAVE, cmd))
+
+        The callables must not share buffers, i.e. each should drive a
+        different connection.
+        @param calls callables taking no arguments
+        @retval list of results, in the order of calls
+        @raise the first exception raised by a call, in the order of calls,
+        once every call has completed
+        """
+        results = [None] * len(calls)
+        errors = [None] * len(calls)
+
+        def run(index, call):
+            try:
+                results[index] = call()
+            except Exception as e:
+                log.error('Exception in concurrent call %r: %r', call, e)
+                errors[index] = e
+
+        threads = [Thread(target=run, args=(index, call)) for index, call in enumerate(calls)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for error in errors:
+            if error is not None:
+                raise error
+
+        return results
+
+    def _do_cmd_resp_all(self, cmd, *args, **kwargs):
+        """
+        Perform the same command-response on every named connection at once.
+        @param cmd The command to execute.
+        @param args positional arguments to pass to the build handler.
+        @retval dict of connection name to response result
+        @raise see _do_cmd_resp_on
+        """
+        names = sorted(self._connections.keys())
+        results = self._run_concurrently(*[partial(self._do_cmd_resp_on, name, cmd, *args, **kwargs)
+                                           for name in names])
+        return dict(zip(names, results))
+
+
 class MenuInstrumentProtocol(CommandResponseInstrumentProtocol):
     """
     Base class for menu-based instrument interfaces that can use a cmd/response approach to
@@ -1311,8 +1827,8 @@ class MenuInstrumentProtocol(CommandResponseInstrumentProtocol):
             except:
                 raise InstrumentProtocolException('MenuTree.get_directions(): node %s not in _node_directions dictionary'
                                                   %str(node))                
-            log.trace("MenuTree.get_directions(): _node_directions = %s, node = %s, d_list = %s" 
-                      %(str(self._node_directions), str(node), str(directions_list)))
+            log.trace("MenuTree.get_directions(): _node_directions = %s, node = %s, d_list = %s",
+                      self._node_directions, node, directions_list)
             directions = []
             for item in directions_list:
                 if not isinstance(item, self.Directions):
@@ -1408,7 +1924,7 @@ class MenuInstrumentProtocol(CommandResponseInstrumentProtocol):
         # iterate through the directions 
         directions_list = self._menu.get_directions(menu)
         for directions in directions_list:
-            log.debug('_navigate: directions: %s' %(directions))
+            log.debug('_navigate: directions: %s', directions)
             command = directions.get_command()
             response = directions.get_response()
             timeout = directions.get_timeout()
@@ -1437,10 +1953,10 @@ class MenuInstrumentProtocol(CommandResponseInstrumentProtocol):
         value = kwargs.pop('value', None)
         if cmd is None:
             cmd_line = self._build_simple_command(value) 
-            log.debug('_navigate_and_execute: sending value: %s to connection.send.' %(cmd_line))
+            log.debug('_navigate_and_execute: sending value: %s to connection.send.', cmd_line)
             self._connection.send(cmd_line)
         else:
-            log.debug('_navigate_and_execute: sending cmd: %s with kwargs: %s to _do_cmd_resp.' %(cmd, kwargs))
+            log.debug('_navigate_and_execute: sending cmd: %s with kwargs: %s to _do_cmd_resp.', cmd, kwargs)
             resp_result = self._do_cmd_resp(cmd, **kwargs)
  
         return resp_result
@@ -52,8 +52,8 @@ class LoggerClient(object):
             self.sock.setblocking(0)        
             self.listener_thread = Listener(self.sock, self.delim, callback)
             self.listener_thread.start()
-            log.info('LoggerClient.init_comms(): connected to port agent at %s:%i.'
-                           % (self.host, self.port))        
+            log.info('LoggerClient.init_comms(): connected to port agent at %s:%i.',
+                     self.host, self.port)        
         except:
             raise InstrumentConnectionException('Failed to connect to port agent at %s:%i.' 
                                                 % (self.host, self.port))
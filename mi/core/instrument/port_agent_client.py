@@ -22,7 +22,7 @@ import binascii
 import ctypes
 import subprocess
 
-from mi.core.log import get_logger ; log = get_logger()
+from mi.core.log import get_guarded_logger ; log = get_guarded_logger()
 from mi.core.exceptions import InstrumentConnectionException
 
 HEADER_SIZE = 16 # BBBBHHLL = 1 + 1 + 1 + 1 + 2 + 2 + 4 + 4 = 16
@@ -441,7 +441,7 @@ class PortAgentClient(object):
             stop any re-entry.
             """        
             self.recovery_mutex.release()
-            log.error("Maximum connection_level recovery attempts (%d) reached." % (self.recovery_attempts))
+            log.error("Maximum connection_level recovery attempts (%d) reached.", self.recovery_attempts)
             if self.listener_thread and self.listener_thread.is_alive():
                 log.info("Stopping listener thread.") 
                 self.listener_thread.done()
@@ -455,7 +455,7 @@ class PortAgentClient(object):
             stop any re-entry.
             """
             self.recovery_attempts = self.recovery_attempts + 1
-            log.error("Attempting connection_level recovery; attempt number %d" % (self.recovery_attempts))
+            log.error("Attempting connection_level recovery; attempt number %d", self.recovery_attempts)
             self.recovery_mutex.release()
             returnValue = self._init_comms()
             if True == returnValue:
@@ -470,7 +470,7 @@ class PortAgentClient(object):
         Send a configuration parameter to the port agent
         """
         command = parameter + value
-        log.debug("Sending config parameter: %s" % (command))
+        log.debug("Sending config parameter: %s", command)
         self._command_port_agent(command)
 
     def send_break(self, duration):
@@ -492,8 +492,8 @@ class PortAgentClient(object):
                 raise InstrumentConnectionException("Missing port agent command port config")
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.connect((self.host, self.cmd_port))
-            log.info('PortAgentClient._command_port_agent(): connected to port agent at %s:%i.'
-                     % (self.host, self.cmd_port))
+            log.info('PortAgentClient._command_port_agent(): connected to port agent at %s:%i.',
+                     self.host, self.cmd_port)
             self.send(cmd, sock)
             sock.close()
         except Exception as e:
@@ -655,7 +655,7 @@ class Listener(threading.Thread):
             """
             Local error callback; this will try local recovery first; 
             """
-            log.error("fn_local_callback_error, Connection error: %s" % (errorString))
+            log.error("fn_local_callback_error, Connection error: %s", errorString)
             
             if local_callback_error:
                 return local_callback_error(errorString)
@@ -711,7 +711,7 @@ class Listener(threading.Thread):
             self.heartbeat = heartbeat + self.HEARTBEAT_FUDGE;
             returnValue = True
         else:
-            log.error('heartbeat out of range: %d' % (heartbeat))
+            log.error('heartbeat out of range: %d', heartbeat)
             returnValue = False
             
         return returnValue
@@ -793,8 +793,7 @@ class Listener(threading.Thread):
                 while bytes_left and not self._done:
                     try:
                         bytesrx = self.sock.recv_into(headerview[HEADER_SIZE - bytes_left:], bytes_left)
-                        log.debug('RX HEADER BYTES %d LEFT %d SOCK %r' % (
-                                                    bytesrx, bytes_left, self.sock,))
+                        log.debug('RX HEADER BYTES %d LEFT %d SOCK %r', bytesrx, bytes_left, self.sock)
                         if bytesrx <= 0:
                             raise SocketClosed()
                         bytes_left -= bytesrx
@@ -815,13 +814,12 @@ class Listener(threading.Thread):
                     bytes_left = data_size
                     data = bytearray(data_size)
                     dataview = memoryview(data)
-                    log.debug('Expecting DATA BYTES %d' % data_size)
+                    log.debug('Expecting DATA BYTES %d', data_size)
                     
                 while bytes_left and not self._done:
                     try:
                         bytesrx = self.sock.recv_into(dataview[data_size - bytes_left:], bytes_left)
-                        log.debug('RX DATA BYTES %d LEFT %d SOCK %r' % (
-                                                    bytesrx, bytes_left, self.sock,))
+                        log.debug('RX DATA BYTES %d LEFT %d SOCK %r', bytesrx, bytes_left, self.sock)
                         if bytesrx <= 0:
                             raise SocketClosed()
                         bytes_left -= bytesrx
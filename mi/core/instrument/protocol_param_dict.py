@@ -14,8 +14,6 @@ __license__ = 'Apache 2.0'
 import re
 import ntplib
 import time
-import yaml
-import pkg_resources
 
 from mi.core.common import BaseEnum
 from mi.core.exceptions import InstrumentParameterException
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.startup_profiler
+@file mi/core/instrument/startup_profiler.py
+@author Ronald Ronquillo
+@brief Measure where driver process start up time goes.
+
+When MI_DRIVER_STARTUP_PROFILE is set in the environment of a driver
+process, install() times every module import and DriverProcess marks the
+points the process reaches on its way to serving the first command.  The
+launching process records the launch time in MI_DRIVER_LAUNCH_TIME so the
+marks include interpreter start up.  The report is logged when the first
+command arrives and returned by the startup_profile driver process
+command.
+
+install() is run first thing in the driver process command string, see
+DriverProcess.launch_process, so it must only depend on the standard
+library.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import __builtin__
+import os
+import sys
+import time
+
+# enables profiling of the driver process when set to a non empty value
+STARTUP_PROFILE_ENV = 'MI_DRIVER_STARTUP_PROFILE'
+
+# time.time() at which the driver process was launched
+LAUNCH_TIME_ENV = 'MI_DRIVER_LAUNCH_TIME'
+
+# number of imports listed in the report
+REPORT_IMPORTS = 25
+
+_profile = None
+
+
+class ImportProfiler(object):
+    """
+    Time imports by wrapping __import__. Only imports which load at least
+    one new module are recorded, with their inclusive time and their
+    exclusive time, less the time of the imports they make themselves.
+    """
+    def __init__(self):
+        self.imports = []
+        self._stack = []
+        self._original = None
+
+    def install(self):
+        if self._original is None:
+            self._original = __builtin__.__import__
+            __builtin__.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            __builtin__.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=None, level=-1):
+        loaded = len(sys.modules)
+        start = time.time()
+        self._stack.append(0.0)
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.time() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            if len(sys.modules) > loaded:
+                self.imports.append((name, elapsed, elapsed - nested))
+
+    def slowest(self, limit=REPORT_IMPORTS):
+        """
+        @retval list of (module, inclusive seconds, exclusive seconds), by
+        exclusive time, slowest first
+        """
+        return sorted(self.imports, key=lambda i: i[2], reverse=True)[:limit]
+
+
+class StartupProfile(object):
+    """
+    Named points in time from the launch of a driver process, plus the
+    import timings.
+    """
+    def __init__(self, launch_time=None):
+        self.launch_time = launch_time or time.time()
+        self.marks = []
+        self.import_profiler = ImportProfiler()
+
+    def mark(self, name):
+        """
+        Record that the process reached a point now, only the first time.
+        """
+        if not self.has(name):
+            self.marks.append((name, time.time()))
+
+    def has(self, name):
+        return name in [mark for (mark, _) in self.marks]
+
+    def elapsed(self, name):
+        """
+        @retval seconds from launch to the named mark, None if not reached
+        """
+        for (mark, when) in self.marks:
+            if mark == name:
+                return when - self.launch_time
+        return None
+
+    def get_report(self, limit=REPORT_IMPORTS):
+        """
+        @retval dict of 'marks', a list of (name, seconds since launch), and
+        'imports', the slowest imports as listed by ImportProfiler.slowest
+        """
+        return {
+            'marks': [(name, when - self.launch_time) for (name, when) in self.marks],
+            'imports': self.import_profiler.slowest(limit),
+        }
+
+    def format_report(self, limit=REPORT_IMPORTS):
+        """
+        @retval report as a list of lines
+        """
+        report = self.get_report(limit)
+        lines = ['%-25s %8.3f secs' % mark for mark in report['marks']]
+        lines.append('%-50s %9s %9s' % ('slowest imports', 'incl secs', 'excl secs'))
+        lines.extend('%-50s %9.3f %9.3f' % i for i in report['imports'])
+        return lines
+
+
+def install():
+    """
+    Start profiling this process if enabled by the environment.
+    @retval the StartupProfile, None if profiling is not enabled
+    """
+    global _profile
+    if _profile is None and os.environ.get(STARTUP_PROFILE_ENV):
+        launch_time = os.environ.get(LAUNCH_TIME_ENV)
+        _profile = StartupProfile(float(launch_time) if launch_time else None)
+        _profile.mark('interpreter_started')
+        _profile.import_profiler.install()
+    return _profile
+
+
+def get_profile():
+    """
+    @retval the StartupProfile of this process, None if not profiling
+    """
+    return _profile
+
+
+def launch_environment():
+    """
+    Environment for launching a driver process, with the launch time
+    recorded when profiling is enabled.
+    @retval dict of environment variables
+    """
+    env = dict(os.environ)
+    if env.get(STARTUP_PROFILE_ENV):
+        env[LAUNCH_TIME_ENV] = repr(time.time())
+    return env
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.benchmark_chunker
+@file mi/core/instrument/test/benchmark_chunker.py
+@author Ronald Ronquillo
+@brief Measure the per packet cost of logging on the data path.
+
+Feeds a stream of port agent sized packets, each holding a few complete
+samples plus a fragment, through CommandResponseInstrumentProtocol.got_data,
+which buffers the data and drains the chunker, after the debug calls
+Listener.run makes for each packet.  It is run twice with debug logging
+disabled, alternately and REPEAT times, the fastest run of each is kept:
+
+ - eager: the log calls as they were, with messages built with % before
+   the call and the scoped logger from get_logger();
+ - deferred: the log calls as they are, passing their arguments to the
+   level guarded logger from get_guarded_logger().
+
+USAGE:
+    $ bin/python -m mi.core.instrument.test.benchmark_chunker [packets]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import logging
+import re
+import sys
+import time
+
+import mi.core.instrument.instrument_protocol as protocol_module
+from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.instrument_protocol import CommandResponseInstrumentProtocol
+from mi.core.instrument.instrument_driver import DriverAsyncEvent, DriverProtocolState
+from mi.core.log import get_logger, get_guarded_logger
+
+SAMPLE = '#12345.6789, 23.4567, 0.1234, 34.5678, 01 Jan 2014 00:00:00\r\n'
+SAMPLE_REGEX = re.compile(r'#.*?\r\n')
+
+DEFAULT_PACKETS = 20000
+# runs of each variant, alternated, the fastest is reported
+REPEAT = 5
+HEADER_SIZE = 16
+
+
+def sieve_function(raw_data):
+    return [(m.start(), m.end()) for m in SAMPLE_REGEX.finditer(raw_data)]
+
+
+def build_packets(count):
+    """
+    Build packets of three samples, split so each packet ends mid sample
+    """
+    stream = SAMPLE * (3 * count)
+    size = len(SAMPLE) * 3
+    offset = len(SAMPLE) / 2
+    return [Packet(stream[i + offset:i + offset + size], float(i))
+            for i in xrange(0, len(stream) - size, size)]
+
+
+class Packet(object):
+    def __init__(self, data, timestamp):
+        self.data = data
+        self.timestamp = timestamp
+
+    def get_data_length(self):
+        return len(self.data)
+
+    def get_data(self):
+        return self.data
+
+    def get_timestamp(self):
+        return self.timestamp
+
+
+class FSM(object):
+    def get_current_state(self):
+        return DriverProtocolState.COMMAND
+
+
+class EagerProtocol(CommandResponseInstrumentProtocol):
+    """
+    got_data and add_to_buffer with the log calls they had before they
+    were deferred
+    """
+
+    def got_data(self, port_agent_packet):
+        data_length = port_agent_packet.get_data_length()
+        data = port_agent_packet.get_data()
+        timestamp = port_agent_packet.get_timestamp()
+
+        # messages built before the call, as the eager log calls did
+        msg = "Got Data: %r" % data
+        log.debug("%s", msg)
+        msg = "Add Port Agent Timestamp: %s" % timestamp
+        log.debug("%s", msg)
+
+        if data_length > 0:
+            if self.get_current_state() == DriverProtocolState.DIRECT_ACCESS:
+                self._driver_event(DriverAsyncEvent.DIRECT_ACCESS, data)
+
+            self.add_to_buffer(data)
+
+            self._chunker.add_chunk(data, timestamp)
+            (timestamp, chunk) = self._chunker.get_next_data()
+            while(chunk):
+                self._got_chunk(chunk, timestamp)
+                (timestamp, chunk) = self._chunker.get_next_data()
+
+    def add_to_buffer(self, data):
+        CommandResponseInstrumentProtocol.add_to_buffer(self, data)
+        log.debug("LINE BUF: %s", self._linebuf)
+        log.debug("PROMPT BUF: %s", self._promptbuf)
+
+
+def eager_listener_logs(sock, data_size):
+    log.debug('RX NEW PACKET')
+    msg = 'RX HEADER BYTES %d LEFT %d SOCK %r' % (HEADER_SIZE, HEADER_SIZE, sock)
+    log.debug('%s', msg)
+    msg = 'Expecting DATA BYTES %d' % data_size
+    log.debug('%s', msg)
+    msg = 'RX DATA BYTES %d LEFT %d SOCK %r' % (data_size, data_size, sock)
+    log.debug('%s', msg)
+    log.debug("HANDLE PACKET")
+
+
+def deferred_listener_logs(sock, data_size):
+    log.debug('RX NEW PACKET')
+    log.debug('RX HEADER BYTES %d LEFT %d SOCK %r', HEADER_SIZE, HEADER_SIZE, sock)
+    log.debug('Expecting DATA BYTES %d', data_size)
+    log.debug('RX DATA BYTES %d LEFT %d SOCK %r', data_size, data_size, sock)
+    log.debug("HANDLE PACKET")
+
+
+# used by EagerProtocol and the listener log calls, set by main
+log = None
+
+
+def run(protocol_class, listener_logs, packets):
+    """
+    @retval (CPU seconds, samples extracted)
+    """
+    samples = []
+    protocol = protocol_class(None, '\r\n', lambda *args: None)
+    protocol._protocol_fsm = FSM()
+    protocol._chunker = StringChunker(sieve_function)
+    protocol._got_chunk = lambda chunk, timestamp: samples.append(chunk)
+    sock = object()
+
+    start = time.clock()
+    for packet in packets:
+        listener_logs(sock, packet.get_data_length())
+        protocol.got_data(packet)
+    return time.clock() - start, len(samples)
+
+
+def main(argv=None):
+    global log
+    if argv is None:
+        argv = sys.argv[1:]
+    count = int(argv[0]) if argv else DEFAULT_PACKETS
+    packets = build_packets(count)
+
+    logging.getLogger(protocol_module.__name__).setLevel(logging.INFO)
+    logging.getLogger(__name__).setLevel(logging.INFO)
+    original = protocol_module.log
+    variants = [('eager', get_logger(), EagerProtocol, eager_listener_logs),
+                ('deferred', get_guarded_logger(), CommandResponseInstrumentProtocol, deferred_listener_logs)]
+    results = {}
+    try:
+        for i in xrange(REPEAT):
+            for (name, logger, protocol_class, listener_logs) in variants:
+                log = logger
+                protocol_module.log = logger
+                (elapsed, samples) = run(protocol_class, listener_logs, packets)
+                results[name] = min(elapsed, results.get(name, elapsed))
+    finally:
+        protocol_module.log = original
+
+    for (name, logger, protocol_class, listener_logs) in variants:
+        print '%-9s %d packets, %d samples, %.3f CPU secs, %.1f usecs/packet' % \
+              (name, len(packets), samples, results[name], results[name] / len(packets) * 1e6)
+    print 'deferred logging saves %.1f usecs/packet (%.0f%%)' % (
+        (results['eager'] - results['deferred']) / len(packets) * 1e6,
+        (1 - results['deferred'] / results['eager']) * 100)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.benchmark_driver_startup
+@file mi/core/instrument/test/benchmark_driver_startup.py
+@author Ronald Ronquillo
+@brief Measure the time from launching a driver process to its first reply.
+
+Each run launches a ZmqDriverProcess for the driver with start up profiling
+enabled, times the first process_echo round trip from the launch, then asks
+the process for its start up profile and stops it.  The import time of the
+driver module in a bare interpreter is measured as well.  The profile of
+the last run is printed.
+
+USAGE:
+    $ bin/python -m mi.core.instrument.test.benchmark_driver_startup [runs] [driver module] [driver class]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import os
+import subprocess
+import sys
+import time
+
+import mi.core.instrument.driver_process as driver_process
+from mi.core.instrument.startup_profiler import STARTUP_PROFILE_ENV
+from mi.core.instrument.zmq_driver_client import ZmqDriverClient
+from mi.core.instrument.zmq_driver_process import ZmqDriverProcess
+
+DEFAULT_RUNS = 5
+DEFAULT_MODULE = 'mi.instrument.seabird.sbe37smb.ooicore.driver'
+DEFAULT_CLASS = 'SBE37Driver'
+
+
+def time_import(module):
+    """
+    @retval seconds to import the module in a new interpreter
+    """
+    code = 'import time; start = time.time(); import %s; print time.time() - start' % module
+    return float(subprocess.check_output([sys.executable, '-c', code]))
+
+
+def time_first_command(module, cls):
+    """
+    @retval (seconds from launch to the first reply, start up profile report)
+    """
+    start = time.time()
+    (process, cmd_port, evt_port) = ZmqDriverProcess.launch_process(module, cls)
+    client = ZmqDriverClient('localhost', cmd_port, evt_port)
+    client.start_messaging()
+    try:
+        client.cmd_dvr('process_echo')
+        elapsed = time.time() - start
+        report = client.cmd_dvr('startup_profile')
+        client.cmd_dvr('stop_driver_process')
+    finally:
+        client.stop_messaging()
+    process.wait()
+    return elapsed, report
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    runs = int(argv[0]) if argv else DEFAULT_RUNS
+    module = argv[1] if len(argv) > 1 else DEFAULT_MODULE
+    cls = argv[2] if len(argv) > 2 else DEFAULT_CLASS
+
+    driver_process.PYTHON = sys.executable
+    os.environ[STARTUP_PROFILE_ENV] = '1'
+
+    imports = [time_import(module) for _ in xrange(runs)]
+    print 'import %s: mean %.3f secs, min %.3f secs' % (module, sum(imports) / runs, min(imports))
+
+    results = [time_first_command(module, cls) for _ in xrange(runs)]
+    times = [elapsed for (elapsed, _) in results]
+    print 'launch to first reply: mean %.3f secs, min %.3f secs' % (sum(times) / runs, min(times))
+
+    report = results[-1][1]
+    for (name, elapsed) in report['marks']:
+        print '    %-25s %8.3f secs' % (name, elapsed)
+    print '    %-50s %9s %9s' % ('slowest imports', 'incl secs', 'excl secs')
+    for (name, inclusive, exclusive) in report['imports'][:15]:
+        print '    %-50s %9.3f %9.3f' % (name, inclusive, exclusive)
+
+
+if __name__ == '__main__':
+    main()
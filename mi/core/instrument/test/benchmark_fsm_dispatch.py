@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.benchmark_fsm_dispatch
+@file mi/core/instrument/test/benchmark_fsm_dispatch.py
+@author Ronald Ronquillo
+@brief Measure the cost of InstrumentFSM event dispatch.
+
+Drives an InstrumentFSM with enums the size of a typical driver's protocol
+states and events, alternating between an event handled in place and one
+which causes a transition.  The run is repeated with BaseEnum members
+found with dir() on every call, as BaseEnum did before caching them, and
+with the cached members.
+
+USAGE:
+    $ bin/python -m mi.core.instrument.test.benchmark_fsm_dispatch [events]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import sys
+import time
+
+from mi.core.common import BaseEnum
+from mi.core.instrument.instrument_fsm import InstrumentFSM, ThreadSafeFSM
+
+DEFAULT_EVENTS = 100000
+
+# states and events of a typical driver protocol
+State = type('State', (BaseEnum, ), dict(('STATE_%d' % i, 'DRIVER_STATE_%d' % i) for i in range(12)))
+Event = type('Event', (BaseEnum, ), dict(('EVENT_%d' % i, 'DRIVER_EVENT_%d' % i) for i in range(40)))
+Event.ENTER = 'DRIVER_EVENT_ENTER'
+Event.EXIT = 'DRIVER_EVENT_EXIT'
+
+
+def _uncached_list(cls):
+    return [getattr(cls,attr) for attr in dir(cls) if\
+            not callable(getattr(cls,attr)) and not attr.startswith('__')]
+
+
+def _uncached_has(cls, item):
+    return item in _uncached_list(cls)
+
+
+def build_fsm(fsm_class):
+    fsm = fsm_class(State, Event, Event.ENTER, Event.EXIT)
+    handled = lambda *args, **kwargs: (None, None)
+    to_1 = lambda *args, **kwargs: (State.STATE_1, None)
+    to_0 = lambda *args, **kwargs: (State.STATE_0, None)
+    for state in State.list():
+        fsm.add_handler(state, Event.ENTER, handled)
+        fsm.add_handler(state, Event.EXIT, handled)
+        fsm.add_handler(state, Event.EVENT_0, handled)
+    fsm.add_handler(State.STATE_0, Event.EVENT_39, to_1)
+    fsm.add_handler(State.STATE_1, Event.EVENT_39, to_0)
+    fsm.start(State.STATE_0)
+    return fsm
+
+
+def run(fsm, count):
+    """
+    @retval seconds elapsed
+    """
+    events = [Event.EVENT_0, Event.EVENT_39] * (count / 2)
+    start = time.time()
+    for event in events:
+        fsm.on_event(event)
+    return time.time() - start
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    count = int(argv[0]) if argv else DEFAULT_EVENTS
+
+    for fsm_class in (InstrumentFSM, ThreadSafeFSM):
+        for name, has in [('uncached enum', classmethod(_uncached_has)), ('cached enum', None)]:
+            original = BaseEnum.__dict__['has']
+            if has:
+                type.__setattr__(BaseEnum, 'has', has)
+            try:
+                elapsed = run(build_fsm(fsm_class), count)
+            finally:
+                type.__setattr__(BaseEnum, 'has', original)
+            print '%-14s %-14s %d events, %.3f secs, %.2f usecs/event' % \
+                  (fsm_class.__name__, name, count, elapsed, elapsed / count * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.benchmark_zmq_driver
+@file mi/core/instrument/test/benchmark_zmq_driver.py
+@author Ronald Ronquillo
+@brief Measure ZMQ driver process command latency and event throughput.
+
+Runs a ZmqDriverProcess messaging layer in this process (no driver is
+constructed, only the built in process_echo and test_events commands are
+used) and drives it with a ZmqDriverClient over localhost TCP, once for
+each message codec.  The events are sample events carrying a generated
+particle.  The CPU time used while the client is idle, and how late sleeps
+of TICK end meanwhile, are measured as well.
+
+With -f the client runs as under the gevent 0.13.7 pinned in buildout.cfg:
+threads are monkey patched and the client polls regular zmq at most every
+GREEN_POLL_INTERVAL ms, see zmq_driver_client._zmq_module.  The messaging
+layer then runs in a separate process, see serve, since its threads
+block in regular zmq pollers.
+
+USAGE:
+    $ bin/python -m mi.core.instrument.test.benchmark_zmq_driver [-f] [commands] [events] [codec ...]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import zmq
+
+import mi.core.instrument.zmq_driver_client as zmq_driver_client
+from mi.core.instrument.data_particle import DataParticle, DataParticleKey
+from mi.core.instrument.driver_codec import available_codecs
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
+from mi.core.instrument.zmq_driver_client import ZmqDriverClient, GREEN_POLL_INTERVAL
+from mi.core.instrument.zmq_driver_process import ZmqDriverProcess
+
+DEFAULT_COMMANDS = 1000
+DEFAULT_EVENTS = 10000
+# seconds the client is left idle, and the sleeps whose wake up delays are measured meanwhile
+IDLE_TIME = 2
+TICK = .001
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+
+class BenchmarkParticle(DataParticle):
+    _data_particle_type = 'benchmark'
+
+    def _build_parsed_values(self):
+        return [{DataParticleKey.VALUE_ID: 'value_%d' % i, DataParticleKey.VALUE: value}
+                for i, value in enumerate(self.raw_data)]
+
+
+def build_events(count):
+    """
+    @retval list of sample events, as built by InstrumentDriver._driver_event
+    """
+    particle = BenchmarkParticle([1.5, 22.125, 3, 44.0625, 'abc', 0.001], internal_timestamp=3600000000.0)
+    sample = particle.generate()
+    return [{'type': DriverAsyncEvent.SAMPLE, 'value': sample, 'time': time.time()} for _ in xrange(count)]
+
+
+def start_process(codec):
+    """
+    Start the driver process messaging threads and return the process and its ports
+    """
+    workdir = tempfile.mkdtemp()
+    cmd_port_fname = os.path.join(workdir, 'cmd_port.txt')
+    evt_port_fname = os.path.join(workdir, 'evt_port.txt')
+    process = ZmqDriverProcess('none', 'None', cmd_port_fname, evt_port_fname, None, codec)
+    process.start_messaging()
+    os.remove(cmd_port_fname)
+    os.remove(evt_port_fname)
+    os.rmdir(workdir)
+    return process
+
+
+def serve(codec):
+    """
+    Run the messaging layer, write its ports to stdout and run until stdin
+    is closed
+    """
+    process = start_process(codec)
+    print process.cmd_port, process.evt_port
+    sys.stdout.flush()
+    try:
+        sys.stdin.read()
+    finally:
+        process.stop_messaging()
+        process.cmd_thread.join()
+
+
+def launch_server(codec):
+    """
+    @retval (Popen of a serve process, cmd port, evt port)
+    """
+    cmd_str = 'from mi.core.instrument.test.benchmark_zmq_driver import serve; serve("%s")' % codec
+    server = subprocess.Popen([sys.executable, '-c', cmd_str],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    (cmd_port, evt_port) = server.stdout.readline().split()
+    return server, int(cmd_port), int(evt_port)
+
+
+def use_poll_fallback():
+    """
+    Monkey patch threads and make the client poll regular zmq, as it does
+    with gevent older than 1.0
+    """
+    from gevent import monkey
+    monkey.patch_all()
+    zmq_driver_client._zmq_module = lambda: (zmq, GREEN_POLL_INTERVAL)
+
+
+def bench_idle(seconds):
+    """
+    @retval CPU seconds used by this process per second while idle
+    """
+    start = time.clock()
+    time.sleep(seconds)
+    return (time.clock() - start) / seconds
+
+
+def bench_wakeups(seconds):
+    """
+    @retval list of the delays, in seconds, with which sleeps of TICK end
+    """
+    delays = []
+    end = time.time() + seconds
+    while time.time() < end:
+        start = time.time()
+        time.sleep(TICK)
+        delays.append(time.time() - start - TICK)
+    return delays
+
+
+def bench_commands(client, count):
+    """
+    @retval list of command round trip times in seconds
+    """
+    times = []
+    for _ in xrange(count):
+        start = time.time()
+        client.cmd_dvr('process_echo')
+        times.append(time.time() - start)
+    return times
+
+
+def bench_events(client, received, done, events):
+    """
+    @retval (seconds until the first event arrived, seconds until all events arrived)
+    """
+    del received[:]
+    done.clear()
+    start = time.time()
+    client.cmd_dvr('test_events', events=events)
+    done.wait(60)
+    if len(received) < len(events):
+        raise Exception('only %d of %d events received' % (len(received), len(events)))
+    return received[0] - start, received[-1] - start
+
+
+def run(codec, commands, events, fallback=False):
+    """
+    Benchmark one codec and print the results
+    @param fallback whether the messaging layer runs in a serve process
+    """
+    if fallback:
+        (server, cmd_port, evt_port) = launch_server(codec)
+    else:
+        process = start_process(codec)
+        (cmd_port, evt_port) = (process.cmd_port, process.evt_port)
+    client = ZmqDriverClient('localhost', cmd_port, evt_port, codec)
+
+    received = []
+    done = threading.Event()
+
+    def callback(evt):
+        received.append(time.time())
+        if len(received) == len(events):
+            done.set()
+
+    client.start_messaging(callback)
+    try:
+        # let the SUB socket finish connecting, PUB drops messages until then
+        time.sleep(.5)
+
+        times = bench_commands(client, commands)
+        print '%-8s cmd_dvr: %d commands, mean %.3f ms, p50 %.3f ms, p99 %.3f ms, max %.3f ms' % \
+              (codec, commands, sum(times) / len(times) * 1e3, percentile(times, 50) * 1e3,
+               percentile(times, 99) * 1e3, max(times) * 1e3)
+
+        first, last = bench_events(client, received, done, events)
+        print '%-8s events: %d events, first after %.3f ms, all after %.3f ms, %.0f events/sec' % \
+              (codec, len(events), first * 1e3, last * 1e3, len(events) / last)
+
+        print '%-8s idle: %.2f%% CPU' % (codec, bench_idle(IDLE_TIME) * 100)
+
+        delays = bench_wakeups(IDLE_TIME)
+        print '%-8s idle: %.0f ms sleeps end late by mean %.3f ms, p99 %.3f ms, max %.3f ms' % \
+              (codec, TICK * 1e3, sum(delays) / len(delays) * 1e3, percentile(delays, 99) * 1e3,
+               max(delays) * 1e3)
+    finally:
+        client.stop_messaging()
+        if fallback:
+            server.stdin.close()
+            server.wait()
+        else:
+            process.stop_messaging()
+            process.cmd_thread.join()
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    fallback = '-f' in argv
+    argv = [arg for arg in argv if arg != '-f']
+    commands = int(argv[0]) if argv else DEFAULT_COMMANDS
+    count = int(argv[1]) if len(argv) > 1 else DEFAULT_EVENTS
+    codecs = argv[2:] or available_codecs()
+
+    if fallback:
+        use_poll_fallback()
+        print 'gevent monkey patched, client polling regular zmq at most every %d ms' % GREEN_POLL_INTERVAL
+
+    events = build_events(count)
+    for codec in codecs:
+        run(codec, commands, events, fallback)
+
+
+if __name__ == '__main__':
+    main()
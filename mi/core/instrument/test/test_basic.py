@@ -115,8 +115,8 @@ class MyProtocol(InstrumentProtocol):
         return InstErrorCode.OK
 
     def get(self, params, *args, **kwargs):
-        mi_logger.debug("MyProtocol(%s).get: params=%s" % (self._channel,
-                                                           str(params)))
+        mi_logger.debug("MyProtocol(%s).get: params=%s", self._channel,
+                                                           str(params))
         assert isinstance(params, (list, tuple))
         result = {}
         for param in params:
@@ -129,8 +129,8 @@ class MyProtocol(InstrumentProtocol):
         return result
 
     def set(self, params, *args, **kwargs):
-        mi_logger.debug("MyProtocol(%s).set: params=%s" % (self._channel,
-                                                           str(params)))
+        mi_logger.debug("MyProtocol(%s).set: params=%s", self._channel,
+                                                           str(params))
 
         assert isinstance(params, dict)
 
@@ -201,9 +201,9 @@ class Some(object):
 
 
 def _print_dict(title, d):
-    mi_logger.debug("%s:" % title)
+    mi_logger.debug("%s:", title)
     for item in d.items():
-        mi_logger.debug("\t%s" % str(item))
+        mi_logger.debug("\t%s", str(item))
 
 
 @unittest.skip('Need to align with new refactoring')
@@ -219,7 +219,7 @@ class DriverTest(MiUnitTest):
         """Driver initialization tests"""
         channels = Some.VALID_CHANNELS + Some.INVALID_CHANNELS
 
-        mi_logger.debug("\n initialize: %s" % str(channels))
+        mi_logger.debug("\n initialize: %s", str(channels))
 
         result = self.driver.initialize(channels)
 
@@ -238,7 +238,7 @@ class DriverTest(MiUnitTest):
         """Driver configuration tests"""
         channels = Some.VALID_CHANNELS + Some.INVALID_CHANNELS
 
-        mi_logger.debug("\n configure: %s" % str(channels))
+        mi_logger.debug("\n configure: %s", str(channels))
 
         configs = {}
         for c in channels:
@@ -265,7 +265,7 @@ class DriverTest(MiUnitTest):
         """Driver connection tests"""
         channels = Some.VALID_CHANNELS + Some.INVALID_CHANNELS
 
-        mi_logger.debug("\n connect: %s" % str(channels))
+        mi_logger.debug("\n connect: %s", str(channels))
 
         result = self.driver.connect(channels)
 
@@ -284,7 +284,7 @@ class DriverTest(MiUnitTest):
         """Driver get params tests"""
         params = Some.VALID_PARAMS + Some.INVALID_PARAMS
 
-        mi_logger.debug("\nGET: %s" % str(params))
+        mi_logger.debug("\nGET: %s", str(params))
 
         get_result = self.driver.get_resource(params)
 
@@ -304,7 +304,7 @@ class DriverTest(MiUnitTest):
         params = [(Channel.ALL, Parameter.PARAM1),
                   (Channel.ALL, Parameter.PARAM2)]
 
-        mi_logger.debug("\nGET: %s" % str(params))
+        mi_logger.debug("\nGET: %s", str(params))
 
         get_result = self.driver.get_resource(params)
 
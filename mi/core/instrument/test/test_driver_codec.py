@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_driver_codec
+@file mi/core/instrument/test/test_driver_codec.py
+@author Ronald Ronquillo
+@brief Test cases for the driver message codecs
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import json
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+from mi.core.exceptions import ConfigurationException
+from mi.core.instrument.driver_codec import DriverCodecName, DEFAULT_CODEC, PickleCodec
+from mi.core.instrument.driver_codec import available_codecs, get_codec
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
+
+
+@attr('UNIT', group='mi')
+class TestDriverCodec(MiUnitTest):
+    """
+    Round trip messages through each available codec
+    """
+    COMMAND = {'cmd': 'set_resource', 'args': [{'PARAM': 1.5}], 'kwargs': {'timeout': 10}}
+    PARTICLE = json.dumps({'stream_name': 'ctd_parsed', 'values': [{'value_id': 'temp', 'value': 12.5}]})
+    SAMPLE = {'type': DriverAsyncEvent.SAMPLE, 'value': PARTICLE, 'time': 3600.5}
+    STATE = {'type': DriverAsyncEvent.STATE_CHANGE, 'value': 'DRIVER_STATE_COMMAND', 'time': 3600.5}
+
+    def test_default(self):
+        self.assertEqual(DEFAULT_CODEC, DriverCodecName.PICKLE)
+        self.assertIsInstance(get_codec(), PickleCodec)
+        self.assertIn(DriverCodecName.PICKLE, available_codecs())
+        self.assertIn(DriverCodecName.JSON, available_codecs())
+
+    def test_unknown(self):
+        with self.assertRaises(ConfigurationException):
+            get_codec('yaml')
+
+    def test_round_trip(self):
+        for name in available_codecs():
+            codec = get_codec(name)
+            for msg in [self.COMMAND, self.SAMPLE, self.STATE, 'ping', None]:
+                self.assertEqual(codec.decode(codec.encode(msg)), msg)
+
+    def test_pickle_single_frame(self):
+        """
+        Pickle keeps the send_pyobj wire format, one frame for every message
+        """
+        codec = get_codec(DriverCodecName.PICKLE)
+        self.assertEqual(len(codec.encode(self.SAMPLE)), 1)
+
+    def test_sample_payload_frame(self):
+        """
+        The particle of a sample event is sent as is in its own frame
+        """
+        for name in available_codecs():
+            if name == DriverCodecName.PICKLE:
+                continue
+            codec = get_codec(name)
+            frames = codec.encode(self.SAMPLE)
+            self.assertEqual(len(frames), 2)
+            self.assertIs(frames[1], self.PARTICLE)
+            self.assertNotIn('value', codec.loads(frames[0]))
+            self.assertEqual(len(codec.encode(self.STATE)), 1)
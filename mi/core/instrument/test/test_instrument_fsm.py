@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_instrument_fsm
+@file mi/core/instrument/test/test_instrument_fsm.py
+@author Ronald Ronquillo
+@brief Test cases for the instrument FSM
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+from mock import patch
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+from mi.core.common import BaseEnum
+from mi.core.exceptions import InstrumentStateException
+from mi.core.instrument.instrument_fsm import InstrumentFSM, ThreadSafeFSM
+
+
+class State(BaseEnum):
+    COMMAND = 'STATE_COMMAND'
+    AUTOSAMPLE = 'STATE_AUTOSAMPLE'
+
+
+class Event(BaseEnum):
+    ENTER = 'EVENT_ENTER'
+    EXIT = 'EVENT_EXIT'
+    GET = 'EVENT_GET'
+    START = 'EVENT_START'
+    STOP = 'EVENT_STOP'
+    FAIL = 'EVENT_FAIL'
+
+
+@attr('UNIT', group='mi')
+class TestInstrumentFSM(MiUnitTest):
+
+    def setUp(self):
+        self.calls = []
+        self.fsm = ThreadSafeFSM(State, Event, Event.ENTER, Event.EXIT)
+        for state in State.list():
+            self.fsm.add_handler(state, Event.ENTER, self._record(state, Event.ENTER))
+            self.fsm.add_handler(state, Event.EXIT, self._record(state, Event.EXIT))
+            self.fsm.add_handler(state, Event.GET, self._record(state, Event.GET, None, 'value'))
+        self.fsm.add_handler(State.COMMAND, Event.START, self._record(State.COMMAND, Event.START, State.AUTOSAMPLE))
+        self.fsm.add_handler(State.AUTOSAMPLE, Event.STOP, self._record(State.AUTOSAMPLE, Event.STOP, State.COMMAND))
+        self.fsm.add_handler(State.COMMAND, Event.FAIL, self._fail)
+
+    def _record(self, state, event, next_state=None, result=None):
+        def handler(*args, **kwargs):
+            self.calls.append((state, event))
+            return (next_state, result)
+        return handler
+
+    def _fail(self, *args, **kwargs):
+        raise ValueError('handler failed')
+
+    def test_dispatch(self):
+        self.assertFalse(self.fsm.add_handler('STATE_UNKNOWN', Event.GET, self._fail))
+        self.assertFalse(self.fsm.add_handler(State.COMMAND, 'EVENT_UNKNOWN', self._fail))
+
+        self.assertTrue(self.fsm.start(State.COMMAND))
+        self.assertEqual(self.fsm.on_event(Event.GET), 'value')
+        self.fsm.on_event(Event.START)
+        self.assertEqual(self.fsm.get_current_state(), State.AUTOSAMPLE)
+        self.assertEqual(self.fsm.previous_state, State.COMMAND)
+        self.assertEqual(self.calls, [(State.COMMAND, Event.ENTER),
+                                      (State.COMMAND, Event.GET),
+                                      (State.COMMAND, Event.START),
+                                      (State.COMMAND, Event.EXIT),
+                                      (State.AUTOSAMPLE, Event.ENTER)])
+
+        with self.assertRaisesRegexp(InstrumentStateException, 'not handled in current state'):
+            self.fsm.on_event(Event.START)
+        with self.assertRaisesRegexp(InstrumentStateException, 'was not handled by InstrumentFSM'):
+            self.fsm.on_event('EVENT_UNKNOWN')
+
+        # state set directly, as in test mode
+        self.fsm.current_state = State.COMMAND
+        with self.assertRaises(ValueError):
+            self.fsm.on_event(Event.FAIL)
+        # the lock is released after a handler raises
+        self.assertEqual(self.fsm.on_event(Event.GET), 'value')
+
+    def test_get_events(self):
+        self.fsm.start(State.COMMAND)
+        self.assertEqual(sorted(self.fsm.get_events()), [Event.FAIL, Event.GET, Event.START])
+        self.assertEqual(sorted(self.fsm.get_events(False)), [Event.FAIL, Event.GET, Event.START, Event.STOP])
+
+        # the returned list may be changed without affecting the FSM
+        self.fsm.get_events().remove(Event.GET)
+        self.assertIn(Event.GET, self.fsm.get_events())
+
+        self.fsm.on_event(Event.START)
+        self.assertEqual(sorted(self.fsm.get_events()), [Event.GET, Event.STOP])
+
+        # handlers added after start are included
+        self.fsm.add_handler(State.AUTOSAMPLE, Event.FAIL, self._fail)
+        self.assertEqual(sorted(self.fsm.get_events()), [Event.FAIL, Event.GET, Event.STOP])
+
+    def test_timing(self):
+        fsm = InstrumentFSM(State, Event, Event.ENTER, Event.EXIT)
+        fsm.add_handler(State.COMMAND, Event.START, self._record(State.COMMAND, Event.START, State.AUTOSAMPLE))
+        fsm.add_handler(State.AUTOSAMPLE, Event.STOP, self._record(State.AUTOSAMPLE, Event.STOP, State.COMMAND))
+        self.assertIsNone(fsm.get_timing())
+        fsm.set_timing()
+
+        with patch('time.time') as now:
+            now.side_effect = [10.0, 11.0, 11.5, 11.5, 13.0, 14.0, 14.0, 20.0]
+            fsm.start(State.COMMAND)
+            fsm.on_event(Event.START)
+            fsm.on_event(Event.STOP)
+            timing = fsm.get_timing()
+
+        self.assertEqual(timing['handlers'], {
+            State.COMMAND: {Event.START: {'count': 1, 'total': .5, 'max': .5}},
+            State.AUTOSAMPLE: {Event.STOP: {'count': 1, 'total': 1.0, 'max': 1.0}},
+        })
+        self.assertEqual(timing['states'], {
+            State.COMMAND: {'entries': 2, 'total': 7.5},
+            State.AUTOSAMPLE: {'entries': 1, 'total': 2.5},
+        })
+
+        fsm.set_timing(False)
+        self.assertIsNone(fsm.get_timing())
@@ -12,8 +12,10 @@ __license__ = 'Apache 2.0'
 
 import re
 import time
+import threading
 import ntplib
 import datetime
+from functools import partial
 from mock import Mock
 from nose.plugins.attrib import attr
 from mi.core.log import get_logger ; log = get_logger()
@@ -22,6 +24,7 @@ from mi.core.instrument.instrument_driver import DriverParameter
 from mi.core.instrument.instrument_protocol import InstrumentProtocol
 from mi.core.instrument.instrument_protocol import MenuInstrumentProtocol
 from mi.core.instrument.instrument_protocol import CommandResponseInstrumentProtocol
+from mi.core.instrument.instrument_protocol import MultiConnectionInstrumentProtocol
 from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.instrument.instrument_driver import ConfigMetadataKey
 from mi.instrument.satlantic.par_ser_600m.driver import SAMPLE_REGEX
@@ -62,10 +65,10 @@ class TestUnitInstrumentProtocol(MiUnitTestCase):
 
     def tearDown(self):
         if self.protocol._scheduler:
-            self.protocol._scheduler._scheduler.shutdown()
+            self.protocol._scheduler.shutdown()
                 
     def event_callback(self, event, value=None):
-        log.debug("Test event callback: %s" % event)
+        log.debug("Test event callback: %s", event)
         self._events.append(event)
         self._trigger_count += 1
 
@@ -79,7 +82,7 @@ class TestUnitInstrumentProtocol(MiUnitTestCase):
         count = 0
         for i in range(0, 40):
             count = self._trigger_count
-            log.debug("check for triggered event, count %d" % self._trigger_count)
+            log.debug("check for triggered event, count %d", self._trigger_count)
             if(count >= event_count): break
             time.sleep(0.3)
 
@@ -112,7 +115,7 @@ class TestUnitInstrumentProtocol(MiUnitTestCase):
                                                ntptime,
                                                publish=False)
 
-        log.debug("R: %s" % result)
+        log.debug("R: %s", result)
         self.assertEqual(result['stream_name'], SatlanticPARDataParticle(None, None).data_particle_type())
 
         # Test the format of the result in the individual driver tests. Here,
@@ -564,7 +567,7 @@ class TestUnitCommandInstrumentProtocol(MiUnitTestCase):
         return "c=%s p=%s" % (resp, prompt)
     
     def event_callback(self, event, value=None):
-        log.debug("Test event callback: %s" % event)
+        log.debug("Test event callback: %s", event)
         self._events.append(event)
         self._trigger_count += 1
 
@@ -613,6 +616,141 @@ class TestUnitCommandInstrumentProtocol(MiUnitTestCase):
                           self.TestEvent.TEST, expected_prompt=">", response_regex=regex1)
 
 
+@attr('UNIT', group='mi')
+class TestUnitMultiConnectionInstrumentProtocol(MiUnitTestCase):
+    """
+    Test cases for the multi-connection protocol class.  Two named
+    connections are registered, each echoing commands back with a prompt
+    tagged with the connection name.
+    """
+
+    class TestEvent(BaseEnum):
+        TEST = "TEST"
+
+    def setUp(self):
+        """
+        """
+        self.prompts = [">"]
+        self.newline = "\n"
+        self._events = []
+        self._chunks = []
+
+        self.protocol = MultiConnectionInstrumentProtocol(self.prompts,
+                                                          self.newline,
+                                                          self.event_callback)
+
+        self.protocol._add_build_handler(self.TestEvent.TEST, lambda cmd, *args: "cmd")
+        self.protocol._add_response_handler(self.TestEvent.TEST, lambda resp, prompt: resp)
+        self.protocol.get_current_state = Mock(return_value=None)
+
+        for name in ['a', 'b']:
+            self.protocol._add_connection(name, got_chunk=self._got_chunk)
+            connection = Mock()
+            connection.send = self._echo(name)
+            self.protocol.set_connection(name, connection)
+
+    def _echo(self, name):
+        def send(data):
+            self.protocol._connections[name].add_to_buffer("%s %s >" % (data, name))
+        return send
+
+    def _got_chunk(self, chunk, timestamp):
+        self._chunks.append((chunk, timestamp))
+
+    def event_callback(self, event, value=None):
+        self._events.append(event)
+
+    def test_add_connection(self):
+        """
+        Test connection registration and lookup
+        """
+        self.assertRaises(KeyError, self.protocol._add_connection, 'a')
+        self.assertRaises(InstrumentProtocolException, self.protocol.set_connection, 'c', Mock())
+        self.assertRaises(InstrumentProtocolException, self.protocol.get_connection_callbacks, 'c')
+
+    def test_cmd_response(self):
+        """
+        Test command-response on each named connection
+        """
+        self.assertEqual(self.protocol._do_cmd_resp_on('a', self.TestEvent.TEST), "cmd a >")
+        self.assertEqual(self.protocol._do_cmd_resp_on('b', self.TestEvent.TEST), "cmd b >")
+
+        regex = re.compile(r'cmd (b)')
+        self.assertEqual(self.protocol._do_cmd_resp_on('b', self.TestEvent.TEST, response_regex=regex), "b")
+
+        self.assertRaises(InstrumentTimeoutException,
+                          self.protocol._do_cmd_resp_on,
+                          'a', self.TestEvent.TEST, expected_prompt="-->", timeout=1)
+
+        self.assertRaises(InstrumentProtocolException,
+                          self.protocol._do_cmd_resp_on,
+                          'a', 'unknown')
+
+        self.assertEqual(self.protocol._do_cmd_resp_all(self.TestEvent.TEST),
+                         {'a': "cmd a >", 'b': "cmd b >"})
+
+    def test_response_waiter(self):
+        """
+        Verify a waiting response returns as soon as the data arrives
+        rather than on a polling boundary.
+        """
+        conn = self.protocol._connections['a']
+        conn.clear_buffers()
+
+        def deliver():
+            time.sleep(.2)
+            conn.add_to_buffer("late response >")
+
+        # not joined, the response arrives while _get_response_on waits
+        thread = threading.Thread(target=deliver)
+        start = time.time()
+        thread.start()
+        self.addCleanup(thread.join)
+        self.assertEqual(self.protocol._get_response_on('a', timeout=2), ('>', "late response >"))
+        elapsed = time.time() - start
+        self.assertGreaterEqual(elapsed, .2)
+        self.assertLess(elapsed, 1)
+
+    def test_got_data(self):
+        """
+        Verify data from each connection goes to its own buffers and chunker
+        """
+        chunker = Mock()
+        chunker.get_next_data.side_effect = [(1.0, "chunk"), (None, None)]
+        self.protocol._connections['b'].chunker = chunker
+
+        packet = Mock()
+        packet.get_data_length.return_value = 4
+        packet.get_data.return_value = "data"
+        packet.get_timestamp.return_value = 1.0
+
+        got_data, got_raw = self.protocol.get_connection_callbacks('b')
+        got_data(packet)
+
+        self.assertEqual(self.protocol._connections['b'].linebuf, "data")
+        self.assertEqual(self.protocol._connections['a'].linebuf, "")
+        chunker.add_chunk.assert_called_once_with("data", 1.0)
+        self.assertEqual(self._chunks, [("chunk", 1.0)])
+
+    def test_run_concurrently(self):
+        """
+        Verify calls run in parallel, results keep their order and errors
+        are raised after all calls complete.
+        """
+        def slow(value):
+            time.sleep(.5)
+            return value
+
+        start = time.time()
+        self.assertEqual(self.protocol._run_concurrently(partial(slow, 1), partial(slow, 2)), [1, 2])
+        self.assertLess(time.time() - start, 1)
+
+        def fail():
+            raise InstrumentProtocolException('failed')
+
+        self.assertRaises(InstrumentProtocolException, self.protocol._run_concurrently, partial(slow, 1), fail)
+
+
 @attr('UNIT', group='mi')
 class TestUnitMenuInstrumentProtocol(MiUnitTestCase):
     """
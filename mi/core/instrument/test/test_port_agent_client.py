@@ -449,7 +449,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
 
     def startPortAgent(self):
         pa_port = self.init_port_agent()
-        log.debug("port_agent started on port: %d" % (pa_port))
+        log.debug("port_agent started on port: %d", pa_port)
         time.sleep(2) # give it a chance to start responding
 
     def resetTestVars(self):
@@ -497,7 +497,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
         timeout = time.time() + 10
         while (timeout > time.time()):
             if (self._instrument_simulator.port > 0):
-                log.debug("Instrument simulator initialized on port %s" % self._instrument_simulator.port)
+                log.debug("Instrument simulator initialized on port %s", self._instrument_simulator.port)
                 return
 
             log.debug("waiting for simulator to bind. sleeping")
@@ -521,14 +521,14 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
         #comm_config = self.get_comm_config()
 
         config = self.port_agent_config()
-        log.debug("port agent config: %s" % config)
+        log.debug("port agent config: %s", config)
 
         port_agent = PortAgentProcess.launch_process(config, timeout = 60, test_mode = True)
 
         port = port_agent.get_data_port()
         pid  = port_agent.get_pid()
 
-        log.info('Started port agent pid %s listening at port %s' % (pid, port))
+        log.info('Started port agent pid %s listening at port %s', pid, port)
 
         self.addCleanup(self.stop_port_agent)
         self.port_agent = port_agent
@@ -642,7 +642,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
             paClient.init_comms(self.myGotData, self.myGotRaw, self.myGotListenerError, self.myGotError)
         
         except InstrumentConnectionException as e:
-            log.error("Exception caught: %r" % (e))
+            log.error("Exception caught: %r", e)
             exceptionCaught = True
             
         else:
@@ -727,7 +727,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
             paClient.init_comms(self.myGotData, self.myGotRaw, self.myGotListenerError, self.myGotError)
 
         except InstrumentConnectionException as e:
-            log.error("Exception caught: %r" % (e))
+            log.error("Exception caught: %r", e)
             raise
 
         else:
@@ -780,7 +780,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
             self._instrument_simulator.send(data)
             
         except InstrumentConnectionException as e:
-            log.error("Exception caught: %r" % (e))
+            log.error("Exception caught: %r", e)
             exceptionCaught = True
             
         else:
@@ -816,7 +816,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
             self._instrument_simulator.send(data)
             
         except InstrumentConnectionException as e:
-            log.error("Exception caught: %r" % (e))
+            log.error("Exception caught: %r", e)
             exceptionCaught = True
             
         else:
@@ -851,7 +851,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
             self.stop_port_agent()    
 
         except InstrumentConnectionException as e:
-            log.error("Exception caught: %r" % (e))
+            log.error("Exception caught: %r", e)
             exceptionCaught = True
             
         else:
@@ -897,7 +897,7 @@ class PAClientIntTestCase(InstrumentDriverTestCase):
             time.sleep(1)
 
         except InstrumentConnectionException as e:
-            log.error("Exception caught: %r" % (e))
+            log.error("Exception caught: %r", e)
             exceptionCaught = True
             
         else:
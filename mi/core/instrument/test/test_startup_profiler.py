@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_startup_profiler
+@file mi/core/instrument/test/test_startup_profiler.py
+@author Ronald Ronquillo
+@brief Test cases for the driver process start up profiler
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import os
+import sys
+
+from mock import patch
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+import mi.core.instrument.startup_profiler as startup_profiler
+from mi.core.instrument.startup_profiler import ImportProfiler, StartupProfile
+from mi.core.instrument.startup_profiler import STARTUP_PROFILE_ENV, LAUNCH_TIME_ENV
+
+
+@attr('UNIT', group='mi')
+class TestStartupProfiler(MiUnitTest):
+
+    def test_import_profiler(self):
+        """
+        Only imports which load a module are recorded
+        """
+        sys.modules.pop('colorsys', None)
+        profiler = ImportProfiler()
+        profiler.install()
+        try:
+            import colorsys
+            import os
+        finally:
+            profiler.uninstall()
+
+        names = [name for (name, _, _) in profiler.imports]
+        self.assertIn('colorsys', names)
+        self.assertNotIn('os', names)
+        for (name, inclusive, exclusive) in profiler.slowest():
+            self.assertGreaterEqual(inclusive, exclusive)
+
+    def test_marks(self):
+        profile = StartupProfile(launch_time=100.0)
+        with patch('time.time', return_value=101.5):
+            profile.mark('driver_imported')
+        with patch('time.time', return_value=102.0):
+            profile.mark('driver_imported')
+        self.assertTrue(profile.has('driver_imported'))
+        self.assertEqual(profile.elapsed('driver_imported'), 1.5)
+        self.assertIsNone(profile.elapsed('first_command'))
+        self.assertEqual(profile.get_report()['marks'], [('driver_imported', 1.5)])
+
+    def test_environment(self):
+        """
+        Profiling is only enabled by the environment, the launch time is passed on
+        """
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertNotIn(LAUNCH_TIME_ENV, startup_profiler.launch_environment())
+            with patch.object(startup_profiler, '_profile', None):
+                self.assertIsNone(startup_profiler.install())
+
+        with patch.dict(os.environ, {STARTUP_PROFILE_ENV: '1'}, clear=True):
+            env = startup_profiler.launch_environment()
+            self.assertIn(LAUNCH_TIME_ENV, env)
+            os.environ[LAUNCH_TIME_ENV] = env[LAUNCH_TIME_ENV]
+            with patch.object(startup_profiler, '_profile', None):
+                profile = startup_profiler.install()
+                profile.import_profiler.uninstall()
+                self.assertIs(startup_profiler.get_profile(), profile)
+                self.assertEqual(profile.launch_time, float(env[LAUNCH_TIME_ENV]))
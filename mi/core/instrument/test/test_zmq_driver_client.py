@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_zmq_driver_client
+@file mi/core/instrument/test/test_zmq_driver_client.py
+@author Ronald Ronquillo
+@brief Test cases for the ZMQ driver client polling fallback
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import thread
+import threading
+import time
+
+import zmq
+from mock import patch
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+from mi.core.instrument.zmq_driver_client import ZmqDriverClient, GREEN_POLL_INTERVAL, _zmq_module
+
+
+def green_start_new_thread(function, args):
+    pass
+green_start_new_thread.__module__ = 'gevent.thread'
+
+
+@attr('UNIT', group='mi')
+class TestZmqDriverClient(MiUnitTest):
+
+    def test_zmq_module(self):
+        """
+        Regular zmq is polled when threads are gevent's and zmq.green is
+        not available
+        """
+        with patch.object(thread, 'start_new_thread', green_start_new_thread):
+            with patch('gevent.version_info', (0, 13, 7, 'final', 0)):
+                self.assertEqual(_zmq_module(), (zmq, GREEN_POLL_INTERVAL))
+        with patch.object(thread, 'start_new_thread', lambda function, args: None):
+            self.assertEqual(_zmq_module(), (zmq, None))
+
+    def test_poll_fallback(self):
+        """
+        Polling regular zmq receives a message at most GREEN_POLL_INTERVAL
+        late, and uses little CPU while waiting
+        """
+        context = zmq.Context()
+        self.addCleanup(context.term)
+        receiver = context.socket(zmq.PAIR)
+        self.addCleanup(receiver.close)
+        receiver.bind('inproc://test_poll_fallback')
+        sender = context.socket(zmq.PAIR)
+        self.addCleanup(sender.close)
+        sender.connect('inproc://test_poll_fallback')
+
+        client = ZmqDriverClient('localhost', 5556, 5557)
+        client.poll_interval = GREEN_POLL_INTERVAL
+        poller = zmq.Poller()
+        poller.register(receiver, zmq.POLLIN)
+
+        def send():
+            time.sleep(1)
+            sender.send('ready')
+        sender_thread = threading.Thread(target=send)
+        sender_thread.start()
+        self.addCleanup(sender_thread.join)
+
+        start = time.time()
+        start_cpu = time.clock()
+        self.assertEqual(client._poll(poller), {receiver: zmq.POLLIN})
+        elapsed = time.time() - start
+        cpu = time.clock() - start_cpu
+
+        self.assertGreaterEqual(elapsed, 1)
+        self.assertLess(elapsed, 1 + GREEN_POLL_INTERVAL / 1000.0 + .05)
+        self.assertLess(cpu, .1)
+        self.assertEqual(receiver.recv(), 'ready')
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_zmq_driver_host
+@file mi/core/instrument/test/test_zmq_driver_host.py
+@author Ronald Ronquillo
+@brief Test cases for the multi driver ZmqDriverHost.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+from mi.core.exceptions import InstrumentParameterException, InstrumentStateException
+from mi.core.instrument.zmq_driver_host import ZmqDriverHost, ZmqDriverHostClient, HOST_ID, event_topic
+
+
+class EchoDriver(object):
+    """
+    Minimal driver loaded by the host under test.
+    """
+    def __init__(self, evt_callback):
+        self._send_event = evt_callback
+        self.connected = False
+
+    def connect(self):
+        self.connected = True
+
+    def disconnect(self):
+        if not self.connected:
+            raise InstrumentStateException('not connected')
+        self.connected = False
+
+    def echo(self, value):
+        return value
+
+    def fail(self):
+        raise InstrumentParameterException('fail requested')
+
+    def wait(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+
+class SlowDriver(EchoDriver):
+    def __init__(self, evt_callback):
+        time.sleep(1)
+        EchoDriver.__init__(self, evt_callback)
+
+
+class BrokenDriver(object):
+    def __init__(self, evt_callback):
+        raise ValueError('broken driver')
+
+
+@attr('UNIT', group='mi')
+class TestZmqDriverHost(MiUnitTest):
+    """
+    Run a driver host in this process and command its drivers over localhost.
+    """
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+        drivers = {
+            'a': (__name__, 'EchoDriver'),
+            'ab': (__name__, 'EchoDriver'),
+            'broken': (__name__, 'BrokenDriver'),
+        }
+        self.host = ZmqDriverHost(drivers, os.path.join(self.workdir, 'cmd'),
+                                  os.path.join(self.workdir, 'evt'), None)
+        self.host.construct_driver()
+        self.host.start_messaging()
+        self.addCleanup(self._stop_host)
+        self.clients = {}
+
+    def _stop_host(self):
+        for client in self.clients.values():
+            client.stop_messaging()
+        self.host.stop_messaging()
+        self.host.cmd_thread.join(10)
+        self.assertFalse(self.host.cmd_thread.is_alive())
+
+    def _client(self, driver_id, callback=None):
+        client = ZmqDriverHostClient('localhost', self.host.cmd_port, self.host.evt_port, driver_id)
+        client.start_messaging(callback)
+        self.clients[driver_id] = client
+        return client
+
+    def test_event_topic(self):
+        self.assertFalse(event_topic('ab').startswith(event_topic('a')))
+
+    def test_routing(self):
+        """
+        Commands reach the driver they are addressed to, failures are reported
+        """
+        host = self._client(HOST_ID)
+        listing = host.cmd_dvr('list_drivers')
+        self.assertEqual(listing['loaded'], ['a', 'ab'])
+        self.assertEqual(listing['failed'].keys(), ['broken'])
+
+        self.assertEqual(self._client('a').cmd_dvr('echo', 'to a'), 'to a')
+        self.assertEqual(self._client('ab').cmd_dvr('echo', value='to ab'), 'to ab')
+
+        reply = self._client('broken').cmd_dvr('echo', 'to broken')
+        self.assertIn('could not be constructed', reply[1])
+        reply = self._client('missing').cmd_dvr('echo', 'to missing')
+        self.assertIn('Unknown driver missing', reply[1])
+
+        self.assertTrue(host.cmd_dvr('load_driver', 'c', __name__, 'EchoDriver'))
+        self.assertEqual(self._client('c').cmd_dvr('echo', 'to c'), 'to c')
+        self.assertTrue(host.cmd_dvr('unload_driver', 'c'))
+        self.assertIn('Unknown driver c', self.clients['c'].cmd_dvr('echo', 'to c')[1])
+
+    def test_events(self):
+        """
+        A client only receives the events of its own driver
+        """
+        received = {'a': [], 'ab': []}
+        done = threading.Event()
+
+        def callback_a(evt):
+            received['a'].append(evt)
+            done.set()
+
+        client_a = self._client('a', callback_a)
+        self._client('ab', received['ab'].append)
+        # let the SUB sockets finish connecting
+        time.sleep(.5)
+
+        self.assertEqual(client_a.cmd_dvr('test_events', events=['event for a']), 'test_events')
+        done.wait(5)
+        time.sleep(.2)
+        self.assertEqual(received, {'a': ['event for a'], 'ab': []})
+
+    def test_isolation(self):
+        """
+        A slow or failing driver does not hold up the others
+        """
+        client_a = self._client('a')
+        client_ab = self._client('ab')
+
+        waiting = threading.Thread(target=client_a.cmd_dvr, args=('wait', 1))
+        waiting.start()
+        time.sleep(.1)
+        start = time.time()
+        self.assertEqual(client_ab.cmd_dvr('echo', 'busy a'), 'busy a')
+        self.assertLess(time.time() - start, .5)
+        waiting.join()
+
+        reply = client_a.cmd_dvr('fail')
+        self.assertIn('InstrumentParameterException', reply[1])
+        self.assertEqual(client_a.cmd_dvr('echo', 'after fail'), 'after fail')
+
+        # stopping one driver leaves the others running
+        self.assertEqual(client_a.cmd_dvr('stop_driver_process'), 'stop_driver_process')
+        self.assertEqual(client_ab.cmd_dvr('echo', 'a stopped'), 'a stopped')
+        self.assertEqual(self._client(HOST_ID).cmd_dvr('list_drivers')['loaded'], ['ab'])
+
+    def test_slow_load(self):
+        """
+        Commands are still routed while a driver is being constructed
+        """
+        host = self._client(HOST_ID)
+        client_a = self._client('a')
+
+        loading = threading.Thread(target=host.cmd_dvr, args=('load_driver', 'slow', __name__, 'SlowDriver'))
+        loading.start()
+        time.sleep(.1)
+        start = time.time()
+        self.assertEqual(client_a.cmd_dvr('echo', 'while loading'), 'while loading')
+        self.assertLess(time.time() - start, .5)
+        loading.join()
+        self.assertEqual(self._client('slow').cmd_dvr('echo', 'loaded'), 'loaded')
+
+    def test_disconnect(self):
+        """
+        Drivers are disconnected when unloaded and when the host stops
+        """
+        for driver_id in ('a', 'ab'):
+            self._client(driver_id).cmd_dvr('connect')
+        driver_a = self.host.drivers['a'].driver
+        driver_ab = self.host.drivers['ab'].driver
+        self.assertTrue(driver_a.connected)
+
+        self.assertTrue(self._client(HOST_ID).cmd_dvr('unload_driver', 'a'))
+        self.assertFalse(driver_a.connected)
+        self.assertTrue(driver_ab.connected)
+
+        self.host.stop_messaging()
+        self.host.cmd_thread.join(10)
+        self.assertFalse(driver_ab.connected)
@@ -18,17 +18,45 @@ c = zdc.ZmqDriverClient('localhost', 5556, 5557)
 """
 
 import thread
-import logging
+import threading
 import time
 
-# We import "regular" zmq, not the patched version because
-# we handle the nonblocking sockets directly as they need to work
-# with unpatched threads as well.
 import zmq
 
 from mi.core.instrument.driver_client import DriverClient
+from mi.core.instrument.driver_codec import DEFAULT_CODEC, get_codec
 from mi.core.log import get_logger ; log = get_logger()
 
+
+# first and longest intervals (ms) between non blocking polls when zmq must not block greenlets
+GREEN_POLL_MIN_INTERVAL = 1
+GREEN_POLL_INTERVAL = 10
+
+
+def _zmq_module():
+    """
+    Select the zmq module matching the threading model in use. When threads
+    have been monkey patched by gevent, blocking on a regular zmq socket would
+    stall every greenlet, so the gevent aware zmq.green is used where the
+    installed gevent supports it (1.0 and later).
+
+    With older gevent, including the 0.13.7 pinned in buildout.cfg, there is
+    no zmq.green and this is not event driven: regular zmq is polled without
+    blocking, sleeping in gevent in between for GREEN_POLL_MIN_INTERVAL ms,
+    doubling up to GREEN_POLL_INTERVAL ms. Replies and events are received
+    up to GREEN_POLL_INTERVAL ms late, and an idle client wakes up every
+    GREEN_POLL_INTERVAL ms, in each of its event greenlet and a cmd_dvr
+    awaiting a reply. benchmark_zmq_driver -f measures these costs.
+    @retval (zmq module, poll interval in ms or None to block)
+    """
+    if 'gevent' in getattr(thread.start_new_thread, '__module__', ''):
+        import gevent
+        if gevent.version_info[0] >= 1:
+            from zmq import green
+            return green, None
+        return zmq, GREEN_POLL_INTERVAL
+    return zmq, None
+
  
 class ZmqDriverClient(DriverClient):
     """
@@ -36,12 +64,13 @@ class ZmqDriverClient(DriverClient):
     thread for catching asynchronous driver events.
     """
     
-    def __init__(self, host, cmd_port, event_port):
+    def __init__(self, host, cmd_port, event_port, codec=DEFAULT_CODEC):
         """
         Initialize members.
         @param host Host string address of the driver process.
         @param cmd_port Port number for the driver process command port.
         @param event_port Port number for the driver process event port.
+        @param codec Name of the codec the driver process was launched with.
         """
         DriverClient.__init__(self)
         self.host = host
@@ -53,7 +82,13 @@ class ZmqDriverClient(DriverClient):
         self.zmq_cmd_socket = None
         self.event_thread = None
         self.stop_event_thread = True
-        
+        self.wakeup_endpoint = None
+        self.poll_interval = None
+        self._poller_type = zmq.Poller
+        self.codec = get_codec(codec)
+        # events are published with this topic frame when not empty
+        self.event_topic = ''
+
     def start_messaging(self, evt_callback=None):
         """
         Initialize and start messaging resources for the driver process client.
@@ -61,64 +96,108 @@ class ZmqDriverClient(DriverClient):
         and starts event thread that listens for events from the driver
         process independently of command request-reply.
         """
-        self.zmq_context = zmq.Context()
+        zmq_module, self.poll_interval = _zmq_module()
+        self.zmq_context = zmq_module.Context()
         self.zmq_cmd_socket = self.zmq_context.socket(zmq.REQ)
         self.zmq_cmd_socket.connect(self.cmd_host_string)
-        log.info('Driver client cmd socket connected to %s.' %
-                       self.cmd_host_string)        
+        log.info('Driver client cmd socket connected to %s.', self.cmd_host_string)        
         self.evt_callback = evt_callback
-        
+        self._poller_type = zmq_module.Poller
+
+        self.wakeup_endpoint = 'inproc://driver_client_wakeup_%s' % id(self)
+        wakeup_sock = self.zmq_context.socket(zmq.PULL)
+        wakeup_sock.bind(self.wakeup_endpoint)
+
         def recv_evt_messages(driver_client):
             """
             A looping function that monitors a ZMQ SUB socket for asynchronous
-            driver events. Can be run as a thread or greenlet.
+            driver events. Can be run as a thread or greenlet. Blocks in a
+            zmq.Poller until an event or a stop request arrives.
             @param driver_client The client object that launches the thread.
             """
-            context = zmq.Context()
-            sock = context.socket(zmq.SUB)
+            sock = driver_client.zmq_context.socket(zmq.SUB)
             sock.connect(driver_client.event_host_string)
-            sock.setsockopt(zmq.SUBSCRIBE, '')
-            log.info('Driver client event thread connected to %s.' %
-                  driver_client.event_host_string)
+            sock.setsockopt(zmq.SUBSCRIBE, driver_client.event_topic)
+            sock.setsockopt(zmq.RCVHWM, 0)
+            log.info('Driver client event thread connected to %s.', driver_client.event_host_string)
+
+            poller = driver_client._poller_type()
+            poller.register(sock, zmq.POLLIN)
+            poller.register(wakeup_sock, zmq.POLLIN)
 
-            driver_client.stop_event_thread = False
-            #last_time = time.time()
             while not driver_client.stop_event_thread:
-                try:
-                    evt = sock.recv_pyobj(flags=zmq.NOBLOCK)
-                    log.debug('got event: %s' % str(evt))
+                ready = driver_client._poll(poller)
+                if wakeup_sock in ready:
+                    wakeup_sock.recv()
+                if sock in ready:
+                    frames = sock.recv_multipart()
+                    if driver_client.event_topic:
+                        frames = frames[1:]
+                    evt = driver_client.codec.decode(frames)
+                    log.debug('got event: %s', evt)
                     if driver_client.evt_callback:
                         driver_client.evt_callback(evt)
-                except zmq.ZMQError:
-                    time.sleep(.5)
-                #cur_time = time.time()
-                #if cur_time - last_time > 5:
-                #    log.info('event thread listening')
-                #    last_time = cur_time
             sock.close()
-            context.term()
+            wakeup_sock.close()
             log.info('Client event socket closed.')
-        self.event_thread = thread.start_new_thread(recv_evt_messages, (self,))
+
+        self.stop_event_thread = False
+        self.event_thread = threading.Thread(target=recv_evt_messages, args=(self,))
+        self.event_thread.daemon = True
+        self.event_thread.start()
         log.info('Driver client messaging started.')
         
     def stop_messaging(self):
         """
-        Close messaging resources for the driver process client. Close
-        ZMQ command socket and terminate command context. Set flag to
-        cause event thread to close event socket and context and terminate.
-        Await event thread completion and return.
+        Close messaging resources for the driver process client. Set flag
+        and wake the event thread so it closes its sockets, await its
+        completion, then close the ZMQ command socket and terminate the
+        context.
         """
-        
+        self.stop_event_thread = True
+        sock = self.zmq_context.socket(zmq.PUSH)
+        sock.setsockopt(zmq.LINGER, 1000)
+        sock.connect(self.wakeup_endpoint)
+        sock.send('')
+        sock.close()
+        if self.event_thread is not threading.current_thread():
+            self.event_thread.join()
+
         self.zmq_cmd_socket.close()
         self.zmq_cmd_socket = None
         self.zmq_context.term()
         self.zmq_context = None
-        self.stop_event_thread = True                    
-        #self.event_thread.join()
         self.event_thread = None
         self.evt_callback = None
         log.info('Driver client messaging closed.')        
     
+    def _poll(self, poller):
+        """
+        Block until at least one of the sockets registered with the poller
+        is ready. With a poll interval the poller is polled without blocking
+        at intervals growing up to it, see _zmq_module.
+        @param poller zmq Poller
+        @retval dictionary of ready sockets to events
+        """
+        if self.poll_interval is None:
+            return dict(poller.poll())
+        interval = GREEN_POLL_MIN_INTERVAL
+        while True:
+            # blocking in regular zmq would block every greenlet, wait in gevent
+            ready = dict(poller.poll(0))
+            if ready:
+                return ready
+            time.sleep(interval / 1000.0)
+            interval = min(interval * 2, self.poll_interval)
+
+    def _encode_cmd(self, msg):
+        """
+        Encode a command message into the frames sent to the driver process.
+        @param msg The command message.
+        @retval list of frames
+        """
+        return self.codec.encode(msg)
+
     def cmd_dvr(self, cmd, *args, **kwargs):
         """
         Command a driver by request-reply messaging. Package command
@@ -132,37 +211,17 @@ class ZmqDriverClient(DriverClient):
         # Package command dictionary.
         msg = {'cmd':cmd,'args':args,'kwargs':kwargs}
         
-        log.debug('Sending command %s.' % str(msg))
-        while True:
-            try:
-                # Attempt command send. Retry if necessary.
-                self.zmq_cmd_socket.send_pyobj(msg)
-                if msg == 'stop_driver_process':
-                    return 'driver stopping'
-
-                # Command sent, break out and wait for reply.
-                break    
-
-            except zmq.ZMQError:
-                # Socket not ready to accept send. Sleep and retry later.
-                time.sleep(.5)
-            
+        log.debug('Sending command %s.', msg)
+        self.zmq_cmd_socket.send_multipart(self._encode_cmd(msg))
+
         log.debug('Awaiting reply.')
-        while True:
-            try:
-                # Attempt reply recv. Retry if necessary.
-                reply = self.zmq_cmd_socket.recv_pyobj(flags=zmq.NOBLOCK)
-                # Reply recieved, break and return.
-                break
-
-            except zmq.ZMQError:
-                # Socket not ready with the reply. Sleep and retry later.
-                time.sleep(.5)
-                
-        log.debug('Reply: %s.' % str(reply))
+        poller = self._poller_type()
+        poller.register(self.zmq_cmd_socket, zmq.POLLIN)
+        self._poll(poller)
+        reply = self.codec.decode(self.zmq_cmd_socket.recv_multipart())
+        log.debug('Reply: %s.', reply)
         
         if isinstance(reply, Exception):
             raise reply
         else:
             return reply
-    
@@ -0,0 +1,566 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.zmq_driver_host
+@file mi/core/instrument/zmq_driver_host.py
+@author Ronald Ronquillo
+@brief Host many drivers in one process using ZMQ messaging.
+
+A ZmqDriverProcess runs one driver per OS process.  A ZmqDriverHost loads
+any number of drivers into one interpreter, so the interpreter start up and
+the driver module imports are paid once per node rather than once per
+instrument.
+
+Commands arrive on a single ROUTER socket.  The first frame after the REQ
+delimiter is the id of the driver the command is for, the rest are the
+codec frames of the command message.  Each hosted driver processes its
+commands on a thread of its own with the same semantics as
+DriverProcess.cmd_driver, so a slow or failing driver does not hold up the
+others.  Commands addressed to HOST_ID are processed by the host itself:
+load_driver, unload_driver, list_drivers, process_echo, startup_profile
+and stop_driver_process.  load_driver and unload_driver are processed on a
+worker thread each, since importing, constructing or disconnecting a driver
+may take a while.  A driver is disconnected before it is dropped, when it
+is unloaded or the host stops.
+
+Events are published on a single PUB socket with the topic frame returned
+by event_topic, so a client only receives the events of its own driver.
+
+To launch a host and talk to one of its drivers:
+    (proc, cmd_port, evt_port) = ZmqDriverHost.launch_process(
+        {'ctd_1': ('mi.instrument.seabird.sbe37smb.ooicore.driver', 'SBE37Driver'),
+         'ctd_2': ('mi.instrument.seabird.sbe37smb.ooicore.driver', 'SBE37Driver')})
+    client = ZmqDriverHostClient('localhost', cmd_port, evt_port, 'ctd_1')
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+from Queue import Queue
+from threading import Thread, Lock, current_thread
+import uuid
+
+import zmq
+
+from mi.core.exceptions import InstrumentCommandException, InstrumentStateException, ConfigurationException
+import mi.core.instrument.driver_process as driver_process
+from mi.core.instrument.driver_codec import DEFAULT_CODEC, get_codec
+from mi.core.instrument.zmq_driver_client import ZmqDriverClient
+from mi.core.instrument.zmq_driver_process import STOP_EVENT, _encode_exception, read_port_file
+from mi.core.log import get_logger
+log = get_logger()
+
+# driver id of commands processed by the host itself
+HOST_ID = ''
+
+# seconds to wait for each hosted driver to finish its command when it is unloaded or the host stops
+DRIVER_STOP_TIMEOUT = 10
+
+# host commands processed on a worker thread rather than the command thread
+WORKER_COMMANDS = ('load_driver', 'unload_driver')
+
+
+def event_topic(driver_id):
+    """
+    Topic frame of the events published for a driver. The id is terminated
+    so that one id never matches the subscription of another it prefixes.
+    @param driver_id The hosted driver id.
+    @retval topic string
+    """
+    return '%s\0' % driver_id
+
+
+class HostedDriver(driver_process.DriverProcess):
+    """
+    A driver loaded in a ZmqDriverHost. Commands are queued by the host and
+    processed on a thread of its own, events are forwarded to the host.
+    """
+    def __init__(self, host, driver_id, driver_module, driver_class):
+        """
+        @param host The ZmqDriverHost.
+        @param driver_id The id commands and events are routed by.
+        @param driver_module The python module containing the driver code.
+        @param driver_class The python driver class.
+        """
+        driver_process.DriverProcess.__init__(self, driver_module, driver_class, None)
+        self.host = host
+        self.driver_id = driver_id
+        self.commands = Queue()
+        self.thread = None
+
+    def send_event(self, evt):
+        """
+        Queue an event to be published by the host with this driver's topic.
+        """
+        self.host.events.put((self.driver_id, evt))
+
+    def stop_messaging(self):
+        """
+        stop_driver_process unloads only this driver, the host keeps running.
+        """
+        self.host.unload_driver(self.driver_id)
+
+    def start(self):
+        """
+        Start the command thread.
+        """
+        self.thread = Thread(target=self._process_commands)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the command thread once the commands already queued are
+        processed. The driver is disconnected by the command thread.
+        """
+        self.commands.put(STOP_EVENT)
+
+    def disconnect(self):
+        """
+        Disconnect the driver if it is connected.
+        """
+        disconnect = getattr(self.driver, 'disconnect', None)
+        if disconnect is None:
+            return
+        try:
+            disconnect()
+        except InstrumentStateException:
+            # not connected
+            pass
+        except Exception as e:
+            log.error('Driver %s could not be disconnected: %s', self.driver_id, e)
+
+    def _process_commands(self):
+        """
+        Process queued commands and send the replies back through the host.
+        """
+        reply_sock = self.host.zmq_context.socket(zmq.PUSH)
+        # replies not yet taken by the host when it stops are discarded
+        reply_sock.setsockopt(zmq.LINGER, 0)
+        reply_sock.connect(self.host.reply_endpoint)
+        while True:
+            item = self.commands.get()
+            if item is STOP_EVENT:
+                break
+            (identity, frames) = item
+            try:
+                reply = self.cmd_driver(self.host.codec.decode(frames))
+            except Exception as e:
+                log.error('Driver %s could not process command: %s', self.driver_id, e)
+                reply = e
+            reply_sock.send_multipart([identity, ''] + self.host.encode_reply(reply))
+        reply_sock.close()
+        self.disconnect()
+        self.shutdown()
+
+
+class ZmqDriverHost(driver_process.DriverProcess):
+    """
+    An OS-level process hosting many drivers, communicating with ZMQ
+    sockets. A ROUTER socket thread routes commands to the hosted drivers
+    and an event thread publishes their events. Both are signaled to end by
+    stop_messaging.
+    """
+
+    @classmethod
+    def launch_process(cls, drivers, workdir='/tmp/', ppid=None, codec=DEFAULT_CODEC):
+        """
+        Class method constructor to launch ZmqDriverHost as a separate OS
+        process.
+        @param drivers Dict of driver id to (driver module, driver class).
+        @param workdir The work directory when temporary port files are written.
+        @param ppid ID of the parent process, used to self destruct when
+        parent dies in test cases.
+        @param codec Name of the codec used for messages, see driver_codec.
+        @retval Tuple containing (Popen object for the process, cmd port,
+            evt_port)
+        @raise ConfigurationException if the codec is not available, or the
+        host process did not agree to it.
+        """
+        get_codec(codec)
+
+        tag = str(uuid.uuid4())
+        cmd_port_fname = workdir + 'dvr_host_cmd_port_%s.txt' % tag
+        evt_port_fname = workdir + 'dvr_host_evt_port_%s.txt' % tag
+        cmd_str = 'from %s import %s; dp = %s(%r, "%s", "%s", %s, "%s");dp.run()' \
+            % (__name__, cls.__name__, cls.__name__, dict(drivers),
+               cmd_port_fname, evt_port_fname, str(ppid), codec)
+
+        host_proc = driver_process.DriverProcess.launch_process(cmd_str)
+
+        (cmd_port, host_codec) = read_port_file(cmd_port_fname, 2)
+        if host_codec != codec:
+            raise ConfigurationException('Driver host is using codec %s, expected %s' % (host_codec, codec))
+        (evt_port, ) = read_port_file(evt_port_fname, 1)
+
+        return (host_proc, int(cmd_port), int(evt_port))
+
+    def __init__(self, drivers, cmd_port_fname, evt_port_fname, ppid, codec=DEFAULT_CODEC):
+        """
+        @param drivers Dict of driver id to (driver module, driver class)
+        loaded when the process runs.
+        @param cmd_port_fname Filename for temp cmd port file.
+        @param evt_port_fname Filename for temp evt port file.
+        @param ppid ID of the parent process, used to self destruct when
+        parent dies in test cases.
+        @param codec Name of the codec used for messages, see driver_codec.
+        """
+        driver_process.DriverProcess.__init__(self, None, None, ppid)
+        self.driver_specs = dict(drivers)
+        self.drivers = {}
+        self.failed = {}
+        self.workers = []
+        self.lock = Lock()
+        self.cmd_port = None
+        self.cmd_port_fname = cmd_port_fname
+        self.evt_port = None
+        self.evt_port_fname = evt_port_fname
+        self.cmd_host_string = 'tcp://*'
+        self.event_host_string = 'tcp://*'
+        self.cmd_thread = None
+        self.evt_thread = None
+        self.stop_cmd_thread = True
+        self.stop_evt_thread = True
+        self.zmq_context = None
+        self.wakeup_endpoint = None
+        self.reply_endpoint = None
+        self.codec = get_codec(codec)
+
+    def construct_driver(self):
+        """
+        Load every configured driver. A driver which cannot be constructed
+        is recorded and reported to its commands, the others are still
+        hosted.
+        @retval True
+        """
+        for driver_id, (driver_module, driver_class) in sorted(self.driver_specs.items()):
+            self.load_driver(driver_id, driver_module, driver_class)
+        return True
+
+    def load_driver(self, driver_id, driver_module, driver_class):
+        """
+        Import and construct a driver and start processing its commands.
+        @param driver_id The id commands and events are routed by.
+        @param driver_module The python module containing the driver code.
+        @param driver_class The python driver class.
+        @retval True if the driver was constructed, False otherwise.
+        @raise InstrumentCommandException if the id is already in use.
+        """
+        driver_id = str(driver_id)
+        if driver_id == HOST_ID:
+            raise InstrumentCommandException('Driver id may not be empty.')
+        hosted = HostedDriver(self, driver_id, str(driver_module), str(driver_class))
+
+        with self.lock:
+            if driver_id in self.drivers:
+                raise InstrumentCommandException('Driver %s is already loaded.' % driver_id)
+
+        # constructed without the lock so other loads and listings are not held up
+        try:
+            constructed = hosted.construct_driver()
+        except Exception as e:
+            log.error('Driver %s raised while being constructed: %s', driver_id, e)
+            constructed = False
+
+        with self.lock:
+            if not constructed:
+                self.failed[driver_id] = 'Driver %s could not be constructed from %s.%s' % \
+                                         (driver_id, driver_module, driver_class)
+                return False
+            if driver_id in self.drivers:
+                raise InstrumentCommandException('Driver %s is already loaded.' % driver_id)
+
+            self.failed.pop(driver_id, None)
+            self.drivers[driver_id] = hosted
+            if self.messaging_started:
+                hosted.start()
+
+        log.info('Driver host loaded driver %s', driver_id)
+        return True
+
+    def unload_driver(self, driver_id):
+        """
+        Stop processing a driver's commands, disconnect and release it.
+        Commands sent to the driver afterwards are rejected.
+        @param driver_id The hosted driver id.
+        @retval True if the driver was loaded, False otherwise.
+        """
+        with self.lock:
+            hosted = self.drivers.pop(driver_id, None)
+        if hosted is None:
+            return False
+        hosted.stop()
+        # wait for the disconnect, unless the driver unloads itself from its command thread
+        if hosted.thread is not None and hosted.thread is not current_thread():
+            hosted.thread.join(DRIVER_STOP_TIMEOUT)
+            if hosted.thread.is_alive():
+                log.error('Driver %s did not stop within %d seconds', driver_id, DRIVER_STOP_TIMEOUT)
+        log.info('Driver host unloaded driver %s', driver_id)
+        return True
+
+    def list_drivers(self):
+        """
+        @retval dict of 'loaded', a list of the hosted driver ids, and
+        'failed', a dict of driver id to error for drivers which could not
+        be constructed.
+        """
+        with self.lock:
+            return {'loaded': sorted(self.drivers), 'failed': dict(self.failed)}
+
+    def cmd_driver(self, msg):
+        """
+        Process a command addressed to the host itself.
+        @param msg A host command message.
+        @retval The command result.
+        """
+        if self.startup_profile and not self.startup_profile.has('first_command'):
+            self._first_command()
+
+        cmd = msg.get('cmd', None)
+        args = msg.get('args', None) or []
+        kwargs = msg.get('kwargs', None) or {}
+        log.debug("ZmqDriverHost.cmd_driver(): cmd=%s", cmd)
+        if cmd == 'stop_driver_process':
+            self.stop_messaging()
+            return 'stop_driver_process'
+        elif cmd == 'process_echo':
+            return 'ping from driver host ppid:%s, drivers:%s' % (str(self.ppid), sorted(self.drivers))
+        elif cmd == 'startup_profile':
+            return self.startup_profile.get_report() if self.startup_profile else None
+        elif cmd in ('load_driver', 'unload_driver', 'list_drivers'):
+            try:
+                return getattr(self, cmd)(*args, **kwargs)
+            except Exception as e:
+                return e
+        else:
+            return InstrumentCommandException('Unknown driver host command.')
+
+    def encode_reply(self, reply):
+        """
+        Encode a command reply, exceptions are encoded as triples.
+        @param reply The command result.
+        @retval list of frames
+        """
+        if isinstance(reply, Exception):
+            reply = _encode_exception(reply)
+        try:
+            return self.codec.encode(reply)
+        except Exception as e:
+            log.error('Unable to encode reply with the %s codec: %s', self.codec.name, e)
+            return self.codec.encode(_encode_exception(e))
+
+    def route_command(self, identity, driver_id, frames):
+        """
+        Pass a command to the hosted driver it is addressed to.
+        @param identity ROUTER identity of the requesting client.
+        @param driver_id The hosted driver id.
+        @param frames The codec frames of the command message.
+        @retval None if the command was queued for the driver or a worker
+        thread, otherwise the reply frames.
+        """
+        if driver_id == HOST_ID:
+            try:
+                msg = self.codec.decode(frames)
+                if msg.get('cmd', None) in WORKER_COMMANDS:
+                    self.start_worker(identity, msg)
+                    return None
+                reply = self.cmd_driver(msg)
+            except Exception as e:
+                reply = e
+            return self.encode_reply(reply)
+
+        with self.lock:
+            hosted = self.drivers.get(driver_id)
+            error = self.failed.get(driver_id, 'Unknown driver %s.' % driver_id)
+        if hosted is None:
+            return self.encode_reply(InstrumentCommandException(error))
+        hosted.commands.put((identity, frames))
+        return None
+
+    def start_worker(self, identity, msg):
+        """
+        Process a host command on a worker thread, which sends the reply
+        back through the host.
+        @param identity ROUTER identity of the requesting client.
+        @param msg A host command message.
+        """
+        worker = Thread(target=self._process_worker_command, args=(identity, msg))
+        with self.lock:
+            self.workers = [w for w in self.workers if w.is_alive()]
+            self.workers.append(worker)
+        worker.start()
+
+    def _process_worker_command(self, identity, msg):
+        try:
+            reply = self.cmd_driver(msg)
+        except Exception as e:
+            reply = e
+        reply_sock = self.zmq_context.socket(zmq.PUSH)
+        # replies not yet taken by the host when it stops are discarded
+        reply_sock.setsockopt(zmq.LINGER, 0)
+        reply_sock.connect(self.reply_endpoint)
+        reply_sock.send_multipart([identity, ''] + self.encode_reply(reply))
+        reply_sock.close()
+
+    def start_messaging(self):
+        """
+        Bind the ROUTER and PUB sockets and start the command and event
+        threads, and the command threads of the hosted drivers.
+        """
+        self.zmq_context = zmq.Context()
+        self.wakeup_endpoint = 'inproc://driver_host_wakeup_%s' % id(self)
+        self.reply_endpoint = 'inproc://driver_host_reply_%s' % id(self)
+
+        cmd_sock = self.zmq_context.socket(zmq.ROUTER)
+        self.cmd_port = cmd_sock.bind_to_random_port(self.cmd_host_string)
+        log.info('Driver host cmd socket bound to %i', self.cmd_port)
+
+        # replies from the hosted drivers, bound before their threads connect
+        reply_sock = self.zmq_context.socket(zmq.PULL)
+        reply_sock.bind(self.reply_endpoint)
+
+        wakeup_sock = self.zmq_context.socket(zmq.PULL)
+        wakeup_sock.bind(self.wakeup_endpoint)
+
+        evt_sock = self.zmq_context.socket(zmq.PUB)
+        evt_sock.setsockopt(zmq.SNDHWM, 0)
+        self.evt_port = evt_sock.bind_to_random_port(self.event_host_string)
+        log.info('Driver host event socket bound to %i', self.evt_port)
+
+        def route_cmd_msg(host):
+            """
+            Route commands from the ROUTER socket to the hosted drivers and
+            their replies back.
+            """
+            poller = zmq.Poller()
+            poller.register(cmd_sock, zmq.POLLIN)
+            poller.register(reply_sock, zmq.POLLIN)
+            poller.register(wakeup_sock, zmq.POLLIN)
+
+            while not host.stop_cmd_thread:
+                ready = dict(poller.poll())
+                if wakeup_sock in ready:
+                    wakeup_sock.recv()
+                if reply_sock in ready:
+                    cmd_sock.send_multipart(reply_sock.recv_multipart())
+                if cmd_sock in ready:
+                    frames = cmd_sock.recv_multipart()
+                    if len(frames) < 4:
+                        log.error('Driver host dropped a malformed command of %d frames', len(frames))
+                        continue
+                    (identity, delimiter, driver_id) = frames[:3]
+                    reply = host.route_command(identity, driver_id, frames[3:])
+                    if reply is not None:
+                        cmd_sock.send_multipart([identity, delimiter] + reply)
+
+            # let loads and unloads in progress finish before stopping the drivers
+            stopped = True
+            with host.lock:
+                workers = host.workers
+                host.workers = []
+            for worker in workers:
+                worker.join(DRIVER_STOP_TIMEOUT)
+                if worker.is_alive():
+                    log.error('Driver host command did not complete within %d seconds', DRIVER_STOP_TIMEOUT)
+                    stopped = False
+
+            with host.lock:
+                hosted_drivers = host.drivers.values()
+                host.drivers = {}
+            for hosted in hosted_drivers:
+                hosted.stop()
+            for hosted in hosted_drivers:
+                if hosted.thread is None:
+                    continue
+                hosted.thread.join(DRIVER_STOP_TIMEOUT)
+                if hosted.thread.is_alive():
+                    log.error('Driver %s did not stop within %d seconds', hosted.driver_id, DRIVER_STOP_TIMEOUT)
+                    stopped = False
+
+            cmd_sock.close()
+            reply_sock.close()
+            wakeup_sock.close()
+            log.info('Driver host cmd socket closed.')
+
+            host.evt_thread.join()
+            # the context cannot be terminated while a driver thread holds a socket
+            if stopped:
+                host.zmq_context.term()
+
+        def send_evt_msg(host):
+            """
+            Publish the events of the hosted drivers with their topics.
+            """
+            while not host.stop_evt_thread:
+                item = host.events.get()
+                if item is STOP_EVENT:
+                    break
+                (driver_id, evt) = item
+                if isinstance(evt, Exception):
+                    evt = _encode_exception(evt)
+                try:
+                    frames = host.codec.encode(evt)
+                except Exception as e:
+                    log.error('Unable to encode event of driver %s, dropped: %s', driver_id, e)
+                    continue
+                evt_sock.send_multipart([event_topic(driver_id)] + frames)
+
+            evt_sock.close()
+            log.info('Driver host event socket closed')
+
+        file(self.cmd_port_fname, 'w+').write('%s\n%s\n' % (self.cmd_port, self.codec.name))
+        file(self.evt_port_fname, 'w+').write('%s\n' % self.evt_port)
+
+        self.stop_cmd_thread = False
+        self.stop_evt_thread = False
+        self.cmd_thread = Thread(target=route_cmd_msg, args=(self, ))
+        self.evt_thread = Thread(target=send_evt_msg, args=(self, ))
+        self.cmd_thread.start()
+        self.evt_thread.start()
+        with self.lock:
+            self.messaging_started = True
+            for hosted in self.drivers.values():
+                hosted.start()
+
+    def stop_messaging(self):
+        """
+        Set flags and wake the command and event threads so they stop the
+        hosted drivers, close their sockets and conclude.
+        """
+        if not self.messaging_started:
+            return
+        self.stop_cmd_thread = True
+        self.stop_evt_thread = True
+        self.messaging_started = False
+
+        self.events.put(STOP_EVENT)
+
+        sock = self.zmq_context.socket(zmq.PUSH)
+        sock.setsockopt(zmq.LINGER, 1000)
+        sock.connect(self.wakeup_endpoint)
+        sock.send('')
+        sock.close()
+
+
+class ZmqDriverHostClient(ZmqDriverClient):
+    """
+    A client for one of the drivers of a ZmqDriverHost, or for the host
+    itself when the driver id is HOST_ID.
+    """
+
+    def __init__(self, host, cmd_port, event_port, driver_id, codec=DEFAULT_CODEC):
+        """
+        @param host Host string address of the driver host.
+        @param cmd_port Port number for the driver host command port.
+        @param event_port Port number for the driver host event port.
+        @param driver_id The hosted driver id.
+        @param codec Name of the codec the driver host was launched with.
+        """
+        ZmqDriverClient.__init__(self, host, cmd_port, event_port, codec)
+        self.driver_id = driver_id
+        self.event_topic = event_topic(driver_id)
+
+    def _encode_cmd(self, msg):
+        """
+        Prefix the command frames with the driver id.
+        """
+        return [self.driver_id] + self.codec.encode(msg)
@@ -28,12 +28,19 @@ import uuid
 import zmq
 
 from ooi.exception import ApplicationException
-from mi.core.exceptions import InstrumentException, UnexpectedError
+from mi.core.exceptions import InstrumentException, UnexpectedError, ConfigurationException
 
 import mi.core.instrument.driver_process as driver_process
+from mi.core.instrument.driver_codec import DEFAULT_CODEC, get_codec
 from mi.core.log import get_logger
 log = get_logger()
 
+# placed on the event queue to wake and stop the event thread
+STOP_EVENT = object()
+
+# seconds between checks for the port files of a launched driver process
+PORT_FILE_POLL_INTERVAL = .01
+
 def _encode_exception(reply):
     if isinstance(reply, InstrumentException):
         # InstrumentExceptions have corresponding IonException error code built-in
@@ -43,16 +50,35 @@ def _encode_exception(reply):
         ex = UnexpectedError("%s('%s')" % (reply.__class__.__name__, reply.message))
         return ex.get_triple()
 
+def read_port_file(fname, count):
+    """
+    Wait for a driver process to write a port file, then read and remove it.
+    @param fname The port file name.
+    @param count The number of whitespace separated values expected.
+    @retval list of the values
+    """
+    while True:
+        try:
+            with open(fname) as port_file:
+                values = port_file.read().split()
+            # the file may be read before it has been completely written
+            if len(values) == count:
+                os.remove(fname)
+                return values
+        except IOError:
+            pass
+        time.sleep(PORT_FILE_POLL_INTERVAL)
+
 class ZmqDriverProcess(driver_process.DriverProcess):
     """
     A OS-level driver process that communicates with ZMQ sockets.
     Command-REP and event-PUB sockets monitor and react to comms
-    needs in separate threads, which can be signaled to end
-    by setting boolean flags stop_cmd_thread and stop_evt_thread.
+    needs in separate threads, which are signaled to end by
+    stop_messaging.
     """
     
     @classmethod
-    def launch_process(cls, driver_module, driver_class, workdir='/tmp/', ppid=None):
+    def launch_process(cls, driver_module, driver_class, workdir='/tmp/', ppid=None, codec=DEFAULT_CODEC):
         """
         Class method constructor to launch ZmqDriverProcess as a
         separate OS process. Creates command string for this
@@ -62,46 +88,40 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         @param workdir The work directory when temporary port files are written.
         @param ppid ID of the parent process, used to self destruct when
         parent dies in test cases.
+        @param codec Name of the codec used for messages, see driver_codec.
+        The client must be constructed with the same codec.
         @retval Tuple containing (Popen object for the process, cmd port,
             evt_port)
+        @raise ConfigurationException if the codec is not available, or the
+        driver process did not agree to it.
         """
-        
+        # fail before launching if the codec is unknown here
+        get_codec(codec)
+
         # Construct the command string.
         tag = str(uuid.uuid4())
         cmd_port_fname = 'dvr_cmd_port_%s.txt' % tag
         cmd_port_fname = workdir + cmd_port_fname
         evt_port_fname = 'dvr_evt_port_%s.txt' % tag
         evt_port_fname = workdir + evt_port_fname
-        cmd_str = 'from %s import %s; dp = %s("%s", "%s", "%s", "%s", %s);dp.run()' \
+        cmd_str = 'from %s import %s; dp = %s("%s", "%s", "%s", "%s", %s, "%s");dp.run()' \
             % (__name__, cls.__name__, cls.__name__, driver_module,
-               driver_class, cmd_port_fname, evt_port_fname, str(ppid))
+               driver_class, cmd_port_fname, evt_port_fname, str(ppid), codec)
                 
         # Call base class launch method.
         dvr_proc = driver_process.DriverProcess.launch_process(cmd_str)
-        while True:
-            try:                
-                cmd_port_file = file(cmd_port_fname, 'r')
-                dvr_cmd_port = int(cmd_port_file.read().strip())
-                cmd_port_file.close()
-                os.remove(cmd_port_fname)
-                break
-            
-            except IOError:
-                time.sleep(.1)
-        while True:
-            try:                
-                evt_port_file = file(evt_port_fname, 'r')
-                dvr_evt_port = int(evt_port_file.read().strip())
-                evt_port_file.close()
-                os.remove(evt_port_fname)
-                break
-            
-            except IOError:
-                time.sleep(.1)
+
+        # the port, then the codec the driver process is using
+        (dvr_cmd_port, dvr_codec) = read_port_file(cmd_port_fname, 2)
+        dvr_cmd_port = int(dvr_cmd_port)
+        if dvr_codec != codec:
+            raise ConfigurationException('Driver process is using codec %s, expected %s' % (dvr_codec, codec))
+        (dvr_evt_port, ) = read_port_file(evt_port_fname, 1)
+        dvr_evt_port = int(dvr_evt_port)
 
         return (dvr_proc, dvr_cmd_port, dvr_evt_port)
         
-    def __init__(self, driver_module, driver_class, cmd_port_fname, evt_port_fname, ppid):
+    def __init__(self, driver_module, driver_class, cmd_port_fname, evt_port_fname, ppid, codec=DEFAULT_CODEC):
         """
         Zmq driver process constructor.
         @param driver_module The python module containing the driver code.
@@ -110,6 +130,7 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         @param evt_port_fname Filename for temp evt port file.
         @param ppid ID of the parent process, used to self destruct when
         parent dies in test cases.        
+        @param codec Name of the codec used for messages, see driver_codec.
         """
         driver_process.DriverProcess.__init__(self, driver_module, driver_class, ppid)
         self.cmd_port = None
@@ -122,100 +143,124 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         self.stop_evt_thread = True
         self.cmd_thread = None
         self.stop_cmd_thread = True
-        
+        self.zmq_context = None
+        self.wakeup_endpoint = None
+        self.codec = get_codec(codec)
+
     def start_messaging(self):
         """
-        Initialize and start messaging resources for the driver, blocking
-        until messaging terminates. This ZMQ implementation starts and
-        joins command and event threads, managing nonblocking send/recv calls
-        on REP and PUB sockets, respectively. Terminate loops and close
-        sockets when stop flag is set in driver process.
+        Initialize and start messaging resources for the driver. This ZMQ
+        implementation binds REP and PUB sockets and starts command and event
+        threads to service them. The command thread blocks in a zmq.Poller on
+        the REP socket and an inproc wakeup socket; the event thread blocks on
+        the event queue. Both return as soon as there is work or a stop
+        request, rather than polling on a timer.
         """
+        self.zmq_context = zmq.Context()
+        self.wakeup_endpoint = 'inproc://driver_process_wakeup_%s' % id(self)
+
+        cmd_sock = self.zmq_context.socket(zmq.REP)
+        self.cmd_port = cmd_sock.bind_to_random_port(self.cmd_host_string)
+        log.info('Driver process cmd socket bound to %i', self.cmd_port)
+
+        wakeup_sock = self.zmq_context.socket(zmq.PULL)
+        wakeup_sock.bind(self.wakeup_endpoint)
+
+        evt_sock = self.zmq_context.socket(zmq.PUB)
+        # queue rather than drop events for a slow subscriber
+        evt_sock.setsockopt(zmq.SNDHWM, 0)
+        self.evt_port = evt_sock.bind_to_random_port(self.event_host_string)
+        log.info('Driver process event socket bound to %i', self.evt_port)
+
+        codec = self.codec
+
         def recv_cmd_msg(zmq_driver_process):
             """
             Await commands on a ZMQ REP socket, forwaring them to the
             driver for processing and returning the result.
             """
-            context = zmq.Context()
-            sock = context.socket(zmq.REP)
-            zmq_driver_process.cmd_port = sock.bind_to_random_port(zmq_driver_process.cmd_host_string)
-            log.info('Driver process cmd socket bound to %i' %
-                           zmq_driver_process.cmd_port)
-            file(zmq_driver_process.cmd_port_fname,'w+').write(str(zmq_driver_process.cmd_port)+'\n')
-
-            zmq_driver_process.stop_cmd_thread = False
+            poller = zmq.Poller()
+            poller.register(cmd_sock, zmq.POLLIN)
+            poller.register(wakeup_sock, zmq.POLLIN)
+
             while not zmq_driver_process.stop_cmd_thread:
-                try:
-                    msg = sock.recv_pyobj(flags=zmq.NOBLOCK)
-                    #log.trace('Processing message %s', msg)
+                ready = dict(poller.poll())
+                if wakeup_sock in ready:
+                    wakeup_sock.recv()
+                if cmd_sock in ready:
+                    msg = codec.decode(cmd_sock.recv_multipart())
                     reply = zmq_driver_process.cmd_driver(msg)
                     # if operation raised exception, encode as triple
                     if isinstance(reply, Exception):
                         reply = _encode_exception(reply)
-                    # send, send, and resend
-                    while True:
-                        try:
-                            sock.send_pyobj(reply, flags=zmq.NOBLOCK)
-                            break
-                        except zmq.ZMQError:
-                            time.sleep(.1)
-                            if zmq_driver_process.stop_cmd_thread:
-                                break
-                except zmq.ZMQError:
-                    time.sleep(.1)
-                
-            sock.close()
-            context.term()
+                    try:
+                        frames = codec.encode(reply)
+                    except Exception as e:
+                        log.error('Unable to encode reply to %s with the %s codec: %s', msg.get('cmd'), codec.name, e)
+                        frames = codec.encode(_encode_exception(e))
+                    cmd_sock.send_multipart(frames)
+
+            cmd_sock.close()
+            wakeup_sock.close()
             log.info('Driver process cmd socket closed.')
 
+            # the event thread has been told to stop, wait for it then release the context
+            zmq_driver_process.evt_thread.join()
+            zmq_driver_process.zmq_context.term()
+
         def send_evt_msg(zmq_driver_process):
             """
             Await events on the driver process event queue and publish them
             on a ZMQ PUB socket to the driver process client.
             """
-            context = zmq.Context()
-            sock = context.socket(zmq.PUB)
-            zmq_driver_process.evt_port = sock.bind_to_random_port(zmq_driver_process.event_host_string)
-            log.info('Driver process event socket bound to %i', zmq_driver_process.evt_port)
-            file(zmq_driver_process.evt_port_fname,'w+').write(str(zmq_driver_process.evt_port)+'\n')
-
-            zmq_driver_process.stop_evt_thread = False
             while not zmq_driver_process.stop_evt_thread:
+                evt = zmq_driver_process.events.get()
+                if evt is STOP_EVENT:
+                    break
+                if isinstance(evt, Exception):
+                    evt = _encode_exception(evt)
                 try:
-                    evt = zmq_driver_process.events.pop(0)
-                    #log.trace('Event thread sending event %s',evt)
-                    while evt:
-                        try:
-                            if isinstance(evt, Exception):
-                                evt = _encode_exception(evt)
-                            sock.send_pyobj(evt, flags=zmq.NOBLOCK)
-                            evt = None
-                            log.trace('Event sent!')
-                        except zmq.ZMQError:
-                            time.sleep(.1)
-                            if zmq_driver_process.stop_evt_thread:
-                                break
-                except IndexError:
-                    time.sleep(.1)
-
-            sock.close()
-            context.term()
+                    frames = codec.encode(evt)
+                except Exception as e:
+                    log.error('Unable to encode event with the %s codec, dropped: %s', codec.name, e)
+                    continue
+                evt_sock.send_multipart(frames)
+                log.trace('Event sent!')
+
+            evt_sock.close()
             log.info('Driver process event socket closed')
 
+        # publish the ports only once the sockets are bound
+        file(self.cmd_port_fname, 'w+').write('%s\n%s\n' % (self.cmd_port, self.codec.name))
+        file(self.evt_port_fname, 'w+').write(str(self.evt_port)+'\n')
+
+        self.stop_cmd_thread = False
+        self.stop_evt_thread = False
         self.cmd_thread = Thread(target=recv_cmd_msg, args=(self, ))
         self.evt_thread = Thread(target=send_evt_msg, args=(self, ))
-        self.cmd_thread.start()        
+        self.cmd_thread.start()
         self.evt_thread.start()
         self.messaging_started = True
     
     def stop_messaging(self):
         """
-        Close messaging resource for the driver. Set flags to cause
-        command and event threads to close sockets and conclude.
+        Close messaging resource for the driver. Set flags and wake the
+        command and event threads so they close their sockets and conclude.
+        May be called from the command thread itself.
         """
+        if not self.messaging_started:
+            return
         self.stop_cmd_thread = True
         self.stop_evt_thread = True
         self.messaging_started = False
+
+        self.events.put(STOP_EVENT)
+
+        sock = self.zmq_context.socket(zmq.PUSH)
+        sock.setsockopt(zmq.LINGER, 1000)
+        sock.connect(self.wakeup_endpoint)
+        sock.send('')
+        sock.close()
     
     def shutdown(self):
         """
@@ -1,6 +1,13 @@
 #!/usr/bin/env python
 
-import _brttpkt as _brttpkt
+import time
+
+try:
+    import _brttpkt as _brttpkt
+except ImportError:
+    # no Antelope; the exceptions and reap_batch still work with the
+    # in process stand-in in mi.core.kudu.fakeorb
+    _brttpkt = None
 
 class OrbReapThrError(Exception): pass
 class SetToStopError(OrbReapThrError): pass
@@ -57,3 +64,23 @@ class OrbReapThr(object):
         if rc < 0:
             raise DestroyError()
 
+
+def reap_batch(reapthr, max_packets, max_seconds=None):
+    """Get up to max_packets packets from reapthr in one call, or the packets
+    got within max_seconds. Raises NoData, Timeout or Stopped like
+    reapthr.get if no packet was got, otherwise these end the batch.
+
+    Returns a list of (pktid, srcname, pkttime, pkt).
+    """
+    batch = []
+    deadline = None if max_seconds is None else time.time() + max_seconds
+    while len(batch) < max_packets:
+        try:
+            batch.append(reapthr.get())
+        except (NoData, Timeout, Stopped):
+            if not batch:
+                raise
+            break
+        if deadline is not None and time.time() >= deadline:
+            break
+    return batch
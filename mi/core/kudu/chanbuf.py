@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""Reusable sample buffers for ORB packet channels.
+
+Building a new numpy array for the samples of every channel of every packet
+makes allocation and copying dominate the decoding of high rate channels.
+ChannelBuffers keeps, for each (sta, chan), an arena holding the samples of
+many packets: the samples of a channel are copied into the next slice of
+the arena in one vectorized assignment, and the slice, a view into the
+arena, is the channel data.  Full arenas are kept, and reused once no view
+into them is referenced any longer, so memory stays steady while channel
+data already handed out is never overwritten.
+
+Antelope channel samples are integer counts, arenas hold numpy.int_ like
+numpy.array of the samples would.
+"""
+
+import sys
+
+import numpy as np
+
+# samples per arena
+DEFAULT_ARENA_SIZE = 65536
+# full arenas kept per (sta, chan) for reuse
+DEFAULT_MAX_FREE = 4
+
+
+class ChannelBuffers(object):
+    def __init__(self, arena_size=DEFAULT_ARENA_SIZE, max_free=DEFAULT_MAX_FREE,
+                 dtype=np.int_):
+        self.arena_size = arena_size
+        self.max_free = max_free
+        self.dtype = dtype
+        # (sta, chan) -> [arena, offset of the free part]
+        self._current = {}
+        # (sta, chan) -> [full arena, ...]
+        self._free = {}
+        self.allocations = 0
+
+    def copy(self, sta, chan, samples):
+        """Returns an array with the samples of a channel.
+
+        samples is a sequence of numbers, as returned by _PktChannel_data_get.
+        """
+        n = len(samples)
+        if n > self.arena_size:
+            self.allocations += 1
+            return np.array(samples, dtype=self.dtype)
+
+        key = (sta, chan)
+        current = self._current.get(key)
+        if current is None or current[1] + n > self.arena_size:
+            current = self._current[key] = [self._get_arena(key, current), 0]
+
+        arena, offset = current
+        data = arena[offset:offset + n]
+        data[:] = samples
+        current[1] = offset + n
+        return data
+
+    def _get_arena(self, key, current):
+        free = self._free.setdefault(key, [])
+        if current is not None:
+            free.append(current[0])
+        for i in xrange(len(free)):
+            # only referenced by the free list, no channel data uses it
+            if sys.getrefcount(free[i]) == 2:
+                return free.pop(i)
+        if len(free) > self.max_free:
+            # in use still, let the channel data keep it alive
+            del free[0]
+        self.allocations += 1
+        return np.empty(self.arena_size, dtype=self.dtype)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+
+"""In process stand-in for an Antelope ORB.
+
+FakeOrb and FakeOrbReapThr have the interface of Orb and OrbReapThr, their
+ORBs are in process packet lists looked up by name, so the code reaping
+packets can be run and benchmarked without a native Antelope install.
+Packets are kept as put, they are not stuffed or unstuffed.
+"""
+
+import re
+import threading
+import time
+
+from mi.core.kudu.orb import Orb, OpenError, SelectError, RejectError, \
+                             SeekError, NotConnected
+from mi.core.kudu.brttpkt import OrbReapThr, OrbReapThrError, NoData, \
+                                 Timeout, Stopped
+
+
+class _FakeOrbServer(object):
+    def __init__(self, orbname):
+        self.orbname = orbname
+        # (pktid, srcname, pkttime, packet), oldest first
+        self.packets = []
+        self.cond = threading.Condition()
+
+    def put(self, srcname, pkttime, packet):
+        with self.cond:
+            pktid = len(self.packets)
+            self.packets.append((pktid, srcname, pkttime, packet))
+            self.cond.notify_all()
+        return pktid
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def _get_server(orbname):
+    with _servers_lock:
+        server = _servers.get(orbname)
+        if server is None:
+            server = _servers[orbname] = _FakeOrbServer(orbname)
+        return server
+
+
+def reset(orbname=None):
+    """Drop the packets of the named ORB, or of all ORBs."""
+    with _servers_lock:
+        if orbname is None:
+            _servers.clear()
+        else:
+            _servers.pop(orbname, None)
+
+
+def _compile(regex):
+    # srcname selection regexes match the whole source name, as in Antelope
+    if regex is None:
+        return None
+    return re.compile('(?:%s)$' % regex)
+
+
+class FakeOrb(Orb):
+    def connect(self):
+        if not self.orbname:
+            raise OpenError()
+        self._server = _get_server(self.orbname)
+        self._fd = id(self._server)
+        self._position = 0
+        self._select = self._reject = None
+        if self.select_str is not None:
+            self.select(self.select_str)
+        if self.reject_str is not None:
+            self.reject(self.reject_str)
+
+    def _check_connected(self):
+        if self._fd is None:
+            raise NotConnected()
+
+    def close(self):
+        self._check_connected()
+        self._fd = None
+        self._server = None
+
+    def select(self, match):
+        self._check_connected()
+        try:
+            self._select = _compile(match)
+        except re.error:
+            raise SelectError()
+        return self
+
+    def reject(self, reject):
+        self._check_connected()
+        try:
+            self._reject = _compile(reject)
+        except re.error:
+            raise RejectError()
+        return self
+
+    def seek(self, whichpkt):
+        """Only packet ids are supported."""
+        self._check_connected()
+        if whichpkt < 0 or whichpkt >= len(self._server.packets):
+            raise SeekError()
+        self._position = whichpkt
+        return whichpkt
+
+    def put(self, srcname, time, packet):
+        self._check_connected()
+        self._server.put(srcname, time, packet)
+        return 0
+
+    def putx(self, srcname, time, packet):
+        self._check_connected()
+        return self._server.put(srcname, time, packet)
+
+
+class FakeOrbReapThr(OrbReapThr):
+    """Reaps the packets of a FakeOrb, in the order they were put, with time
+    after tafter (the newest packets if tafter < 0). There is no reap thread
+    nor queue, get takes the next packet from the ORB.
+    """
+
+    def __init__(self, orbname, select=None, reject=None,
+                 tafter=-1, timeout=-1, queuesize=64):
+        self.orbname = orbname
+        self._server = _get_server(orbname)
+        try:
+            self._select = _compile(select)
+            self._reject = _compile(reject)
+        except re.error:
+            raise OrbReapThrError()
+        self._timeout = timeout
+        self._stopped = False
+        with self._server.cond:
+            packets = self._server.packets
+            if tafter < 0:
+                self._position = len(packets)
+            else:
+                self._position = 0
+                while self._position < len(packets) and packets[self._position][2] <= tafter:
+                    self._position += 1
+
+    def _matches(self, srcname):
+        if self._select is not None and not self._select.match(srcname):
+            return False
+        if self._reject is not None and self._reject.match(srcname):
+            return False
+        return True
+
+    def stop_and_wait(self):
+        self.set_to_stop()
+
+    def set_to_stop(self):
+        with self._server.cond:
+            self._stopped = True
+            self._server.cond.notify_all()
+
+    def is_stopped(self):
+        return self._stopped
+
+    def get(self):
+        deadline = None
+        if self._timeout > 0:
+            deadline = time.time() + self._timeout
+        with self._server.cond:
+            packets = self._server.packets
+            while True:
+                while self._position < len(packets):
+                    packet = packets[self._position]
+                    self._position += 1
+                    if self._matches(packet[1]):
+                        return packet
+                if self._stopped:
+                    raise Stopped()
+                if self._timeout == 0:
+                    raise NoData()
+                if deadline is None:
+                    self._server.cond.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise Timeout()
+                    self._server.cond.wait(remaining)
+
+    def destroy(self):
+        self.set_to_stop()
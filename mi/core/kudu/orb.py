@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 
-import _orb
-from _orb import ORBCURRENT, ORBPREV, ORBPREVSTASH, ORBNEXT, \
-                          ORBNEXT_WAIT, ORBOLDEST,  ORBNEWEST, ORBSTASH
+try:
+    import _orb
+    from _orb import ORBCURRENT, ORBPREV, ORBPREVSTASH, ORBNEXT, \
+                              ORBNEXT_WAIT, ORBOLDEST,  ORBNEWEST, ORBSTASH
+except ImportError:
+    # no Antelope; Orb can only be used through the in process stand-in in
+    # mi.core.kudu.fakeorb
+    _orb = None
 
 from mi.core.kudu.exc import check_error, OrbError
 #from mi.core.kudu import _crap
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.kudu.test.benchmark_chanbuf
+@file mi/core/kudu/test/benchmark_chanbuf.py
+@author Ronald Ronquillo
+@brief Measure CPU and memory of decoding ORB channel samples.
+
+Packets of a few high rate channels are put in a FakeOrb and reaped in
+batches.  The samples of each channel, as _PktChannel_data_get returns
+them, are turned into arrays with numpy.array per channel, as the Antelope
+ORB particle used to, and with ChannelBuffers.  The arrays of the last
+packets are kept alive, as particles waiting to be published would.
+
+USAGE:
+    $ bin/python -m mi.core.kudu.test.benchmark_chanbuf [packets [samples]]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import resource
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from mi.core.kudu import fakeorb
+from mi.core.kudu.fakeorb import FakeOrb, FakeOrbReapThr
+from mi.core.kudu.brttpkt import NoData, reap_batch
+from mi.core.kudu.chanbuf import ChannelBuffers
+
+ORBNAME = 'benchmark:chanbuf'
+CHANNELS = [('HYS1', 'HHE'), ('HYS1', 'HHN'), ('HYS1', 'HHZ'), ('HYS1', 'HDH')]
+DEFAULT_PACKETS = 20000
+DEFAULT_SAMPLES = 200
+# packets whose arrays are kept alive
+IN_FLIGHT = 500
+
+
+def fill_orb(count, samples):
+    fakeorb.reset(ORBNAME)
+    data = tuple(range(samples))
+    with FakeOrb(ORBNAME, 'w') as orb:
+        for i in xrange(count):
+            # the packet is the channel samples, as unstuffing would give them
+            orb.put('OO_HYS1_HHZ', float(i + 1), [(sta, chan, data) for (sta, chan) in CHANNELS])
+
+
+def decode(count, to_array):
+    """
+    @retval (cpu seconds, max RSS growth in KB)
+    """
+    reapthr = FakeOrbReapThr(ORBNAME, tafter=0, timeout=0)
+    in_flight = deque(maxlen=IN_FLIGHT)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.clock()
+    while True:
+        try:
+            batch = reap_batch(reapthr, 100)
+        except NoData:
+            break
+        for (pktid, srcname, pkttime, packet) in batch:
+            in_flight.append([to_array(sta, chan, data) for (sta, chan, data) in packet])
+    elapsed = time.clock() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    count = int(argv[0]) if argv else DEFAULT_PACKETS
+    samples = int(argv[1]) if len(argv) > 1 else DEFAULT_SAMPLES
+    fill_orb(count, samples)
+
+    buffers = ChannelBuffers()
+    for (name, to_array) in (('buffers', buffers.copy),
+                             ('numpy.array', lambda sta, chan, data: np.array(data))):
+        elapsed, rss = decode(count, to_array)
+        print '%-12s %d packets of %d x %d samples: %.1f usecs/packet, max RSS +%d KB' % (
+            name, count, len(CHANNELS), samples, elapsed / count * 1e6, rss)
+    print 'buffers allocated %d arenas, numpy.array %d arrays' % (
+        buffers.allocations, count * len(CHANNELS))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.kudu.test.benchmark_orb_reap
+@file mi/core/kudu/test/benchmark_orb_reap.py
+@author Ronald Ronquillo
+@brief Measure ORB reaping throughput and latency, packet by packet and in batches.
+
+Uses the in process FakeOrb, so no Antelope install is needed.  The
+consumer does what AntelopeOrbParser.get_records does around the reap:
+each call publishes its particles and pushes the state to the driver,
+which here serializes it as the driver state persistence does.  Particles
+are not built, unstuffing packets needs Antelope.
+
+Throughput drains an ORB holding the packets.  Latency has a thread put
+packets at a steady rate while the consumer polls like the driver record
+getter, sleeping while no packet is available, and measures the time from
+put to publication.
+
+USAGE:
+    $ bin/python -m mi.core.kudu.test.benchmark_orb_reap [packets [rate]]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import json
+import sys
+import threading
+import time
+
+from mi.core.kudu import fakeorb
+from mi.core.kudu.fakeorb import FakeOrb, FakeOrbReapThr
+from mi.core.kudu.brttpkt import NoData, reap_batch
+
+ORBNAME = 'benchmark:orb'
+PACKET = 'x' * 512
+DEFAULT_PACKETS = 100000
+DEFAULT_RATE = 2000
+BATCH_SIZE = 100
+BATCH_SECONDS = 0.1
+POLL_DELAY = 0.01
+
+
+class Consumer(object):
+    """
+    Reaps packets, publishing them and updating the state once per call.
+    """
+
+    def __init__(self, reapthr, batch_size):
+        self.reapthr = reapthr
+        self.batch_size = batch_size
+        self.state = {'tafter': 0.0}
+        self.published = []
+
+    def get_records(self):
+        try:
+            if self.batch_size:
+                batch = reap_batch(self.reapthr, self.batch_size, BATCH_SECONDS)
+            else:
+                batch = [self.reapthr.get()]
+        except NoData:
+            return None
+        self.published.append((time.time(), batch))
+        self.state['tafter'] = batch[-1][2]
+        json.dumps(self.state)
+        return batch
+
+
+def put(count, rate=None):
+    with FakeOrb(ORBNAME, 'w') as orb:
+        for i in xrange(count):
+            if rate:
+                time.sleep(1.0 / rate)
+            orb.put('OO_HYS1_BHZ', time.time(), PACKET)
+
+
+def throughput(count, batch_size):
+    fakeorb.reset()
+    put(count)
+    consumer = Consumer(FakeOrbReapThr(ORBNAME, tafter=0, timeout=0), batch_size)
+    start = time.time()
+    while consumer.get_records():
+        pass
+    return time.time() - start, consumer
+
+
+def latency(count, rate, batch_size):
+    fakeorb.reset()
+    consumer = Consumer(FakeOrbReapThr(ORBNAME, tafter=0, timeout=0), batch_size)
+    producer = threading.Thread(target=put, args=(count, rate))
+    producer.start()
+    received = 0
+    while received < count:
+        batch = consumer.get_records()
+        if batch:
+            received += len(batch)
+        else:
+            time.sleep(POLL_DELAY)
+    producer.join()
+    delays = [published - pkt[2] for (published, batch) in consumer.published for pkt in batch]
+    return sum(delays) / len(delays), max(delays), consumer
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    count = int(argv[0]) if argv else DEFAULT_PACKETS
+    rate = float(argv[1]) if len(argv) > 1 else DEFAULT_RATE
+
+    for (name, batch_size) in (('packet by packet', 0), ('batch of %d' % BATCH_SIZE, BATCH_SIZE)):
+        elapsed, consumer = throughput(count, batch_size)
+        print '%-18s throughput %8.0f packets/sec, %d state updates' % (
+            name, count / elapsed, len(consumer.published))
+
+    count = min(count, int(rate * 5))
+    for (name, batch_size) in (('packet by packet', 0), ('batch of %d' % BATCH_SIZE, BATCH_SIZE)):
+        mean, worst, consumer = latency(count, rate, batch_size)
+        print '%-18s latency at %d packets/sec mean %.4f secs, max %.4f secs, %d state updates' % (
+            name, rate, mean, worst, len(consumer.published))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.kudu.test.test_chanbuf
+@file mi/core/kudu/test/test_chanbuf.py
+@author Ronald Ronquillo
+@brief Test cases for the reusable channel sample buffers
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import numpy as np
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.kudu.chanbuf import ChannelBuffers
+
+
+@attr('UNIT', group='mi')
+class ChannelBuffersUnitTestCase(MiUnitTestCase):
+
+    def test_copy(self):
+        buffers = ChannelBuffers(arena_size=10)
+        a = buffers.copy('HYS1', 'BHZ', (1, 2, 3))
+        b = buffers.copy('HYS1', 'BHZ', (4, 5, 6, 7))
+        c = buffers.copy('HYS1', 'BHN', (8,))
+        self.assertEqual(a.tolist(), [1, 2, 3])
+        self.assertEqual(b.tolist(), [4, 5, 6, 7])
+        self.assertEqual(c.tolist(), [8])
+        self.assertEqual(a.dtype, np.array((1, 2, 3)).dtype)
+        self.assertIs(a.base, b.base)
+        self.assertIsNot(a.base, c.base)
+        self.assertEqual(buffers.allocations, 2)
+
+        # larger than an arena
+        d = buffers.copy('HYS1', 'BHZ', range(11))
+        self.assertEqual(d.tolist(), range(11))
+        self.assertEqual(buffers.allocations, 3)
+
+    def test_reuse(self):
+        """
+        Full arenas are reused once their channel data is gone
+        """
+        buffers = ChannelBuffers(arena_size=10)
+        kept = [buffers.copy('HYS1', 'BHZ', range(5)) for i in range(2)]
+        # arena full and in use, a new one is allocated
+        new = buffers.copy('HYS1', 'BHZ', range(10, 15))
+        self.assertEqual(buffers.allocations, 2)
+        self.assertEqual([k.tolist() for k in kept], [range(5)] * 2)
+
+        del kept
+        buffers.copy('HYS1', 'BHZ', range(5))
+        buffers.copy('HYS1', 'BHZ', range(5))
+        self.assertEqual(buffers.allocations, 2)
+        self.assertEqual(new.tolist(), range(10, 15))
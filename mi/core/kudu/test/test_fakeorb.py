@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.kudu.test.test_fakeorb
+@file mi/core/kudu/test/test_fakeorb.py
+@author Ronald Ronquillo
+@brief Test cases for the in process ORB stand-in and batched reaping
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import threading
+import time
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.kudu import fakeorb
+from mi.core.kudu.fakeorb import FakeOrb, FakeOrbReapThr
+from mi.core.kudu.brttpkt import NoData, Timeout, Stopped, reap_batch
+
+ORBNAME = 'test:orb'
+
+
+@attr('UNIT', group='mi')
+class FakeOrbUnitTestCase(MiUnitTestCase):
+
+    def setUp(self):
+        fakeorb.reset()
+        self.addCleanup(fakeorb.reset)
+
+    def put(self, count, start=0, srcname='OO_HYS1_BHZ'):
+        with FakeOrb(ORBNAME, 'w') as orb:
+            return [orb.putx(srcname, float(start + i), 'packet %d' % (start + i))
+                    for i in range(count)]
+
+    def test_reap(self):
+        self.put(3)
+        self.put(2, start=3, srcname='OO_HYS1_LHZ')
+        reapthr = FakeOrbReapThr(ORBNAME, select='.*_BHZ', tafter=0.0, timeout=0)
+        self.assertEqual(reapthr.get(), (1, 'OO_HYS1_BHZ', 1.0, 'packet 1'))
+        self.assertEqual(reapthr.get()[0], 2)
+        self.assertRaises(NoData, reapthr.get)
+
+        reapthr = FakeOrbReapThr(ORBNAME, reject='.*_BHZ', tafter=0.0, timeout=0)
+        self.assertEqual([reapthr.get()[0] for i in range(2)], [3, 4])
+
+    def test_reap_batch(self):
+        self.put(10, start=1)
+        reapthr = FakeOrbReapThr(ORBNAME, tafter=0.0, timeout=0)
+        self.assertEqual([p[0] for p in reap_batch(reapthr, 4)], [0, 1, 2, 3])
+        # ended by NoData
+        self.assertEqual([p[0] for p in reap_batch(reapthr, 100)], range(4, 10))
+        self.assertRaises(NoData, reap_batch, reapthr, 100)
+        # ended by the time limit
+        self.put(10, start=11)
+        self.assertEqual(len(reap_batch(reapthr, 100, 0)), 1)
+
+    def test_blocking(self):
+        reapthr = FakeOrbReapThr(ORBNAME, tafter=0, timeout=0.05)
+        self.assertRaises(Timeout, reapthr.get)
+
+        reapthr = FakeOrbReapThr(ORBNAME, tafter=0, timeout=-1)
+        putter = threading.Timer(0.05, self.put, (1,))
+        putter.start()
+        start = time.time()
+        self.assertEqual(reapthr.get()[0], 0)
+        self.assertLess(time.time() - start, 1)
+        putter.join()
+
+        reapthr.stop_and_wait()
+        self.assertTrue(reapthr.is_stopped())
+        self.assertRaises(Stopped, reapthr.get)
@@ -22,15 +22,21 @@ to create a logger automatically scoped with the calling package and ready to us
 
     from ooi.logging import log    # no longer need get_logger at all
 
+hot paths (per packet, per chunk, per record) should use a level guarded logger instead.  It is bound
+to the calling module once, and a call at a disabled level costs a single level check; the message
+is never formatted and the arguments never touched:
+
+    from mi.core.log import get_guarded_logger ; log = get_guarded_logger()
+
+    log.debug("Got Data: %r", data)    # pass arguments, never "..." % data
+
 """
 import inspect
 import logging
 import os
 import sys
-import yaml
-import pkg_resources
 from types import FunctionType
-from functools import wraps
+from functools import wraps, partial
 
 from mi.core.common import Singleton
 from ooi.logging import config, log
@@ -42,6 +48,8 @@ LOGGING_PRIMARY_FROM_EGG='mi-logging.yml'
 LOGGING_MI_OVERRIDE='res/config/mi-logging.local.yml'
 LOGGING_CONTAINER_OVERRIDE='res/config/logging.local.yml'
 
+TRACE = 5
+
 
 class LoggerManager(Singleton):
     """
@@ -62,6 +70,8 @@ class LoggerManager(Singleton):
             if debug:
                 print >> sys.stderr, str(os.getpid()) + ' configured logging from ' + LOGGING_PRIMARY_FROM_FILE
         else:
+            import yaml
+            import pkg_resources
             logconfig = pkg_resources.resource_string('mi', LOGGING_PRIMARY_FROM_EGG)
             parsed = yaml.load(logconfig)
             config.replace_configuration(parsed)
@@ -122,3 +132,80 @@ def log_method(class_name=None, log_level='trace'):
 
 def get_logger():
     return log
+
+
+def _discard(*args, **kwargs):
+    """
+    Stand in for a logging method when its level is disabled
+    """
+
+
+def _level_number(level):
+    """
+    Convert a level name ('trace', 'DEBUG') to its number.  Numbers are returned unchanged.
+    """
+    if isinstance(level, basestring):
+        name = level.upper()
+        if name == 'TRACE':
+            return TRACE
+        number = logging.getLevelName(name)
+        if not isinstance(number, int):
+            raise ValueError('Unknown log level: %s' % level)
+        return number
+    return level
+
+
+def _guarded(level, name):
+    """
+    Build a level guarded logging method.  The attribute lookup returns the underlying
+    logger's own bound method when the level is enabled, so no extra stack frame is added
+    and the reported caller (module, function, line) stays correct.  When the level is
+    disabled a no-op is returned instead.
+    """
+    def getter(self):
+        logger = self.logger
+        if logger.isEnabledFor(level):
+            if name == 'trace':
+                return partial(logger.log, TRACE)
+            return getattr(logger, name)
+        return _discard
+    return property(getter)
+
+
+class GuardedLogger(object):
+    """
+    Logging facade with level guarded fast paths.  Wraps a standard library logger;
+    anything other than the logging methods is delegated to it.
+    """
+    trace = _guarded(TRACE, 'trace')
+    debug = _guarded(logging.DEBUG, 'debug')
+    info = _guarded(logging.INFO, 'info')
+    warn = _guarded(logging.WARNING, 'warning')
+    warning = _guarded(logging.WARNING, 'warning')
+    error = _guarded(logging.ERROR, 'error')
+    exception = _guarded(logging.ERROR, 'exception')
+    critical = _guarded(logging.CRITICAL, 'critical')
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def isEnabledFor(self, level):
+        """
+        @param level level number or name, e.g. 'trace' or logging.DEBUG
+        @retval True if a message at this level would be emitted
+        """
+        return self.logger.isEnabledFor(_level_number(level))
+
+    def __getattr__(self, name):
+        return getattr(self.logger, name)
+
+
+def get_guarded_logger(name=None):
+    """
+    Return a level guarded logger.
+    @param name logger name, defaults to the name of the calling module
+    @retval GuardedLogger
+    """
+    if name is None:
+        name = sys._getframe(1).f_globals.get('__name__', 'UNKNOWN_MODULE_NAME')
+    return GuardedLogger(logging.getLogger(name))
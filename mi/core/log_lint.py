@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.log_lint
+@file mi/core/log_lint.py
+@author Ronald Ronquillo
+@brief Flag log calls which format their message eagerly.
+
+A call such as log.debug("Got Data: %r" % data) builds the message on every
+call, even when debug logging is disabled.  Passing the arguments to the
+logger, log.debug("Got Data: %r", data), defers formatting until a record
+is actually emitted.
+
+USAGE:
+    $ bin/python -m mi.core.log_lint mi/core mi/dataset
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import ast
+import os
+import re
+import sys
+
+# default trees checked when no paths are given
+DEFAULT_PATHS = ['mi/core', 'mi/dataset']
+
+LOG_METHODS = ['trace', 'debug', 'info', 'warn', 'warning', 'error', 'exception', 'critical']
+
+LOGGER_NAME_REGEX = re.compile(r'^_?(log|logger|mi_logger|LOG)$')
+
+
+def _logger_name(node):
+    """
+    Return the name of the object a method is called on, e.g. 'log' for
+    log.debug and 'logger' for self.logger.debug
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _is_eager(node):
+    """
+    @param node first argument of a log call
+    @retval True if the argument is a message formatted with % or str.format
+    """
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mod):
+        return isinstance(node.left, ast.Str)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        return node.func.attr == 'format' and isinstance(node.func.value, ast.Str)
+    return False
+
+
+def check_source(source, filename='<string>'):
+    """
+    Find log calls which format their message eagerly.
+    @param source python source code
+    @param filename file name used in the results
+    @retval list of (filename, line number, log method) tuples
+    @raise SyntaxError if the source cannot be parsed
+    """
+    results = []
+    for node in ast.walk(ast.parse(source, filename)):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+            continue
+        if node.func.attr not in LOG_METHODS or not node.args:
+            continue
+        name = _logger_name(node.func.value)
+        if name is None or not LOGGER_NAME_REGEX.match(name):
+            continue
+        if _is_eager(node.args[0]):
+            results.append((filename, node.lineno, node.func.attr))
+    return sorted(results)
+
+
+def check_paths(paths):
+    """
+    Check every python file in the given files and directories.
+    @param paths list of files and directories
+    @retval (list of violations, list of files which could not be parsed)
+    """
+    results = []
+    skipped = []
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.py'))
+
+        for filename in files:
+            try:
+                with open(filename) as f:
+                    results.extend(check_source(f.read(), filename))
+            except SyntaxError:
+                skipped.append(filename)
+    return results, skipped
+
+
+def main(argv=None):
+    """
+    Print each eager log call found, return 1 if there were any
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    results, skipped = check_paths(argv or DEFAULT_PATHS)
+    for filename in skipped:
+        print >> sys.stderr, '%s: unable to parse, skipped' % filename
+    for filename, lineno, method in results:
+        print '%s:%d: log.%s message formatted eagerly, pass the arguments to the logger' % \
+              (filename, lineno, method)
+    return 1 if results else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
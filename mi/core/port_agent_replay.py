@@ -0,0 +1,373 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.port_agent_replay
+@file mi/core/port_agent_replay.py
+@author Ronald Ronquillo
+@brief Replay captured port agent traffic to PortAgentClient's under load.
+
+Captures are read either as port agent framed streams, whose packets are
+kept with their type and timestamp, or as raw instrument logs, which are
+split in lines sent as DATA_FROM_INSTRUMENT packets at a fixed interval.
+PortAgentReplayServer listens like the data port of a port agent and sends
+the packets to every connection, framed with a valid checksum, at the
+original pace, scaled, or as fast as possible, interleaving heartbeats if
+requested.  run_load connects any number of PortAgentClient's to it and
+reports the particles per second and the latency from the time a packet is
+sent to the time its particles are built.
+
+USAGE:
+    $ bin/python -m mi.core.port_agent_replay capture [-r] [-c connections] [-s speed]
+"""
+
+# Needed because we import the time module below.  With out this '.' is search first
+# and we import ourselves.
+from __future__ import absolute_import
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import argparse
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from mi.core.log import get_logger
+log = get_logger()
+
+from mi.core.exceptions import InstrumentConnectionException
+from mi.core.instrument.port_agent_client import PortAgentClient, PortAgentPacket, \
+     HEADER_SIZE, NTP_DELTA, OFFSET_P_CHECKSUM_LOW, OFFSET_P_CHECKSUM_HIGH
+from mi.core.port_agent_simulator import LOCALHOST, DEFAULT_PORT_RANGE
+
+SYNC = '\xa3\x9d\x7a'
+# sync, type, packet size (including header), checksum, NTP seconds, NTP fraction
+HEADER = struct.Struct('>3sBHHII')
+
+DEFAULT_RAW_INTERVAL = 0.1
+DEFAULT_TIMEOUT = 60
+PERCENTILES = (50, 90, 99, 100)
+
+ReplayPacket = namedtuple('ReplayPacket', 'type timestamp data')
+
+
+def checksum(packet):
+    """
+    Checksum of a framed packet as PortAgentPacket.verify_checksum computes
+    it: the XOR of all its bytes but the checksum field.
+    """
+    result = 0
+    for (i, byte) in enumerate(bytearray(packet)):
+        if i < OFFSET_P_CHECKSUM_LOW or i > OFFSET_P_CHECKSUM_HIGH:
+            result ^= byte
+    return result
+
+
+def to_ntp(timestamp):
+    seconds = int(timestamp)
+    fraction = int((timestamp - seconds) * 2**32) & 0xffffffff
+    return seconds + NTP_DELTA, fraction
+
+
+def from_ntp(seconds, fraction):
+    return seconds - NTP_DELTA + fraction / 2.0**32
+
+
+def packet_timestamp(pa_packet):
+    """
+    System time at which a port agent stamped a received PortAgentPacket.
+    """
+    (sync, packet_type, size, packet_checksum, seconds, fraction) = \
+        HEADER.unpack_from(pa_packet.get_header())
+    return from_ntp(seconds, fraction)
+
+
+def frame(packet_type, data, timestamp=None):
+    """
+    Framed port agent packet, as the port agent sends it.
+    @param timestamp system time stamped in the header, now if None
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    (seconds, fraction) = to_ntp(timestamp)
+    packet = bytearray(HEADER.pack(SYNC, packet_type, HEADER_SIZE + len(data), 0,
+                                   seconds, fraction))
+    packet.extend(data)
+    struct.pack_into('>H', packet, OFFSET_P_CHECKSUM_LOW, checksum(packet))
+    return str(packet)
+
+
+def read_framed(capture):
+    """
+    Packets of a port agent framed capture.  Bytes between packets, and
+    packets with an invalid size or checksum, are skipped.
+    @param capture the captured bytes
+    @retval list of ReplayPacket
+    """
+    packets = []
+    skipped = 0
+    start = capture.find(SYNC)
+    while start >= 0 and start + HEADER_SIZE <= len(capture):
+        (sync, packet_type, size, packet_checksum, seconds, fraction) = \
+            HEADER.unpack_from(capture, start)
+        end = start + size
+        if size >= HEADER_SIZE and end <= len(capture) and \
+           checksum(capture[start:end]) == packet_checksum:
+            packets.append(ReplayPacket(packet_type, from_ntp(seconds, fraction),
+                                        capture[start + HEADER_SIZE:end]))
+        else:
+            # not a packet, look for one after its sync bytes
+            skipped += 1
+            end = start + 1
+        start = capture.find(SYNC, end)
+    if skipped:
+        log.warn("skipped %d invalid packets", skipped)
+    return packets
+
+
+def read_raw(capture, interval=DEFAULT_RAW_INTERVAL):
+    """
+    Lines of a raw instrument log as DATA_FROM_INSTRUMENT packets, one
+    every interval seconds.
+    @retval list of ReplayPacket
+    """
+    return [ReplayPacket(PortAgentPacket.DATA_FROM_INSTRUMENT, i * interval, line)
+            for (i, line) in enumerate(capture.splitlines(True))]
+
+
+def read_capture(filename, raw=False, interval=DEFAULT_RAW_INTERVAL):
+    with open(filename, 'rb') as f:
+        capture = f.read()
+    if raw:
+        return read_raw(capture, interval)
+    return read_framed(capture)
+
+
+class PortAgentReplayServer(object):
+    """
+    Data port of a port agent replaying packets.  Each connection is sent
+    all the packets from its own thread, then kept open until close.
+    """
+
+    def __init__(self, packets, speed=1.0, heartbeat=0, restamp=True,
+                 port_range=DEFAULT_PORT_RANGE):
+        """
+        @param packets list of ReplayPacket
+        @param speed replay speed relative to the capture timestamps, None
+                     to send as fast as possible
+        @param heartbeat seconds between heartbeats while waiting to send
+                     a packet, 0 for no heartbeats
+        @param restamp whether the packets are stamped with the time they
+                     are sent, as a live port agent does, or keep the
+                     capture timestamps
+        @param port_range port numbers to attempt to bind to
+        """
+        self.packets = packets
+        self.speed = speed
+        self.heartbeat = heartbeat
+        self.restamp = restamp
+        self.connections = []
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.port = self._bind(port_range)
+        self.socket.listen(5)
+        self._start_thread(self._accept)
+
+    def _bind(self, port_range):
+        for port in port_range:
+            try:
+                self.socket.bind((LOCALHOST, port))
+                log.debug("Bind to port: %d", port)
+                return port
+            except socket.error as e:
+                log.debug("Failed to bind to port %s (%s)", port, e)
+        raise InstrumentConnectionException("Failed to bind to a port")
+
+    def _start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
+
+    def _accept(self):
+        while not self._done.is_set():
+            try:
+                (connection, address) = self.socket.accept()
+            except socket.error:
+                # closed
+                return
+            log.debug("accepted replay connection from %s", address)
+            with self._lock:
+                self.connections.append(connection)
+            self._start_thread(self._replay, connection)
+
+    def _wait(self, connection, until):
+        while not self._done.is_set():
+            remaining = until - time.time()
+            if remaining <= 0:
+                return
+            if self.heartbeat:
+                if remaining >= self.heartbeat:
+                    if self._done.wait(self.heartbeat):
+                        return
+                    connection.sendall(frame(PortAgentPacket.HEARTBEAT, ''))
+                    continue
+            self._done.wait(remaining)
+
+    def _replay(self, connection):
+        if not self.packets:
+            return
+        start = time.time()
+        first = self.packets[0].timestamp
+        try:
+            for packet in self.packets:
+                if self._done.is_set():
+                    return
+                if self.speed:
+                    self._wait(connection, start + (packet.timestamp - first) / float(self.speed))
+                timestamp = None if self.restamp else packet.timestamp
+                connection.sendall(frame(packet.type, packet.data, timestamp))
+            # keep the connection up, as a port agent would
+            while not self._done.is_set():
+                self._wait(connection, time.time() + (self.heartbeat or 1))
+        except socket.error as e:
+            # the client went away
+            log.debug("replay connection closed: %s", e)
+
+    def close(self):
+        self._done.set()
+        try:
+            # wakes up the accept thread
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self.socket.close()
+        with self._lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+        for thread in self._threads:
+            thread.join(1)
+
+
+class LoadReport(object):
+    """
+    Counts and latencies of a run_load.
+    """
+
+    def __init__(self):
+        self.packets = 0
+        self.particles = 0
+        self.errors = 0
+        self.latencies = []
+        self.elapsed = None
+
+    def percentile(self, percent):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100.0))
+        return latencies[index]
+
+    def __str__(self):
+        lines = ['%d packets, %d particles in %.3f secs, %.1f particles/sec, %d errors' % (
+            self.packets, self.particles, self.elapsed, self.particles / self.elapsed,
+            self.errors)]
+        if self.latencies:
+            lines.append('latency ' + ', '.join(
+                'p%d %.2f ms' % (percent, self.percentile(percent) * 1000)
+                for percent in PERCENTILES))
+        return '\n'.join(lines)
+
+
+def run_load(packets, connections=1, speed=None, heartbeat=0, got_data=None,
+             timeout=DEFAULT_TIMEOUT):
+    """
+    Replays packets to a number of PortAgentClient's, each in its own
+    connection, and waits until they received all the data packets.
+
+    @param packets list of ReplayPacket
+    @param connections number of simultaneous clients
+    @param speed, heartbeat see PortAgentReplayServer
+    @param got_data function handling a PortAgentPacket as a driver
+                    would, returning the number of particles built; each
+                    data packet counts as a particle if None
+    @param timeout seconds to wait for the data to be received
+    @retval LoadReport
+    """
+    expected = connections * sum(1 for packet in packets
+                                 if packet.type in (PortAgentPacket.DATA_FROM_INSTRUMENT,
+                                                    PortAgentPacket.PICKLED_DATA_FROM_INSTRUMENT))
+    report = LoadReport()
+    lock = threading.Lock()
+    received = threading.Event()
+
+    def got_packet(pa_packet):
+        if got_data:
+            particles = got_data(pa_packet)
+        else:
+            particles = 1
+        latency = time.time() - packet_timestamp(pa_packet)
+        with lock:
+            report.packets += 1
+            report.particles += particles
+            report.latencies.append(latency)
+            if report.packets >= expected:
+                received.set()
+
+    def got_error(error):
+        with lock:
+            report.errors += 1
+
+    server = PortAgentReplayServer(packets, speed, heartbeat)
+    clients = []
+    try:
+        start = time.time()
+        for i in xrange(connections):
+            client = PortAgentClient(LOCALHOST, server.port, None)
+            client.init_comms(got_packet, lambda pa_packet: None, got_error, got_error)
+            clients.append(client)
+        if not received.wait(timeout):
+            log.error("received %d of %d data packets in %d secs", report.packets,
+                      expected, timeout)
+        report.elapsed = time.time() - start
+    finally:
+        for client in clients:
+            client.stop_comms()
+        server.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a port agent capture to port agent clients.')
+    parser.add_argument('capture', help='port agent framed capture, or raw instrument log with -r')
+    parser.add_argument('-r', '--raw', action='store_true',
+                        help='the capture is a raw instrument log, sent line by line')
+    parser.add_argument('-i', '--interval', type=float, default=DEFAULT_RAW_INTERVAL,
+                        help='seconds between the lines of a raw log')
+    parser.add_argument('-c', '--connections', type=int, default=1,
+                        help='number of simultaneous clients')
+    parser.add_argument('-s', '--speed', default='max',
+                        help="replay speed relative to the capture, or 'max'")
+    parser.add_argument('-b', '--heartbeat', type=float, default=0,
+                        help='seconds between heartbeats, 0 for none')
+    parser.add_argument('-t', '--timeout', type=float, default=DEFAULT_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    packets = read_capture(args.capture, args.raw, args.interval)
+    speed = None if args.speed == 'max' else float(args.speed)
+    report = run_load(packets, args.connections, speed, args.heartbeat,
+                      timeout=args.timeout)
+    print report
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -65,10 +65,10 @@ class TCPSimulatorServer(object):
             try:
                 self.socket.bind((LOCALHOST,port))
                 self.port = port
-                log.debug("Bind to port: %d" % port)
+                log.debug("Bind to port: %d", port)
                 return
             except Exception as e:
-                log.error("Failed to bind to port %s (%s)" % (port, e))
+                log.error("Failed to bind to port %s (%s)", port, e)
 
         # If we made it this far we haven't found a port to bind to.
         raise InstrumentConnectionException("Failed to bind to a port")
@@ -144,14 +144,14 @@ class TCPSimulatorClient(object):
             try:
                 bytes_read = self.socket.recv(1024)
                 if(bytes_read):
-                    log.debug("RECV: %s" % bytes_read)
+                    log.debug("RECV: %s", bytes_read)
                     self._buffer += bytes_read
 
             except socket.error as e:
                 if e.errno == errno.EWOULDBLOCK:
                     time.sleep(.1)
                 else:
-                    log.error("Socket read error: %s" % e)
+                    log.error("Socket read error: %s", e)
 
     def clear_buffer(self):
         """
@@ -46,6 +46,15 @@ job = scheduler.add_polled_job(some_callback, test_name, min_interval, max_inter
 
 scheduler.run_polled_job(test_name)
 
+For drivers sharing a process:
+
+# One scheduler thread and worker pool serve every job in the process.
+scheduler = get_shared_scheduler()
+job = scheduler.add_job(IntervalTrigger(PolledScheduler.interval(seconds=3)), some_callback)
+job = scheduler.add_job(PolledIntervalTrigger(min_interval, max_interval), some_callback)
+scheduler.run_polled_job(job)
+scheduler.remove_job(job)
+
 This module extends the Advanced Python Scheduler:
 @see http://packages.python.org/APScheduler
 """
@@ -53,11 +62,16 @@ This module extends the Advanced Python Scheduler:
 __author__ = 'Bill French'
 __license__ = 'Apache 2.0'
 
+import heapq
+import itertools
+import threading
 from datetime import timedelta
 from datetime import datetime
 from math import ceil
 
 from apscheduler.scheduler import Scheduler
+from apscheduler.threadpool import ThreadPool
+from apscheduler.triggers import SimpleTrigger, IntervalTrigger, CronTrigger
 from apscheduler.scheduler import JobStoreEvent
 from apscheduler.scheduler import EVENT_JOBSTORE_JOB_ADDED
 from apscheduler.job import Job
@@ -144,13 +158,13 @@ class PolledScheduler(Scheduler):
                 raise LookupError("no PolledIntervalJob found named '%s'" % name )
 
             if(job.ready_to_run()):
-                log.debug("Job '%s' is ready to run" % job.name)
+                log.debug("Job '%s' is ready to run", job.name)
                 self._threadpool.submit(self._run_job, job, [datetime.now()])
                 job.compute_next_run_time(now)
                 jobstore.update_job(job)
                 return True
             else:
-                log.debug("Job '%s' is *NOT* ready to run" % job.name)
+                log.debug("Job '%s' is *NOT* ready to run", job.name)
                 return False
 
         finally:
@@ -198,7 +212,7 @@ class PolledScheduler(Scheduler):
             log.debug("_process_jobs lock acquired")
             for (alias, jobstore) in self._jobstores.items():
                 for job in tuple(jobstore.jobs):
-                    log.debug("_process_jobs process job %s" % job)
+                    log.debug("_process_jobs process job %s", job)
                     if isinstance(job, PolledIntervalJob):
                         next_polled_wakeup_time_job = self._process_polled_job(job, now, alias, jobstore)
                         if next_polled_wakeup_time is None: next_polled_wakeup_time = next_polled_wakeup_time_job
@@ -209,8 +223,8 @@ class PolledScheduler(Scheduler):
                         next_wakeup_time = min(next_wakeup_time, next_wakeup_time_job)
 
             log.debug("_process_jobs loop complete")
-            log.debug("_process_jobs next polled wakeup %s" % next_polled_wakeup_time)
-            log.debug("_process_jobs next wakeup %s" % next_wakeup_time)
+            log.debug("_process_jobs next polled wakeup %s", next_polled_wakeup_time)
+            log.debug("_process_jobs next wakeup %s", next_wakeup_time)
 
             if(next_polled_wakeup_time and next_wakeup_time):
                 return min(next_polled_wakeup_time, next_wakeup_time)
@@ -259,7 +273,7 @@ class PolledScheduler(Scheduler):
         next_wakeup_time=job.trigger.get_next_fire_time()
 
         if not next_wakeup_time == None and next_wakeup_time <= now:
-            log.debug("submit job to pool: %s" % job)
+            log.debug("submit job to pool: %s", job)
             if(not self._threadpool._shutdown):
                 self._threadpool.submit(self._run_job, job, [next_wakeup_time])
 
@@ -409,8 +423,8 @@ class PolledIntervalTrigger(object):
                 self.next_max_date = now + self.max_interval
             self.next_min_date = now + self.min_interval
 
-            log.debug("Next min date: %s" % self.next_min_date)
-            log.debug("Next max date: %s" % self.next_max_date)
+            log.debug("Next min date: %s", self.next_min_date)
+            log.debug("Next max date: %s", self.next_max_date)
 
             return True
 
@@ -424,5 +438,254 @@ class PolledIntervalTrigger(object):
             self.__class__.__name__, repr(self.min_interval), repr(self.max_interval))
 
 
+DEFAULT_MISFIRE_GRACE_TIME = 1
+DEFAULT_MAX_THREADS = 20
+
+# Rebuild the queue once it holds more removed than live entries
+MIN_COMPACT_SIZE = 64
+
+
+class ScheduledJob(object):
+    """
+    A job of the SharedScheduler.  The trigger is any trigger with a
+    get_next_fire_time method, i.e. the apscheduler SimpleTrigger,
+    IntervalTrigger and CronTrigger or a PolledIntervalTrigger.
+    """
+    def __init__(self, trigger, func, args=None, kwargs=None, name=None):
+        self.trigger = trigger
+        self.func = func
+        self.args = args or []
+        self.kwargs = kwargs or {}
+        self.name = name or getattr(func, '__name__', repr(func))
+        self.polled = isinstance(trigger, PolledIntervalTrigger)
+        self.next_run_time = None
+        self.runs = 0
+        self.instances = 0
+        self.scheduled = False
+
+        # sequence number of the queue entry for the next run, None when
+        # the job is not queued.  Older entries are skipped.
+        self._seq = None
+
+    def __repr__(self):
+        return '<%s (name=%s, trigger=%s)>' % (self.__class__.__name__, self.name, repr(self.trigger))
+
 
+class SharedScheduler(object):
+    """
+    Process wide scheduler.  Jobs wait in a heap ordered by their next run
+    time so adding, removing and running a job is O(log n) in the number
+    of jobs in the process, and a single thread sleeps until the earliest
+    one is due.  Jobs run on a shared thread pool.  Like the PolledScheduler
+    runs are coalesced, a run missed by more than the misfire grace time is
+    skipped and a job only runs in one thread at a time.
+    """
+    def __init__(self, misfire_grace_time=DEFAULT_MISFIRE_GRACE_TIME, max_threads=DEFAULT_MAX_THREADS):
+        self.misfire_grace_time = timedelta(seconds=misfire_grace_time)
+        self._threadpool = ThreadPool(max_threads=max_threads)
+        self._queue = []
+        self._counter = itertools.count()
+        self._stale = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stopped
+
+    def add_job(self, trigger, func, args=None, kwargs=None, name=None):
+        """
+        Schedule a job.  Polled interval jobs without a maximum interval
+        are accepted although they only run when polled.
+        @param trigger: trigger of the job
+        @param func: callable to run
+        @param args: list of positional arguments to call func with
+        @param kwargs: dict of keyword arguments to call func with
+        @param name: name of the job
+        @retval the ScheduledJob
+        @raise ValueError if the job would never run
+        """
+        job = ScheduledJob(trigger, func, args, kwargs, name)
+        next_run_time = trigger.get_next_fire_time(datetime.now())
+        if not job.polled and not next_run_time:
+            raise ValueError('Not adding job since it would never be run')
 
+        with self._condition:
+            if self._stopped:
+                raise ValueError('Not adding job since the scheduler is shut down')
+            job.scheduled = True
+            self._schedule(job, next_run_time)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._main_loop, name='SharedScheduler')
+                self._thread.daemon = True
+                self._thread.start()
+
+        log.debug('Added job %s, next run at %s', job, next_run_time)
+        return job
+
+    def remove_job(self, job):
+        """
+        Unschedule a job.  A run in progress is not interrupted.
+        @param job: ScheduledJob to remove
+        @raise KeyError if the job is not scheduled
+        """
+        with self._condition:
+            if not job.scheduled:
+                raise KeyError('Job %s is not scheduled' % job)
+            job.scheduled = False
+            self._unqueue(job)
+
+    def run_polled_job(self, job):
+        """
+        Run a polled job if it has reached its minimum interval.
+        @param job: ScheduledJob with a PolledIntervalTrigger
+        @retval True if the job is run, False otherwise
+        @raise LookupError if the job is not a scheduled polled job
+        """
+        with self._condition:
+            if not (job.polled and job.scheduled):
+                raise LookupError("no PolledIntervalJob found named '%s'" % job.name)
+
+            if not job.trigger.pull_trigger():
+                log.debug("Job '%s' is *NOT* ready to run", job.name)
+                return False
+
+            log.debug("Job '%s' is ready to run", job.name)
+            self._submit(job, datetime.now())
+            self._unqueue(job)
+            self._schedule(job, job.trigger.get_next_fire_time())
+            return True
+
+    def get_jobs(self):
+        """
+        @retval list of the scheduled jobs, ordered by their next run time
+        """
+        with self._condition:
+            return [job for (_, seq, job) in sorted(self._queue) if job._seq == seq]
+
+    def shutdown(self, wait=True):
+        """
+        Stop the scheduler and drop all jobs.
+        @param wait: wait for running jobs to finish
+        """
+        with self._condition:
+            self._stopped = True
+            for (_, _, job) in self._queue:
+                job.scheduled = False
+            self._queue = []
+            self._stale = 0
+            self._condition.notify()
+        self._threadpool.shutdown(wait)
+
+    def _schedule(self, job, run_time):
+        """
+        Queue the next run of a job.  Called with the condition held.
+        """
+        job.next_run_time = run_time
+        if run_time is None:
+            job._seq = None
+            return
+
+        job._seq = next(self._counter)
+        heapq.heappush(self._queue, (run_time, job._seq, job))
+        if self._queue[0][2] is job:
+            self._condition.notify()
+
+    def _unqueue(self, job):
+        """
+        Drop the queued run of a job.  The heap entry is left in place and
+        skipped when it reaches the front of the queue, or dropped when
+        the queue is compacted.  Called with the condition held.
+        """
+        if job._seq is None:
+            return
+
+        job._seq = None
+        self._stale += 1
+        if self._stale > MIN_COMPACT_SIZE and self._stale * 2 > len(self._queue):
+            self._queue = [entry for entry in self._queue if entry[2]._seq == entry[1]]
+            heapq.heapify(self._queue)
+            self._stale = 0
+
+    def _main_loop(self):
+        """
+        Run jobs as they come due.
+        """
+        with self._condition:
+            while not self._stopped:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                (run_time, seq, job) = self._queue[0]
+                if job._seq != seq:
+                    heapq.heappop(self._queue)
+                    self._stale -= 1
+                    continue
+
+                now = datetime.now()
+                if run_time > now:
+                    self._condition.wait(timedelta_seconds(run_time - now))
+                    continue
+
+                heapq.heappop(self._queue)
+                job._seq = None
+                self._fire(job, run_time, now)
+
+    def _fire(self, job, run_time, now):
+        """
+        Run a job which is due and queue its next run.  Called with the
+        condition held.
+        """
+        if now - run_time > self.misfire_grace_time:
+            log.warning('Run time of job "%s" was missed by %s', job, now - run_time)
+        else:
+            self._submit(job, run_time)
+
+        if job.polled:
+            job.trigger.pull_trigger()
+            next_run_time = job.trigger.get_next_fire_time()
+        else:
+            next_run_time = job.trigger.get_next_fire_time(now + timedelta(microseconds=1))
+            if next_run_time is None:
+                job.scheduled = False
+        self._schedule(job, next_run_time)
+
+    def _submit(self, job, run_time):
+        """
+        Hand a job to the thread pool unless it is already running.  Called
+        with the condition held.
+        """
+        if job.instances:
+            log.warning('Execution of job "%s" skipped: already running', job)
+            return
+
+        job.instances += 1
+        job.runs += 1
+        self._threadpool.submit(self._run_job, job, run_time)
+
+    def _run_job(self, job, run_time):
+        log.debug('Running job "%s" (scheduled at %s)', job, run_time)
+        try:
+            job.func(*job.args, **job.kwargs)
+        except Exception:
+            log.exception('Job "%s" raised an exception', job)
+        finally:
+            with self._condition:
+                job.instances -= 1
+
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_shared_scheduler():
+    """
+    @retval the SharedScheduler of this process
+    """
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = SharedScheduler()
+        return _shared_scheduler
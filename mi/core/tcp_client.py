@@ -1,10 +1,18 @@
 #!/usr/bin/env python
 
+# Needed because we import the time module below.  With out this '.' is search first
+# and we import ourselves.
+from __future__ import absolute_import
+
 from mi.core.log import get_logger ; log = get_logger()
 
+import errno
 import re
+import sre_parse
+import time
 import gevent
 import socket
+from gevent import select
 
 # 'will echo' command sequence to be sent from DA telnet server
 # see RFCs 854 & 857
@@ -13,12 +21,35 @@ WILL_ECHO_CMD = '\xff\xfd\x03\xff\xfb\x03\xff\xfb\x01'
 DO_ECHO_CMD   = '\xff\xfb\x03\xff\xfd\x03\xff\xfd\x01'
 BUFFER_SIZE = 4096
 
+# (pattern, flags) -> longest match, see _max_match_size
+_max_match_sizes = {}
+
 
-class TcpClient():
+def _max_match_size(pattern):
+    """
+    Longest string a compiled pattern can match, or None if unbounded or if
+    the pattern looks ahead, in which case a search cannot resume past the
+    data already scanned.
+    """
+    key = (pattern.pattern, pattern.flags)
+    if key not in _max_match_sizes:
+        size = None
+        if '(?=' not in pattern.pattern and '(?!' not in pattern.pattern:
+            size = sre_parse.parse(pattern.pattern, pattern.flags).getwidth()[1]
+            if size >= sre_parse.MAXREPEAT:
+                size = None
+        _max_match_sizes[key] = size
+    return _max_match_sizes[key]
+
+
+class TcpClient(object):
     """
     Setup a tcp client to act as a telnet client for testing.
+
+    Received data is appended to a bytearray and consumed by moving an
+    offset, expect resumes its search where the previous attempt left off
+    and waits for the socket to be readable rather than sleeping.
     """
-    buf = ""
 
     def __init__(self, host = None, port = None):
         """
@@ -26,11 +57,29 @@ class TcpClient():
         @param host: host address
         @param port: host port
         """
-        self.buf = ""
+        self._buf = bytearray()
+        # start of the data not consumed yet
+        self._pos = 0
+        # unconsumed data already searched for a newline by get_data
+        self._line_scanned = 0
+        self.s = None
 
         if(host and port):
             self.connect(host, port)
 
+    @property
+    def buf(self):
+        """
+        Data received and not consumed yet
+        """
+        return str(self._buf[self._pos:])
+
+    @buf.setter
+    def buf(self, value):
+        self._buf = bytearray(value)
+        self._pos = 0
+        self._line_scanned = 0
+
     def connect(self, host, port):
         log.debug("OPEN SOCKET HOST = " + str(host) + " PORT = " + str(port))
         self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -48,14 +97,41 @@ class TcpClient():
             return True
         return False
 
+    def _recv(self):
+        """
+        Append the data available on the socket to the buffer.
+        @return: the data read, '' if the peer closed the connection
+        @raise: socket.error if no data is available
+        """
+        data = self.s.recv(BUFFER_SIZE)
+        if data:
+            if self._pos > len(self._buf) // 2:
+                # drop the consumed data, amortized over the data consumed
+                del self._buf[:self._pos]
+                self._pos = 0
+            self._buf.extend(data)
+        return data
+
+    def _consume(self, size):
+        """
+        Drop the first size bytes of the unconsumed data.
+        """
+        self._pos += size
+        self._line_scanned = max(0, self._line_scanned - size)
+        if self._pos >= len(self._buf):
+            del self._buf[:]
+            self._pos = 0
+
+    def _wait_readable(self, timeout):
+        select.select([self.s], [], [], timeout)
+
     def read_a_char(self):
-        temp = self.s.recv(BUFFER_SIZE)
+        temp = self._recv()
         if len(temp) > 0:
             log.debug("read_a_char got '" + str(repr(temp)) + "'")
-            self.buf += temp
-        if len(self.buf) > 0:
-            c = self.buf[0:1]
-            self.buf = self.buf[1:]
+        if self._pos < len(self._buf):
+            c = chr(self._buf[self._pos])
+            self._consume(1)
         else:
             c = None
         return c
@@ -78,7 +154,9 @@ class TcpClient():
         Watch the input buffer for a regular expression match.  If found,
         then consume that string from the buffer and return the match object.
         If the string isn't seen in a timely manner (retry * sleep_time)
-        then return None
+        then return None.  Data is searched as soon as it is received, only
+        from where a match could start that the data already searched did not
+        complete.
         @param pattern: regular expression to watch for
         @param max_retries: how many times to we check for that string
         @param sleep_time: how long to wait between queries
@@ -89,40 +167,68 @@ class TcpClient():
         if type(pattern) == str:
             pattern = re.compile(pattern)
 
-        for attempt in range(max_retries):
+        max_size = _max_match_size(pattern)
+        deadline = time.time() + max_retries * sleep_time
+        scanned = 0
+        attempt = 0
+        while True:
+            attempt += 1
+            closed = False
             try:
-                self.buf += self.s.recv(BUFFER_SIZE)
+                closed = not self._recv()
             except:
                 pass
-            log.trace('expect | attempt: %d/%d pattern: %r buf(%d): %r',
-                      attempt + 1, max_retries, pattern.pattern, len(self.buf), self.buf)
-            match = pattern.search(self.buf)
+            # the unconsumed data, without copying it
+            data = buffer(self._buf, self._pos)
+            start = 0
+            if max_size is not None:
+                start = max(0, scanned - max_size + 1)
+            log.trace('expect | attempt: %d pattern: %r buf(%d) from %d: %r',
+                      attempt, pattern.pattern, len(data), start, data[start:])
+            match = pattern.search(data, start)
             if match:
-                self.buf = self.buf[match.end():]
+                # match again in a copy, the buffer changes with the data
+                match = pattern.search(str(data), match.start())
+                self._consume(match.end())
                 log.debug('expect | found match: %r', match.group())
                 break
+            scanned = len(data)
 
-            gevent.sleep(sleep_time)
+            remaining = deadline - time.time()
+            if remaining <= 0 or closed:
+                break
+            self._wait_readable(remaining)
         if match is None:
             log.error('expect | no match found: %r', pattern.pattern)
         return match
 
     def get_data(self):
+        """
+        Read a line.
+        @return: the next line received in lower case, including its newline,
+        or what is left of the data once the connection is closed; ''
+        if no whole line was received yet.
+        """
         data = ""
         try:
-            ret = ""
-
-            while True:
-                c = self.read_a_char()
-                if c is None:
-                    break
-                if c == '\n' or c == '':
-                    ret += c
+            # read all the data available
+            closed = False
+            while not closed:
+                try:
+                    closed = not self._recv()
+                except socket.error as e:
+                    if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        raise
                     break
-                else:
-                    ret += c
 
-            data = ret
+            end = self._buf.find('\n', self._pos + self._line_scanned)
+            if end >= 0:
+                data = str(self._buf[self._pos:end + 1])
+            elif closed:
+                data = self.buf
+            else:
+                self._line_scanned = len(self._buf) - self._pos
+            self._consume(len(data))
         except AttributeError:
             log.debug("CLOSING - GOT AN ATTRIBUTE ERROR")
             self.s.close()
@@ -140,4 +246,3 @@ class TcpClient():
             self.s.sendall(data)
         except:
             log.debug("*** send_data FAILED [" + debug + "] had an exception sending [" + data + "]")
-
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.test.benchmark_driver_scheduler
+@file mi/core/test/benchmark_driver_scheduler.py
+@author Ronald Ronquillo
+@brief Compare a PolledScheduler per driver with the shared scheduler.
+
+Creates a scheduler for each of a number of drivers, each with an interval
+and a polled interval job, and reports the time to add the jobs and the
+threads running once they are scheduled.  The jobs are removed and the
+schedulers stopped afterwards.
+
+USAGE:
+    $ bin/python -m mi.core.test.benchmark_driver_scheduler [drivers]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import sys
+import threading
+import time
+
+from mi.core.driver_scheduler import DriverScheduler, DriverSchedulerConfigKey, TriggerType
+from mi.core.scheduler import PolledScheduler, SharedScheduler
+
+DEFAULT_DRIVERS = 100
+
+
+def _callback():
+    pass
+
+
+def _config(index):
+    return {
+        'interval_%d' % index: {
+            DriverSchedulerConfigKey.TRIGGER: {
+                DriverSchedulerConfigKey.TRIGGER_TYPE: TriggerType.INTERVAL,
+                DriverSchedulerConfigKey.SECONDS: 60
+            },
+            DriverSchedulerConfigKey.CALLBACK: _callback
+        },
+        'polled_%d' % index: {
+            DriverSchedulerConfigKey.TRIGGER: {
+                DriverSchedulerConfigKey.TRIGGER_TYPE: TriggerType.POLLED_INTERVAL,
+                DriverSchedulerConfigKey.MINIMAL_INTERVAL: {DriverSchedulerConfigKey.SECONDS: 30},
+                DriverSchedulerConfigKey.MAXIMUM_INTERVAL: {DriverSchedulerConfigKey.SECONDS: 60}
+            },
+            DriverSchedulerConfigKey.CALLBACK: _callback
+        }
+    }
+
+
+def run_polled(count):
+    """
+    A PolledScheduler per driver, as DriverScheduler used before
+    @retval (seconds to schedule, threads running)
+    """
+    start = time.time()
+    schedulers = []
+    for index in xrange(count):
+        scheduler = PolledScheduler()
+        scheduler.start()
+        for (name, config) in _config(index).items():
+            trigger = config[DriverSchedulerConfigKey.TRIGGER]
+            if trigger[DriverSchedulerConfigKey.TRIGGER_TYPE] == TriggerType.INTERVAL:
+                scheduler.add_interval_job(_callback, seconds=60)
+            else:
+                scheduler.add_polled_job(_callback, name, PolledScheduler.interval(seconds=30),
+                                         PolledScheduler.interval(seconds=60))
+        schedulers.append(scheduler)
+    elapsed = time.time() - start
+    threads = threading.active_count()
+    for scheduler in schedulers:
+        scheduler.shutdown()
+    return elapsed, threads
+
+
+def run_shared(count):
+    """
+    @retval (seconds to schedule, threads running)
+    """
+    shared = SharedScheduler()
+    start = time.time()
+    schedulers = [DriverScheduler(_config(index), shared) for index in xrange(count)]
+    elapsed = time.time() - start
+    threads = threading.active_count()
+    for scheduler in schedulers:
+        scheduler.shutdown()
+    shared.shutdown()
+    return elapsed, threads
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    count = int(argv[0]) if argv else DEFAULT_DRIVERS
+
+    for (name, run) in [('PolledScheduler per driver', run_polled), ('SharedScheduler', run_shared)]:
+        (elapsed, threads) = run(count)
+        print '%-27s %d drivers, %.3f secs to schedule, %d threads' % (name, count, elapsed, threads)
+        time.sleep(.5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+from mi.core.common import BaseEnum
+
+
+@attr('UNIT', group='mi')
+class TestBaseEnum(MiUnitTest):
+    """
+    Test the cached BaseEnum members
+    """
+    def test_members(self):
+        class Color(BaseEnum):
+            RED = 'red'
+            GREEN = 'green'
+
+            def method(self):
+                pass
+
+        self.assertEqual(Color.list(), ['green', 'red'])
+        self.assertEqual(Color.dict(), {'RED': 'red', 'GREEN': 'green'})
+        self.assertTrue(Color.has('red'))
+        self.assertFalse(Color.has('blue'))
+        self.assertFalse(Color.has(['red']))
+        self.assertFalse(Color.has(None))
+
+        # the results may be changed by the caller without affecting the enum
+        Color.list().append('blue')
+        Color.dict()['BLUE'] = 'blue'
+        self.assertFalse(Color.has('blue'))
+        self.assertEqual(len(Color.list()), 2)
+
+    def test_hierarchy(self):
+        """
+        Each class has its own members, combined enums have the members of all their bases
+        """
+        class Base(BaseEnum):
+            ENTER = 'enter'
+
+        class Mcu(Base):
+            START = 'mcu_start'
+
+        class Rga(Base):
+            SCAN = 'rga_scan'
+
+        self.assertEqual(Base.list(), ['enter'])
+        self.assertEqual(Mcu.list(), ['enter', 'mcu_start'])
+
+        class Combined(Mcu, Rga):
+            STOP = 'stop'
+
+        self.assertEqual(sorted(Combined.list()), ['enter', 'mcu_start', 'rga_scan', 'stop'])
+        self.assertFalse(Base.has('stop'))
+        self.assertFalse(Rga.has('mcu_start'))
+        self.assertTrue(Combined.has('rga_scan'))
+
+    def test_invalidation(self):
+        """
+        Changing an enum updates it and the enums derived from it
+        """
+        class Base(BaseEnum):
+            ENTER = 'enter'
+
+        class Derived(Base):
+            EXIT = 'exit'
+
+        class Combined(Derived):
+            pass
+
+        self.assertFalse(Combined.has('added'))
+        Base.ADDED = 'added'
+        self.assertTrue(Base.has('added'))
+        self.assertTrue(Derived.has('added'))
+        self.assertTrue(Combined.has('added'))
+
+        del Base.ADDED
+        self.assertFalse(Combined.has('added'))
+        self.assertEqual(Combined.list(), ['enter', 'exit'])
+
+    def test_unhashable(self):
+        class Mixed(BaseEnum):
+            LIST = [1, 2]
+            NAME = 'name'
+
+        self.assertTrue(Mixed.has([1, 2]))
+        self.assertTrue(Mixed.has('name'))
+        self.assertFalse(Mixed.has('other'))
@@ -37,7 +37,7 @@ class TestDriverScheduler(MiUnitTest):
         self._triggered = []
 
     def tearDown(self):
-        self._scheduler._scheduler.shutdown()
+        self._scheduler.shutdown()
 
     def _callback(self):
         """
@@ -114,7 +114,7 @@ class TestDriverScheduler(MiUnitTest):
         try:
             self._scheduler.remove_job(self._callback)
         except Exception as e:
-            log.debug("test_job_removal: job removal correctly raised exception %s" %e)
+            log.debug("test_job_removal: job removal correctly raised exception %s", e)
             return
         self.fail("a non-existent job was erroneous removed")
         
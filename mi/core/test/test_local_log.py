@@ -8,7 +8,10 @@ from os import makedirs
 from os.path import exists
 import sys
 
+import logging
+
 from mi.core.log import get_logger ; log = get_logger()
+from mi.core.log import get_guarded_logger, TRACE
 
 from nose.plugins.attrib import attr
 from mock import Mock
@@ -34,3 +37,54 @@ class TestLogger(MiUnitTest):
         """
         log.setLevel("DEBUG")
         log.info("boom")
+
+    def test_guarded_logger(self):
+        """
+        Test the level guarded logger only formats enabled messages and
+        reports the real caller
+        """
+        records = []
+
+        class Handler(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+
+        logger = logging.getLogger('mi.core.test.guarded')
+        logger.propagate = False
+        logger.addHandler(Handler())
+        logger.setLevel(logging.INFO)
+        guarded = get_guarded_logger('mi.core.test.guarded')
+
+        formatted = []
+
+        class Arg(object):
+            def __str__(self):
+                formatted.append(self)
+                return 'arg'
+
+        guarded.debug("not formatted: %s", Arg())
+        guarded.trace("not formatted: %s", Arg())
+        self.assertEqual(formatted, [])
+        self.assertEqual(records, [])
+
+        guarded.info("formatted: %s", 'value')
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].getMessage(), "formatted: value")
+        self.assertEqual(records[0].funcName, 'test_guarded_logger')
+
+        self.assertTrue(guarded.isEnabledFor('info'))
+        self.assertFalse(guarded.isEnabledFor('trace'))
+        self.assertFalse(guarded.isEnabledFor(logging.DEBUG))
+
+        logger.setLevel(TRACE)
+        guarded.trace("trace: %d", 1)
+        self.assertEqual(records[-1].levelno, TRACE)
+        self.assertEqual(records[-1].getMessage(), "trace: 1")
+
+        self.assertEqual(guarded.getEffectiveLevel(), TRACE)
+
+    def test_default_guarded_logger_name(self):
+        """
+        Test the guarded logger is named after the calling module
+        """
+        self.assertEqual(get_guarded_logger().name, __name__)
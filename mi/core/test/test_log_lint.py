@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.test.test_log_lint
+@file mi/core/test/test_log_lint.py
+@author Ronald Ronquillo
+@brief Test cases for the eager log formatting check
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import os
+
+from nose.plugins.attrib import attr
+
+import mi
+from mi.core.unit_test import MiUnitTest
+from mi.core.log_lint import check_source, check_paths
+
+SOURCE = '''
+log.debug("eager %s" % value)
+log.info("eager {0}".format(value))
+self._log.error("eager %s %s" % (a, b))
+logger.warn("lazy %s", value)
+log.debug(message % value)
+log.debug("no arguments")
+result = "not logged %s" % value
+parser.debug("not a logger %s" % value)
+'''
+
+
+@attr('UNIT', group='mi')
+class TestLogLint(MiUnitTest):
+    """
+    Test the eager log formatting check
+    """
+    def test_check_source(self):
+        """
+        Test eager formatting is flagged and deferred formatting is not
+        """
+        self.assertEqual(check_source(SOURCE, 'test.py'),
+                         [('test.py', 2, 'debug'), ('test.py', 3, 'info'), ('test.py', 4, 'error')])
+
+    def test_tree_is_clean(self):
+        """
+        Hot path code in mi/core and mi/dataset must not format log messages eagerly
+        """
+        base = os.path.dirname(mi.__file__)
+        results, _ = check_paths([os.path.join(base, 'core'), os.path.join(base, 'dataset')])
+        self.assertEqual(results, [])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.test.test_port_agent_replay
+@file mi/core/test/test_port_agent_replay.py
+@author Ronald Ronquillo
+@brief Tests for the port agent traffic replay
+"""
+
+# Needed because we import the time module below.  With out this '.' is search first
+# and we import ourselves.
+from __future__ import absolute_import
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import socket
+import time
+
+from mi.core.unit_test import MiUnitTest
+from nose.plugins.attrib import attr
+from mi.core.instrument.port_agent_client import PortAgentPacket, HEADER_SIZE
+from mi.core.port_agent_replay import ReplayPacket, PortAgentReplayServer, frame, \
+     read_framed, read_raw, run_load, packet_timestamp
+from mi.core.port_agent_simulator import LOCALHOST
+
+# MI logger
+from mi.core.log import get_logger ; log = get_logger()
+
+SAMPLE = '#  24.2345,  3.14159, 1000.123,   12.3456, 1500.222, 01 Jan 2014, 00:00:01\r\n'
+
+
+@attr('UNIT', group='mi')
+class TestPortAgentReplay(MiUnitTest):
+
+    def test_frame(self):
+        """
+        Framed packets are read back, and are valid port agent packets
+        """
+        packet = frame(PortAgentPacket.DATA_FROM_INSTRUMENT, SAMPLE, 1388534401.25)
+
+        pa_packet = PortAgentPacket()
+        pa_packet.unpack_header(packet[:HEADER_SIZE])
+        pa_packet.attach_data(packet[HEADER_SIZE:])
+        pa_packet.verify_checksum()
+        self.assertTrue(pa_packet.is_valid())
+        self.assertEqual(pa_packet.get_header_type(), PortAgentPacket.DATA_FROM_INSTRUMENT)
+        self.assertEqual(pa_packet.get_data(), SAMPLE)
+        self.assertAlmostEqual(packet_timestamp(pa_packet), 1388534401.25)
+
+        self.assertEqual(read_framed(packet),
+                         [ReplayPacket(PortAgentPacket.DATA_FROM_INSTRUMENT, 1388534401.25, SAMPLE)])
+
+    def test_read_framed(self):
+        """
+        Garbage and corrupt packets in a capture are skipped
+        """
+        heartbeat = frame(PortAgentPacket.HEARTBEAT, '', 10.0)
+        data = frame(PortAgentPacket.DATA_FROM_INSTRUMENT, SAMPLE, 11.0)
+        status = frame(PortAgentPacket.PORT_AGENT_STATUS, 'DISCONNECTED', 12.0)
+        corrupt = data[:-1] + 'X'
+        truncated = data[:HEADER_SIZE + 5]
+
+        packets = read_framed('garbage' + heartbeat + corrupt + data + '\xa3\x9d' + status + truncated)
+        self.assertEqual([(packet.type, packet.timestamp) for packet in packets],
+                         [(PortAgentPacket.HEARTBEAT, 10.0),
+                          (PortAgentPacket.DATA_FROM_INSTRUMENT, 11.0),
+                          (PortAgentPacket.PORT_AGENT_STATUS, 12.0)])
+        self.assertEqual(packets[1].data, SAMPLE)
+
+    def test_read_raw(self):
+        packets = read_raw(SAMPLE * 3, interval=.5)
+        self.assertEqual(packets, [ReplayPacket(PortAgentPacket.DATA_FROM_INSTRUMENT, i * .5, SAMPLE)
+                                   for i in range(3)])
+
+    def test_speed(self):
+        """
+        Packets are sent at the capture pace scaled by speed, with
+        heartbeats while waiting
+        """
+        packets = [ReplayPacket(PortAgentPacket.DATA_FROM_INSTRUMENT, i, SAMPLE) for i in range(3)]
+        server = PortAgentReplayServer(packets, speed=10, heartbeat=.05)
+        self.addCleanup(server.close)
+        sock = socket.create_connection((LOCALHOST, server.port))
+        self.addCleanup(sock.close)
+        sock.settimeout(5)
+
+        start = time.time()
+        received = ''
+        while received.count(SAMPLE) < 3:
+            received += sock.recv(4096)
+        self.assertGreaterEqual(time.time() - start, .2)
+
+        packets = read_framed(received)
+        self.assertEqual([packet.data for packet in packets
+                          if packet.type == PortAgentPacket.DATA_FROM_INSTRUMENT], [SAMPLE] * 3)
+        self.assertGreater(len([packet for packet in packets
+                                if packet.type == PortAgentPacket.HEARTBEAT]), 0)
+
+    def test_run_load(self):
+        """
+        Every client gets all the data packets
+        """
+        packets = read_raw(SAMPLE * 100)
+        packets.insert(50, ReplayPacket(PortAgentPacket.PORT_AGENT_STATUS, 4.95, 'CONNECTED'))
+        report = run_load(packets, connections=4, got_data=lambda pa_packet: 2, timeout=10)
+        log.debug("load report: %s", report)
+
+        self.assertEqual(report.packets, 400)
+        self.assertEqual(report.particles, 800)
+        self.assertEqual(report.errors, 0)
+        self.assertLessEqual(report.percentile(50), report.percentile(100))
@@ -22,6 +22,8 @@ from mi.core.unit_test import MiUnitTest
 from mi.core.scheduler import PolledScheduler
 from mi.core.scheduler import PolledIntervalTrigger
 from mi.core.scheduler import PolledIntervalJob
+from mi.core.scheduler import SharedScheduler, get_shared_scheduler
+from mi.core.scheduler import SimpleTrigger, IntervalTrigger, CronTrigger
 from apscheduler.util import timedelta_seconds
 
 @attr('UNIT', group='mi')
@@ -205,7 +207,7 @@ class TestScheduler(MiUnitTest):
 
         self._scheduler.start()
 
-        log.debug("JOBS: %s" % self._scheduler.get_jobs())
+        log.debug("JOBS: %s", self._scheduler.get_jobs())
         self.assertEqual(len(self._scheduler.get_jobs()), 1)
 
         self.assertTrue(self._scheduler.run_polled_job(test_name))
@@ -267,7 +269,7 @@ class TestScheduler(MiUnitTest):
         # Verify min and max dates are incremented correctly.
         ###
         now = datetime.datetime.now()
-        log.debug("Now: %s" % now)
+        log.debug("Now: %s", now)
         min_interval = PolledScheduler.interval(seconds=1)
         max_interval = PolledScheduler.interval(seconds=3)
 
@@ -296,7 +298,7 @@ class TestScheduler(MiUnitTest):
         # Now do the same sequence, but with no max_interval
         ###
         now = datetime.datetime.now()
-        log.debug("Now: %s" % now)
+        log.debug("Now: %s", now)
         min_interval = PolledScheduler.interval(seconds=1)
         max_interval = None
 
@@ -352,7 +354,7 @@ class TestScheduler(MiUnitTest):
 
         job = PolledIntervalJob(trigger, self._callback, [], {}, 1, 1, name='test_job')
         self.assertIsNotNone(job)
-        log.debug("H: %s" % repr(job))
+        log.debug("H: %s", repr(job))
         next_time = job.compute_next_run_time(now)
         self.assert_datetime_close(next_time, now + max_interval)
         self.assertEqual(job.name, 'test_job')
@@ -370,3 +372,99 @@ class TestScheduler(MiUnitTest):
         self.assertFalse(job.ready_to_run())
         self.assert_datetime_close(next_time, now + max_interval)
 
+
+@attr('UNIT', group='mi')
+class TestSharedScheduler(MiUnitTest):
+    """
+    Test the process wide scheduler
+    """
+    def setUp(self):
+        self._scheduler = SharedScheduler()
+        self._triggered = []
+
+    def tearDown(self):
+        self._scheduler.shutdown()
+
+    def _callback(self, name='job'):
+        self._triggered.append((name, datetime.datetime.now()))
+
+    def assert_triggered(self, count, timeout=5):
+        endtime = time.time() + timeout
+        while len(self._triggered) < count and time.time() < endtime:
+            time.sleep(.05)
+        self.assertGreaterEqual(len(self._triggered), count)
+
+    def test_shared(self):
+        self.assertIs(get_shared_scheduler(), get_shared_scheduler())
+
+    def test_order(self):
+        """
+        Jobs run in order of their run time, not the order they were added
+        """
+        now = datetime.datetime.now()
+        for (name, delay) in [('late', .6), ('early', .2), ('middle', .4)]:
+            self._scheduler.add_job(SimpleTrigger(now + datetime.timedelta(seconds=delay)),
+                                    self._callback, [name])
+        self.assertEqual(len(self._scheduler.get_jobs()), 3)
+        self.assert_triggered(3)
+        self.assertEqual([name for (name, _) in self._triggered], ['early', 'middle', 'late'])
+
+        # absolute jobs are done once they have run
+        self.assertEqual(self._scheduler.get_jobs(), [])
+
+        with self.assertRaisesRegexp(ValueError, 'would never be run'):
+            self._scheduler.add_job(SimpleTrigger(now - datetime.timedelta(seconds=1)), self._callback)
+
+    def test_interval_and_cron(self):
+        job = self._scheduler.add_job(IntervalTrigger(datetime.timedelta(seconds=.2)), self._callback)
+        self._scheduler.add_job(CronTrigger(second='*'), self._callback, ['cron'])
+        self.assert_triggered(4)
+
+        self._scheduler.remove_job(job)
+        with self.assertRaises(KeyError):
+            self._scheduler.remove_job(job)
+        self._triggered = []
+        time.sleep(1.1)
+        self.assertEqual(set(name for (name, _) in self._triggered), set(['cron']))
+
+    def test_polled(self):
+        trigger = PolledIntervalTrigger(PolledScheduler.interval(seconds=1), PolledScheduler.interval(seconds=2))
+        job = self._scheduler.add_job(trigger, self._callback, name='polled')
+        self.assertTrue(job.polled)
+
+        # the job may run once when added, after which the minimum interval applies
+        self._scheduler.run_polled_job(job)
+        self.assertFalse(self._scheduler.run_polled_job(job))
+
+        # the maximum interval triggers the job without polling
+        self._triggered = []
+        self.assert_triggered(1)
+
+        time.sleep(1.1)
+        self.assertTrue(self._scheduler.run_polled_job(job))
+
+        self._scheduler.remove_job(job)
+        with self.assertRaisesRegexp(LookupError, "no PolledIntervalJob found named 'polled'"):
+            self._scheduler.run_polled_job(job)
+
+    def test_exception(self):
+        """
+        A failing job does not stop the scheduler
+        """
+        def fail():
+            raise Exception('job failed')
+        now = datetime.datetime.now()
+        self._scheduler.add_job(SimpleTrigger(now + datetime.timedelta(seconds=.1)), fail)
+        self._scheduler.add_job(SimpleTrigger(now + datetime.timedelta(seconds=.2)), self._callback)
+        self.assert_triggered(1)
+
+    def test_compact(self):
+        """
+        Removed jobs do not accumulate in the queue
+        """
+        date = datetime.datetime.now() + datetime.timedelta(days=1)
+        jobs = [self._scheduler.add_job(SimpleTrigger(date), self._callback) for _ in range(200)]
+        for job in jobs[:150]:
+            self._scheduler.remove_job(job)
+        self.assertLess(len(self._scheduler._queue), 150)
+        self.assertEqual(len(self._scheduler.get_jobs()), 50)
@@ -17,6 +17,9 @@ log = get_logger()
 
 import mock
 import re
+import socket
+import threading
+import time
 from nose.plugins.attrib import attr
 
 from mi.core.unit_test import MiUnitTest
@@ -58,4 +61,68 @@ class TestTCPClient(MiUnitTest):
         result = client.expect_regex(re.compile(r'(abc)(def)'))
         self.assertEqual(result.group(1), 'abc')
         self.assertEqual(result.group(2), 'def')
-        self.assertEqual(client.buf, 'ghi')
\ No newline at end of file
+        self.assertEqual(client.buf, 'ghi')
+
+    def _socket_client(self):
+        """
+        Client connected to a local socket, returns the client and the
+        peer socket
+        """
+        (peer, sock) = socket.socketpair()
+        sock.settimeout(0.0)
+        self.addCleanup(peer.close)
+        self.addCleanup(sock.close)
+        client = TcpClient()
+        client.s = sock
+        return (client, peer)
+
+    def test_expect_data_arrival(self):
+        """
+        expect returns as soon as a match spanning several receives arrives
+        """
+        (client, peer) = self._socket_client()
+        peer.sendall('junk junk junk S')
+        timer = threading.Timer(.1, peer.sendall, ['BE37>\r\nmore'])
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        start = time.time()
+        result = client.expect_regex(r'S\w{4}>\r\n', max_retries=5, sleep_time=1)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(result.group(), 'SBE37>\r\n')
+        self.assertEqual(client.buf, 'more')
+
+        # unbounded pattern, the whole buffer is searched
+        peer.sendall(' data 42')
+        self.assertEqual(client.expect_regex(r'(\w+) data (\d+)').groups(), ('more', '42'))
+
+    def test_expect_timeout(self):
+        (client, peer) = self._socket_client()
+        peer.sendall('abc')
+
+        start = time.time()
+        self.assertFalse(client.expect('abcd', max_retries=2, sleep_time=.1))
+        self.assertGreaterEqual(time.time() - start, .2)
+        self.assertEqual(client.buf, 'abc')
+
+        # the connection is closed, no need to wait any longer
+        peer.close()
+        start = time.time()
+        self.assertFalse(client.expect('abcd', max_retries=2, sleep_time=1))
+        self.assertLess(time.time() - start, 1)
+
+    def test_get_data(self):
+        (client, peer) = self._socket_client()
+        self.assertEqual(client.get_data(), '')
+
+        peer.sendall('Line 1\r\nLine')
+        self.assertEqual(client.get_data(), 'line 1\r\n')
+        # partial lines are kept until their end is received
+        self.assertEqual(client.get_data(), '')
+        peer.sendall(' 2\n')
+        self.assertEqual(client.get_data(), 'line 2\n')
+
+        peer.sendall('last')
+        peer.close()
+        self.assertEqual(client.get_data(), 'last')
+        self.assertEqual(client.buf, '')
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.batch_parser Offline batch parsing of data files
+@file mi/dataset/batch_parser.py
+@author Ronald Ronquillo
+@brief Run a dataset parser over files outside of the agent and driver
+
+Each file is parsed from the start by a new parser, built with no-op state
+callbacks.  The particles of each input file are written to their own
+output file by the process parsing it, so files are parsed in a pool of
+processes without passing particles between them.
+
+Output formats:
+    ndjson - one particle per line as returned by DataParticle.generate_dict
+    csv - one file per particle stream, a column for each header field and
+          value_id.  Values which are not scalars are written as JSON.
+
+Usage:
+
+result = parse_files('mi.dataset.parser.cg_stc_eng_stc.CgStcEngStcParser',
+                     ['/data/*.txt'], '/tmp/out', config=config, workers=4)
+log.info("%d particles, %.1f particles/s", result.particles, result.particles_per_second)
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import copy
+import csv
+import glob
+import inspect
+import json
+import multiprocessing
+import os
+import time
+
+from mi.core.log import get_logger; log = get_logger()
+
+from mi.core.common import BaseEnum
+from mi.core.exceptions import ConfigurationException
+from mi.core.instrument.data_particle import DataParticleKey
+
+# parser.get_records batch size
+RECORDS_PER_CALL = 1000
+
+# header fields in csv output, in column order
+CSV_HEADER = [DataParticleKey.INTERNAL_TIMESTAMP,
+              DataParticleKey.PORT_TIMESTAMP,
+              DataParticleKey.DRIVER_TIMESTAMP,
+              DataParticleKey.PREFERRED_TIMESTAMP,
+              DataParticleKey.QUALITY_FLAG]
+
+
+class OutputFormat(BaseEnum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+class FileResult(object):
+    """
+    Outcome of parsing one file
+    """
+    def __init__(self, path, particles=0, exceptions=0, elapsed=0.0, error=None, outputs=None):
+        self.path = path
+        self.particles = particles
+        self.exceptions = exceptions
+        self.elapsed = elapsed
+        self.error = error
+        self.outputs = outputs or []
+
+
+class BatchResult(object):
+    """
+    Outcome of a batch, with the throughput over the wall clock time
+    """
+    def __init__(self, files, elapsed):
+        self.files = files
+        self.elapsed = elapsed
+        self.particles = sum(f.particles for f in files)
+        self.exceptions = sum(f.exceptions for f in files)
+        self.failed = [f for f in files if f.error]
+
+    @property
+    def files_per_second(self):
+        return len(self.files) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def particles_per_second(self):
+        return self.particles / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return "%d files (%d failed), %d particles, %d recoverable exceptions in %.2f secs: " \
+               "%.1f files/s, %.1f particles/s" % \
+               (len(self.files), len(self.failed), self.particles, self.exceptions, self.elapsed,
+                self.files_per_second, self.particles_per_second)
+
+
+def load_object(name):
+    """
+    Import an object by name
+    @param name: 'package.module.name' or 'package.module:name'
+    @retval the object
+    @raise ConfigurationException if the object can not be imported
+    """
+    if ':' in name:
+        (module, attribute) = name.split(':', 1)
+    else:
+        (module, _, attribute) = name.rpartition('.')
+
+    try:
+        return getattr(__import__(module, fromlist=[attribute]), attribute)
+    except (ImportError, AttributeError, ValueError) as e:
+        raise ConfigurationException("failed to load '%s': %s" % (name, e))
+
+
+def load_config(value):
+    """
+    Load a parser config
+    @param value: None, a JSON string, the path of a JSON or YAML file or the
+                  name of a dict to import, as for load_object.  Importing
+                  allows configs holding particle classes.
+    @retval config dict
+    @raise ConfigurationException if the config can not be loaded
+    """
+    if value is None:
+        return {}
+    if isinstance(value, dict):
+        return value
+
+    try:
+        if value.lstrip()[:1] in ('{', '['):
+            config = json.loads(value)
+        elif os.path.isfile(value):
+            import yaml
+            with open(value) as f:
+                config = yaml.safe_load(f)
+        else:
+            config = load_object(value)
+    except ValueError as e:
+        raise ConfigurationException("failed to load parser config: %s" % e)
+
+    if not isinstance(config, dict):
+        raise ConfigurationException("parser config not a dict")
+    return config
+
+
+def expand_files(patterns):
+    """
+    @param patterns: list of file names and glob patterns
+    @retval sorted list of files, without duplicates
+    """
+    files = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern)
+        if not matches and os.path.isfile(pattern):
+            matches = [pattern]
+        files.update(path for path in matches if os.path.isfile(path))
+    return sorted(files)
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def build_parser(parser_class, config, stream_handle, path, exception_callback):
+    """
+    Build a parser to read a file from the start.  Constructor arguments are
+    matched by name, as the parsers do not agree on their order.
+    @param parser_class: parser class
+    @param config: parser config
+    @param stream_handle: open file
+    @param path: path of the file, for parsers which need the file name
+    @param exception_callback: called with recoverable sample exceptions
+    @retval parser
+    """
+    values = {
+        'config': config,
+        'state': None,
+        'stream_handle': stream_handle,
+        'file_handle': stream_handle,
+        'state_callback': _noop,
+        'publish_callback': _noop,
+        'exception_callback': exception_callback,
+        'filename': os.path.basename(path),
+        'filesize': os.fstat(stream_handle.fileno()).st_size,
+    }
+    args = inspect.getargspec(parser_class.__init__).args[1:]
+    return parser_class(**dict((arg, values[arg]) for arg in args if arg in values))
+
+
+class _NdjsonWriter(object):
+    def __init__(self, stem):
+        self.outputs = [stem + '.ndjson']
+        self._file = open(self.outputs[0], 'w')
+
+    def write(self, particle):
+        self._file.write(json.dumps(particle))
+        self._file.write('\n')
+
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter(object):
+    def __init__(self, stem):
+        self.outputs = []
+        self._stem = stem
+        self._files = {}
+        self._writers = {}
+        self._columns = {}
+
+    def _open(self, stream, particle):
+        path = '%s.%s.csv' % (self._stem, stream)
+        self.outputs.append(path)
+        self._files[stream] = open(path, 'wb')
+        writer = csv.writer(self._files[stream])
+        columns = [value[DataParticleKey.VALUE_ID] for value in particle[DataParticleKey.VALUES]]
+        writer.writerow(CSV_HEADER + columns)
+        self._writers[stream] = writer
+        self._columns[stream] = columns
+        return writer
+
+    def write(self, particle):
+        stream = particle[DataParticleKey.STREAM_NAME]
+        writer = self._writers.get(stream) or self._open(stream, particle)
+
+        values = dict((value[DataParticleKey.VALUE_ID], value[DataParticleKey.VALUE])
+                      for value in particle[DataParticleKey.VALUES])
+        row = [particle.get(key) for key in CSV_HEADER]
+        for column in self._columns[stream]:
+            value = values.get(column)
+            if isinstance(value, (list, tuple, dict)):
+                value = json.dumps(value)
+            row.append(value)
+        writer.writerow(row)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+WRITERS = {
+    OutputFormat.NDJSON: _NdjsonWriter,
+    OutputFormat.CSV: _CsvWriter,
+}
+
+
+def parse_file(parser_name, config, path, stem, output_format=OutputFormat.NDJSON,
+               records_per_call=RECORDS_PER_CALL):
+    """
+    Parse one file and write its particles.  Errors are returned in the
+    result rather than raised so a bad file does not stop a batch.
+    @param parser_name: name of the parser class, as for load_object
+    @param config: parser config
+    @param path: file to parse
+    @param stem: output path without extension
+    @param output_format: OutputFormat
+    @param records_per_call: records requested from the parser at a time
+    @retval FileResult
+    """
+    result = FileResult(path)
+    start = time.time()
+    writer = None
+
+    def exception_callback(exception):
+        log.debug("Recoverable exception parsing %s: %s", path, exception)
+        result.exceptions += 1
+
+    try:
+        parser_class = load_object(parser_name)
+        writer = WRITERS[output_format](stem)
+        with open(path, 'rb') as stream_handle:
+            parser = build_parser(parser_class, copy.deepcopy(config), stream_handle, path,
+                                  exception_callback)
+            while True:
+                particles = parser.get_records(records_per_call)
+                if not particles:
+                    break
+                for particle in particles:
+                    writer.write(particle.generate_dict())
+                result.particles += len(particles)
+    except Exception as e:
+        log.error("Failed to parse %s: %s", path, e)
+        result.error = '%s: %s' % (type(e).__name__, e)
+    finally:
+        if writer:
+            writer.close()
+            result.outputs = writer.outputs
+
+    result.elapsed = time.time() - start
+    return result
+
+
+def _parse_task(task):
+    return parse_file(*task)
+
+
+def parse_files(parser_name, patterns, output_dir, config=None, workers=1,
+                output_format=OutputFormat.NDJSON, records_per_call=RECORDS_PER_CALL):
+    """
+    Parse files in a pool of processes.  The particles of each input file
+    are written to output_dir, named after the input file.
+    @param parser_name: name of the parser class, as for load_object
+    @param patterns: list of file names and glob patterns
+    @param output_dir: directory for the output, created if needed
+    @param config: parser config, anything accepted by load_config
+    @param workers: number of processes, 1 parses in this process
+    @param output_format: OutputFormat
+    @param records_per_call: records requested from the parser at a time
+    @retval BatchResult
+    @raise ConfigurationException for a bad parser, config or output format
+    """
+    load_object(parser_name)
+    config = load_config(config)
+    if not OutputFormat.has(output_format):
+        raise ConfigurationException("unknown output format '%s'" % output_format)
+    if workers < 1:
+        raise ConfigurationException("workers must be at least 1")
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    tasks = []
+    stems = set()
+    for path in expand_files(patterns):
+        name = os.path.basename(path)
+        stem = os.path.join(output_dir, name)
+        count = 1
+        while stem in stems:
+            stem = os.path.join(output_dir, '%s.%d' % (name, count))
+            count += 1
+        stems.add(stem)
+        tasks.append((parser_name, config, path, stem, output_format, records_per_call))
+
+    log.info("Parsing %d files with %s in %d processes", len(tasks), parser_name, workers)
+    start = time.time()
+    if workers == 1 or len(tasks) < 2:
+        files = [_parse_task(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(min(workers, len(tasks)))
+        try:
+            files = pool.map(_parse_task, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    result = BatchResult(files, time.time() - start)
+    log.info(result.summary())
+    return result
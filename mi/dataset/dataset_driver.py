@@ -34,6 +34,7 @@ from mi.core.instrument.protocol_cmd_dict import ProtocolCommandDict
 from mi.core.instrument.driver_dict import DriverDict
 from mi.core.instrument.protocol_param_dict import ParameterDictType
 from mi.core.instrument.protocol_param_dict import Parameter
+from mi.dataset.state_checkpoint import StateCheckpoint
 from mi.core.common import BaseEnum
 
 class DataSourceConfigKey(BaseEnum):
@@ -41,6 +42,8 @@ class DataSourceConfigKey(BaseEnum):
     PARSER = 'parser'
     DRIVER = 'driver'
     RESOURCE_ID = 'resource_id'
+    STATE_CHECKPOINT = 'state_checkpoint'
+    STATE_COMPACTION = 'state_compaction'
 
 class DriverStateKey(BaseEnum):
     VERSION = 'version'
@@ -51,6 +54,100 @@ class DriverStateKey(BaseEnum):
     INGESTED = 'ingested'
     PARSER_STATE = 'parser_state'
     MODIFIED_STATE = 'modified_state'
+    COMPACTED_STATE = 'compacted_state'
+
+class CompactedStateKey(BaseEnum):
+    WATERMARK = 'watermark'
+    INGESTED = 'ingested'
+    COUNT = 'count'
+
+class StateCompactionConfigKey(BaseEnum):
+    RETAIN = 'retain'
+
+# ingested files kept in full in a compacted directory state
+DEFAULT_RETAIN_FILES = 100
+
+def file_sort_key(file_name):
+    """
+    Sort key of a file name in the harvester order, numbers separated by
+    underscores compare as integers so 'file_9' sorts before 'file_10'
+    @param file_name: file name without directory
+    @retval sort key
+    """
+    (root, extension) = os.path.splitext(file_name)
+    return ([int(part) if part.isdigit() else part for part in root.split('_')], file_name)
+
+class CompactedFileState(object):
+    """
+    Membership test for the files folded out of a directory driver state by
+    compact_file_state.  Files sorting at or below the watermark and files
+    in the exact list are known to be ingested.
+    """
+    def __init__(self, file_state):
+        """
+        @param file_state: driver state of a directory, file names to file state
+        """
+        compacted = file_state.get(DriverStateKey.COMPACTED_STATE) or {}
+        watermark = compacted.get(CompactedStateKey.WATERMARK)
+        self._watermark_key = file_sort_key(watermark) if watermark else None
+        self._ingested = frozenset(compacted.get(CompactedStateKey.INGESTED, ()))
+
+    def __nonzero__(self):
+        return self._watermark_key is not None or bool(self._ingested)
+
+    def __contains__(self, file_name):
+        if file_name in self._ingested:
+            return True
+        return self._watermark_key is not None and file_sort_key(file_name) <= self._watermark_key
+
+def compact_file_state(file_state, retain=DEFAULT_RETAIN_FILES):
+    """
+    Fold all but the newest ingested files of a directory driver state into
+    its compacted state, so the state and the harvester scans stay bounded
+    however many files a directory collects.  The watermark advances over
+    folded files sorting below every file not yet ingested, the rest are
+    kept in a sorted list of names.  Files folded out of the state are no
+    longer checked for modification, and files which show up later with a
+    name sorting below the watermark are not ingested.
+
+    A state written before compaction is migrated by compacting it, the
+    compacted state stays valid without compaction configured.
+    @param file_state: driver state of a directory, updated in place
+    @param retain: number of ingested files kept in full
+    @retval list of the file names folded out of the state
+    """
+    files = [name for (name, value) in file_state.iteritems()
+             if isinstance(value, dict) and name != DriverStateKey.COMPACTED_STATE]
+    ingested = sorted((name for name in files if file_state[name].get(DriverStateKey.INGESTED)),
+                      key=file_sort_key)
+    if len(ingested) <= retain:
+        return []
+    folded = ingested[:len(ingested) - retain]
+
+    compacted = file_state.get(DriverStateKey.COMPACTED_STATE) or {}
+    watermark = compacted.get(CompactedStateKey.WATERMARK)
+    names = sorted(set(compacted.get(CompactedStateKey.INGESTED, [])).union(folded), key=file_sort_key)
+
+    pending = [file_sort_key(name) for name in files if not file_state[name].get(DriverStateKey.INGESTED)]
+    limit = min(pending) if pending else None
+    below = [name for name in names if limit is None or file_sort_key(name) < limit]
+    if below and (watermark is None or file_sort_key(below[-1]) > file_sort_key(watermark)):
+        watermark = below[-1]
+    if watermark:
+        watermark_key = file_sort_key(watermark)
+        names = [name for name in names if file_sort_key(name) > watermark_key]
+
+    # replace rather than update the compacted state and fold the files out
+    # after, so the harvester never finds a file in neither
+    file_state[DriverStateKey.COMPACTED_STATE] = {
+        CompactedStateKey.WATERMARK: watermark,
+        CompactedStateKey.INGESTED: names,
+        CompactedStateKey.COUNT: compacted.get(CompactedStateKey.COUNT, 0) + len(folded),
+    }
+    for name in folded:
+        del file_state[name]
+    log.debug("compacted %d ingested files, watermark %s", len(folded), watermark)
+    return folded
 
 # Driver parameters.
 class DriverParameter(BaseEnum):
@@ -146,7 +243,20 @@ class DataSetDriver(object):
             'harvester_polling_interval'
             'batched_particle_count'
         }
+        'state_checkpoint': {
+            'records': 100,
+            'interval': 5.0
+        }
+        'state_compaction': {
+            'retain': 100
+        }
     }
+
+    The optional 'state_checkpoint' section sets how often the driver state
+    is persisted, see mi.dataset.state_checkpoint.  The optional
+    'state_compaction' section bounds the state of directory harvesters,
+    keeping the newest 'retain' ingested files in full, see
+    compact_file_state.
     """
     def __init__(self, config, memento, data_callback, state_callback, event_callback, exception_callback):
         self._config = copy.deepcopy(config)
@@ -173,9 +283,23 @@ class DataSetDriver(object):
         self._build_driver_dict()
         self._build_param_dict()
 
+        self._checkpoint = StateCheckpoint.from_config(
+            state_callback, self._config.get(DataSourceConfigKey.STATE_CHECKPOINT))
+        self._retain_files = self._verify_compaction_config(
+            self._config.get(DataSourceConfigKey.STATE_COMPACTION))
+
     def shutdown(self):
         self.stop_sampling()
 
+    def set_state_diff_callback(self, diff_callback):
+        """
+        Also hand the changes of the driver state to a consumer each time
+        the state is persisted, see mi.dataset.state_checkpoint.  The whole
+        state is still persisted through the state callback.
+        @param diff_callback: callback receiving the diffs, None to stop
+        """
+        self._checkpoint.set_diff_callback(diff_callback)
+
     def start_sampling(self):
         """
         Start a new thread to monitor for data
@@ -191,6 +315,7 @@ class DataSetDriver(object):
 
         self._stop_sampling()
         self._stop_publisher_thread()
+        self._checkpoint.flush()
 
     def _start_sampling(self):
         raise NotImplementedException('virtual method needs to be specialized')
@@ -437,6 +562,54 @@ class DataSetDriver(object):
     def _poll(self):
         raise NotImplementedException('virtual methond needs to be specialized')
 
+    def _save_driver_state(self, changed=None, records=0, force=False):
+        """
+        Hand the driver state to the checkpoint, which persists it through
+        the state callback when it is due.
+        @param changed: list of paths, as tuples of keys, to the parts of the
+                        driver state changed.  None if unknown.
+        @param records: number of records parsed since the last save
+        @param force: persist now, e.g. when a file is complete
+        """
+        self._checkpoint.update(self._driver_state, changed, records, force)
+
+    def _verify_compaction_config(self, config):
+        """
+        @param config: state compaction config, may be None
+        @retval number of ingested files to retain, None without compaction
+        @raise ConfigurationException for a bad config
+        """
+        if config is None:
+            return None
+        if not isinstance(config, dict):
+            raise ConfigurationException("state compaction config not a dict")
+        retain = config.get(StateCompactionConfigKey.RETAIN, DEFAULT_RETAIN_FILES)
+        if not isinstance(retain, int) or retain < 1:
+            raise ConfigurationException("state compaction retain must be an integer > 0")
+        return retain
+
+    def _compact_file_state(self, file_state, path=()):
+        """
+        Compact the driver state of a directory if compaction is configured
+        and save the driver state if it changed.  The save is not forced,
+        the uncompacted state persisted before is still valid.
+        @param file_state: driver state of a directory
+        @param path: path to file_state in the driver state
+        """
+        if self._retain_files is None:
+            return
+        folded = compact_file_state(file_state, self._retain_files)
+        if folded:
+            self._save_driver_state([path + (DriverStateKey.COMPACTED_STATE, )] +
+                                    [path + (name, ) for name in folded])
+
+    def _parsed_record_count(self):
+        """
+        Records parsed between parser state callbacks, parsers report
+        their state once per batch.
+        """
+        return self._generate_particle_count or 1
+
     def _new_file_exception(self):
         raise NotImplementedException('virtual methond needs to be specialized')
 
@@ -481,6 +654,7 @@ class SimpleDataSetDriver(DataSetDriver):
         self._driver_state = None
 
         self._init_state(memento)
+        self._compact_state()
 
         self._ingest_directory = self._harvester_config.get(DataSetDriverConfigKeys.DIRECTORY)
 
@@ -594,7 +768,7 @@ class SimpleDataSetDriver(DataSetDriver):
         if os.path.exists(destpath):
             log.error("'%s' exists, not overwriting", destpath)
         else:
-            log.debug("Copy file %s from %s to %s" % (filename, path, destpath))
+            log.debug("Copy file %s from %s to %s", filename, path, destpath)
             try:
                 shutil.copy2(path, destpath)
             except Exception as e:
@@ -657,6 +831,7 @@ class SimpleDataSetDriver(DataSetDriver):
 
         finally:
             self._file_in_process = None
+            self._compact_state()
 
     def _save_parser_state(self, state, file_ingested):
         """
@@ -670,7 +845,7 @@ class SimpleDataSetDriver(DataSetDriver):
         if file_ingested:
             log.debug("File %s fully parsed", self._file_in_process)
             self._driver_state[self._file_in_process][DriverStateKey.INGESTED] = True
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(self._file_in_process, )], self._parsed_record_count(), bool(file_ingested))
 
     def _save_parser_state_after_error(self):
         """
@@ -679,7 +854,7 @@ class SimpleDataSetDriver(DataSetDriver):
         """
         log.debug("File %s fully parsed", self._file_in_process)
         self._driver_state[self._file_in_process][DriverStateKey.INGESTED] = True
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(self._file_in_process, )], force=True)
 
     def _init_state(self, memento):
         """
@@ -698,6 +873,12 @@ class SimpleDataSetDriver(DataSetDriver):
             self._driver_state = {DriverStateKey.VERSION: 0.1}
         log.debug('initial driver state %s', self._driver_state)
 
+    def _compact_state(self):
+        """
+        Compact the driver state, which holds the files of a single directory
+        """
+        self._compact_file_state(self._driver_state)
+
     def _new_file_callback(self, file_name):
         """
         Callback used by the single directory harvester called when a new file is detected.  Store the
@@ -727,7 +908,7 @@ class SimpleDataSetDriver(DataSetDriver):
             count = len(self._new_file_queue)
             log.trace("Current new file queue length: %d", count)
         # the harvester updates the driver state, make sure we save the newly found file state info
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(file_name, )], force=True)
 
     def _modified_file_callback(self, modified_state):
         """
@@ -737,7 +918,7 @@ class SimpleDataSetDriver(DataSetDriver):
         log.debug('got modified file callback, modified state %s', modified_state)
         for filename in modified_state:
             self._driver_state[filename][DriverStateKey.MODIFIED_STATE] = modified_state[filename]
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(filename, ) for filename in modified_state], force=True)
 
 class SingleFileDataSetDriver(SimpleDataSetDriver):
     """
@@ -864,7 +1045,7 @@ class SingleFileDataSetDriver(SimpleDataSetDriver):
         log.trace("saving parser state: %r", state)
         # this is for the single file harvester, which does not use file name keys
         self._driver_state[self._filename][DriverStateKey.PARSER_STATE] = state
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(self._filename, )], self._parsed_record_count())
 
     def _file_changed_callback(self, new_state):
         """
@@ -889,7 +1070,7 @@ class SingleFileDataSetDriver(SimpleDataSetDriver):
                 log.debug('clearing next driver state')
             self._in_process_state = None
         log.debug('saving driver state %s', self._driver_state)
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(self._filename, )], force=True)
 
     def _driver_and_next_state_equal(self):
         if self._next_driver_state == None and self._driver_state == None:
@@ -975,6 +1156,16 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
                 self._driver_state[key] = {}
         log.debug('initial driver state %s', self._driver_state)
 
+    def _compact_state(self):
+        """
+        Compact the driver state of each directory harvester
+        """
+        for key in self._data_keys:
+            if self._harvester_type and self._harvester_type.get(key) == HarvesterType.SINGLE_FILE:
+                continue
+            if isinstance(self._driver_state.get(key), dict):
+                self._compact_file_state(self._driver_state[key], (key, ))
+
     def _start_publisher_thread(self):
         """
         Start however many publisher threads are needed, one for each data key
@@ -1116,10 +1307,11 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
             # need to mark the bad file as ingested so we don't re-ingest it
             log.debug("File %s fully parsed", file_name)
             self._driver_state[data_key][file_name][DriverStateKey.INGESTED] = True
-            self._state_callback(self._driver_state)
+            self._save_driver_state([(data_key, file_name)], force=True)
             self._sample_exception_callback(e)
         finally:
             self._file_in_process[data_key] = None
+            self._compact_file_state(self._driver_state[data_key], (data_key, ))
 
     def _got_single_file(self, file_name, data_key):
         """
@@ -1139,7 +1331,7 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
             # make sure we have initialized the file name dictionary with the parser state
             if file_name not in self._driver_state[data_key]:
                 self._driver_state[data_key][file_name] = {DriverStateKey.PARSER_STATE: None}
-                self._state_callback(self._driver_state)
+                self._save_driver_state([(data_key, file_name)], force=True)
 
             # pre_parse can be overloaded if there is anything needed to be done prior to parsing
             self.pre_parse_single(filename=file_name, data_key=data_key)
@@ -1225,7 +1417,7 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
         if file_ingested:
             log.debug("File %s fully parsed", file_name)
             self._driver_state[data_key][file_name][DriverStateKey.INGESTED] = True
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(data_key, file_name)], self._parsed_record_count(), bool(file_ingested))
 
     def _file_changed_callback(self, new_state, data_key):
         """
@@ -1271,7 +1463,7 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
             count = len(self._new_file_queue[data_key])
             log.trace("Current new file queue length: %d", count)
         # the harvester updates the driver state, make sure we save the newly found file state info
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(data_key, file_name)], force=True)
 
     def _modified_file_callback(self, modified_state, data_key):
         """
@@ -1281,7 +1473,7 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
         log.debug('got modified file callback, modified state %s', modified_state)
         for filename in modified_state:
             self._driver_state[data_key][filename][DriverStateKey.MODIFIED_STATE] = modified_state[filename]
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(data_key, filename) for filename in modified_state], force=True)
 
     def _verify_config(self):
         """
@@ -1339,6 +1531,6 @@ class MultipleHarvesterDataSetDriver(SimpleDataSetDriver):
 
             self._in_process_queue[data_key] = None
         log.debug('saving driver state %s', self._driver_state)
-        self._state_callback(self._driver_state)
+        self._save_driver_state([(data_key, file_name)], force=True)
 
 
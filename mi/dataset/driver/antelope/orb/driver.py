@@ -89,15 +89,17 @@ class AntelopeOrbDataSetDriver(DataSetDriver):
             self._driver_state = {DriverStateKey.VERSION: 0.1}
         log.debug('initial driver state %s', self._driver_state)
 
-    def _save_parser_state(self, state, file_ingested):
+    def _save_parser_state(self, state, file_ingested, records=1):
         """
         Callback to store the parser state in the driver object.
         @param state: Object used by the parser to indicate position
+        @param records: number of packets processed since the last state
         """
         log.trace("saving parser state: %r", state)
         self._driver_state[DriverStateKey.PARSER_STATE] = state
-        # check if file has been completely parsed by comparing the parsed position and file size
-        self._state_callback(self._driver_state)
+        # the parser reports its state once per batch of packets, the
+        # checkpoint rate limits persisting it by the packets processed
+        self._save_driver_state([(DriverStateKey.PARSER_STATE, )], records)
 
     def _save_parser_state_after_error(self):
         """
@@ -107,7 +109,7 @@ class AntelopeOrbDataSetDriver(DataSetDriver):
         # TODO whut? maybe take this method out? we never fully ingest an orb.
         log.debug("File %s fully parsed", self._file_in_process)
 #        self._driver_state[DriverStateKey.INGESTED] = True
-        self._state_callback(self._driver_state)
+        self._save_driver_state(force=True)
 
     def _build_parser(self):
         """
@@ -573,8 +573,8 @@ class QualificationTest(DataSetQualificationTestCase):
               profile.disable()
               period = end_time - start_time
               rate = float(nsamps) / period
-              log.critical("Processed %d PACKETS_TO_SEND in %s for a rate of %s pps"
-                  % (nsamps, period,  rate ))
+              log.critical("Processed %d PACKETS_TO_SEND in %s for a rate of %s pps",
+                           nsamps, period, rate)
 
 #            self.assert_reset()
 #            self.stop_dataset_agent_client()
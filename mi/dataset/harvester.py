@@ -24,7 +24,7 @@ from gevent.event import Event
 from mi.core.log import get_logger ; log = get_logger()
 from mi.core.poller import DirectoryPoller, ConditionPoller
 from mi.core.common import BaseEnum
-from mi.dataset.dataset_driver import DriverStateKey
+from mi.dataset.dataset_driver import DriverStateKey, CompactedFileState
 
 
 class Harvester(object):
@@ -80,7 +80,7 @@ class SingleDirectoryPoller(ConditionPoller):
         # this queue holds the names of the files that have been sent to the driver.  Each time the harvester
         # restarts, the queue is emptied so all files that have not been ingested can be added and sent again,
         # but this keeps the harvester from sending the same files over and over to not be put in the driver queue
-        self.sent_to_driver_queue = []
+        self.sent_to_driver_queue = set()
         super(SingleDirectoryPoller,self).__init__(self._check_for_files, callback,
                                                    exception_callback, interval)
 
@@ -102,12 +102,16 @@ class SingleDirectoryPoller(ConditionPoller):
 
         new_files = []
         modified_state = {}
+        compacted = CompactedFileState(self._found_file_state)
         # loop over all files in the directory and compare their state to that in the harvester state dictionary
         for i_file in filenames:
+            file_name = os.path.basename(i_file)
+            if compacted and file_name in compacted:
+                # ingested and folded out of the driver state, no need to look at it again
+                continue
             mod_time = os.path.getmtime(i_file)
             # check if the file has not been modified in the last X seconds
             if (mod_time + self.file_mod_wait) < time.time():
-                file_name = os.path.basename(i_file)
                 # find if this file already exists in the found files
                 if file_name in self._found_file_state and self._found_file_state[file_name][DriverStateKey.INGESTED]:
                     # this file has been ingested (file size and date will only be available for ingested files)
@@ -145,7 +149,7 @@ class SingleDirectoryPoller(ConditionPoller):
                     # duplicates are not sent
                     if file_name not in self.sent_to_driver_queue:
                         # only send this file once
-                        self.sent_to_driver_queue.append(file_name)
+                        self.sent_to_driver_queue.add(file_name)
                         new_files.append(file_name)
 
         log.debug('found new files: %r, modified_files: %r', new_files, modified_state)
@@ -172,6 +172,13 @@ class DatasetParameterDict(ProtocolParameterDict):
                 log.error("Dataset parameter dict error encoding Name:%s, set to None", name)
                 self._encoding_errors.append({name: None})
 
+    def get_regex_params(self):
+        """
+        Return the regex parameters in the order update tries them
+        @retval list of (name, compiled regex, f_getval) tuples
+        """
+        return [(name, val.regex, val.f_getval) for (name, val) in self._param_dict.iteritems()]
+
     def get_encoding_errors(self):
         """
         Return the encoding errors list
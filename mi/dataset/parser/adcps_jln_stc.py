@@ -442,7 +442,7 @@ class AdcpsJlnStcParser(BufferLoadingParser):
         if non_data is not None and non_end <= start:
             # this non-data is an error, send an UnexpectedDataException and increment the state
             self._increment_state(len(non_data))
-            log.debug("Found %d bytes of unexpected non-data" % len(non_data))
+            log.debug("Found %d bytes of unexpected non-data", len(non_data))
             # if non-data is a fatal error, directly call the exception, if it is not use the _exception_callback
             self._exception_callback(UnexpectedDataException("Found %d bytes of un-expected non-data %s"
                                                              % (len(non_data), non_data)))
@@ -14,8 +14,6 @@ __author__ = 'Jeff Laughlin <jeff@jefflaughlinconsulting.com>'
 __license__ = 'Apache 2.0'
 
 
-import numpy as np
-
 from mi.core.log import get_logger
 log = get_logger()
 #import logging
@@ -27,7 +25,8 @@ from mi.core.exceptions import SampleException
 
 from mi.dataset.dataset_parser import Parser
 
-from mi.core.kudu.brttpkt import OrbReapThr, Timeout, NoData
+from mi.core.kudu.brttpkt import OrbReapThr, Timeout, NoData, reap_batch
+from mi.core.kudu.chanbuf import ChannelBuffers
 from mi.core.kudu import _pkt
 
 
@@ -38,11 +37,17 @@ SUFFIXES = [s.lower() for s in ['BHE', 'BHN', 'BHZ', 'EHE', 'EHN', 'EHZ', 'HDH',
         'chan' # used for testing
         ]]
 
+# packets reaped by one get_records call, and milliseconds spent reaping them
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_MS = 100
+
 
 class ParserConfigKey(BaseEnum):
     ORBNAME = "orbname"
     SELECT  = "select"
     REJECT  = "reject"
+    BATCH_SIZE = "batch_size" # optional, DEFAULT_BATCH_SIZE
+    BATCH_MS = "batch_ms" # optional, DEFAULT_BATCH_MS
 
 
 class StateKey(BaseEnum):
@@ -96,6 +101,9 @@ class AntelopeOrbPacketParticle(DataParticle):
 
     _pkt = None
 
+    # channel samples are copied into arenas shared by all the particles
+    _channel_buffers = ChannelBuffers()
+
     def __init__(self, raw_data, *args, **kwargs):
         pktid, srcname, orbtimestamp, raw_packet, pkttype, pkt = raw_data
         self._pkt = pkt
@@ -154,12 +162,15 @@ class AntelopeOrbPacketParticle(DataParticle):
         for pktchan in _pkt._Pkt_channels_get(pkt):
             channel = {}
             channels.append(channel)
+            sta = _pkt._PktChannel_sta_get(pktchan)
+            chan = _pkt._PktChannel_chan_get(pktchan)
             channel[ck.CALIB] = _pkt._PktChannel_calib_get(pktchan)
             channel[ck.CALPER] = _pkt._PktChannel_calper_get(pktchan)
-            channel[ck.CHAN] = _pkt._PktChannel_chan_get(pktchan)
+            channel[ck.CHAN] = chan
             channel[ck.CUSER1] = _pkt._PktChannel_cuser1_get(pktchan)
             channel[ck.CUSER2] = _pkt._PktChannel_cuser2_get(pktchan)
-            channel[ck.DATA] = np.array(_pkt._PktChannel_data_get(pktchan))
+            channel[ck.DATA] = self._channel_buffers.copy(
+                sta, chan, _pkt._PktChannel_data_get(pktchan))
             channel[ck.DUSER1] = _pkt._PktChannel_duser1_get(pktchan)
             channel[ck.DUSER2] = _pkt._PktChannel_duser2_get(pktchan)
             channel[ck.IUSER1] = _pkt._PktChannel_iuser1_get(pktchan)
@@ -169,7 +180,7 @@ class AntelopeOrbPacketParticle(DataParticle):
             channel[ck.NET] = _pkt._PktChannel_net_get(pktchan)
             channel[ck.SAMPRATE] = _pkt._PktChannel_samprate_get(pktchan)
             channel[ck.SEGTYPE] = _pkt._PktChannel_segtype_get(pktchan)
-            channel[ck.STA] = _pkt._PktChannel_sta_get(pktchan)
+            channel[ck.STA] = sta
             channel[ck.TIME] = _pkt._PktChannel_time_get(pktchan)
 
         result.append({vid: pk.CHANNELS, v: channels})
@@ -243,41 +254,66 @@ class AntelopeOrbParser(Parser):
 
         tafter = state[StateKey.TAFTER]
 
+        self._batch_size = config.get(ParserConfigKey.BATCH_SIZE, DEFAULT_BATCH_SIZE)
+        self._batch_seconds = config.get(ParserConfigKey.BATCH_MS, DEFAULT_BATCH_MS) / 1000.0
+
         self._orbreapthr = OrbReapThr(orbname, select, reject, float(tafter), timeout=0, queuesize=100)
-        log.info("Connected to ORB %s %s %s %s" % (orbname, select, reject, tafter))
+        log.info("Connected to ORB %s %s %s %s", orbname, select, reject, tafter)
 
     def kill_threads(self):
         self._orbreapthr.stop_and_wait()
         self._orbreapthr.destroy()
 
-    def get_records(self):
+    def get_records(self, num_records=None):
         """
-        Go ahead and execute the data parsing loop up to a point. This involves
-        getting data from the file, stuffing it in to the chunker, then parsing
-        it and publishing.
-        @param num_records The number of records to gather
-        @retval Return the list of particles requested, [] if none available
+        Reap a batch of packets from the ORB, up to num_records or the
+        packets reaped within the configured batch time, publish their
+        particles together and update the state once for the whole batch.
+        A packet whose particle cannot be built is reported to the exception
+        callback as a SampleException and skipped.
+        @param num_records The maximum number of packets, the configured
+        batch size by default
+        @retval Return the list of packets reaped, None if none available
         """
         log.trace("GET RECORDS")
+        if self.stop:
+            return
+        if num_records is None:
+            num_records = self._batch_size
         try:
-            if self.stop:
-                return
-            get_r = self._orbreapthr.get()
-            pktid, srcname, orbtimestamp, raw_packet = get_r
-            log.trace("get_r: %s %s %s %s", pktid, srcname, orbtimestamp, len(raw_packet))
-            particle = make_antelope_particle(
-                get_r,
-                preferred_timestamp = DataParticleKey.INTERNAL_TIMESTAMP,
-                new_sequence=False,
-            )
-            self._publish_sample(particle)
-            # TODO rate limit state updates?
-            self._state[StateKey.TAFTER] = orbtimestamp
-            log.debug("State: ", self._state)
-            self._state_callback(self._state, False) # push new state to driver
+            batch = reap_batch(self._orbreapthr, num_records, self._batch_seconds)
         except (Timeout, NoData), e:
-            log.debug("orbreapthr.get exception %r" % type(e))
+            log.debug("orbreapthr.get exception %r", type(e))
             return None
-        return get_r
-
+        log.trace("reaped %d packets", len(batch))
 
+        particles = []
+        processed = 0
+        try:
+            for get_r in batch:
+                try:
+                    particles.append(make_antelope_particle(
+                        get_r,
+                        preferred_timestamp = DataParticleKey.INTERNAL_TIMESTAMP,
+                        new_sequence=False,
+                    ))
+                except Exception as e:
+                    msg = "Failed to build particle for ORB packet %r: %s" % (get_r[0], e)
+                    log.error(msg)
+                    if not isinstance(e, SampleException):
+                        e = SampleException(msg)
+                    if not self._exception_callback:
+                        raise e
+                    self._exception_callback(e)
+                processed += 1
+        finally:
+            # without an exception callback a bad packet ends the batch, the
+            # particles and state up to it still go out
+            if particles:
+                self._publish_sample(particles)
+            if processed:
+                # the driver's StateCheckpoint rate limits persisting the state
+                self._state[StateKey.TAFTER] = batch[processed - 1][2]
+                log.debug("State: %s", self._state)
+                self._state_callback(self._state, False, processed) # push new state to driver
+        return batch
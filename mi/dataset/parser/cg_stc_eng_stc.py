@@ -339,11 +339,119 @@ class CgStcEngStcParserDataParticleKey(BaseEnum):
     CG_ENG_DMGRSTATUS_UPDATE = 'cg_eng_dmgrstatus_update'
 
 
+# name of a status line, the text up to the first '='
+LINE_NAME_REGEX = re.compile(r'(?:\A|(?<=[\r\n]))([^=\r\n]*=)')
+# literal line name at the start of a parameter regex
+PATTERN_NAME_REGEX = re.compile(r'((?:\\\.|[^\\()\[\]{}*+?|^$=])*=)')
+
+
+class StcStatusScanner(object):
+    """
+    Extract the parameters of a DatasetParameterDict from an STC status file
+    in one pass.  Status lines are name=value, so rather than searching the
+    whole file with the regex of every parameter, each regex is only matched
+    at the start of the lines with its name, and parameters sharing a regex
+    share one match.  An unescaped '.' in the name matches any character.
+    A regex without a literal line name is searched for in the whole file.
+    As in DatasetParameterDict.update, a parameter gets its value from the
+    first match and is set to None with an encoding error if extracting the
+    value fails.
+    """
+    def __init__(self, param_dict):
+        """
+        @param param_dict DatasetParameterDict to extract the parameters of
+        """
+        # (name, regex index, f_getval) in the parameter dict order
+        self._params = []
+        self._regexes = []
+        # line name -> indices of the regexes matched on those lines
+        self._line_regexes = {}
+        # (name length, wildcard positions) -> name with '.' at the wildcards
+        # -> indices of the regexes matched on lines with a matching name
+        self._wildcard_regexes = {}
+        # indices of the regexes searched for in the whole file
+        self._file_regexes = []
+
+        regex_index = {}
+        for (name, regex, f_getval) in param_dict.get_regex_params():
+            regex_key = (regex.pattern, regex.flags)
+            if regex_key not in regex_index:
+                index = len(self._regexes)
+                regex_index[regex_key] = index
+                self._regexes.append(regex)
+                line_name = PATTERN_NAME_REGEX.match(regex.pattern)
+                if line_name:
+                    self._add_line_regex(line_name.group(1), index)
+                else:
+                    self._file_regexes.append(index)
+            self._params.append((name, regex_index[regex_key], f_getval))
+
+    def _add_line_regex(self, pattern_name, index):
+        """
+        Add a regex to be matched on the lines with its name
+        @param pattern_name line name at the start of the regex pattern
+        @param index index of the regex
+        """
+        # an unescaped '.' in the name matches any character
+        tokens = re.findall(r'\\.|.', pattern_name)
+        wildcards = tuple(i for (i, token) in enumerate(tokens) if token == '.')
+        name = ''.join(token[-1] for token in tokens)
+        if wildcards:
+            self._wildcard_regexes.setdefault((len(name), wildcards), {}).setdefault(name, []).append(index)
+        else:
+            self._line_regexes.setdefault(name, []).append(index)
+
+    def _get_line_regexes(self, line_name):
+        """
+        @param line_name name of a status line
+        @retval indices of the regexes to match on the line
+        """
+        indices = self._line_regexes.get(line_name, [])
+        for ((length, wildcards), names) in self._wildcard_regexes.iteritems():
+            if len(line_name) == length:
+                chars = list(line_name)
+                for i in wildcards:
+                    chars[i] = '.'
+                indices = indices + names.get(''.join(chars), [])
+        return indices
+
+    def scan(self, in_data):
+        """
+        Extract the parameter values from a status file
+        @param in_data status file contents
+        @retval (dict of parameter name to value, list of encoding errors)
+        """
+        if not isinstance(in_data, str):
+            in_data = str(in_data)
+
+        matches = [None] * len(self._regexes)
+        for line_name in LINE_NAME_REGEX.finditer(in_data):
+            for index in self._get_line_regexes(line_name.group(1)):
+                if matches[index] is None:
+                    matches[index] = self._regexes[index].match(in_data, line_name.start())
+        for index in self._file_regexes:
+            matches[index] = self._regexes[index].search(in_data)
+
+        values = {}
+        encoding_errors = []
+        for (name, index, f_getval) in self._params:
+            values[name] = None
+            if matches[index]:
+                try:
+                    values[name] = f_getval(matches[index])
+                except Exception:
+                    log.error("Dataset parameter dict error encoding Name:%s, set to None", name)
+                    encoding_errors.append({name: None})
+        return (values, encoding_errors)
+
+
 class CgStcEngStcParserDataAbstractParticle(DataParticle):
     """
     Abstract Class for parsing data from the cg_stc_eng_stc data set
     """
     _data_particle_type = None
+    # scanner for the parameters of _build_param_dict, built once on first use
+    _scanner = None
 
     def _build_parsed_values(self):
         """
@@ -352,14 +460,14 @@ class CgStcEngStcParserDataAbstractParticle(DataParticle):
         @throws SampleException If there is a problem with sample creation
         """
         result = []
-        # Instantiate the param_dict 
-        params = self._build_param_dict()
-        
-        # Go through the param_dict dictionary for every definition
-        params.update(self.raw_data)
-        encoding_errors = params.get_encoding_errors()
+        scanner = CgStcEngStcParserDataAbstractParticle._scanner
+        if scanner is None:
+            scanner = StcStatusScanner(self._build_param_dict())
+            CgStcEngStcParserDataAbstractParticle._scanner = scanner
+
+        # Go through the file once for every definition
+        (all_params, encoding_errors) = scanner.scan(self.raw_data)
         self._encoding_errors = encoding_errors
-        all_params = params.get_all()
         for (key, value) in all_params.iteritems():
             result.append({DataParticleKey.VALUE_ID: key, DataParticleKey.VALUE: value})
         log.debug("CgStcEngStcParserDataParticle %s", result)
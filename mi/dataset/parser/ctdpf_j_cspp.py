@@ -13,8 +13,6 @@ Initial Release
 __author__ = 'Joe Padula'
 __license__ = 'Apache 2.0'
 
-import numpy
-
 from mi.core.log import get_logger
 log = get_logger()
 from mi.core.common import BaseEnum
@@ -98,7 +96,7 @@ class CtdpfJCsppMetadataDataParticle(CsppMetadataDataParticle):
             data_match = self.raw_data[MetadataRawDataKey.DATA_MATCH]
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -144,7 +142,7 @@ class CtdpfJCsppInstrumentDataParticle(DataParticle):
         try:
             results.append(self._encode_value(CtdpfJCsppParserDataParticleKey.PROFILER_TIMESTAMP,
                                               self.raw_data.group(DataMatchesGroupNumber.PROFILER_TIMESTAMP),
-                                              numpy.float))
+                                              float))
 
             results.append(self._encode_value(CtdpfJCsppParserDataParticleKey.SUSPECT_TIMESTAMP,
                                               self.raw_data.group(DataMatchesGroupNumber.SUSPECT_TIMESTAMP),
@@ -167,7 +165,7 @@ class CtdpfJCsppInstrumentDataParticle(DataParticle):
                                               float))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -17,7 +17,6 @@ import copy
 import re
 from functools import partial
 import string
-import numpy
 
 from mi.core.log import get_logger
 log = get_logger()
@@ -130,7 +129,7 @@ class DbgPdbgGpsParticleKey(BaseEnum):
 # used to simplify encoding using a loop
 
 COMMON_PARTICLE_ENCODING_RULES = [
-    (DbgPdbgGpsParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, numpy.float),
+    (DbgPdbgGpsParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, float),
     (DbgPdbgGpsParticleKey.PRESSURE, DataMatchesGroupNumber.PRESSURE, float),
     (DbgPdbgGpsParticleKey.SUSPECT_TIMESTAMP, DataMatchesGroupNumber.SUSPECT_TIMESTAMP, encode_y_or_n),
 ]
@@ -159,7 +158,7 @@ class DbgPdbgMetadataDataParticle(CsppMetadataDataParticle):
             data_match = self.raw_data[MetadataRawDataKey.DATA_MATCH]
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -216,7 +215,7 @@ class DbgPdbgBatteryParticle(DataParticle):
                                               float))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -271,7 +270,7 @@ class DbgPdbgGpsParticle(DataParticle):
                                               int))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
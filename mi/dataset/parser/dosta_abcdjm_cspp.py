@@ -13,8 +13,6 @@ initial release
 __author__ = 'Mark Worden'
 __license__ = 'Apache 2.0'
 
-import numpy
-
 from mi.core.log import get_logger
 log = get_logger()
 from mi.core.common import BaseEnum
@@ -113,7 +111,7 @@ NON_COMMON_METADATA_PARTICLE_ENCODING_RULES = [
 
 # A group of instrument data particle encoding rules used to simplify encoding using a loop
 INSTRUMENT_PARTICLE_ENCODING_RULES = [
-    (DostaAbcdjmCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, numpy.float),
+    (DostaAbcdjmCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, float),
     (DostaAbcdjmCsppParserDataParticleKey.PRESSURE, DataMatchesGroupNumber.PRESSURE, float),
     (DostaAbcdjmCsppParserDataParticleKey.SUSPECT_TIMESTAMP, DataMatchesGroupNumber.SUSPECT_TIMESTAMP, encode_y_or_n),
     (DostaAbcdjmCsppParserDataParticleKey.ESTIMATED_OXYGEN_CONCENTRATION,
@@ -160,7 +158,7 @@ class DostaAbcdjmCsppMetadataDataParticle(CsppMetadataDataParticle):
                     rule[TYPE_ENCODING_INDEX]))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -214,7 +212,7 @@ class DostaAbcdjmCsppInstrumentDataParticle(DataParticle):
                     rule[TYPE_ENCODING_INDEX]))
 
             # # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -13,8 +13,6 @@ initial release
 __author__ = 'Jeremy Amundson'
 __license__ = 'Apache 2.0'
 
-import numpy
-
 from mi.core.log import get_logger
 log = get_logger()
 from mi.core.common import BaseEnum
@@ -103,7 +101,7 @@ class FlortDjCsppParserDataParticleKey(BaseEnum):
 
 # A group of instrument data particle encoding rules used to simplify encoding using a loop
 INSTRUMENT_PARTICLE_ENCODING_RULES = [
-    (FlortDjCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, numpy.float),
+    (FlortDjCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, float),
     (FlortDjCsppParserDataParticleKey.PRESSURE, DataMatchesGroupNumber.PRESSURE, float),
     (FlortDjCsppParserDataParticleKey.SUSPECT_TIMESTAMP, DataMatchesGroupNumber.SUSPECT_TIMESTAMP, encode_y_or_n),
     (FlortDjCsppParserDataParticleKey.DATE, DataMatchesGroupNumber.DATE, str),
@@ -140,7 +138,7 @@ class FlortDjCsppMetadataDataParticle(CsppMetadataDataParticle):
 
             data_match = self.raw_data[MetadataRawDataKey.DATA_MATCH]
 
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -193,7 +191,7 @@ class FlortDjCsppInstrumentDataParticle(DataParticle):
                     rule[TYPE_ENCODING_INDEX]))
 
             # # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
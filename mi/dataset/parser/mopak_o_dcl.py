@@ -17,6 +17,7 @@ import copy
 import ntplib
 import struct
 import binascii
+import numpy
 from datetime import datetime
 import time
 
@@ -37,6 +38,8 @@ from mi.dataset.dataset_driver import DataSetDriverConfigKeys
 
 ACCEL_ID = b'\xcb'
 RATE_ID = b'\xcf'
+ACCEL_VALUE = ord(ACCEL_ID)
+RATE_VALUE = ord(RATE_ID)
 ACCEL_BYTES = 43
 RATE_BYTES = 31
 
@@ -183,6 +186,76 @@ class MopakODclRateParserRecoveredDataParticle(MopakODclRateParserDataAbstractPa
     _data_particle_type = MopakDataParticleType.RATE_RECOV
 
 
+def sieve_records(raw_data):
+    """
+    Find the accel and rate records in a buffer.  The ID bytes and the 16-bit
+    additive checksums of every candidate record are checked at once on
+    arrays, only the candidates are walked to resync the same way as going
+    byte by byte: a record whose checksum does not match is skipped up to an
+    accel ID inside it, otherwise a rate ID inside it, and if there is no ID
+    inside it the record is returned so the bytes are known to be processed.
+    @param raw_data buffer of binary data
+    @retval list of (start, end) index tuples of the records
+    """
+    raw_data_len = len(raw_data)
+    buf = numpy.frombuffer(raw_data, dtype=numpy.uint8)
+    ids = numpy.flatnonzero((buf == ACCEL_VALUE) | (buf == RATE_VALUE))
+    if not len(ids):
+        return []
+
+    is_accel = buf[ids] == ACCEL_VALUE
+    ends = numpy.where(is_accel, ACCEL_BYTES, RATE_BYTES) + ids
+    complete = ends <= raw_data_len
+    # running sum of the bytes gives the sum of every record with two lookups
+    sums = numpy.zeros(raw_data_len + 1, dtype=numpy.int64)
+    numpy.cumsum(buf, out=sums[1:])
+    checksum_at = numpy.minimum(ends, raw_data_len) - 2
+    calc_checksum = (sums[checksum_at] - sums[ids]) & 0xffff
+    rcv_checksum = (buf[checksum_at].astype(numpy.int64) << 8) | buf[numpy.minimum(checksum_at + 1, raw_data_len - 1)]
+    valid = complete & (calc_checksum == rcv_checksum)
+
+    ids = ids.tolist()
+    is_accel = is_accel.tolist()
+    ends = ends.tolist()
+    complete = complete.tolist()
+    valid = valid.tolist()
+
+    return_list = []
+    n_ids = len(ids)
+    k = 0
+    while k < n_ids:
+        data_index = ids[k]
+        if not complete[k]:
+            # not enough bytes for this record yet, done
+            break
+        record_end = ends[k]
+        if valid[k]:
+            return_list.append((data_index, record_end))
+            next_index = record_end
+        else:
+            log.debug('checking %s at %d for ID since checksums didnt match',
+                      'accel' if is_accel[k] else 'rate', data_index)
+            next_index = None
+            another_rate = None
+            j = k + 1
+            while j < n_ids and ids[j] < record_end:
+                if is_accel[j]:
+                    next_index = ids[j]
+                    break
+                if another_rate is None:
+                    another_rate = ids[j]
+                j += 1
+            if next_index is None:
+                next_index = another_rate
+            if next_index is None:
+                # no other possible starts in here, add to chunk so we know this is processed
+                return_list.append((data_index, record_end))
+                next_index = record_end
+        while k < n_ids and ids[k] < next_index:
+            k += 1
+    return return_list
+
+
 class MopakODclParser(BufferLoadingParser):
     
     def __init__(self,
@@ -231,64 +304,7 @@ class MopakODclParser(BufferLoadingParser):
         This is needed instead of a regex because blocks are identified by position
         in this binary file.
         """
-        data_index = 0
-        return_list = []
-        raw_data_len = len(raw_data)
-
-        while data_index < raw_data_len:
-            # check if this is a status or data sample message
-            if raw_data[data_index] == ACCEL_ID:
-                if (data_index + ACCEL_BYTES) <= raw_data_len:
-                    # start of accel record
-                    if self.compare_checksum(raw_data[data_index:data_index+ACCEL_BYTES]):
-                        return_list.append((data_index, data_index + ACCEL_BYTES))
-                        data_index += ACCEL_BYTES
-                    else:
-                        log.debug('checking accel for ID in 0x%s since checksums didnt match',
-                                  binascii.hexlify(raw_data[data_index:data_index+ACCEL_BYTES]))
-                        another_accel = raw_data[data_index+1:data_index+ACCEL_BYTES].find(ACCEL_ID)
-                        another_rate = raw_data[data_index+1:data_index+ACCEL_BYTES].find(RATE_ID)
-                        if another_accel == -1 and another_rate == -1:
-                            # no other possible starts in here, add to chunk so we know this is processed
-                            return_list.append((data_index, data_index + ACCEL_BYTES))
-                            data_index += ACCEL_BYTES
-                        elif another_accel != -1:
-                            data_index += (another_accel + 1)
-                        elif another_rate != -1:
-                            data_index += (another_rate + 1)
-                else:
-                    # not enough bytes for accel yet, jump to end
-                    data_index = raw_data_len
-            elif raw_data[data_index] == RATE_ID:
-                if (data_index + RATE_BYTES) <= raw_data_len:
-                    # start of rate record
-                    if self.compare_checksum(raw_data[data_index:data_index+RATE_BYTES]):
-                        return_list.append((data_index, data_index + RATE_BYTES))
-                        data_index += RATE_BYTES
-                    else:
-                        log.debug('checking rate for ID in 0x%s since checksums didnt match',
-                                  binascii.hexlify(raw_data[data_index:data_index+RATE_BYTES]))
-                        another_accel = raw_data[data_index+1:data_index+RATE_BYTES].find(ACCEL_ID)
-                        another_rate = raw_data[data_index+1:data_index+RATE_BYTES].find(RATE_ID)
-                        if another_accel == -1 and another_rate == -1:
-                            # no other possible starts in here, add to chunk so we know this is processed
-                            return_list.append((data_index, data_index + RATE_BYTES))
-                            data_index += RATE_BYTES
-                        elif another_accel != -1:
-                            data_index += (another_accel + 1)
-                        elif another_rate != -1:
-                            data_index += (another_rate + 1)
-                else:
-                    # not enough bytes for rate yet, jump to end
-                    data_index = raw_data_len
-            else:
-                data_index += 1
-
-            remain_bytes = raw_data_len - data_index
-            # if the remaining bytes are less than the data rate bytes we're done
-            if remain_bytes < RATE_BYTES:
-                break
-        return return_list
+        return sieve_records(raw_data)
 
     def compare_checksum(self, raw_bytes):
         rcv_chksum = struct.unpack('>H', raw_bytes[-2:])
@@ -299,17 +315,8 @@ class MopakODclParser(BufferLoadingParser):
         return False
 
     def calc_checksum(self, raw_bytes):
-        n_bytes = len(raw_bytes)
-        # unpack raw bytes into unsigned chars
-        unpack_str = '>'
-        for i in range(0, n_bytes):
-            unpack_str = unpack_str + 'B'
-        fields = struct.unpack(unpack_str, raw_bytes)
-        sum_fields = sum(fields)
         # since we are summing as unsigned short, limit range to 0 to 65535
-        while sum_fields > 65535:
-            sum_fields -= 65536
-        return sum_fields
+        return sum(bytearray(raw_bytes)) & 0xffff
 
     def set_state(self, state_obj):
         """
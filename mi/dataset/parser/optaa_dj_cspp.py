@@ -15,7 +15,6 @@ Initial Release
 __author__ = 'Joe Padula'
 __license__ = 'Apache 2.0'
 
-import numpy
 import re
 
 from mi.core.log import get_logger
@@ -113,7 +112,7 @@ class OptaaDjCsppParserDataParticleKey(BaseEnum):
 # This the beginning part of the encoding, before the lists.
 INSTRUMENT_PARTICLE_ENCODING_RULES_BEGIN = [
     # Since 1/1/70 with millisecond resolution
-    (OptaaDjCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, numpy.float),
+    (OptaaDjCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, float),
     # "Depth" from Record Structure section
     (OptaaDjCsppParserDataParticleKey.PRESSURE_DEPTH, DataMatchesGroupNumber.DEPTH, float),
     # Flag indicating a potential inaccuracy in the timestamp
@@ -165,7 +164,7 @@ class OptaaDjCsppMetadataDataParticle(CsppMetadataDataParticle):
                                                         int))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -261,7 +260,7 @@ class OptaaDjCsppInstrumentDataParticle(DataParticle):
                 results.append(self._encode_value(name, self.raw_data.group(group), function))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                                                   DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -14,7 +14,6 @@ __author__ = 'Joe Padula'
 __license__ = 'Apache 2.0'
 
 import re
-import numpy
 
 from mi.core.log import get_logger
 log = get_logger()
@@ -117,7 +116,7 @@ class ParadJCsppMetadataDataParticle(CsppMetadataDataParticle):
             data_match = self.raw_data[MetadataRawDataKey.DATA_MATCH]
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -163,7 +162,7 @@ class ParadJCsppInstrumentDataParticle(DataParticle):
         try:
             results.append(self._encode_value(ParadJCsppParserDataParticleKey.PROFILER_TIMESTAMP,
                                               self.raw_data.group(DataMatchesGroupNumber.PROFILER_TIMESTAMP),
-                                              numpy.float))
+                                              float))
 
             results.append(self._encode_value(ParadJCsppParserDataParticleKey.PRESSURE_DEPTH,
                                               self.raw_data.group(DataMatchesGroupNumber.DEPTH),
@@ -186,7 +185,7 @@ class ParadJCsppInstrumentDataParticle(DataParticle):
                                               int))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -14,7 +14,6 @@ __author__ = 'Jeff Roy'
 __license__ = 'Apache 2.0'
 
 import re
-import numpy
 
 from mi.core.log import get_logger
 log = get_logger()
@@ -189,7 +188,7 @@ class SpkirAbjCsppMetadataDataParticle(CsppMetadataDataParticle):
                     rule[TYPE_ENCODING_INDEX]))
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -236,7 +235,7 @@ class SpkirAbjCsppInstrumentDataParticle(DataParticle):
 
             results.append(self._encode_value(SpkirAbjCsppParserDataParticleKey.PROFILER_TIMESTAMP,
                                               self.raw_data.group(DataMatchesGroupNumber.PROFILER_TIMESTAMP),
-                                              numpy.float))
+                                              float))
 
             results.append(self._encode_value(SpkirAbjCsppParserDataParticleKey.PRESSURE,
                                               self.raw_data.group(DataMatchesGroupNumber.PRESSURE),
@@ -248,7 +247,7 @@ class SpkirAbjCsppInstrumentDataParticle(DataParticle):
 
             results.append(self._encode_value(SpkirAbjCsppParserDataParticleKey.TIMER,
                                               self.raw_data.group(DataMatchesGroupNumber.TIMER),
-                                              numpy.float))
+                                              float))
 
             results.append(self._encode_value(SpkirAbjCsppParserDataParticleKey.SAMPLE_DELAY,
                                               self.raw_data.group(DataMatchesGroupNumber.SAMPLE_DELAY),
@@ -289,7 +288,7 @@ class SpkirAbjCsppInstrumentDataParticle(DataParticle):
                                               int))
 
             # # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.test.benchmark_mopak_sieve
+@file mi/dataset/parser/test/benchmark_mopak_sieve.py
+@author Ronald Ronquillo
+@brief Compare the array sieve of the mopak_o_dcl parser to the byte by byte sieve.
+
+Builds a synthetic MOPAK file of interleaved accel and rate records, with
+a corrupted record and a few stray bytes every so often to exercise the
+resync, and times sieving it with sieve_records and with bytewise_sieve,
+the byte by byte sieve the parser used before.  Both must find the same
+records.
+
+USAGE:
+    $ bin/python -m mi.dataset.parser.test.benchmark_mopak_sieve [megabytes]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import sys
+import time
+
+from mi.dataset.parser.mopak_o_dcl import sieve_records
+from mi.dataset.parser.test.mopak_data import build_data, bytewise_sieve
+
+DEFAULT_MEGABYTES = 4
+
+
+def run(sieve, raw_data):
+    """
+    @retval (seconds elapsed, records found)
+    """
+    start = time.time()
+    records = sieve(raw_data)
+    return time.time() - start, records
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    megabytes = float(argv[0]) if argv else DEFAULT_MEGABYTES
+    raw_data = build_data(int(megabytes * 1024 * 1024))
+
+    results = []
+    for name, sieve in [('bytewise sieve', bytewise_sieve), ('array sieve', sieve_records)]:
+        elapsed, records = run(sieve, raw_data)
+        results.append(records)
+        print '%-15s %d bytes, %d records, %.3f secs, %.1f MB/sec' % \
+              (name, len(raw_data), len(records), elapsed, len(raw_data) / elapsed / 1024 / 1024)
+    if results[0] != results[1]:
+        print 'sieves found different records'
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.test.mopak_data
+@file mi/dataset/parser/test/mopak_data.py
+@author Ronald Ronquillo
+@brief Synthetic MOPAK data and the byte by byte reference sieve, for the
+mopak_o_dcl sieve tests and benchmark.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import random
+import struct
+
+from mi.dataset.parser.mopak_o_dcl import ACCEL_ID, RATE_ID, ACCEL_BYTES, RATE_BYTES
+
+# one in this many records is corrupted
+CORRUPT_EVERY = 50
+
+
+def checksum(raw_bytes):
+    return sum(bytearray(raw_bytes)) & 0xffff
+
+
+def build_record(record_id, n_floats, timer):
+    body = record_id + struct.pack('>%dfI' % n_floats,
+                                   *([random.uniform(-2.0, 2.0) for i in range(n_floats)] + [timer]))
+    return body + struct.pack('>H', checksum(body))
+
+
+def build_data(size, seed=0):
+    """
+    Build about size bytes of 10 Hz accel and rate records
+    @param size number of bytes to build
+    @param seed random seed, the same seed builds the same data
+    @retval string of binary data
+    """
+    random.seed(seed)
+    records = []
+    length = 0
+    timer = 0
+    while length < size:
+        timer += 6250
+        if random.randint(0, 1):
+            record = build_record(ACCEL_ID, 9, timer)
+        else:
+            record = build_record(RATE_ID, 6, timer)
+        if random.randint(0, CORRUPT_EVERY) == 0:
+            # flip a byte so the checksum does not match, and sometimes add stray ID bytes
+            index = random.randint(1, len(record) - 1)
+            record = record[:index] + chr(ord(record[index]) ^ 0x5a) + record[index + 1:]
+            record += random.choice(['', ACCEL_ID, RATE_ID, '\x00' + RATE_ID + ACCEL_ID])
+        records.append(record)
+        length += len(record)
+    return ''.join(records)
+
+
+def bytewise_sieve(raw_data):
+    """
+    The byte by byte sieve of MopakODclParser before sieve_records
+    """
+    data_index = 0
+    return_list = []
+    raw_data_len = len(raw_data)
+
+    while data_index < raw_data_len:
+        if raw_data[data_index] == ACCEL_ID or raw_data[data_index] == RATE_ID:
+            record_bytes = ACCEL_BYTES if raw_data[data_index] == ACCEL_ID else RATE_BYTES
+            if (data_index + record_bytes) <= raw_data_len:
+                record = raw_data[data_index:data_index+record_bytes]
+                if struct.unpack('>H', record[-2:])[0] == checksum(record[:-2]):
+                    return_list.append((data_index, data_index + record_bytes))
+                    data_index += record_bytes
+                else:
+                    another_accel = raw_data[data_index+1:data_index+record_bytes].find(ACCEL_ID)
+                    another_rate = raw_data[data_index+1:data_index+record_bytes].find(RATE_ID)
+                    if another_accel == -1 and another_rate == -1:
+                        return_list.append((data_index, data_index + record_bytes))
+                        data_index += record_bytes
+                    elif another_accel != -1:
+                        data_index += (another_accel + 1)
+                    elif another_rate != -1:
+                        data_index += (another_rate + 1)
+            else:
+                data_index = raw_data_len
+        else:
+            data_index += 1
+
+        if raw_data_len - data_index < RATE_BYTES:
+            break
+    return return_list
@@ -33,10 +33,11 @@ except Exception as e:
 
 @attr('ANTELOPE', group='mi')
 class AntelopeOrbParserUnitTestCase(ParserUnitTestCase):
-    def state_callback(self, state, file_ingested):
+    def state_callback(self, state, file_ingested, records=1):
         """ Call back method to watch what comes in via the state callback """
         log.trace("SETTING state_callback_value to " + str(state))
         self.state_callback_values.append(state)
+        self.state_callback_records.append(records)
         self.file_ingested = file_ingested
 
     def pub_callback(self, particle):
@@ -54,6 +55,7 @@ class AntelopeOrbParserUnitTestCase(ParserUnitTestCase):
 
         self.error_callback_values = []
         self.state_callback_values = []
+        self.state_callback_records = []
         self.publish_callback_values = []
 
         self.parser_config = {
@@ -142,6 +144,27 @@ class AntelopeOrbParserUnitTestCase(ParserUnitTestCase):
         self.parser.get_records()
         self.assert_state(self.PKT_TIME)
 
+    def test_batch(self):
+        """
+        Packets reaped in one call are published together with one state update
+        """
+        get_r = self.parser._orbreapthr.get.return_value
+        pktid, srcname, time, packet = get_r
+        self.parser._orbreapthr.get = MagicMock(side_effect=[
+            (pktid + i, srcname, time + i, packet) for i in range(3)] + [NoData()])
+        r = self.parser.get_records()
+        self.assertEqual(len(r), 3)
+        self.assertEqual(len(self.publish_callback_values), 1)
+        self.assertEqual(len(self.publish_callback_values[0]), 3)
+        self.assertEqual(len(self.state_callback_values), 1)
+        self.assertEqual(self.state_callback_records, [3])
+        self.assert_state(time + 2)
+
+        self.parser._orbreapthr.get = MagicMock(return_value=get_r)
+        r = self.parser.get_records(2)
+        self.assertEqual(len(r), 2)
+        self.assertEqual(len(self.publish_callback_values[1]), 2)
+
     def test_get_exception(self):
         def f(*args, **kwargs):
             raise Exception()
@@ -157,6 +180,33 @@ class AntelopeOrbParserUnitTestCase(ParserUnitTestCase):
 
     def test_sample_exception(self):
         self.parser._orbreapthr.get = MagicMock(return_value=(0, '', 0, 'asdf'))
+        self.parser.get_records(2)
+        self.assertEqual(len(self.error_callback_values), 2)
+        self.assertIsInstance(self.error_callback_values[0], SampleException)
+        self.assertEqual(self.publish_callback_values, [])
+
+        # without an exception callback the bad packet is raised
+        self.parser._exception_callback = None
         self.assertRaises(SampleException, self.parser.get_records)
 
+    def test_bad_packet_in_batch(self):
+        """
+        A bad packet is reported and skipped, the rest of its batch is
+        published and counted in the state update
+        """
+        pktid, srcname, time, packet = self.parser._orbreapthr.get.return_value
+        self.parser._orbreapthr.get = MagicMock(side_effect=[
+            (pktid, srcname, time, packet),
+            (pktid + 1, '', time + 1, 'asdf'),
+            (pktid + 2, srcname, time + 2, packet),
+            NoData()])
+        r = self.parser.get_records()
+        self.assertEqual(len(r), 3)
+        self.assertEqual(len(self.error_callback_values), 1)
+        self.assertIsInstance(self.error_callback_values[0], SampleException)
+        self.assertEqual(len(self.publish_callback_values), 1)
+        self.assertEqual(len(self.publish_callback_values[0]), 2)
+        self.assertEqual(self.state_callback_records, [3])
+        self.assert_state(time + 2)
+
 
@@ -272,4 +272,18 @@ class CgParserUnitTestCase(ParserUnitTestCase):
 	res_dict = result[0].generate_dict()
 	errors = result[0].get_encoding_errors()
 	log.debug("encoding errors: %s", errors)
-	self.assertNotEqual(errors, [])
\ No newline at end of file
+	self.assertNotEqual(errors, [])
+
+    def test_scanner(self):
+        """
+        Ensure the single pass scanner extracts the same values and encoding errors
+        as updating the parameter dictionary with the whole file
+        """
+        for file_name in ['stc_status.txt', 'stc_status_bad_encode.txt']:
+            fid = open(os.path.join(RESOURCE_PATH, file_name))
+            data = fid.read()
+            fid.close()
+            params = self.particle_a._build_param_dict()
+            params.update(data)
+            scanner = StcStatusScanner(self.particle_a._build_param_dict())
+            self.assertEqual(scanner.scan(data), (params.get_all(), params.get_encoding_errors()))
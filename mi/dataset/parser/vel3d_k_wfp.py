@@ -380,8 +380,7 @@ class Vel3dKWfpParser(BufferLoadingParser):
         if non_data is not None and non_end <= start:
             self._increment_position(len(non_data))
 
-            log.warn("Found %d bytes (from %d to %d) of un-expected non-data" %
-                (len(non_data), non_start, non_end))
+            log.warn("Found %d bytes (from %d to %d) of un-expected non-data", len(non_data), non_start, non_end)
 
             # if non-data is a fatal error, directly call the exception,
             # if it is not use the _exception_callback
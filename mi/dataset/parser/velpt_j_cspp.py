@@ -13,8 +13,6 @@ Initial Release
 __author__ = 'Jeremy Amundson'
 __license__ = 'Apache 2.0'
 
-import numpy
-
 from mi.core.log import get_logger
 from mi.core.exceptions import RecoverableSampleException
 log = get_logger()
@@ -101,7 +99,7 @@ class VelptJCsppParserDataParticleKey(BaseEnum):
 
 # A group of instrument data particle encoding rules used to simplify encoding using a loop
 INSTRUMENT_PARTICLE_ENCODING_RULES = [
-    (VelptJCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, numpy.float),
+    (VelptJCsppParserDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, float),
     (VelptJCsppParserDataParticleKey.PRESSURE_DEPTH, DataMatchesGroupNumber.PRESSURE_DEPTH, float),
     (VelptJCsppParserDataParticleKey.SUSPECT_TIMESTAMP, DataMatchesGroupNumber.SUSPECT_TIMESTAMP, encode_y_or_n),
     (VelptJCsppParserDataParticleKey.SOUND_SPEED, DataMatchesGroupNumber.SOUND_SPEED, float),
@@ -141,7 +139,7 @@ class VelptJCsppMetadataDataParticle(CsppMetadataDataParticle):
 
             data_match = self.raw_data[MetadataRawDataKey.DATA_MATCH]
 
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -193,7 +191,7 @@ class VelptJCsppInstrumentDataParticle(DataParticle):
                     rule[TYPE_ENCODING_INDEX]))
 
             # # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -13,8 +13,6 @@ initial release
 __author__ = 'Jeff Roy'
 __license__ = 'Apache 2.0'
 
-import numpy
-
 from mi.core.log import get_logger
 log = get_logger()
 
@@ -90,7 +88,7 @@ class WcHmrEngDataParticleKey(BaseEnum):
 
 # A group of instrument data particle encoding rules used to simplify encoding using a loop
 ENGINEERING_PARTICLE_ENCODING_RULES = [
-    (WcHmrEngDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, numpy.float),
+    (WcHmrEngDataParticleKey.PROFILER_TIMESTAMP, DataMatchesGroupNumber.PROFILER_TIMESTAMP, float),
     (WcHmrEngDataParticleKey.PRESSURE, DataMatchesGroupNumber.PRESSURE, float),
     (WcHmrEngDataParticleKey.SUSPECT_TIMESTAMP, DataMatchesGroupNumber.SUSPECT_TIMESTAMP, encode_y_or_n),
     (WcHmrEngDataParticleKey.HEADING, DataMatchesGroupNumber.HEADING, float),
@@ -122,7 +120,7 @@ class WcHmrMetadataDataParticle(CsppMetadataDataParticle):
             data_match = self.raw_data[MetadataRawDataKey.DATA_MATCH]
 
             # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(data_match.group(
+            internal_timestamp_unix = float(data_match.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
@@ -171,7 +169,7 @@ class WcHmrEngDataParticle(DataParticle):
                 results.append(self._encode_value(name, self.raw_data.group(group), function))
 
             # # Set the internal timestamp
-            internal_timestamp_unix = numpy.float(self.raw_data.group(
+            internal_timestamp_unix = float(self.raw_data.group(
                 DataMatchesGroupNumber.PROFILER_TIMESTAMP))
             self.set_internal_timestamp(unix_time=internal_timestamp_unix)
 
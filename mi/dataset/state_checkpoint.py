@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.state_checkpoint Coalesced driver state persistence
+@file mi/dataset/state_checkpoint.py
+@author Ronald Ronquillo
+@brief Rate limits the driver state handed to the agent
+
+Parsers report their state after every batch of records, and the drivers
+passed the whole driver state, holding every file ever seen, to the agent
+each time.  A StateCheckpoint sits between the two: drivers update it with
+the parts of the state which changed, and it persists the state through
+the state callback at most every N records or T seconds, when a file is
+completed and when sampling stops.
+
+By default every update is persisted, as before.  The checkpoint is
+configured by the 'state_checkpoint' section of the driver config:
+
+config = {
+    'state_checkpoint': {
+        'records': 100,     # persist after this many records
+        'interval': 5.0     # or this many seconds since the last persist
+    }
+}
+
+The state callback always receives the whole driver state, which the agent
+hands back as the memento on restart.  A consumer which only wants what
+changed, e.g. to replicate the state, can be set as the diff callback.  On
+each persist it receives a dict holding what changed since the last
+persist, or the whole state the first time:
+
+{'state': {...}}
+{'changed': [[path, value], ...], 'removed': [path, ...]}
+
+where a path is the list of keys leading to a value in the driver state.
+apply_state_diff rebuilds the driver state from them.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import copy
+import time
+
+from mi.core.log import get_logger; log = get_logger()
+
+from mi.core.common import BaseEnum
+from mi.core.exceptions import ConfigurationException
+
+
+class StateCheckpointConfigKey(BaseEnum):
+    RECORDS = 'records'
+    INTERVAL = 'interval'
+
+
+class StateDiffKey(BaseEnum):
+    STATE = 'state'
+    CHANGED = 'changed'
+    REMOVED = 'removed'
+
+
+_MISSING = object()
+
+
+def _lookup(state, path):
+    for key in path:
+        if not isinstance(state, dict) or key not in state:
+            return _MISSING
+        state = state[key]
+    return state
+
+
+def apply_state_diff(state, diff):
+    """
+    Apply a diff persisted by a StateCheckpoint
+    @param state: driver state, updated in place, or None
+    @param diff: diff to apply
+    @retval the updated driver state
+    """
+    if StateDiffKey.STATE in diff:
+        return copy.deepcopy(diff[StateDiffKey.STATE])
+
+    if state is None:
+        state = {}
+    for (path, value) in diff.get(StateDiffKey.CHANGED, []):
+        parent = state
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        parent[path[-1]] = copy.deepcopy(value)
+    for path in diff.get(StateDiffKey.REMOVED, []):
+        parent = _lookup(state, path[:-1])
+        if isinstance(parent, dict):
+            parent.pop(path[-1], None)
+    return state
+
+
+class StateCheckpoint(object):
+    """
+    Coalesces driver state updates and persists them through the state
+    callback.
+    """
+    def __init__(self, state_callback, records=None, interval=None, diff_callback=None):
+        """
+        @param state_callback: callback persisting the whole driver state
+        @param records: persist once this many records are parsed
+        @param interval: persist once this many seconds passed since the
+                         last persist.  Without records or interval every
+                         update is persisted.
+        @param diff_callback: callback also receiving the diff of the state
+                              on each persist, may be None
+        @raise ConfigurationException for a bad records or interval
+        """
+        if records is None and interval is None:
+            records = 1
+        if records is not None and (not isinstance(records, int) or records < 1):
+            raise ConfigurationException("state checkpoint records must be an integer > 0")
+        if interval is not None and (not isinstance(interval, (int, float)) or interval <= 0):
+            raise ConfigurationException("state checkpoint interval must be > 0")
+
+        self._state_callback = state_callback
+        self._max_records = records
+        self._interval = interval
+        self._diff_callback = diff_callback
+
+        self._state = None
+        self._pending = False
+        self._records = 0
+        self._changed = set()
+        self._full = True
+        self._last_persist = time.time()
+
+        # counts of updates received and state persisted
+        self.updates = 0
+        self.persisted = 0
+
+    @classmethod
+    def from_config(cls, state_callback, config):
+        """
+        @param state_callback: callback persisting the driver state
+        @param config: dict of StateCheckpointConfigKey, may be None
+        @retval StateCheckpoint
+        """
+        config = config or {}
+        if not isinstance(config, dict):
+            raise ConfigurationException("state checkpoint config not a dict")
+        return cls(state_callback,
+                   records=config.get(StateCheckpointConfigKey.RECORDS),
+                   interval=config.get(StateCheckpointConfigKey.INTERVAL))
+
+    def set_diff_callback(self, diff_callback):
+        """
+        Set the callback receiving the diffs of the state, the first one
+        holds the whole state.
+        @param diff_callback: callback receiving the diffs, None to stop
+        """
+        self._diff_callback = diff_callback
+        self._changed = set()
+        self._full = True
+
+    @property
+    def pending(self):
+        """
+        True if there are updates which have not been persisted
+        """
+        return self._pending
+
+    def update(self, state, changed=None, records=0, force=False):
+        """
+        Record a change of the driver state and persist it if it is due
+        @param state: the driver state
+        @param changed: list of paths, as tuples of keys, to the parts of
+                        the state changed.  None if unknown.
+        @param records: number of records parsed since the last update
+        @param force: persist now, e.g. on file completion
+        """
+        self.updates += 1
+        self._state = state
+        self._pending = True
+        self._records += records
+        if changed is None:
+            self._full = True
+        elif not self._full:
+            self._changed.update(tuple(path) for path in changed)
+
+        if force or (self._max_records and self._records >= self._max_records) or \
+                (self._interval and time.time() - self._last_persist >= self._interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Persist pending updates
+        """
+        if not self._pending:
+            return
+
+        diff = None
+        if self._diff_callback:
+            diff = self._diff()
+
+        self._pending = False
+        self._records = 0
+        self._changed = set()
+        self._full = False
+        self._last_persist = time.time()
+        self.persisted += 1
+        log.trace("persisting driver state after %d updates", self.updates)
+        self._state_callback(self._state)
+        if diff is not None:
+            self._diff_callback(diff)
+
+    def _diff(self):
+        if self._full:
+            return {StateDiffKey.STATE: copy.deepcopy(self._state)}
+
+        changed = []
+        removed = []
+        for path in sorted(self._changed, key=len):
+            value = _lookup(self._state, path)
+            if value is _MISSING:
+                removed.append(list(path))
+            else:
+                changed.append([list(path), copy.deepcopy(value)])
+        return {StateDiffKey.CHANGED: changed, StateDiffKey.REMOVED: removed}
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.test.test_batch_parser
+@file mi/dataset/test/test_batch_parser.py
+@author Ronald Ronquillo
+@brief Test code for offline batch parsing
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.exceptions import ConfigurationException, RecoverableSampleException
+from mi.core.instrument.data_particle import DataParticle, DataParticleKey
+from mi.dataset.dataset_parser import Parser
+from mi.dataset.batch_parser import parse_files, load_config, OutputFormat
+
+PARSER = 'mi.dataset.test.test_batch_parser.LineParser'
+
+# importable config
+LINE_CONFIG = {'scale': 2}
+
+
+class LineParticle(DataParticle):
+    _data_particle_type = 'line_sample'
+
+    def _build_parsed_values(self):
+        (count, values) = self.raw_data
+        return [{DataParticleKey.VALUE_ID: 'count', DataParticleKey.VALUE: count},
+                {DataParticleKey.VALUE_ID: 'values', DataParticleKey.VALUE: values}]
+
+
+class LineParser(Parser):
+    """
+    A parser of lines of integers, 'bad' lines are recoverable errors,
+    'fail' fails the file
+    """
+    def __init__(self, config, state, stream_handle, state_callback, publish_callback,
+                 exception_callback, filename):
+        super(LineParser, self).__init__(config, stream_handle, state, None, state_callback,
+                                         publish_callback, exception_callback)
+        self._scale = config.get('scale', 1)
+        self.filename = filename
+
+    def get_records(self, num_records):
+        particles = []
+        while len(particles) < num_records:
+            line = self._stream_handle.readline()
+            if not line:
+                break
+            line = line.strip()
+            if line == 'bad':
+                self._exception_callback(RecoverableSampleException('bad line'))
+            elif line == 'fail':
+                raise ValueError('failed line')
+            else:
+                values = [int(v) * self._scale for v in line.split()]
+                particles.append(LineParticle((len(values), values), port_timestamp=3600000000.0))
+        return particles
+
+
+@attr('UNIT', group='mi')
+class TestBatchParser(MiUnitTestCase):
+
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.input_dir, 'out')
+        self.write('a.txt', '1 2\nbad\n3\n')
+        self.write('b.txt', '4 5 6\n')
+        self.write('c.txt', '7\nfail\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+
+    def write(self, name, data):
+        with open(os.path.join(self.input_dir, name), 'w') as f:
+            f.write(data)
+
+    def read_ndjson(self, name):
+        with open(os.path.join(self.output_dir, name)) as f:
+            return [json.loads(line) for line in f]
+
+    def assert_batch(self, result):
+        self.assertEqual(len(result.files), 3)
+        # the batch holding the failed line is lost
+        self.assertEqual(result.particles, 3)
+        self.assertEqual(result.exceptions, 1)
+        self.assertEqual([os.path.basename(f.path) for f in result.failed], ['c.txt'])
+        self.assertIn('ValueError: failed line', result.failed[0].error)
+        self.assertGreater(result.files_per_second, 0)
+        self.assertGreater(result.particles_per_second, 0)
+
+    def test_ndjson(self):
+        result = parse_files(PARSER, [os.path.join(self.input_dir, '*.txt')], self.output_dir,
+                             config='{"scale": 10}', workers=2)
+        self.assert_batch(result)
+
+        particles = self.read_ndjson('a.txt.ndjson')
+        self.assertEqual([p[DataParticleKey.STREAM_NAME] for p in particles], ['line_sample'] * 2)
+        self.assertEqual(particles[0][DataParticleKey.VALUES],
+                         [{DataParticleKey.VALUE_ID: 'count', DataParticleKey.VALUE: 2},
+                          {DataParticleKey.VALUE_ID: 'values', DataParticleKey.VALUE: [10, 20]}])
+        self.assertEqual(self.read_ndjson('c.txt.ndjson'), [])
+
+    def test_csv(self):
+        result = parse_files(PARSER, [os.path.join(self.input_dir, 'b.txt')], self.output_dir,
+                             config='mi.dataset.test.test_batch_parser:LINE_CONFIG',
+                             output_format=OutputFormat.CSV)
+        self.assertEqual(result.particles, 1)
+        self.assertEqual(result.files[0].outputs, [os.path.join(self.output_dir, 'b.txt.line_sample.csv')])
+
+        with open(result.files[0].outputs[0]) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['count'], '3')
+        self.assertEqual(json.loads(rows[0]['values']), [8, 10, 12])
+        self.assertEqual(float(rows[0][DataParticleKey.PORT_TIMESTAMP]), 3600000000.0)
+
+    def test_in_process(self):
+        """
+        A single worker parses in this process, duplicate file names get their own output
+        """
+        os.mkdir(os.path.join(self.input_dir, 'sub'))
+        self.write(os.path.join('sub', 'b.txt'), '8\n')
+        result = parse_files(PARSER, [os.path.join(self.input_dir, '*.txt'),
+                                      os.path.join(self.input_dir, 'sub', '*.txt')], self.output_dir)
+        self.assertEqual(len(result.files), 4)
+        self.assertEqual(len(self.read_ndjson('b.txt.ndjson')), 1)
+        self.assertEqual(len(self.read_ndjson('b.txt.1.ndjson')), 1)
+
+    def test_errors(self):
+        with self.assertRaisesRegexp(ConfigurationException, 'failed to load'):
+            parse_files('mi.dataset.test.test_batch_parser.NoParser', [], self.output_dir)
+        with self.assertRaisesRegexp(ConfigurationException, 'unknown output format'):
+            parse_files(PARSER, [], self.output_dir, output_format='xml')
+        with self.assertRaisesRegexp(ConfigurationException, 'parser config not a dict'):
+            load_config('[1, 2]')
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.test.test_state_checkpoint
+@file mi/dataset/test/test_state_checkpoint.py
+@author Ronald Ronquillo
+@brief Test code for the driver state checkpoint
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import copy
+import os
+import shutil
+import tempfile
+
+from mock import patch
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.exceptions import ConfigurationException
+from mi.dataset.dataset_driver import SimpleDataSetDriver, DataSourceConfigKey, DriverStateKey
+from mi.dataset.dataset_driver import DataSetDriverConfigKeys
+from mi.dataset.state_checkpoint import StateCheckpoint, apply_state_diff, StateDiffKey
+
+
+class CheckpointDriver(SimpleDataSetDriver):
+    def _build_parser(self, memento, infile):
+        pass
+
+    def _build_harvester(self, memento):
+        pass
+
+
+@attr('UNIT', group='mi')
+class TestStateCheckpoint(MiUnitTestCase):
+
+    def setUp(self):
+        self.persisted = []
+        self.diffs = []
+        self.state = {'a.txt': {'position': 0}, 'b.txt': {'position': 0}}
+
+    def persist(self, state):
+        self.persisted.append(copy.deepcopy(state))
+
+    def consume_diff(self, diff):
+        self.diffs.append(diff)
+
+    def test_default(self):
+        """
+        Without configuration every update is persisted
+        """
+        checkpoint = StateCheckpoint(self.persist)
+        for position in range(3):
+            self.state['a.txt']['position'] = position
+            checkpoint.update(self.state, [('a.txt', )], 1)
+        self.assertEqual([s['a.txt']['position'] for s in self.persisted], [0, 1, 2])
+        self.assertFalse(checkpoint.pending)
+
+    def test_records(self):
+        checkpoint = StateCheckpoint(self.persist, records=10)
+        for position in range(1, 25):
+            self.state['a.txt']['position'] = position
+            checkpoint.update(self.state, [('a.txt', )], 1)
+        self.assertEqual([s['a.txt']['position'] for s in self.persisted], [10, 20])
+        self.assertTrue(checkpoint.pending)
+
+        # file completion is persisted right away
+        checkpoint.update(self.state, [('a.txt', )], 1, force=True)
+        self.assertEqual(self.persisted[-1]['a.txt']['position'], 24)
+
+        # flushing without updates does nothing
+        checkpoint.flush()
+        self.assertEqual(len(self.persisted), 3)
+        self.assertEqual((checkpoint.updates, checkpoint.persisted), (25, 3))
+
+    def test_interval(self):
+        with patch('time.time', return_value=1000) as now:
+            checkpoint = StateCheckpoint(self.persist, interval=5)
+            for (when, position) in [(1, 1), (4, 2), (6, 3), (7, 4), (12, 5)]:
+                now.return_value = 1000 + when
+                self.state['a.txt']['position'] = position
+                checkpoint.update(self.state, [('a.txt', )], 1)
+        self.assertEqual([s['a.txt']['position'] for s in self.persisted], [3, 5])
+
+    def test_diffs(self):
+        """
+        The diff consumer gets what changed, the state callback still gets
+        the whole state
+        """
+        checkpoint = StateCheckpoint(self.persist, records=2, diff_callback=self.consume_diff)
+        checkpoint.update(self.state, [('a.txt', )], 2)
+        self.assertEqual(self.diffs[0], {StateDiffKey.STATE: self.state})
+
+        self.state['a.txt']['position'] = 10
+        self.state['c.txt'] = {'position': 3}
+        del self.state['b.txt']
+        checkpoint.update(self.state, [('a.txt', ), ('c.txt', )], 1)
+        checkpoint.update(self.state, [('b.txt', ), ('a.txt', )], 1)
+        self.assertEqual(len(self.diffs), 2)
+        diff = self.diffs[1]
+        self.assertEqual(sorted(diff[StateDiffKey.CHANGED]),
+                         [[['a.txt'], {'position': 10}], [['c.txt'], {'position': 3}]])
+        self.assertEqual(diff[StateDiffKey.REMOVED], [['b.txt']])
+        self.assertEqual(self.persisted, [{'a.txt': {'position': 0}, 'b.txt': {'position': 0}}, self.state])
+
+        # the diffs rebuild the state
+        state = None
+        for diff in self.diffs:
+            state = apply_state_diff(state, diff)
+        self.assertEqual(state, self.state)
+
+        # an update with unknown changes sends the whole state
+        checkpoint.update(self.state, None, force=True)
+        self.assertEqual(self.diffs[-1], {StateDiffKey.STATE: self.state})
+
+        # a new consumer starts from the whole state
+        checkpoint.set_diff_callback(self.consume_diff)
+        self.state['a.txt']['position'] = 11
+        checkpoint.update(self.state, [('a.txt', )], force=True)
+        self.assertEqual(self.diffs[-1], {StateDiffKey.STATE: self.state})
+
+    def test_nested_diff(self):
+        state = apply_state_diff(None, {StateDiffKey.CHANGED: [[['key', 'a.txt'], {'position': 1}]],
+                                        StateDiffKey.REMOVED: [['key', 'b.txt'], ['other', 'c.txt']]})
+        self.assertEqual(state, {'key': {'a.txt': {'position': 1}}})
+
+    def test_config(self):
+        with self.assertRaisesRegexp(ConfigurationException, 'records must be an integer'):
+            StateCheckpoint(self.persist, records=0)
+        with self.assertRaisesRegexp(ConfigurationException, 'interval must be > 0'):
+            StateCheckpoint(self.persist, interval=-1)
+        with self.assertRaisesRegexp(ConfigurationException, 'config not a dict'):
+            StateCheckpoint.from_config(self.persist, 'records')
+
+
+@attr('UNIT', group='mi')
+class TestDriverStateCheckpoint(MiUnitTestCase):
+    """
+    Drivers persist their state through the checkpoint
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, 'a.txt'), 'w') as f:
+            f.write('data')
+        self.persisted = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def persist(self, state):
+        self.persisted.append(copy.deepcopy(state))
+
+    def build_driver(self, checkpoint_config=None, memento=None):
+        config = {
+            DataSourceConfigKey.HARVESTER: {
+                DataSetDriverConfigKeys.DIRECTORY: self.directory,
+                DataSetDriverConfigKeys.PATTERN: '*.txt',
+            },
+            DataSourceConfigKey.PARSER: {},
+        }
+        if checkpoint_config:
+            config[DataSourceConfigKey.STATE_CHECKPOINT] = checkpoint_config
+        return CheckpointDriver(config, memento, None, self.persist, None, None)
+
+    def test_driver(self):
+        driver = self.build_driver({'records': 3})
+        diffs = []
+        driver.set_state_diff_callback(diffs.append)
+
+        # new files are persisted right away
+        driver._new_file_callback('a.txt')
+        self.assertEqual(len(self.persisted), 1)
+        self.assertFalse(self.persisted[0]['a.txt'][DriverStateKey.INGESTED])
+        self.assertFalse(diffs[0][StateDiffKey.STATE]['a.txt'][DriverStateKey.INGESTED])
+
+        driver._file_in_process = 'a.txt'
+        for position in range(1, 5):
+            driver._save_parser_state({'position': position}, False)
+        self.assertEqual(len(self.persisted), 2)
+        self.assertEqual(self.persisted[1]['a.txt'][DriverStateKey.PARSER_STATE], {'position': 3})
+        self.assertEqual(diffs[1][StateDiffKey.CHANGED][0][1][DriverStateKey.PARSER_STATE],
+                         {'position': 3})
+
+        # the completed file is persisted right away
+        driver._save_parser_state({'position': 5}, True)
+        self.assertEqual(len(self.persisted), 3)
+        self.assertTrue(self.persisted[2]['a.txt'][DriverStateKey.INGESTED])
+        self.assertTrue(diffs[2][StateDiffKey.CHANGED][0][1][DriverStateKey.INGESTED])
+
+        state = None
+        for diff in diffs:
+            state = apply_state_diff(state, diff)
+        self.assertEqual(state, driver._driver_state)
+
+    def test_restart(self):
+        """
+        A driver restarted from the last persisted state, as the agent
+        passes it back as the memento, still knows the files it ingested
+        """
+        driver = self.build_driver({'records': 3})
+        diffs = []
+        driver.set_state_diff_callback(diffs.append)
+        driver._new_file_callback('a.txt')
+        driver._file_in_process = 'a.txt'
+        driver._save_parser_state({'position': 4}, True)
+        driver.stop_sampling()
+
+        restarted = self.build_driver({'records': 3}, copy.deepcopy(self.persisted[-1]))
+        file_state = restarted._driver_state['a.txt']
+        self.assertTrue(file_state[DriverStateKey.INGESTED])
+        self.assertEqual(file_state[DriverStateKey.PARSER_STATE], {'position': 4})
+        self.assertEqual(restarted._driver_state, driver._driver_state)
+
+        # the diff consumer holds the same state
+        state = None
+        for diff in diffs:
+            state = apply_state_diff(state, diff)
+        self.assertEqual(state, restarted._driver_state)
+
+    def test_stop_sampling(self):
+        """
+        Pending state is persisted when sampling stops
+        """
+        driver = self.build_driver({'interval': 600})
+        driver._new_file_callback('a.txt')
+        driver._file_in_process = 'a.txt'
+        driver._save_parser_state({'position': 1}, False)
+        self.assertEqual(len(self.persisted), 1)
+
+        driver.stop_sampling()
+        self.assertEqual(len(self.persisted), 2)
+        self.assertEqual(self.persisted[-1]['a.txt'][DriverStateKey.PARSER_STATE], {'position': 1})
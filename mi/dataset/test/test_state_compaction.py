@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.test.test_state_compaction
+@file mi/dataset/test/test_state_compaction.py
+@author Ronald Ronquillo
+@brief Test code for the compacted directory driver state
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import copy
+import os
+import shutil
+import tempfile
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.exceptions import ConfigurationException
+from mi.dataset.dataset_driver import SimpleDataSetDriver, DataSourceConfigKey, DriverStateKey
+from mi.dataset.dataset_driver import DataSetDriverConfigKeys, CompactedStateKey, CompactedFileState
+from mi.dataset.dataset_driver import compact_file_state, file_sort_key
+from mi.dataset.harvester import SingleDirectoryHarvester
+from mi.dataset.state_checkpoint import apply_state_diff
+
+
+def file_state(ingested=True):
+    return {DriverStateKey.FILE_SIZE: 4,
+            DriverStateKey.FILE_MOD_DATE: 1.0,
+            DriverStateKey.FILE_CHECKSUM: 'checksum',
+            DriverStateKey.INGESTED: ingested,
+            DriverStateKey.PARSER_STATE: {'position': 4} if ingested else None}
+
+
+class OneRecordParser(object):
+    """
+    Completes a file with one state callback
+    """
+    def __init__(self, driver):
+        self._driver = driver
+        self._done = False
+
+    def get_records(self, count):
+        if self._done:
+            return []
+        self._done = True
+        self._driver._save_parser_state({'position': 4}, True)
+        return ['record']
+
+
+class CompactionDriver(SimpleDataSetDriver):
+    def _build_parser(self, memento, infile):
+        return OneRecordParser(self)
+
+    def _build_harvester(self, memento):
+        pass
+
+
+@attr('UNIT', group='mi')
+class TestStateCompaction(MiUnitTestCase):
+
+    def test_sort_key(self):
+        names = ['file_10.txt', 'file_9.txt', 'file_9_1.txt', 'a.txt']
+        self.assertEqual(sorted(names, key=file_sort_key),
+                         ['a.txt', 'file_9.txt', 'file_9_1.txt', 'file_10.txt'])
+
+    def test_compact(self):
+        state = {DriverStateKey.VERSION: 0.1}
+        for index in range(1, 11):
+            state['file_%d.txt' % index] = file_state()
+        # file 4 is still being parsed
+        state['file_4.txt'] = file_state(False)
+
+        self.assertEqual(compact_file_state(state, retain=10), [])
+        folded = compact_file_state(state, retain=3)
+        self.assertEqual(folded, ['file_1.txt', 'file_2.txt', 'file_3.txt', 'file_5.txt',
+                                  'file_6.txt', 'file_7.txt'])
+        self.assertEqual(sorted(state), ['compacted_state', 'file_10.txt', 'file_4.txt',
+                                         'file_8.txt', 'file_9.txt', DriverStateKey.VERSION])
+        self.assertEqual(state[DriverStateKey.COMPACTED_STATE], {
+            CompactedStateKey.WATERMARK: 'file_3.txt',
+            CompactedStateKey.INGESTED: ['file_5.txt', 'file_6.txt', 'file_7.txt'],
+            CompactedStateKey.COUNT: 6})
+
+        compacted = CompactedFileState(state)
+        for index in [1, 2, 3, 5, 6, 7]:
+            self.assertIn('file_%d.txt' % index, compacted)
+        for index in [4, 8, 11]:
+            self.assertNotIn('file_%d.txt' % index, compacted)
+
+        # once file 4 is done the watermark moves past the list
+        state['file_4.txt'][DriverStateKey.INGESTED] = True
+        state['file_11.txt'] = file_state()
+        self.assertEqual(compact_file_state(state, retain=3), ['file_4.txt', 'file_8.txt'])
+        self.assertEqual(state[DriverStateKey.COMPACTED_STATE], {
+            CompactedStateKey.WATERMARK: 'file_8.txt',
+            CompactedStateKey.INGESTED: [],
+            CompactedStateKey.COUNT: 8})
+
+    def test_bounded(self):
+        """
+        The compacted state stays the same size however many files are ingested
+        """
+        state = {}
+        for index in range(1000):
+            state['file_%04d.txt' % index] = file_state()
+            compact_file_state(state, retain=5)
+            self.assertLessEqual(len(state), 6)
+        self.assertEqual(state[DriverStateKey.COMPACTED_STATE][CompactedStateKey.INGESTED], [])
+        self.assertEqual(state[DriverStateKey.COMPACTED_STATE][CompactedStateKey.COUNT], 995)
+
+    def test_harvester(self):
+        """
+        The harvester only looks at files above the watermark
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            for index in range(1, 6):
+                with open(os.path.join(directory, 'file_%d.txt' % index), 'w') as f:
+                    f.write('data')
+            memento = {'file_5.txt': file_state(False),
+                       DriverStateKey.COMPACTED_STATE: {CompactedStateKey.WATERMARK: 'file_2.txt',
+                                                        CompactedStateKey.INGESTED: ['file_4.txt'],
+                                                        CompactedStateKey.COUNT: 3}}
+            config = {DataSetDriverConfigKeys.DIRECTORY: directory,
+                      DataSetDriverConfigKeys.PATTERN: '*.txt',
+                      DataSetDriverConfigKeys.FILE_MOD_WAIT_TIME: 0}
+            harvester = SingleDirectoryHarvester(config, memento, None, None, None)
+            (new_files, modified) = harvester._check_for_files()
+            self.assertEqual(new_files, ['file_3.txt', 'file_5.txt'])
+            self.assertEqual(modified, {})
+        finally:
+            shutil.rmtree(directory)
+
+
+@attr('UNIT', group='mi')
+class TestDriverStateCompaction(MiUnitTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for index in range(1, 6):
+            with open(os.path.join(self.directory, 'file_%d.txt' % index), 'w') as f:
+                f.write('data')
+        self.persisted = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def persist(self, state):
+        self.persisted.append(copy.deepcopy(state))
+
+    def build_driver(self, memento=None, compaction_config=None):
+        config = {
+            DataSourceConfigKey.HARVESTER: {
+                DataSetDriverConfigKeys.DIRECTORY: self.directory,
+                DataSetDriverConfigKeys.PATTERN: '*.txt',
+            },
+            DataSourceConfigKey.PARSER: {},
+        }
+        if compaction_config is not None:
+            config[DataSourceConfigKey.STATE_COMPACTION] = compaction_config
+        return CompactionDriver(config, memento, None, self.persist, lambda **kwargs: None, None)
+
+    def test_migration(self):
+        """
+        An existing memento is compacted when the driver starts
+        """
+        memento = {DriverStateKey.VERSION: 0.1}
+        for index in range(1, 5):
+            memento['file_%d.txt' % index] = file_state()
+        driver = self.build_driver(copy.deepcopy(memento), {'retain': 1})
+        self.assertEqual(sorted(driver._driver_state),
+                         ['compacted_state', 'file_4.txt', DriverStateKey.VERSION])
+        self.assertEqual(driver._driver_state[DriverStateKey.COMPACTED_STATE][CompactedStateKey.WATERMARK],
+                         'file_3.txt')
+
+        # without compaction configured the memento is left as it was
+        driver = self.build_driver(copy.deepcopy(memento))
+        self.assertEqual(driver._driver_state, memento)
+
+    def test_driver(self):
+        driver = self.build_driver(compaction_config={'retain': 2})
+        diffs = []
+        driver.set_state_diff_callback(diffs.append)
+        for index in range(1, 6):
+            driver._new_file_callback('file_%d.txt' % index)
+        for index in range(1, 6):
+            driver._poll()
+
+        state = driver._driver_state
+        self.assertEqual(sorted(state), ['compacted_state', 'file_4.txt', 'file_5.txt', DriverStateKey.VERSION])
+        self.assertEqual(state[DriverStateKey.COMPACTED_STATE][CompactedStateKey.COUNT], 3)
+
+        # the compacted state is persisted, and the diffs rebuild it
+        driver.stop_sampling()
+        self.assertEqual(self.persisted[-1], state)
+        rebuilt = None
+        for diff in diffs:
+            rebuilt = apply_state_diff(rebuilt, diff)
+        self.assertEqual(rebuilt, state)
+
+    def test_config(self):
+        with self.assertRaisesRegexp(ConfigurationException, 'retain must be an integer'):
+            self.build_driver(compaction_config={'retain': 0})
+        with self.assertRaisesRegexp(ConfigurationException, 'config not a dict'):
+            self.build_driver(compaction_config=100)
@@ -0,0 +1,44 @@
+__author__ = 'Ronald Ronquillo'
+
+import argparse
+import sys
+
+from mi.core.exceptions import ConfigurationException
+from mi.dataset.batch_parser import parse_files, OutputFormat, RECORDS_PER_CALL
+
+
+def run():
+    opts = parseArgs()
+    try:
+        result = parse_files(opts.parser, opts.files, opts.output, config=opts.config,
+                             workers=opts.workers, output_format=opts.format,
+                             records_per_call=opts.records)
+    except ConfigurationException as e:
+        sys.exit(str(e))
+
+    for failed in result.failed:
+        print 'FAILED %s: %s' % (failed.path, failed.error)
+    print result.summary()
+    if result.failed:
+        sys.exit(1)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Parse data files with a dataset parser, outside of a driver")
+    parser.add_argument("parser", help="parser class, e.g. mi.dataset.parser.cg_stc_eng_stc.CgStcEngStcParser")
+    parser.add_argument("files", nargs='+', help="files or glob patterns to parse")
+    parser.add_argument("-o", "--output", dest='output', required=True,
+                        help="directory to write the particles to")
+    parser.add_argument("-c", "--config", dest='config',
+                        help="parser config: JSON, a JSON or YAML file, or module:name of a dict")
+    parser.add_argument("-w", "--workers", dest='workers', type=int, default=1,
+                        help="number of parsing processes")
+    parser.add_argument("-f", "--format", dest='format', default=OutputFormat.NDJSON,
+                        choices=OutputFormat.list(), help="output format")
+    parser.add_argument("--records", dest='records', type=int, default=RECORDS_PER_CALL,
+                        help="records requested from the parser at a time")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    run()
@@ -10,6 +10,7 @@ Driver for the MASSP in-situ mass spectrometer
 
 import functools
 import time
+from threading import Thread, Lock
 
 import mi.core.log
 from mi.core.driver_scheduler import DriverSchedulerConfigKey, TriggerType
@@ -30,6 +31,7 @@ from mi.core.instrument.instrument_driver import ConfigMetadataKey
 from mi.core.common import BaseEnum, Units
 from mi.core.exceptions import InstrumentParameterException, InstrumentProtocolException
 from mi.core.exceptions import InstrumentConnectionException
+from mi.core.exceptions import InstrumentTimeoutException
 from mi.core.instrument.instrument_fsm import InstrumentFSM
 from mi.instrument.harvard.massp.common import MASSP_STATE_ERROR, MASSP_CLEAR_ERROR
 import mi.instrument.harvard.massp.mcu.driver as mcu
@@ -54,6 +56,8 @@ TURBO = 'turbo'
 MCU = 'mcu'
 DA_COMMAND_DELIMITER = ':'
 DA_EXIT_MAX_RETRIES = 3
+# default deadline (seconds) for a single slave protocol to complete a dispatched action
+SLAVE_TIMEOUT = 60
 
 
 class DataParticleType(mcu.DataParticleType, turbo.DataParticleType, rga.DataParticleType):
@@ -403,6 +407,9 @@ class Protocol(InstrumentProtocol):
         self._sent_cmds = []
 
         self._slave_protocols = {}
+        # slave name -> thread of a _run_on_slaves which missed its deadline and has not completed yet
+        self._late_slave_threads = {}
+        self._late_slave_lock = Lock()
         self.initialize_scheduler()
 
     def _add_manual_override_handlers(self):
@@ -584,12 +591,98 @@ class Protocol(InstrumentProtocol):
             self._slave_protocols[RGA].get_current_state(),
         )
 
-    def _send_event_to_all(self, event):
-        """
-        Send the same event to all slave protocols.
-        @return: List of (name, result) for a slave protocols
-        """
-        return [(name, slave._protocol_fsm.on_event(event)) for name, slave in self._slave_protocols.items()]
+    def _run_on_slaves(self, func, names=None, timeouts=None):
+        """
+        Run func(name, protocol) against each of the named slave protocols concurrently.  Each slave
+        protocol owns its own connection and state machine, so the aggregate operation takes as
+        long as the slowest slave rather than the sum of all slaves.
+
+        A slave which misses its deadline cannot be interrupted: it is failed, its late result is
+        ignored and it is refused any further operation until its thread has completed.
+        @param func: callable accepting a slave protocol name and instance
+        @param names: names of the slave protocols to target, defaults to all slave protocols
+        @param timeouts: optional dictionary of per-slave deadlines in seconds, default SLAVE_TIMEOUT
+        @return: dictionary of slave name to result
+        @throws InstrumentTimeoutException if any slave fails to complete within its deadline
+        @throws InstrumentProtocolException if a slave is still running an operation which timed out
+        @throws the first exception raised by a slave, once all slaves have completed
+        """
+        if names is None:
+            names = self._slave_protocols.keys()
+        if timeouts is None:
+            timeouts = {}
+
+        results = {}
+        errors = {}
+        threads = {}
+        # slaves which completed, and which missed their deadline, guarded by _late_slave_lock
+        completed = set()
+        expired = set()
+
+        def run(name, protocol):
+            try:
+                result = func(name, protocol)
+                error = None
+            except Exception as e:
+                result = None
+                error = e
+            with self._late_slave_lock:
+                completed.add(name)
+                if name in expired:
+                    del self._late_slave_threads[name]
+                    log.error('Slave protocol %s completed after its deadline, ignoring its result: %r',
+                              name, error or result)
+                elif error is not None:
+                    errors[name] = error
+                else:
+                    results[name] = result
+
+        with self._late_slave_lock:
+            late = [name for name in names if name in self._late_slave_threads]
+        if late:
+            raise InstrumentProtocolException('Slave protocol(s) still running an operation which timed out: %r'
+                                              % late)
+
+        for name in names:
+            if self._slave_protocols.get(name) is None:
+                raise InstrumentProtocolException('Attempted to send event to non-existent protocol: %s' % name)
+
+        for name in names:
+            thread = Thread(target=run, args=(name, self._slave_protocols[name]))
+            thread.daemon = True
+            thread.start()
+            threads[name] = thread
+
+        start = time.time()
+        for name, thread in threads.items():
+            thread.join(max(0, start + timeouts.get(name, SLAVE_TIMEOUT) - time.time()))
+
+        with self._late_slave_lock:
+            for name in names:
+                if name not in completed:
+                    expired.add(name)
+                    self._late_slave_threads[name] = threads[name]
+        if expired:
+            raise InstrumentTimeoutException('Slave protocol(s) failed to respond within deadline: %r'
+                                             % sorted(expired))
+
+        for name in names:
+            if name in errors:
+                log.error('Slave protocol %s raised exception: %r', name, errors[name])
+                raise errors[name]
+
+        return results
+
+    def _send_event_to_all(self, event, *args, **kwargs):
+        """
+        Send the same event to all slave protocols concurrently.
+        @param event: event to be sent
+        @param timeouts: optional dictionary of per-slave deadlines in seconds
+        @return: List of (name, result) for all slave protocols
+        """
+        timeouts = kwargs.pop('timeouts', None)
+        return self._run_on_slaves(lambda name, slave: slave._protocol_fsm.on_event(event, *args, **kwargs),
+                                   timeouts=timeouts).items()
 
     def _send_event_to_slave(self, name, event):
         """
@@ -659,11 +752,10 @@ class Protocol(InstrumentProtocol):
 
         # set parameters for slave protocols
         for name in temp_dict:
-            if name in self._slave_protocols:
-                self._slave_protocols[name]._set_params(temp_dict[name])
-            else:
+            if name not in self._slave_protocols:
                 # how did we get here?  This should never happen, but raise an exception if it does.
                 raise InstrumentParameterException('Invalid key(s) in SET action: %r' % temp_dict[name])
+        self._run_on_slaves(lambda name, slave: slave._set_params(temp_dict[name]), names=temp_dict.keys())
 
         _, new_config = self._handler_command_get([Parameter.ALL])
 
@@ -838,8 +930,8 @@ class Protocol(InstrumentProtocol):
             params = [Parameter.ALL]
             _, result = self._handler_get(params, **kwargs)
             result_dict.update(result)
-            for protocol in self._slave_protocols.values():
-                _, result = protocol._handler_get(params, **kwargs)
+            results = self._run_on_slaves(lambda name, slave: slave._handler_get(params, **kwargs))
+            for _, result in results.values():
                 result_dict.update(result)
 
         # request is for specific parameters.  Determine which protocol should service each,
@@ -849,14 +941,17 @@ class Protocol(InstrumentProtocol):
                 log.debug('about to split: %s', key)
                 target, _ = key.split('_', 1)
                 temp_dict.setdefault(target, []).append(key)
+            slaves = []
             for key in temp_dict:
                 if key == MASTER:
                     _, result = self._handler_get(params, **kwargs)
+                    result_dict.update(result)
+                elif key in self._slave_protocols:
+                    slaves.append(key)
                 else:
-                    if key in self._slave_protocols:
-                        _, result = self._slave_protocols[key]._handler_get(params, **kwargs)
-                    else:
-                        raise InstrumentParameterException('Invalid key(s) in GET action: %r' % temp_dict[key])
+                    raise InstrumentParameterException('Invalid key(s) in GET action: %r' % temp_dict[key])
+            results = self._run_on_slaves(lambda name, slave: slave._handler_get(params, **kwargs), names=slaves)
+            for _, result in results.values():
                 result_dict.update(result)
 
         return None, result_dict
@@ -948,12 +1043,10 @@ class Protocol(InstrumentProtocol):
         Send the CLEAR event to any slave protocol in the error state and return this driver to COMMAND
         @return next_state, (next_agent_state, result)
         """
-        for protocol in self._slave_protocols:
-            state = protocol.get_current_state()
-            if state == MASSP_STATE_ERROR:
-                # do this synchronously, to allow each slave protocol to complete the CLEAR action
-                # before transitioning states.
-                protocol._protocol_fsm.on_event(ProtocolEvent.CLEAR)
+        errored = [name for name, protocol in self._slave_protocols.items()
+                   if protocol.get_current_state() == MASSP_STATE_ERROR]
+        # wait for each slave protocol to complete the CLEAR action before transitioning states.
+        self._run_on_slaves(lambda name, slave: slave._protocol_fsm.on_event(ProtocolEvent.CLEAR), names=errored)
         return ProtocolState.COMMAND, (ResourceAgentState.COMMAND, None)
 
     ########################################################################
@@ -25,7 +25,8 @@ import gevent
 from nose.plugins.attrib import attr
 from mock import Mock
 from pyon.core.exception import ResourceError, BadRequest
-from mi.core.exceptions import InstrumentCommandException
+from mi.core.exceptions import InstrumentCommandException, InstrumentTimeoutException
+from mi.core.exceptions import InstrumentProtocolException
 from mi.core.instrument.port_agent_client import PortAgentClient, PortAgentPacket
 from mi.idk.comm_config import ConfigTypes
 from mi.idk.unit_test import InstrumentDriverTestCase, LOCALHOST, ParameterTestConfigKey, AgentCapabilityType
@@ -473,6 +474,49 @@ class DriverUnitTest(InstrumentDriverUnitTestCase, DriverTestMixinSub):
         self.assertEquals(sorted(driver_capabilities),
                           sorted(protocol._filter_capabilities(test_capabilities)))
 
+    def test_slave_dispatch(self):
+        """
+        Verify events are dispatched to the slave protocols concurrently, results are aggregated
+        and per-slave deadlines are enforced.
+        """
+        protocol = Protocol(Mock())
+
+        def slow_event(delay):
+            def inner(event, *args, **kwargs):
+                time.sleep(delay)
+                return event
+            return inner
+
+        for name in SlaveProtocol.list():
+            slave = Mock()
+            slave._protocol_fsm.on_event.side_effect = slow_event(.5)
+            protocol.register_slave_protocol(name, slave)
+
+        start = time.time()
+        results = dict(protocol._send_event_to_all(ProtocolEvent.DISCOVER))
+        self.assertLess(time.time() - start, 1.5)
+        self.assertEqual(results, dict((name, ProtocolEvent.DISCOVER) for name in SlaveProtocol.list()))
+
+        rga_fsm = protocol._slave_protocols['rga']._protocol_fsm
+        rga_fsm.on_event.side_effect = slow_event(1.5)
+        self.assertRaises(InstrumentTimeoutException, protocol._send_event_to_all,
+                          ProtocolEvent.DISCOVER, timeouts={'rga': .5})
+
+        # the late slave is refused operations until it completes, nothing is dispatched
+        mcu_calls = protocol._slave_protocols['mcu']._protocol_fsm.on_event.call_count
+        self.assertRaises(InstrumentProtocolException, protocol._send_event_to_all, ProtocolEvent.DISCOVER)
+        self.assertEqual(protocol._slave_protocols['mcu']._protocol_fsm.on_event.call_count, mcu_calls)
+        self.assertEqual(rga_fsm.on_event.call_count, 2)
+
+        # once completed its late result is dropped, and it can be used again
+        time.sleep(1.5)
+        self.assertEqual(protocol._late_slave_threads, {})
+        results = dict(protocol._send_event_to_all(ProtocolEvent.DISCOVER))
+        self.assertEqual(results['rga'], ProtocolEvent.DISCOVER)
+
+        rga_fsm.on_event.side_effect = InstrumentCommandException('failed')
+        self.assertRaises(InstrumentCommandException, protocol._send_event_to_all, ProtocolEvent.DISCOVER)
+
     def test_driver_schema(self):
         """
         get the driver schema and verify it is configured properly
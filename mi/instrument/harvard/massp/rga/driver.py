@@ -278,6 +278,129 @@ class RGAStatusParticle(DataParticle):
         return result
 
 
+class ScanMetricsKey(BaseEnum):
+    """
+    Keys for the scan metrics dictionary returned by Protocol.get_scan_metrics
+    """
+    FRAME_LENGTH = 'frame_length'
+    IN_SCAN = 'in_scan'
+    SCANS_STARTED = 'scans_started'
+    SCANS_COMPLETED = 'scans_completed'
+    SCANS_FAILED = 'scans_failed'
+    LAST_DURATION = 'last_duration'
+    MIN_DURATION = 'min_duration'
+    MAX_DURATION = 'max_duration'
+    MEAN_DURATION = 'mean_duration'
+    BYTES_PER_SECOND = 'bytes_per_second'
+    POINTS_PER_SECOND = 'points_per_second'
+
+
+class ScanMetrics(object):
+    """
+    Per-scan timing and throughput for the RGA.  A scan starts when the scan command is sent
+    and completes when the chunker returns a full frame.
+    """
+    def __init__(self):
+        self.frame_length = 0
+        self.scan_start_time = 0
+        self.in_scan = False
+        self.scans_started = 0
+        self.scans_completed = 0
+        self.scans_failed = 0
+        self.last_duration = None
+        self.min_duration = None
+        self.max_duration = None
+        self.total_duration = 0.0
+        self.total_bytes = 0
+
+    def start(self):
+        """
+        Record the start of a scan.  A scan still in progress is counted as failed.
+        """
+        if self.in_scan:
+            log.error('FAILED scan detected, in_scan sentinel set to TRUE')
+            self.scans_failed += 1
+        self.scans_started += 1
+        self.scan_start_time = time.time()
+        self.in_scan = True
+
+    def complete(self, size):
+        """
+        Record the completion of a scan
+        @param size: length of the scan data in bytes
+        @return: duration of the scan in seconds
+        """
+        elapsed = time.time() - self.scan_start_time
+        self.in_scan = False
+        self.scans_completed += 1
+        self.last_duration = elapsed
+        self.min_duration = elapsed if self.min_duration is None else min(self.min_duration, elapsed)
+        self.max_duration = elapsed if self.max_duration is None else max(self.max_duration, elapsed)
+        self.total_duration += elapsed
+        self.total_bytes += size
+        return elapsed
+
+    def abort(self):
+        """
+        Record that the current scan (if any) was stopped before completion
+        """
+        self.in_scan = False
+
+    def get(self):
+        """
+        @return: dictionary of the current scan metrics, keyed by ScanMetricsKey
+        """
+        mean = bytes_per_second = points_per_second = None
+        if self.scans_completed:
+            mean = self.total_duration / self.scans_completed
+        if self.total_duration > 0:
+            bytes_per_second = self.total_bytes / self.total_duration
+            points_per_second = bytes_per_second / 4
+        return {
+            ScanMetricsKey.FRAME_LENGTH: self.frame_length,
+            ScanMetricsKey.IN_SCAN: self.in_scan,
+            ScanMetricsKey.SCANS_STARTED: self.scans_started,
+            ScanMetricsKey.SCANS_COMPLETED: self.scans_completed,
+            ScanMetricsKey.SCANS_FAILED: self.scans_failed,
+            ScanMetricsKey.LAST_DURATION: self.last_duration,
+            ScanMetricsKey.MIN_DURATION: self.min_duration,
+            ScanMetricsKey.MAX_DURATION: self.max_duration,
+            ScanMetricsKey.MEAN_DURATION: mean,
+            ScanMetricsKey.BYTES_PER_SECOND: bytes_per_second,
+            ScanMetricsKey.POINTS_PER_SECOND: points_per_second,
+        }
+
+
+def build_scan_sieve(frame_length):
+    """
+    Build a sieve function which frames scan data by length.  A scan is the frame_length bytes
+    immediately following SCAN_START_SENTINEL.  Frames containing another sentinel are the result
+    of an aborted scan and are consumed but not returned.
+    @param frame_length: expected length in bytes of the scan data
+    @return: sieve function suitable for a StringChunker
+    """
+    sentinel = SCAN_START_SENTINEL
+    sentinel_length = len(sentinel)
+
+    def sieve(raw_data):
+        return_list = []
+        data_length = len(raw_data)
+        index = raw_data.find(sentinel)
+        while index != -1:
+            start = index + sentinel_length
+            end = start + frame_length
+            if end > data_length:
+                # any later sentinel has even less data behind it
+                break
+            if raw_data.find(sentinel, start, end) == -1:
+                return_list.append((start, end))
+            # resume from the end of this frame, a sentinel may end exactly on the boundary
+            index = raw_data.find(sentinel, end - sentinel_length)
+        return return_list
+
+    return sieve
+
+
 ###############################################################################
 # Driver
 ###############################################################################
@@ -401,10 +524,8 @@ class Protocol(CommandResponseInstrumentProtocol):
         # all calls to do_cmd_resp should expect RESPONSE_REGEX and use TIMEOUT.  Freeze these arguments...
         self._do_cmd_resp = functools.partial(self._do_cmd_resp, response_regex=RESPONSE_REGEX, timeout=TIMEOUT)
 
-        # these variables are used to track scan time and completion status
-        # for development and performance data
-        self.scan_start_time = 0
-        self.in_scan = False
+        # scan timing and throughput, see get_scan_metrics()
+        self._scan_metrics = ScanMetrics()
 
     @staticmethod
     def sieve_function(raw_data):
@@ -560,9 +681,8 @@ class Protocol(CommandResponseInstrumentProtocol):
         @param chunk: data to process
         @param ts: timestamp
         """
-        elapsed = time.time() - self.scan_start_time
-        self.in_scan = False
-        log.debug('_got_chunk: Received complete scan.  AP: %d NF: %d SIZE: %d ET: %d secs',
+        elapsed = self._scan_metrics.complete(len(chunk))
+        log.debug('_got_chunk: Received complete scan.  AP: %d NF: %d SIZE: %d ET: %.2f secs',
                   self._param_dict.get(Parameter.AP),
                   self._param_dict.get(Parameter.NF),
                   len(chunk),
@@ -781,35 +901,22 @@ class Protocol(CommandResponseInstrumentProtocol):
 
     def _build_sieve_function(self):
         """
-        Build a sieve function based on the expected data size.  Replace the previous sieve function in
-        the chunker.  This should happen during the configuration phase.
+        Compile the scan plan for the current scan parameters.  The expected frame length is derived
+        once, here, and the chunker sieve replaced with one which frames the scan data by length.
+        This should happen during the configuration phase.
         """
         num_points = int(self._param_dict.get(Parameter.AP))
-        match_string = r'(?<=%s)(.{%d})' % (SCAN_START_SENTINEL, (num_points + 1) * 4)
-        matcher = re.compile(match_string, re.DOTALL)
+        frame_length = (num_points + 1) * 4
+        log.debug('_build_sieve_function: AP: %d frame length: %d', num_points, frame_length)
+        self._scan_metrics.frame_length = frame_length
+        self._chunker.sieve = build_scan_sieve(frame_length)
 
-        def my_sieve(raw_data):
-            return_list = []
-
-            log.debug('SIEVE: pattern=%r, raw_data_len=%d', matcher.pattern, len(raw_data))
-            # do not descend into this loop unless we are at log level trace...
-            if log.isEnabledFor('trace'):
-                temp = raw_data[:]
-                while temp:
-                    log.trace('SIEVE: raw_data: %s', temp[:32].encode('hex'))
-                    if len(temp) > 32:
-                        temp = temp[32:]
-                    else:
-                        temp = ''
-
-            for match in matcher.finditer(raw_data):
-                # if sentinel value present in this slice it is invalid
-                if not SCAN_START_SENTINEL in raw_data[match.start():match.end()]:
-                    return_list.append((match.start(), match.end()))
-
-            return return_list
-
-        self._chunker.sieve = my_sieve
+    def get_scan_metrics(self):
+        """
+        Return the timing and throughput of scans taken by this protocol
+        @return: dictionary keyed by ScanMetricsKey
+        """
+        return self._scan_metrics.get()
 
     def _verify_filament(self):
         """
@@ -839,7 +946,7 @@ class Protocol(CommandResponseInstrumentProtocol):
         self._do_cmd_resp(InstrumentCommand.INITIALIZE, 0)
         self._do_cmd_resp(InstrumentCommand.INITIALIZE, 2)
         self._do_cmd_resp(InstrumentCommand.FILAMENT_EMISSION)
-        self.in_scan = False
+        self._scan_metrics.abort()
 
     ########################################################################
     # Unknown handlers.
@@ -995,10 +1102,7 @@ class Protocol(CommandResponseInstrumentProtocol):
         self._chunker.clean_all_chunks()
         # place sentinel value in chunker
         self._chunker.add_chunk(SCAN_START_SENTINEL, ntplib.system_to_ntp_time(time.time()))
-        self.scan_start_time = time.time()
-        if self.in_scan:
-            log.error('FAILED scan detected, in_scan sentinel set to TRUE')
-        self.in_scan = True
+        self._scan_metrics.start()
         self._do_cmd_no_resp(InstrumentCommand.ANALOG_SCAN, 1)
         return None, (None, None)
 
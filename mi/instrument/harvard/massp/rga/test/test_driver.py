@@ -48,6 +48,9 @@ from mi.instrument.harvard.massp.rga.driver import Parameter
 from mi.instrument.harvard.massp.rga.driver import Protocol
 from mi.instrument.harvard.massp.rga.driver import Prompt
 from mi.instrument.harvard.massp.rga.driver import NEWLINE
+from mi.instrument.harvard.massp.rga.driver import SCAN_START_SENTINEL
+from mi.instrument.harvard.massp.rga.driver import ScanMetricsKey
+from mi.instrument.harvard.massp.rga.driver import build_scan_sieve
 from mi.core.log import get_logger
 
 
@@ -419,6 +422,50 @@ class DriverUnitTest(InstrumentDriverUnitTestCase, DriverTestMixinSub):
         driver._protocol._protocol_fsm.on_event(Capability.CLEAR)
         self.assertEqual(driver._protocol.get_current_state(), ProtocolState.COMMAND)
 
+    def test_scan_sieve(self):
+        """
+        Verify the length-framed scan sieve returns only complete scans following a sentinel
+        """
+        sieve = build_scan_sieve(8)
+        scan = struct.pack('<2i', 1, 2)
+
+        self.assertEqual(sieve(''), [])
+        self.assertEqual(sieve(scan), [])
+        self.assertEqual(sieve(SCAN_START_SENTINEL + scan[:4]), [])
+        self.assertEqual(sieve('junk' + SCAN_START_SENTINEL + scan + 'junk'), [(8, 16)])
+        # aborted scan, frame contains the next sentinel
+        self.assertEqual(sieve(SCAN_START_SENTINEL + 'ab' + SCAN_START_SENTINEL + scan), [])
+        self.assertEqual(sieve(SCAN_START_SENTINEL + 'abcd' + SCAN_START_SENTINEL + scan),
+                         [(12, 20)])
+        self.assertEqual(sieve(SCAN_START_SENTINEL + scan + SCAN_START_SENTINEL + scan),
+                         [(4, 12), (16, 24)])
+
+    def test_scan_metrics(self):
+        """
+        Verify scan timing and throughput are tracked
+        """
+        protocol = Protocol(Prompt, NEWLINE, Mock())
+        protocol._param_dict.set_value(Parameter.AP, 9)
+        protocol._build_sieve_function()
+        metrics = protocol.get_scan_metrics()
+        self.assertEqual(metrics[ScanMetricsKey.FRAME_LENGTH], 40)
+        self.assertEqual(metrics[ScanMetricsKey.SCANS_STARTED], 0)
+        self.assertIsNone(metrics[ScanMetricsKey.MEAN_DURATION])
+
+        protocol._scan_metrics.start()
+        protocol._scan_metrics.start()
+        time.sleep(.1)
+        protocol._got_chunk('\x00' * 40, ntplib.system_to_ntp_time(time.time()))
+
+        metrics = protocol.get_scan_metrics()
+        self.assertFalse(metrics[ScanMetricsKey.IN_SCAN])
+        self.assertEqual(metrics[ScanMetricsKey.SCANS_STARTED], 2)
+        self.assertEqual(metrics[ScanMetricsKey.SCANS_COMPLETED], 1)
+        self.assertEqual(metrics[ScanMetricsKey.SCANS_FAILED], 1)
+        self.assertGreater(metrics[ScanMetricsKey.LAST_DURATION], 0)
+        self.assertAlmostEqual(metrics[ScanMetricsKey.POINTS_PER_SECOND],
+                               10 / metrics[ScanMetricsKey.LAST_DURATION])
+
     def test_protocol_filter_capabilities(self):
         """
         This tests driver filter_capabilities.
@@ -7,6 +7,7 @@
 
 import base64
 import time
+from functools import partial
 from mi.instrument.teledyne.driver import TIMEOUT
 from mi.instrument.teledyne.particles import ADCP_COMPASS_CALIBRATION_DataParticle, \
     ADCP_SYSTEM_CONFIGURATION_DataParticle, ADCP_ANCILLARY_SYSTEM_DATA_PARTICLE, ADCP_TRANSMIT_PATH_PARTICLE, \
@@ -50,6 +51,7 @@ from mi.core.instrument.instrument_driver import DriverProtocolState
 from mi.core.instrument.data_particle import RawDataParticle
 from mi.core.common import BaseEnum
 from mi.core.instrument.instrument_protocol import InitializationType
+from mi.core.instrument.instrument_protocol import MultiConnectionInstrumentProtocol
 from mi.core.exceptions import InstrumentParameterExpirationException
 from mi.core.instrument.instrument_driver import ResourceAgentState
 from mi.instrument.teledyne.driver import TeledyneParameter
@@ -375,11 +377,12 @@ class InstrumentDriver(WorkhorseInstrumentDriver):
 
         # for Slave
         try:
-            self._connections[SlaveProtocol.FIFTHBEAM].init_comms(self._protocol.got_data2,
-                                                                  self._protocol.got_raw2,
+            got_data, got_raw = self._protocol.get_connection_callbacks(SlaveProtocol.FIFTHBEAM)
+            self._connections[SlaveProtocol.FIFTHBEAM].init_comms(got_data,
+                                                                  got_raw,
                                                                   self._got_exception,
                                                                   self._lost_connection_callback)
-            self._protocol._connection_5thBeam = self._connections[SlaveProtocol.FIFTHBEAM]
+            self._protocol.set_connection(SlaveProtocol.FIFTHBEAM, self._connections[SlaveProtocol.FIFTHBEAM])
 
         except InstrumentConnectionException as e:
             log.error("5th beam Connection init Exception: %s", e)
@@ -475,7 +478,9 @@ class InstrumentDriver(WorkhorseInstrumentDriver):
 # There is only one protocol and only one state machine for VADCP.
 # The handlers of the state machine will invoke both 4Beam(master) and 5th beam(slave) instruments
 # There will be trailing '2' when the methods are used for the slave instrument
-class Protocol(WorkhorseProtocol):
+# The master uses the inherited single connection command/response path, the
+# slave is a named connection of MultiConnectionInstrumentProtocol.
+class Protocol(WorkhorseProtocol, MultiConnectionInstrumentProtocol):
     DEFAULT_CMD_TIMEOUT = 20
     DEFAULT_WRITE_DELAY = 0
 
@@ -509,19 +514,18 @@ class Protocol(WorkhorseProtocol):
         self._add_response_handler(InstrumentCmds.GET2, self._parse_get_response2)
 
         self._connection_4Beam = None
-        self._connection_5thBeam = None
 
-        # Line buffer for input from device.
-        self._linebuf2 = ''
-
-        # Short buffer to look for prompts from device in command-response
-        # mode.
-        self._promptbuf2 = ''
+        # WorkhorseProtocol does not chain to the multi-connection
+        # constructor, so set up the slave connection here.
+        self._init_connections()
+        self._add_connection(SlaveProtocol.FIFTHBEAM,
+                             StringChunker(WorkhorseProtocol.sieve_function),
+                             self._got_chunk2,
+                             RawDataParticle_5thbeam)
 
         # The parameter, comamnd, and driver dictionaries.
         self._param_dict2 = ProtocolParameterDict()
         self._build_param_dict2()
-        self._chunker2 = StringChunker(WorkhorseProtocol.sieve_function)
 
     # Overridden for dual(master/slave) instruments
     def set_init_params(self, config):
@@ -646,27 +650,7 @@ class Protocol(WorkhorseProtocol):
         presented by this string
         @throw InstrumentProtocolException on timeout
         """
-        # Grab time for timeout and wait for prompt.
-        strip_chars = "\t "
-
-        starttime = time.time()
-        if expected_prompt is None:
-            prompt_list = self._get_prompts()
-        else:
-            if isinstance(expected_prompt, str):
-                prompt_list = [expected_prompt]
-            else:
-                prompt_list = expected_prompt
-
-        while True:
-            for item in prompt_list:
-                if self._promptbuf2.rstrip(strip_chars).endswith(item.rstrip(strip_chars)):
-                    return item, self._linebuf2
-                else:
-                    time.sleep(.1)
-
-            if time.time() > starttime + timeout:
-                raise InstrumentTimeoutException("in InstrumentProtocol._get_raw_response()")
+        return self._get_raw_response_on(SlaveProtocol.FIFTHBEAM, timeout, expected_prompt)
 
     # for Master and Slave
     def _do_cmd_direct(self, cmd):
@@ -684,10 +668,10 @@ class Protocol(WorkhorseProtocol):
             if instrument == "master":
                 self._connection_4Beam.send(NEWLINE + cmd_split[1])
             if instrument == "slave":
-                self._connection_5thBeam.send(NEWLINE + cmd_split[1])
+                self._send_on(SlaveProtocol.FIFTHBEAM, NEWLINE + cmd_split[1])
         else:
             self._connection_4Beam.send(cmd)
-            self._connection_5thBeam.send(cmd)
+            self._send_on(SlaveProtocol.FIFTHBEAM, cmd)
 
     # for Master
     def _do_cmd_resp(self, cmd, *args, **kwargs):
@@ -773,144 +757,30 @@ class Protocol(WorkhorseProtocol):
     # for Slave
     def _do_cmd_resp2(self, cmd, *args, **kwargs):
         """
-        Perform a command-response on the device.
-        @param cmd The command to execute.
-        @param args positional arguments to pass to the build handler.
-        @param write_delay kwarg for the amount of delay in seconds to pause
-        between each character. If none supplied, the DEFAULT_WRITE_DELAY
-        value will be used.
-        @param timeout optional wakeup and command timeout via kwargs.
-        @param expected_prompt kwarg offering a specific prompt to look for
-        other than the ones in the protocol class itself.
-        @param response_regex kwarg with a compiled regex for the response to
-        match. Groups that match will be returned as a string.
-        Cannot be supplied with expected_prompt. May be helpful for
-        instruments that do not have a prompt.
-        @return resp_result The (possibly parsed) response result including the
-        first instance of the prompt matched. If a regex was used, the prompt
-        will be an empty string and the response will be the joined collection
-        of matched groups.
-        @raises InstrumentTimeoutException if the response did not occur in time.
-        @raises InstrumentProtocolException if command could not be built or if response
-        was not recognized.
+        Perform a command-response on the 5th beam instrument.
+        @see MultiConnectionInstrumentProtocol._do_cmd_resp_on
         """
-
-        # Get timeout and initialize response.
-        timeout = kwargs.get('timeout', self.DEFAULT_CMD_TIMEOUT)
-        expected_prompt = kwargs.get('expected_prompt', None)
-        response_regex = kwargs.get('response_regex', None)
-        write_delay = kwargs.get('write_delay', self.DEFAULT_WRITE_DELAY)
-        if response_regex and not isinstance(response_regex, self.RE_PATTERN):
-            raise InstrumentProtocolException('Response regex is not a compiled pattern!')
-
-        if expected_prompt and response_regex:
-            raise InstrumentProtocolException('Cannot supply both regex and expected prompt!')
-
-        # Get the build handler.
-        build_handler = self._build_handlers.get(cmd, None)
-
-        if not build_handler:
-            raise InstrumentProtocolException('Cannot build command: %s' % cmd)
-        cmd_line = build_handler(cmd, *args)
-        # Wakeup the device, pass up exception if timeout
-        self._wakeup2(timeout)
-
-        # Clear line and prompt buffers for result.
-        self._linebuf2 = ''
-        self._promptbuf2 = ''
-
-        # Send command.
-        log.trace('_do_cmd_resp2: %s, timeout=%s, write_delay=%s, expected_prompt=%s, response_regex=%s',
-                  repr(cmd_line), timeout, write_delay, expected_prompt, response_regex)
-        if write_delay == 0:
-            self._connection_5thBeam.send(cmd_line)
-
-        else:
-            for char in cmd_line:
-                self._connection_5thBeam.send(char)
-                time.sleep(write_delay)
-
-        # Wait for the prompt, prepare result and return, timeout exception
-        if response_regex:
-            prompt = ""
-            result_tuple = self._get_response2(timeout,
-                                               response_regex=response_regex,
-                                               expected_prompt=expected_prompt)
-            result = "".join(result_tuple)
-        else:
-            (prompt, result) = self._get_response2(timeout,
-                                                   expected_prompt=expected_prompt)
-
-        resp_handler = self._response_handlers.get((self.get_current_state(), cmd), None) or \
-                       self._response_handlers.get(cmd, None)
-        resp_result = None
-        if resp_handler:
-            resp_result = resp_handler(result, prompt)
-
-        return resp_result
+        return self._do_cmd_resp_on(SlaveProtocol.FIFTHBEAM, cmd, *args, **kwargs)
 
     # for Slave
     def _get_response2(self, timeout=10, expected_prompt=None, response_regex=None):
         """
-        Get a response from the instrument, but be a bit loose with what we
-        find. Leave some room for white space around prompts and not try to
-        match that just in case we are off by a little whitespace or not quite
-        at the end of a line.
-
-        @todo Consider cases with no prompt
-        @param timeout The timeout in seconds
-        @param expected_prompt Only consider the specific expected prompt as
-        presented by this string
-        @param response_regex Look for a response value that matches the
-        supplied compiled regex pattern. Groups that match will be returned as a
-        string. Cannot be used with expected prompt. None
-        will be returned as a prompt with this match. If a regex is supplied,
-        internal the prompt list will be ignored.
-        @return Regex search result tuple (as MatchObject.groups() would return
-        if a response_regex is supplied. A tuple of (prompt, response) if a
-        prompt is looked for.
-        @throw InstrumentProtocolException if both regex and expected prompt are
-        passed in or regex is not a compiled pattern.
-        @throw InstrumentTimeoutException on timeout
-        """
-        # Grab time for timeout and wait for prompt.
-        starttime = time.time()
-
-        if response_regex and not isinstance(response_regex, self.RE_PATTERN):
-            raise InstrumentProtocolException('Response regex is not a compiled pattern!')
-
-        if expected_prompt and response_regex:
-            raise InstrumentProtocolException('Cannot supply both regex and expected prompt!')
-
-        if response_regex:
-            prompt_list = []
-
-        if expected_prompt is None:
-            prompt_list = self._get_prompts()
-        else:
-            if isinstance(expected_prompt, str):
-                prompt_list = [expected_prompt]
-            else:
-                prompt_list = expected_prompt
-
-        while True:
-            if response_regex:
-                match = response_regex.search(self._linebuf2)
-                if match:
-                    return match.groups()
-                else:
-                    time.sleep(.1)
-            else:
-                for item in prompt_list:
-                    index = self._promptbuf2.find(item)
-                    if index >= 0:
-                        result = self._promptbuf2[0:index + len(item)]
-                        return item, result
-                    else:
-                        time.sleep(.1)
+        Get a response from the 5th beam instrument.
+        @see MultiConnectionInstrumentProtocol._get_response_on
+        """
+        return self._get_response_on(SlaveProtocol.FIFTHBEAM, timeout,
+                                     expected_prompt=expected_prompt,
+                                     response_regex=response_regex)
 
-            if time.time() > starttime + timeout:
-                raise InstrumentTimeoutException("in InstrumentProtocol._get_response()")
+    # for Master and Slave
+    def _do_cmd_resp_both(self, cmd, *args, **kwargs):
+        """
+        Issue the same command-response to the 4 beam and 5th beam
+        instruments at once.
+        @return [result, result2] responses from the master and the slave
+        """
+        return self._run_concurrently(partial(self._do_cmd_resp, cmd, *args, **kwargs),
+                                      partial(self._do_cmd_resp2, cmd, *args, **kwargs))
 
     # for Master
     # We need to Override the base class for the different connection to Master instrument
@@ -951,74 +821,34 @@ class Protocol(WorkhorseProtocol):
                 self._connection_4Beam.send(char)
                 time.sleep(write_delay)
 
-    # for Slave
-    def _do_cmd_no_resp2(self, cmd, *args, **kwargs):
+    # for Master and Slave
+    def _acquire_status_both(self, *args, **kwargs):
         """
-        Issue a command to the instrument after a wake up and clearing of
-        buffers. No response is handled as a result of the command.
-
-        @param cmd The command to execute.
-        @param args positional arguments to pass to the build handler.
-        @param timeout=timeout optional wakeup timeout.
-        @raises InstrumentTimeoutException if the response did not occur in time.
-        @raises InstrumentProtocolException if command could not be built.
+        Request AC, PT2 and PT4 output from the 4 beam and 5th beam
+        instruments at once.  The responses are published by the chunkers.
         """
+        status_cmds = [TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA,
+                       TeledyneInstrumentCmds.OUTPUT_PT2,
+                       TeledyneInstrumentCmds.OUTPUT_PT4]
 
-        timeout = kwargs.get('timeout', self.DEFAULT_CMD_TIMEOUT)
-        write_delay = kwargs.get('write_delay', self.DEFAULT_WRITE_DELAY)
+        def master():
+            for cmd in status_cmds:
+                self._do_cmd_no_resp(cmd, *args, **kwargs)
 
-        build_handler = self._build_handlers.get(cmd, None)
-        if not build_handler:
-            log.error('_do_cmd_no_resp: no handler for command: %s' % cmd)
-            raise InstrumentProtocolException(error_code=InstErrorCode.BAD_DRIVER_COMMAND)
-        cmd_line = build_handler(cmd, *args)
-
-        # Wakeup the device, timeout exception as needed
-        self._wakeup2(timeout)
+        def slave():
+            for cmd in status_cmds:
+                self._do_cmd_no_resp2(cmd, *args, **kwargs)
 
-        # Clear line and prompt buffers for result.
-        self._linebuf2 = ''
-        self._promptbuf2 = ''
-
-        # Send command.
-        log.trace('_do_cmd_no_resp2: %s, timeout=%s' % (repr(cmd_line), timeout))
-        if write_delay == 0:
-            self._connection_5thBeam.send(cmd_line)
-        else:
-            for char in cmd_line:
-                self._connection_5thBeam.send(char)
-                time.sleep(write_delay)
+        self._run_concurrently(master, slave)
 
     # for Slave
-    def got_data2(self, port_agent_packet):
+    def _do_cmd_no_resp2(self, cmd, *args, **kwargs):
         """
-        Called by the instrument connection when data is available.
-        Append line and prompt buffers.
-
-        @param port_agent_packet is port agent stream.
-
-        Also add data to the chunker and when received call got_chunk
-        to publish results.
+        Issue a command to the 5th beam instrument after a wake up and
+        clearing of buffers. No response is handled as a result of the command.
+        @see MultiConnectionInstrumentProtocol._do_cmd_no_resp_on
         """
-
-        data_length = port_agent_packet.get_data_length()
-        data = port_agent_packet.get_data()
-        timestamp = port_agent_packet.get_timestamp()
-
-        log.trace("Got Data 2: %s" % data)
-        log.trace("Add Port Agent Timestamp 2: %s" % timestamp)
-
-        if data_length > 0:
-            if self.get_current_state() == DriverProtocolState.DIRECT_ACCESS:
-                self._driver_event(DriverAsyncEvent.DIRECT_ACCESS, data)
-
-            self.add_to_buffer2(data)
-
-            self._chunker2.add_chunk(data, timestamp)
-            (timestamp, chunk) = self._chunker2.get_next_data()
-            while chunk:
-                self._got_chunk2(chunk, timestamp)
-                (timestamp, chunk) = self._chunker2.get_next_data()
+        self._do_cmd_no_resp_on(SlaveProtocol.FIFTHBEAM, cmd, *args, **kwargs)
 
     # for Master
     def _got_chunk(self, chunk, timestamp):
@@ -1092,65 +922,15 @@ class Protocol(WorkhorseProtocol):
         """
         self.publish_raw(port_agent_packet)
 
-    # for Slave
-    def got_raw2(self, port_agent_packet):
-        """
-        Called by the port agent client when raw data is available, such as data
-        sent by the driver to the instrument, the instrument responses,etc.
-        """
-        self.publish_raw2(port_agent_packet)
-
-    # for Slave
-    def publish_raw2(self, port_agent_packet):
-        """
-        Publish raw data
-        @param: port_agent_packet port agent packet containing raw
-        """
-        particle = RawDataParticle_5thbeam(port_agent_packet.get_as_dict(),
-                                           port_timestamp=port_agent_packet.get_timestamp())
-
-        parsed_sample = particle.generate()
-        if self._driver_event:
-            self._driver_event(DriverAsyncEvent.SAMPLE, parsed_sample)
-
-    # for Slave
-    def add_to_buffer2(self, data):
-        """
-        Add a chunk of data to the internal data buffers
-        @param data: bytes to add to the buffer
-        """
-        # Update the line and prompt buffers.
-        self._linebuf2 += data
-        self._promptbuf2 += data
-        self._last_data_timestamp2 = time.time()
-
-        log.trace("LINE BUF2: %s", self._linebuf2)
-        log.trace("PROMPT BUF2: %s", self._promptbuf2)
-
     # for Slave
     def _wakeup_until2(self, timeout, desired_prompt, delay=1, no_tries=5):
         """
         Continue waking device until a specific prompt appears or a number
         of tries has occurred. Desired prompt must be in the instrument's
         prompt list.
-        @param timeout The timeout to wake the device.
-        @desired_prompt Continue waking until this prompt is seen.
-        @delay Time to wake between consecutive wakeups.
-        @no_tries Maximum number of wakeup tries to see desired prompt.
-        @raises InstrumentTimeoutException if device could not be woken.
-        @raises InstrumentProtocolException if the desired prompt is not seen in the
-        maximum number of attempts.
+        @see MultiConnectionInstrumentProtocol._wakeup_until_on
         """
-
-        count = 0
-        while count < no_tries:
-            prompt = self._wakeup2(timeout, delay)
-            if prompt == desired_prompt:
-                break
-            time.sleep(delay)
-            count += 1
-            if count >= no_tries:
-                raise InstrumentProtocolException('Incorrect prompt.')
+        self._wakeup_until_on(SlaveProtocol.FIFTHBEAM, timeout, desired_prompt, delay, no_tries)
 
     # for Master
     def _send_break(self, duration=3000):
@@ -1191,33 +971,22 @@ class Protocol(WorkhorseProtocol):
         """
         Send a BREAK to attempt to wake the device.
         """
-        self._promptbuf2 = ''
-        self._linebuf2 = ''
+        conn = self._get_connection(SlaveProtocol.FIFTHBEAM)
+        conn.clear_buffers()
         self._send_break_cmd_5thBeam(duration)
-        break_confirmation = []
-        log.trace("self._linebuf2 = " + self._linebuf2)
 
-        break_confirmation.append("[BREAK Wakeup A]" + NEWLINE +
-                                  "WorkHorse Broadband ADCP Version 50.40" + NEWLINE +
-                                  "Teledyne RD Instruments (c) 1996-2010" + NEWLINE +
-                                  "All Rights Reserved.")
+        # Both break banners start with the short form.
+        def break_found(c):
+            if "[BREAK Wakeup A]" in c.linebuf:
+                return True
 
-        break_confirmation.append("[BREAK Wakeup A]")
-        found = False
-        timeout = 30
-        count = 0
-        while not found:
-            count += 1
-            for break_message in break_confirmation:
-                if break_message in self._linebuf2:
-                    found = True
-            if count > (timeout * 10):
-                if not found:
-                    raise InstrumentTimeoutException("NO BREAK RESPONSE2.")
-            time.sleep(0.1)
-        self._chunker2._clean_buffer(len(self._chunker2.raw_chunk_list))
-        self._promptbuf2 = ''
-        self._linebuf2 = ''
+        try:
+            conn.wait_for(break_found, 30)
+        except InstrumentTimeoutException:
+            raise InstrumentTimeoutException("NO BREAK RESPONSE2.")
+
+        conn.chunker._clean_buffer(len(conn.chunker.raw_chunk_list))
+        conn.clear_buffers()
         return True
 
     # for Master
@@ -1229,12 +998,12 @@ class Protocol(WorkhorseProtocol):
         self._connection_4Beam.send(NEWLINE)
 
     # for Slave
-    def _send_wakeup2(self):
+    def _send_wakeup_on(self, name):
         """
         Send a newline to attempt to wake the device.
         """
-        self._connection_5thBeam.send(NEWLINE)
-        self._connection_5thBeam.send(NEWLINE)
+        self._send_on(name, NEWLINE)
+        self._send_on(name, NEWLINE)
 
     # For Master
     def _send_break_cmd_4beam(self, delay):
@@ -1248,7 +1017,7 @@ class Protocol(WorkhorseProtocol):
         """
         Send a BREAK to attempt to wake the device.
         """
-        self._connection_5thBeam.send_break(delay)
+        self._get_connection(SlaveProtocol.FIFTHBEAM).connection.send_break(delay)
 
     # for Master and Slave
     def _sync_clock(self, command, date_time_param, timeout=TIMEOUT, delay=1, time_format="%d %b %Y %H:%M:%S"):
@@ -1265,17 +1034,15 @@ class Protocol(WorkhorseProtocol):
         # lets clear out any past data so it doesnt confuse the command
         self._linebuf = ''
         self._promptbuf = ''
+        self._get_connection(SlaveProtocol.FIFTHBEAM).clear_buffers()
 
-        self._linebuf2 = ''
-        self._promptbuf2 = ''
-
-        self._wakeup(timeout=3, delay=delay)
-        self._wakeup2(timeout=3, delay=delay)
+        self._run_concurrently(partial(self._wakeup, timeout=3, delay=delay),
+                               partial(self._wakeup2, timeout=3, delay=delay))
         str_val = get_timestamp_delayed(time_format)
         self._do_cmd_direct(date_time_param + str_val)
         time.sleep(1)
-        self._get_response(TIMEOUT)
-        self._get_response2(TIMEOUT)
+        self._run_concurrently(partial(self._get_response, TIMEOUT),
+                               partial(self._get_response2, TIMEOUT))
 
     # for Slave
     def _instrument_config_dirty2(self):
@@ -1532,8 +1299,7 @@ class Protocol(WorkhorseProtocol):
         @return: True - instrument logging, False - not logging
         """
 
-        self._linebuf2 = ""
-        self._promptbuf2 = ""
+        self._get_connection(SlaveProtocol.FIFTHBEAM).clear_buffers()
 
         prompt = self._wakeup2(timeout=3)
         if TeledynePrompt.COMMAND == prompt:
@@ -2738,18 +2504,14 @@ class Protocol(WorkhorseProtocol):
         kwargs['timeout'] = 70
 
         log.info("SYNCING TIME WITH SENSOR.")
-        self._do_cmd_resp(TeledyneInstrumentCmds.SET, TeledyneParameter.TIME,
-                          get_timestamp_delayed("%Y/%m/%d, %H:%M:%S"), **kwargs)
-        self._do_cmd_resp2(TeledyneInstrumentCmds.SET, TeledyneParameter.TIME,
-                           get_timestamp_delayed("%Y/%m/%d, %H:%M:%S"), **kwargs)
+        self._do_cmd_resp_both(TeledyneInstrumentCmds.SET, TeledyneParameter.TIME,
+                               get_timestamp_delayed("%Y/%m/%d, %H:%M:%S"), **kwargs)
 
         # Save setup to nvram and switch to autosample if successful.
-        self._do_cmd_resp(TeledyneInstrumentCmds.SAVE_SETUP_TO_RAM, *args, **kwargs)
-        self._do_cmd_resp2(TeledyneInstrumentCmds.SAVE_SETUP_TO_RAM, *args, **kwargs)
+        self._do_cmd_resp_both(TeledyneInstrumentCmds.SAVE_SETUP_TO_RAM, *args, **kwargs)
 
         # Issue start command and switch to autosample if successful.
-        self._start_logging()
-        self._start_logging2()
+        self._run_concurrently(self._start_logging, self._start_logging2)
 
         next_state = TeledyneProtocolState.AUTOSAMPLE
         next_agent_state = ResourceAgentState.STREAMING
@@ -2875,8 +2637,8 @@ class Protocol(WorkhorseProtocol):
         result = None
 
         timeout = kwargs.get('timeout', TIMEOUT)
-        self._wakeup(timeout=3)
-        self._wakeup2(timeout=3)
+        self._run_concurrently(partial(self._wakeup, timeout=3),
+                               partial(self._wakeup2, timeout=3))
         self._sync_clock(TeledyneInstrumentCmds.SET, TeledyneParameter.TIME, timeout, time_format="%Y/%m/%d,%H:%M:%S")
         return next_state, (next_agent_state, result)
 
@@ -2892,8 +2654,7 @@ class Protocol(WorkhorseProtocol):
 
         kwargs['timeout'] = 180
 
-        output = self._do_cmd_resp(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-        output2 = self._do_cmd_resp2(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
+        output, output2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
         result = self._sanitize(base64.b64decode(output))
         result2 = self._sanitize(base64.b64decode(output2))
         result_combined = result + result2
@@ -2907,8 +2668,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.SAVE_SETUP_TO_RAM, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.SAVE_SETUP_TO_RAM, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.SAVE_SETUP_TO_RAM, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -2923,8 +2683,7 @@ class Protocol(WorkhorseProtocol):
         next_agent_state = None
 
         kwargs['timeout'] = 180  # long time to get params.
-        output = self._do_cmd_resp(TeledyneInstrumentCmds.GET_SYSTEM_CONFIGURATION, *args, **kwargs)
-        output2 = self._do_cmd_resp2(TeledyneInstrumentCmds.GET_SYSTEM_CONFIGURATION, *args, **kwargs)
+        output, output2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.GET_SYSTEM_CONFIGURATION, *args, **kwargs)
         result = self._sanitize(base64.b64decode(output))
         result2 = self._sanitize(base64.b64decode(output2))
         result_combined = result + result2
@@ -2938,8 +2697,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.RUN_TEST_200, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.RUN_TEST_200, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.RUN_TEST_200, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -2951,8 +2709,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.FACTORY_SETS, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.FACTORY_SETS, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.FACTORY_SETS, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -2964,8 +2721,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.USER_SETS, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.USER_SETS, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.USER_SETS, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -2977,8 +2733,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.CLEAR_ERROR_STATUS_WORD, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.CLEAR_ERROR_STATUS_WORD, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.CLEAR_ERROR_STATUS_WORD, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -2990,8 +2745,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.DISPLAY_ERROR_STATUS_WORD, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.DISPLAY_ERROR_STATUS_WORD, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.DISPLAY_ERROR_STATUS_WORD, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
         # return (next_state, result)
@@ -3004,8 +2758,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.GET_FAULT_LOG, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.GET_FAULT_LOG, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.GET_FAULT_LOG, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -3017,8 +2770,7 @@ class Protocol(WorkhorseProtocol):
         next_state = None
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
-        result = self._do_cmd_resp(TeledyneInstrumentCmds.CLEAR_FAULT_LOG, *args, **kwargs)
-        result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.CLEAR_FAULT_LOG, *args, **kwargs)
+        result, result2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.CLEAR_FAULT_LOG, *args, **kwargs)
         result_combined = result + result2
         return next_state, result_combined
 
@@ -3089,8 +2841,8 @@ class Protocol(WorkhorseProtocol):
         # Wake up the device, continuing until autosample prompt seen.
         timeout = kwargs.get('timeout', TIMEOUT)
 
-        self._stop_logging(timeout)
-        self._stop_logging2(timeout)
+        self._run_concurrently(partial(self._stop_logging, timeout),
+                               partial(self._stop_logging2, timeout))
 
         next_state = TeledyneProtocolState.COMMAND
         next_agent_state = ResourceAgentState.COMMAND
@@ -3177,8 +2929,7 @@ class Protocol(WorkhorseProtocol):
         self._promptbuf = ""
         self._linebuf = ""
 
-        self._promptbuf2 = ""
-        self._linebuf2 = ""
+        self._get_connection(SlaveProtocol.FIFTHBEAM).clear_buffers()
 
         if self._is_logging():
             logging = True
@@ -3226,14 +2977,7 @@ class Protocol(WorkhorseProtocol):
         next_agent_state = None
         result = None
         try:
-            self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-            self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-
-            self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_PT2, *args, **kwargs)
-            self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_PT2, *args, **kwargs)
-
-            self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_PT4, *args, **kwargs)
-            self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_PT4, *args, **kwargs)
+            self._acquire_status_both(*args, **kwargs)
 
         except Exception as e:
             log.error("Exception on Executing do_cmd_no_resp() %s", e)
@@ -3261,12 +3005,11 @@ class Protocol(WorkhorseProtocol):
 
         try:
             # Switch to command mode,
-            self._stop_logging(*args, **kwargs)
-            self._stop_logging2(*args, **kwargs)
+            self._run_concurrently(partial(self._stop_logging, *args, **kwargs),
+                                   partial(self._stop_logging2, *args, **kwargs))
 
             kwargs['timeout'] = 180
-            output = self._do_cmd_resp(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-            output2 = self._do_cmd_resp2(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
+            output, output2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
 
         # Catch all error so we can put ourselves back into
         # streaming.  Then rethrow the error
@@ -3275,8 +3018,7 @@ class Protocol(WorkhorseProtocol):
 
         finally:
             # Switch back to streaming
-            self._start_logging()
-            self._start_logging2()
+            self._run_concurrently(self._start_logging, self._start_logging2)
 
         if error_status:
             raise error_status
@@ -3316,15 +3058,7 @@ class Protocol(WorkhorseProtocol):
             self._stop_logging2()
 
         try:
-            # for master
-            self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-            self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_PT2, *args, **kwargs)
-            self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_PT4, *args, **kwargs)
-
-            # for slave
-            self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-            self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_PT2, *args, **kwargs)
-            self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_PT4, *args, **kwargs)
+            self._acquire_status_both(*args, **kwargs)
 
         except Exception as e:
             log.error("Unknown driver parameter on _do_cmd_no_resp in handle_autosample_get_status. Exception thrown")
@@ -3363,12 +3097,11 @@ class Protocol(WorkhorseProtocol):
 
         try:
             # Switch to command mode,
-            self._stop_logging(*args, **kwargs)
-            self._stop_logging2(*args, **kwargs)
+            self._run_concurrently(partial(self._stop_logging, *args, **kwargs),
+                                   partial(self._stop_logging2, *args, **kwargs))
 
             # Sync the clock
-            output = self._do_cmd_resp(TeledyneInstrumentCmds.GET_SYSTEM_CONFIGURATION, *args, **kwargs)
-            output2 = self._do_cmd_resp2(TeledyneInstrumentCmds.GET_SYSTEM_CONFIGURATION, *args, **kwargs)
+            output, output2 = self._do_cmd_resp_both(TeledyneInstrumentCmds.GET_SYSTEM_CONFIGURATION, *args, **kwargs)
 
         # Catch all error so we can put ourselves back into
         # streaming.  Then rethrow the error
@@ -3377,8 +3110,7 @@ class Protocol(WorkhorseProtocol):
 
         finally:
             # Switch back to streaming
-            self._start_logging()
-            self._start_logging2()
+            self._run_concurrently(self._start_logging, self._start_logging2)
 
         if error_status:
             raise error_status
@@ -3394,8 +3126,7 @@ class Protocol(WorkhorseProtocol):
         """
         Exit direct access state.
         """
-        self._send_break()
-        self._send_break2()
+        self._run_concurrently(self._send_break, self._send_break2)
 
         result = self._do_cmd_resp(TeledyneInstrumentCmds.GET, TeledyneParameter.TIME_OF_FIRST_PING)
         result2 = self._do_cmd_resp2(TeledyneInstrumentCmds.GET, TeledyneParameter.TIME_OF_FIRST_PING)
@@ -3419,13 +3150,7 @@ class Protocol(WorkhorseProtocol):
         kwargs['timeout'] = 70
         kwargs['expected_prompt'] = TeledynePrompt.COMMAND
 
-        self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-        self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_PT2, *args, **kwargs)
-        self._do_cmd_no_resp(TeledyneInstrumentCmds.OUTPUT_PT4, *args, **kwargs)
-
-        self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_CALIBRATION_DATA, *args, **kwargs)
-        self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_PT2, *args, **kwargs)
-        self._do_cmd_no_resp2(TeledyneInstrumentCmds.OUTPUT_PT4, *args, **kwargs)
+        self._acquire_status_both(*args, **kwargs)
 
         return next_state, None
 
@@ -3464,27 +3189,18 @@ class Protocol(WorkhorseProtocol):
         Clear buffers and send a wakeup command to the instrument
         @param timeout The timeout to wake the device.
         @param delay The time to wait between consecutive wakeups.
-        @throw InstrumentTimeoutException if the device could not be woken.
+        @return the prompt seen, None if the device could not be woken.
         """
-
         self.last_wakeup2 = time.time()
-        # Clear the prompt buffer.
-        self._promptbuf2 = ''
-
-        # Grab time for timeout.
-        starttime = time.time()
-        endtime = starttime + float(timeout)
-
-        # Send a line return and wait a sec.
-        log.trace('Sending wakeup2. timeout=%s' % timeout)
-        self._send_wakeup2()
-
-        while time.time() < endtime:
-            time.sleep(0.05)
-            for item in self._get_prompts():
-                index = self._promptbuf2.find(item)
-                if index >= 0:
-                    log.trace('wakeup2 got prompt: %s' % repr(item))
-                    return item
-        return None
+        return self._wakeup_on(SlaveProtocol.FIFTHBEAM, timeout, delay)
 
+    # for Slave
+    def _wakeup_on(self, name, timeout=3, delay=1):
+        """
+        Send a single wakeup and wait for a prompt.  Like the master _wakeup,
+        return None instead of raising if no prompt is seen.
+        """
+        try:
+            return MultiConnectionInstrumentProtocol._wakeup_on(self, name, timeout, delay=timeout)
+        except InstrumentTimeoutException:
+            return None
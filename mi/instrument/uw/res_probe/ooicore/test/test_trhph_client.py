@@ -9,9 +9,11 @@
 __author__ = "Carlos Rueda"
 __license__ = 'Apache 2.0'
 
+import mi.instrument.uw.res_probe.ooicore.trhph as trhph
 from mi.instrument.uw.res_probe.ooicore.trhph import CHANNEL_NAMES
 from mi.instrument.uw.res_probe.ooicore.trhph_client import TrhphClient
 from mi.instrument.uw.res_probe.ooicore.trhph_client import State
+from mi.instrument.uw.res_probe.ooicore.trhph_client import _Recv
 
 from mi.core.mi_logger import mi_logger
 log = mi_logger
@@ -20,12 +22,46 @@ import time
 import datetime
 
 from mi.instrument.uw.res_probe.ooicore.test import TrhphTestCase
+from mi.core.unit_test import MiUnitTest
 from nose.plugins.attrib import attr
 
 import unittest
 import os
 
 
+@attr('UNIT', group='mi')
+class RecvBlockTest(MiUnitTest):
+    """
+    Verifies that processing received data in blocks gives the same
+    lines, state and values as processing it one character at a time.
+    """
+
+    DATA_LINE = "  0.440  0.002  0.015  0.062  0.000  0.000  0.000  0.000" \
+                "  1.396  21.27  1.530  22.20" + trhph.NEWLINE
+
+    STREAM = trhph.MAIN_MENU + trhph.SYSTEM_INFO + trhph.MAIN_MENU + \
+        trhph.SENSOR_POWER_CONTROL_MENU + DATA_LINE * 3 + \
+        trhph.SYSTEM_PARAMETER_MENU
+
+    def _receive(self, blocks):
+        samples = []
+        recv = _Recv(None, samples.append)
+        for block in blocks:
+            recv._process_block(block)
+        return (samples, recv._lines, recv._new_line, recv._state,
+                recv._system_info, recv._power_statuses)
+
+    def test_block_vs_char(self):
+        expected = self._receive(list(self.STREAM))
+        self.assertEqual(len(expected[0]), 3)
+        self.assertEqual(expected[3], State.SYSTEM_PARAM_MENU)
+
+        for size in [2, 7, 64, 4096]:
+            blocks = [self.STREAM[i:i + size]
+                      for i in range(0, len(self.STREAM), size)]
+            self.assertEqual(self._receive(blocks), expected)
+
+
 @unittest.skipIf(os.getenv('run_it') is None,
 '''Not run by default because of mixed monkey-patching issues. \
 Define environment variable run_it to force execution.''')
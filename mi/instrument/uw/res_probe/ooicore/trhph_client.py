@@ -94,6 +94,9 @@ GENERIC_PROMPT_PATTERN = re.compile(r'.*--> ')
 # keep this max number of received lines
 MAX_NUM_LINES = 30
 
+# max number of bytes requested from the socket on each read
+RECV_BLOCK_SIZE = 4096
+
 # default value for the generic timeout. By default, 30 secs
 DEFAULT_GENERIC_TIMEOUT = 30
 
@@ -196,7 +199,8 @@ class _Recv(Greenlet):
     def _update_lines(self, c):
         """
         Updates the internal buffers.
-        @param c Character that has just been received
+        @param c Either a single newline or a fragment of a line (not
+               containing any newline) that has just been received
         """
         if c == '\n':
             self._last_line = self._new_line
@@ -327,7 +331,8 @@ class _Recv(Greenlet):
     def _update_outfile(self, c):
         """
         Updates the outfile if any.
-        @param c Character that has just been received
+        @param c Either a single newline or a fragment of a line (not
+               containing any newline) that has just been received
         """
         if self._outfile:
             os.write(self._outfile.fileno(), c)
@@ -344,6 +349,33 @@ class _Recv(Greenlet):
             os.write(self._outfile.fileno(), '\n\n<_Recv ended.>\n\n')
             self._outfile.flush()
 
+    def _process_block(self, data):
+        """
+        Runs the updaters over a block of received data. The block is
+        split into line fragments and newlines; a fragment is appended to
+        the current (possibly partial) line, so lines and tokens split
+        across blocks are reassembled naturally. The state is evaluated at
+        the end of each fragment and after each newline.
+        @param data Block of data that has just been received
+        """
+        start = 0
+        length = len(data)
+        while start < length:
+            end = data.find('\n', start)
+            if end == -1:
+                end = length
+            if end > start:
+                fragment = data[start:end]
+                self._update_lines(fragment)
+                self._update_state()
+                self._update_outfile(fragment)
+            if end < length:
+                self._update_lines('\n')
+                self._update_state()
+                self._update_values('\n')
+                self._update_outfile('\n')
+            start = end + 1
+
     def run(self):  # in case of Thread
         self.__run()
 
@@ -362,16 +394,13 @@ class _Recv(Greenlet):
 
         log.debug("_Recv running.")
         while self._active:
-            # Note that we read one character at a time.
+            # read whatever is available, up to a block at a time.
             try:
-                c = self._sock.recv(1)
+                data = self._sock.recv(RECV_BLOCK_SIZE)
             except socket.timeout, e:
                 # ok, just reattempt reading
                 continue
-            self._update_lines(c)
-            self._update_state()
-            self._update_values(c)
-            self._update_outfile(c)
+            self._process_block(data)
             _yield()
         log.debug("_Recv.run done.")
         self._end_outfile()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.attr_cache
+@file    mi/platform/driver/rsn/attr_cache.py
+@author  Ronald Ronquillo
+@brief   Cache of the attribute values a platform driver got from the OMS.
+
+The resource monitors of a platform agent ask the driver for the values of
+its attributes since some from_time, and every cycle the OMS used to send
+back the whole window again.  AttributeValueCache keeps, per attribute, a
+bounded ring buffer of the (value, timestamp) samples received and the
+timestamp up to which the OMS was queried (the high-water mark):
+
+ - a request for a window the cache holds is rewritten to ask the OMS only
+   for the samples since the high-water mark, the answer is made from the
+   buffer;
+ - a request for a window the cache holds, for an attribute refreshed less
+   than max_age seconds ago, is answered from the buffer without asking
+   the OMS at all;
+ - a request for a window older than what the buffer holds goes to the
+   OMS unchanged and its answer replaces the buffer.
+
+Timestamps are NTP, as used by the OMS.  A sample is part of the window of
+from_time if its timestamp is >= from_time.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+
+from pyon.public import log
+
+import time
+from collections import deque
+
+# samples kept per attribute
+DEFAULT_CACHE_SIZE = 1000
+# seconds an attribute refreshed from the OMS is served from the cache only
+DEFAULT_MAX_AGE = 1.0
+
+
+class _AttrBuffer(object):
+    """
+    Samples of one attribute, oldest first.
+    """
+
+    def __init__(self, size, from_time, samples):
+        self.samples = deque(samples, size)
+        # all the samples with timestamp >= start are held
+        self.start = from_time
+        if len(samples) > size:
+            self.start = self.samples[0][1]
+        # the OMS was last queried from this time
+        self.high_water = self.samples[-1][1] if self.samples else from_time
+        self.refreshed = time.time()
+
+    def covers(self, from_time):
+        return from_time >= self.start
+
+    def extend(self, samples):
+        """
+        Appends the samples newer than the last one held.
+
+        @retval list of the samples appended
+        """
+        if self.samples:
+            last = self.samples[-1][1]
+            samples = [sample for sample in samples if sample[1] > last]
+        else:
+            samples = list(samples)
+        if not samples:
+            return samples
+        dropped = len(self.samples) + len(samples) - self.samples.maxlen
+        self.samples.extend(samples)
+        if dropped > 0:
+            self.start = self.samples[0][1]
+        self.high_water = self.samples[-1][1]
+        return samples
+
+    def values(self, from_time):
+        """
+        @retval list of the samples with timestamp >= from_time
+        """
+        values = []
+        for sample in reversed(self.samples):
+            if sample[1] < from_time:
+                break
+            values.append(sample)
+        values.reverse()
+        return values
+
+
+class AttributeValueCache(object):
+    """
+    Attribute values of one platform, see module doc.  hits counts the
+    attribute requests answered from the cache, misses the ones whose
+    whole window had to be fetched.
+    """
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE, max_age=DEFAULT_MAX_AGE):
+        """
+        @param size     maximum number of samples kept per attribute
+        @param max_age  seconds during which an attribute refreshed from the
+                        OMS is served without asking the OMS again
+        """
+        self._size = size
+        self._max_age = max_age
+        self._buffers = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_attribute_values(self, attrs, fetch):
+        """
+        Gets attribute values, fetching from the OMS only what the cache
+        does not hold.
+
+        @param attrs  [(attr_id, from_time), ...] with NTP from_time
+        @param fetch  called with a list like attrs of what to get from the
+                      OMS, returns the OMS response for the platform:
+                      {attr_id: [(value, timestamp), ...], ...}
+        @retval {attr_id: [(value, timestamp), ...], ...} as the OMS would
+                have responded to attrs
+        """
+        now = time.time()
+        request = []
+        refresh = set()
+        for (attr_id, from_time) in attrs:
+            buf = self._buffers.get(attr_id)
+            if buf is not None and buf.covers(from_time):
+                self.hits += 1
+                if now - buf.refreshed >= self._max_age:
+                    request.append((attr_id, buf.high_water))
+                    refresh.add(attr_id)
+            else:
+                self.misses += 1
+                request.append((attr_id, from_time))
+
+        response = fetch(request) if request else {}
+
+        retval = {}
+        for (attr_id, from_time) in attrs:
+            buf = self._buffers.get(attr_id)
+            if attr_id not in response:
+                if buf is not None and buf.covers(from_time):
+                    retval[attr_id] = buf.values(from_time)
+                continue
+            samples = response[attr_id]
+            if not isinstance(samples, (list, tuple)):
+                # InvalidResponse for the attribute, nothing to cache
+                self._buffers.pop(attr_id, None)
+                retval[attr_id] = samples
+            elif attr_id in refresh:
+                values = buf.values(from_time)
+                values.extend(sample for sample in buf.extend(samples) if sample[1] >= from_time)
+                retval[attr_id] = values
+                buf.refreshed = now
+            else:
+                self._buffers[attr_id] = _AttrBuffer(self._size, from_time, samples)
+                retval[attr_id] = list(samples)
+
+        log.debug("attribute value cache: %d hits, %d misses, %d attributes fetched",
+                  self.hits, self.misses, len(request))
+        return retval
+
+    def clear(self):
+        """
+        Drops all cached values.
+        """
+        self._buffers.clear()
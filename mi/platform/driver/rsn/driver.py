@@ -24,7 +24,9 @@ from mi.platform.platform_driver_event import ExternalEventDriverEvent
 from mi.platform.exceptions import PlatformException
 from mi.platform.exceptions import PlatformDriverException
 from mi.platform.exceptions import PlatformConnectionException
-from mi.platform.driver.rsn.oms_client_factory import CIOMSClientFactory
+from mi.platform.driver.rsn.oms_access import OmsAccess
+from mi.platform.driver.rsn.attr_cache import AttributeValueCache
+from mi.platform.driver.rsn.oms_event_hub import OmsEventHub
 from mi.platform.responses import InvalidResponse
 
 from ion.agents.platform.util import ion_ts_2_ntp
@@ -78,9 +80,13 @@ class PlatformDriver(PlatformDriver):
         PlatformDriver.__init__(self, pnode, event_callback,
                                 create_event_subscriber, destroy_event_subscriber)
 
-        # CIOMSClient instance created by connect() and destroyed by disconnect():
+        # OmsAccess shared with the other drivers of the process, acquired by
+        # connect() and released by disconnect():
         self._rsn_oms = None
 
+        # attribute values already received from the OMS, see configure():
+        self._attr_cache = AttributeValueCache()
+
         # TODO(OOIION-1495) review the following. Commented out for the moment.
         # What does "ports that have devices attached" mean?
         """
@@ -94,13 +100,11 @@ class PlatformDriver(PlatformDriver):
         # URL for the event listener registration/unregistration (based on
         # web server launched by ServiceGatewayService, since that's the
         # service in charge of receiving/relaying the OMS events).
-        # NOTE: (as proposed long ago), this kind of functionality should
-        # actually be provided by some component more in charge of the RSN
-        # platform netwokr as a whole -- as opposed to platform-specific).
         self.listener_url = None
 
-        # external event listener: created in _start_event_dispatch
-        self._event_listener = None
+        # OmsEventHub shared with the other drivers of the process, acquired
+        # in _start_event_dispatch:
+        self._event_hub = None
 
     def get_platform_driver_event_class(self):
         return RSNPlatformDriverEvent
@@ -163,11 +167,14 @@ class PlatformDriver(PlatformDriver):
         """
     def configure(self, driver_config):
         """
-        Nothing special done here, only calls super.configure(driver_config)
+        Calls super.configure(driver_config) and sets up the attribute value
+        cache with the optional 'attr_cache' entry, a dict with 'size' and
+        'max_age' (see AttributeValueCache).
 
         @param driver_config with required 'oms_uri' entry.
         """
         PlatformDriver.configure(self, driver_config)
+        self._attr_cache = AttributeValueCache(**driver_config.get('attr_cache', {}))
         self._construct_resource_schema()
 
     def _construct_resource_schema(self):
@@ -263,22 +270,30 @@ class PlatformDriver(PlatformDriver):
 
     def connect(self, recursion=None):
         """
-        Creates an CIOMSClient instance, does a ping to verify connection,
+        Acquires the OmsAccess for the OMS, does a ping to verify connection,
         and starts event dispatch.
         """
-        # create CIOMSClient:
+        # acquire OmsAccess:
         oms_uri = self._driver_config['oms_uri']
-        log.debug("%r: creating CIOMSClient instance with oms_uri=%r",
+        log.debug("%r: acquiring OmsAccess with oms_uri=%r",
                   self._platform_id, oms_uri)
-        self._rsn_oms = CIOMSClientFactory.create_instance(oms_uri)
-        log.debug("%r: CIOMSClient instance created: %s",
+        self._rsn_oms = OmsAccess.acquire(oms_uri)
+        log.debug("%r: OmsAccess acquired: %s",
                   self._platform_id, self._rsn_oms)
 
-        # ping to verify connection:
-        self.ping()
-
-        # start event dispatch:
-        self._start_event_dispatch()
+        try:
+            # ping to verify connection:
+            self.ping()
+
+            # start event dispatch:
+            self._start_event_dispatch()
+        except Exception:
+            # release the reference so a failed connect doesn't keep the
+            # shared OmsAccess alive
+            self._rsn_oms.release()
+            self._rsn_oms = None
+            log.debug("%r: OmsAccess released", self._platform_id)
+            raise
 
         # TODO(OOIION-1495) review the following. Commented out for the moment.
         # 2014-06-05: The pending review in terms of ports is still relevant in
@@ -302,24 +317,26 @@ class PlatformDriver(PlatformDriver):
 
     def disconnect(self, recursion=None):
         """
-        Stops event dispatch and destroys the CIOMSClient instance.
+        Stops event dispatch and releases the OmsAccess, even if stopping
+        fails.
         """
-        self._stop_event_dispatch()
-
-        # TODO(OOIION-1495) review the following. Only change is the use
-        # of self._pnode.ports instead of self._active_ports,
-        # while we address the "active ports" concept mentioned above.
-        # BTW, is it OK to turn off ports in this "disconnect driver" operation?
-
-        # power off all ports with connected devices
-        if recursion:
-            for port in self._pnode.ports:
-                log.debug('disconnect power port: %s', port)
-                self.turn_off_port(port)
-
-        CIOMSClientFactory.destroy_instance(self._rsn_oms)
-        self._rsn_oms = None
-        log.debug("%r: CIOMSClient instance destroyed", self._platform_id)
+        try:
+            self._stop_event_dispatch()
+
+            # TODO(OOIION-1495) review the following. Only change is the use
+            # of self._pnode.ports instead of self._active_ports,
+            # while we address the "active ports" concept mentioned above.
+            # BTW, is it OK to turn off ports in this "disconnect driver" operation?
+
+            # power off all ports with connected devices
+            if recursion:
+                for port in self._pnode.ports:
+                    log.debug('disconnect power port: %s', port)
+                    self.turn_off_port(port)
+        finally:
+            self._rsn_oms.release()
+            self._rsn_oms = None
+            log.debug("%r: OmsAccess released", self._platform_id)
 
     def get_metadata(self):
         """
@@ -363,6 +380,20 @@ class PlatformDriver(PlatformDriver):
         attrs_ntp = [(attr_id, ion_ts_2_ntp(from_time))
                      for (attr_id, from_time) in attrs]
 
+        # only the values not already in the cache are requested:
+        attr_values = self._attr_cache.get_attribute_values(attrs_ntp,
+                                                            self._fetch_attribute_values)
+
+        # reported timestamps are already in NTP. Just return the dict:
+        return attr_values
+
+    def _fetch_attribute_values(self, attrs_ntp):
+        """
+        Gets attribute values from the OMS.
+
+        @param attrs_ntp [(attrName, from_time), ...] with NTP from_time
+        @retval {attrName : [(attrValue, timestamp), ...], ...}
+        """
         try:
             retval = self._rsn_oms.attr.get_platform_attribute_values(self._platform_id,
                                                                       attrs_ntp)
@@ -373,10 +404,7 @@ class PlatformDriver(PlatformDriver):
             raise PlatformException("Unexpected: response does not include "
                                     "requested platform '%s'" % self._platform_id)
 
-        attr_values = retval[self._platform_id]
-
-        # reported timestamps are already in NTP. Just return the dict:
-        return attr_values
+        return retval[self._platform_id]
 
     def _verify_platform_id_in_response(self, response):
         """
@@ -498,49 +526,13 @@ class PlatformDriver(PlatformDriver):
     ###############################################
     # External event handling:
 
-    def _register_event_listener(self, url):
-        """
-        Registers given url for all event types.
-        """
-        log.debug("%r: registering event listener: %s", self._platform_id, url)
-        try:
-            already_registered = self._rsn_oms.event.get_registered_event_listeners()
-        except Exception as e:
-            raise PlatformConnectionException(
-                msg="%r: Cannot get registered event listeners: %s" % (self._platform_id, e))
-
-        if url in already_registered:
-            log.debug("listener %r was already registered", url)
-            return
-
-        try:
-            result = self._rsn_oms.event.register_event_listener(url)
-        except Exception as e:
-            raise PlatformConnectionException(
-                msg="%r: Cannot register_event_listener: %s" % (self._platform_id, e))
-
-        log.debug("%r: register_event_listener(%r) => %s", self._platform_id, url, result)
-
-    def _unregister_event_listener(self, url):
-        """
-        Unregisters given url for all event types.
-        """
-        log.debug("%r: unregistering event listener: %s", self._platform_id, url)
-        try:
-            result = self._rsn_oms.event.unregister_event_listener(url)
-        except Exception as e:
-            raise PlatformConnectionException(
-                msg="%r: Cannot unregister_event_listener: %s" % (self._platform_id, e))
-
-        log.debug("%r: unregister_event_listener(%r) => %s", self._platform_id, url, result)
-
     def _start_event_dispatch(self):
         """
-        Registers the event listener by using a URL that is composed from
-        CFG.server.oms.host, CFG.server.oms.port, and CFG.server.oms.path.
-
-        NOTE: the same listener URL will be registered by multiple RSN platform
-        drivers. See other related notes in this file.
+        Subscribes to the events of this platform in the OmsEventHub of the
+        process for the listener URL composed from CFG.server.oms.host,
+        CFG.server.oms.port, and CFG.server.oms.path. The listener is
+        registered and the event subscriber created by the hub, once for all
+        the RSN platform drivers of the process.
 
         @see https://jira.oceanobservatories.org/tasks/browse/OOIION-1287
         @see https://jira.oceanobservatories.org/tasks/browse/OOIION-968
@@ -552,48 +544,36 @@ class PlatformDriver(PlatformDriver):
         path = CFG.get_safe('server.oms.path', "/ion-service/oms_event")
 
         self.listener_url = "http://%s:%s%s" % (host, port, path)
-        self._register_event_listener(self.listener_url)
 
-        # start OMSDeviceStatusEvent listener to notify the agent about those:
-        def event_received(evt, *args, **kwargs):
-            log.debug('%r: OmsEventListener received: %s', self._platform_id, evt)
-            self._send_event(ExternalEventDriverEvent(evt))
+        self._event_hub = OmsEventHub.acquire(self._rsn_oms, self.listener_url,
+                                              self._create_event_subscriber,
+                                              self._destroy_event_subscriber)
+        self._event_hub.subscribe(self._platform_id, self._event_received)
 
-        self._event_listener = self._create_event_subscriber(
-            event_type   = 'OMSDeviceStatusEvent',
-            origin       = self._platform_id,
-            origin_type  = 'OMS Platform',
-            callback     = event_received)
-
-        log.debug("%r: started OMSDeviceStatusEvent listener", self._platform_id)
+        log.debug("%r: subscribed to OMSDeviceStatusEvent's", self._platform_id)
 
         return "OK"
 
+    def _event_received(self, evt):
+        log.debug('%r: OmsEventHub received: %s', self._platform_id, evt)
+        self._send_event(ExternalEventDriverEvent(evt))
+
     def _stop_event_dispatch(self):
         """
         Stops the dispatch of events received from the platform network.
-
-        NOTE: since the same listener URL is registered by multiple RSN
-        platform drivers, we avoid unregistering it here because it would
-        affect other drivers still depending on the events being notified.
+        The listener URL is left registered, other drivers might still
+        depend on it, see OmsEventHub.
 
         @see https://jira.oceanobservatories.org/tasks/browse/OOIION-968
         """
 
-        if self._event_listener:
-            log.debug("%r: stopping OMSDeviceStatusEvent listener", self._platform_id)
+        if self._event_hub:
+            log.debug("%r: unsubscribing from OMSDeviceStatusEvent's", self._platform_id)
             try:
-                self._destroy_event_subscriber(self._event_listener)
+                self._event_hub.unsubscribe(self._platform_id, self._event_received)
+                self._event_hub.release()
             finally:
-                self._event_listener = None
-
-        log.debug("%r: Not unregistering listener URL to avoid affecting "
-                  "other RSN platform drivers", self._platform_id)
-
-        # unregister listener:
-        #self._unregister_event_listener(self.listener_url)
-        # NOTE: NO, DON'T unregister: other drivers might still be depending
-        # on the listener being registered.
+                self._event_hub = None
 
         return "OK"
 
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.oms_access
+@file    mi/platform/driver/rsn/oms_access.py
+@author  Ronald Ronquillo
+@brief   Process wide access to an OMS shared by all RSN platform drivers.
+
+Each RSN platform driver used to create its own CIOMSClient and make one
+get_platform_attribute_values round trip per monitoring cycle for its own
+platform.  OmsAccess is shared by all the drivers of a process talking to
+the same OMS URI:
+
+ - OmsClientPool keeps a few CIOMSClient instances, each an xmlrpclib
+   ServerProxy holding a persistent HTTP/1.1 connection, and hands them
+   out to one caller at a time.
+ - OmsAttributeBatcher coalesces the get_platform_attribute_values
+   requests of concurrent drivers into one xmlrpclib.MultiCall round trip
+   and fans the results back out to the requesting drivers.
+
+OmsAccess has the same handler interface as CIOMSClient (hello, config,
+attr, event, port) so a driver uses it in place of its own client.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+
+from pyon.public import log
+
+import xmlrpclib
+from gevent import Greenlet, sleep
+from gevent.event import AsyncResult
+from gevent.queue import Queue, Empty
+
+from mi.platform.driver.rsn.oms_client import CIOMSClient
+from mi.platform.driver.rsn.oms_client_factory import CIOMSClientFactory
+
+# clients, and so persistent connections, kept per OMS URI
+DEFAULT_POOL_SIZE = 4
+# seconds the batcher waits after a request for others to join the batch
+DEFAULT_BATCH_WINDOW = 0.01
+# requests in one multicall round trip
+DEFAULT_MAX_BATCH = 64
+
+
+class OmsClientPool(object):
+    """
+    Pool of CIOMSClient instances for one OMS URI.  Clients are created as
+    needed up to the pool size, a caller needing a client when all are in
+    use waits for one to be returned.
+    """
+
+    def __init__(self, uri, size=DEFAULT_POOL_SIZE,
+                 create_client=CIOMSClientFactory.create_instance,
+                 destroy_client=CIOMSClientFactory.destroy_instance):
+        """
+        @param uri             URI of the OMS, see CIOMSClientFactory.create_instance
+        @param size            maximum number of clients
+        @param create_client   creates a client given the URI
+        @param destroy_client  destroys a client created with create_client
+        """
+        self._uri = uri
+        self._size = size
+        self._create_client = create_client
+        self._destroy_client = destroy_client
+        self._idle = Queue()
+        self._created = 0
+        self._closed = False
+
+    def get(self):
+        """
+        Gets a client, to be returned with put when done with it.
+        """
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        if self._created < self._size:
+            self._created += 1
+            try:
+                client = self._create_client(self._uri)
+            except Exception:
+                self._created -= 1
+                raise
+            if isinstance(client, CIOMSClient):
+                # embedded simulator, all callers share the one instance
+                self._size = 1
+            return client
+        return self._idle.get()
+
+    def put(self, client):
+        """
+        Returns a client obtained with get.
+        """
+        if self._closed:
+            self._destroy(client)
+        else:
+            self._idle.put(client)
+
+    def call(self, handler, method, *args):
+        """
+        Calls an OMS operation on a client from the pool.
+
+        @param handler  OMS handler name, for example 'hello'
+        @param method   method of the handler, for example 'ping'
+        """
+        client = self.get()
+        try:
+            return getattr(getattr(client, handler), method)(*args)
+        finally:
+            self.put(client)
+
+    def close(self):
+        """
+        Destroys the idle clients.  Clients still in use are destroyed when
+        they are put back.
+        """
+        self._closed = True
+        while True:
+            try:
+                self._destroy(self._idle.get_nowait())
+            except Empty:
+                break
+
+    def _destroy(self, client):
+        self._created -= 1
+        try:
+            self._destroy_client(client)
+        except Exception as e:
+            log.warn("error destroying OMS client for %r: %s", self._uri, e)
+
+
+class OmsAttributeBatcher(object):
+    """
+    Coalesces get_platform_attribute_values requests.  A request waits for
+    the batch window so concurrent requests of other drivers join it, then
+    up to max_batch requests go to the OMS in a single xmlrpclib.MultiCall
+    round trip.  Each requester gets the result of its own call, or the
+    exception it raised.  Embedded CIOMSSimulator clients do not take multi
+    calls, the calls of a batch are made one by one on them.
+    """
+
+    def __init__(self, pool, batch_window=DEFAULT_BATCH_WINDOW,
+                 max_batch=DEFAULT_MAX_BATCH):
+        """
+        @param pool          OmsClientPool to make the calls with
+        @param batch_window  seconds to wait for requests to join a batch
+        @param max_batch     maximum number of requests in a batch
+        """
+        self._pool = pool
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._queue = Queue()
+        self._dispatcher = None
+
+    def get_platform_attribute_values(self, platform_id, attrs):
+        """
+        Same as CIOMSClient.get_platform_attribute_values, the call is
+        made together with the ones of other platforms.
+        """
+        if self._dispatcher is None:
+            self._dispatcher = Greenlet.spawn(self._dispatch)
+        result = AsyncResult()
+        self._queue.put((platform_id, attrs, result))
+        return result.get()
+
+    def stop(self):
+        """
+        Stops dispatching once the pending requests are done.
+        """
+        if self._dispatcher is not None:
+            self._queue.put(None)
+            self._dispatcher.join()
+            self._dispatcher = None
+
+    def _dispatch(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            sleep(self._batch_window)
+            batch = [request]
+            stop = False
+            while len(batch) < self._max_batch:
+                try:
+                    request = self._queue.get_nowait()
+                except Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch):
+        """
+        Makes the calls of a batch of requests and sets their results.
+
+        @param batch  list of (platform_id, attrs, AsyncResult)
+        """
+        log.debug("get_platform_attribute_values batch of %d platforms", len(batch))
+        try:
+            client = self._pool.get()
+        except Exception as e:
+            for (platform_id, attrs, result) in batch:
+                result.set_exception(e)
+            return
+
+        try:
+            if isinstance(client, CIOMSClient):
+                for (platform_id, attrs, result) in batch:
+                    try:
+                        result.set(client.attr.get_platform_attribute_values(platform_id, attrs))
+                    except Exception as e:
+                        result.set_exception(e)
+                return
+
+            multicall = xmlrpclib.MultiCall(client)
+            for (platform_id, attrs, result) in batch:
+                multicall.attr.get_platform_attribute_values(platform_id, attrs)
+            try:
+                responses = multicall()
+            except Exception as e:
+                for (platform_id, attrs, result) in batch:
+                    result.set_exception(e)
+                return
+
+            for (i, (platform_id, attrs, result)) in enumerate(batch):
+                try:
+                    # raises the xmlrpclib.Fault of a failed call
+                    result.set(responses[i])
+                except Exception as e:
+                    result.set_exception(e)
+        finally:
+            self._pool.put(client)
+
+
+class _OmsHandler(object):
+    """
+    A handler of the OMS interface (hello, config, ...) whose operations
+    are called on a client from the pool.
+    """
+
+    def __init__(self, pool, handler):
+        self._pool = pool
+        self._handler = handler
+
+    def __getattr__(self, method):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args):
+            return self._pool.call(self._handler, method, *args)
+        return call
+
+
+class _OmsAttrHandler(_OmsHandler):
+    """
+    The attr handler, attribute values are requested in batches.
+    """
+
+    def __init__(self, pool, batcher):
+        _OmsHandler.__init__(self, pool, 'attr')
+        self._batcher = batcher
+
+    def get_platform_attribute_values(self, platform_id, attrs):
+        return self._batcher.get_platform_attribute_values(platform_id, attrs)
+
+
+class OmsAccess(object):
+    """
+    Access to an OMS shared by all the platform drivers of a process using
+    the same URI.  Get it with acquire and give it back with release.
+    """
+
+    # URI -> OmsAccess shared in this process
+    _instances = {}
+
+    @classmethod
+    def acquire(cls, uri, **kwargs):
+        """
+        Gets the OmsAccess for a URI, creating it on first use.
+
+        @param uri     URI of the OMS, see CIOMSClientFactory.create_instance
+        @param kwargs  passed to the constructor when the instance is created
+        """
+        instance = cls._instances.get(uri)
+        if instance is None:
+            instance = cls(uri, **kwargs)
+            cls._instances[uri] = instance
+            log.debug("created OmsAccess for uri=%r", uri)
+        instance._ref_count += 1
+        return instance
+
+    def __init__(self, uri, pool_size=DEFAULT_POOL_SIZE,
+                 batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                 create_client=CIOMSClientFactory.create_instance,
+                 destroy_client=CIOMSClientFactory.destroy_instance):
+        """
+        @see OmsClientPool and OmsAttributeBatcher for the parameters
+        """
+        self._uri = uri
+        self._ref_count = 0
+        self._pool = OmsClientPool(uri, pool_size, create_client, destroy_client)
+        self._batcher = OmsAttributeBatcher(self._pool, batch_window, max_batch)
+
+        self.hello = _OmsHandler(self._pool, 'hello')
+        self.config = _OmsHandler(self._pool, 'config')
+        self.attr = _OmsAttrHandler(self._pool, self._batcher)
+        self.event = _OmsHandler(self._pool, 'event')
+        self.port = _OmsHandler(self._pool, 'port')
+
+    def release(self):
+        """
+        Gives back an instance obtained with acquire, the last release
+        stops the batcher and destroys the clients.
+        """
+        self._ref_count -= 1
+        if self._ref_count > 0:
+            return
+        if OmsAccess._instances.get(self._uri) is self:
+            del OmsAccess._instances[self._uri]
+        self._batcher.stop()
+        self._pool.close()
+        log.debug("destroyed OmsAccess for uri=%r", self._uri)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.oms_event_hub
+@file    mi/platform/driver/rsn/oms_event_hub.py
+@author  Ronald Ronquillo
+@brief   Process wide ingest of the OMS events for the RSN platform drivers.
+
+The OMS notifies its events to a listener URL, from where they are relayed
+as OMSDeviceStatusEvent's whose origin is the platform ID.  Each RSN
+platform driver used to register the same listener URL and create its own
+event subscriber filtering on its platform ID.  OmsEventHub is shared by
+all the drivers of a process using the same OMS and listener URL: it
+registers the listener URL once, creates a single subscriber for all the
+platforms and hands each event to the drivers subscribed to its origin.
+
+The listener URL is never unregistered: it is the gateway shared with the
+drivers of other processes, which still depend on the events being
+notified (OOIION-968).
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+
+from pyon.public import log
+
+from mi.platform.exceptions import PlatformConnectionException
+
+EVENT_TYPE = 'OMSDeviceStatusEvent'
+ORIGIN_TYPE = 'OMS Platform'
+
+
+class OmsEventHub(object):
+    """
+    Event ingest for the drivers of a process sharing an OMS and listener
+    URL.  Get it with acquire and give it back with release, drivers get
+    the events of their platform with subscribe.
+    """
+
+    # (OmsAccess, listener URL) -> OmsEventHub shared in this process
+    _instances = {}
+
+    @classmethod
+    def acquire(cls, rsn_oms, url, create_event_subscriber, destroy_event_subscriber):
+        """
+        Gets the hub for an OMS and listener URL, creating it and registering
+        the listener on first use.
+
+        @param rsn_oms  OmsAccess to the OMS
+        @param url      listener URL to register in the OMS
+        @param create_event_subscriber
+        @param destroy_event_subscriber
+                        see PlatformDriver, used if the hub is created
+        """
+        key = (rsn_oms, url)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls(rsn_oms, url, create_event_subscriber, destroy_event_subscriber)
+            cls._instances[key] = instance
+            try:
+                instance._start()
+            except Exception:
+                del cls._instances[key]
+                raise
+            log.debug("created OmsEventHub for url=%r", url)
+        instance._ref_count += 1
+        return instance
+
+    def __init__(self, rsn_oms, url, create_event_subscriber, destroy_event_subscriber):
+        self._rsn_oms = rsn_oms
+        self._url = url
+        self._create_event_subscriber = create_event_subscriber
+        self._destroy_event_subscriber = destroy_event_subscriber
+        self._ref_count = 0
+        # platform_id -> [callback, ...]
+        self._callbacks = {}
+        self._event_subscriber = None
+
+    def subscribe(self, platform_id, callback):
+        """
+        Calls callback(evt) with the events of a platform.
+        """
+        self._callbacks.setdefault(platform_id, []).append(callback)
+
+    def unsubscribe(self, platform_id, callback):
+        callbacks = self._callbacks.get(platform_id, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._callbacks.pop(platform_id, None)
+
+    def release(self):
+        """
+        Gives back an instance obtained with acquire, the last release
+        destroys the subscriber.  The listener URL is left registered.
+        """
+        self._ref_count -= 1
+        if self._ref_count > 0:
+            return
+        key = (self._rsn_oms, self._url)
+        if OmsEventHub._instances.get(key) is self:
+            del OmsEventHub._instances[key]
+        self._stop()
+        log.debug("destroyed OmsEventHub for url=%r", self._url)
+
+    def _event_received(self, evt, *args, **kwargs):
+        callbacks = self._callbacks.get(evt.origin)
+        if not callbacks:
+            return
+        for callback in list(callbacks):
+            try:
+                callback(evt)
+            except Exception:
+                log.exception("error handling OMS event for platform %r", evt.origin)
+
+    def _start(self):
+        log.debug("registering event listener: %s", self._url)
+        try:
+            already_registered = self._rsn_oms.event.get_registered_event_listeners()
+        except Exception as e:
+            raise PlatformConnectionException(
+                msg="Cannot get registered event listeners: %s" % e)
+
+        if self._url in already_registered:
+            log.debug("listener %r was already registered", self._url)
+        else:
+            try:
+                result = self._rsn_oms.event.register_event_listener(self._url)
+            except Exception as e:
+                raise PlatformConnectionException(
+                    msg="Cannot register_event_listener: %s" % e)
+            log.debug("register_event_listener(%r) => %s", self._url, result)
+
+        try:
+            self._event_subscriber = self._create_event_subscriber(
+                event_type   = EVENT_TYPE,
+                origin_type  = ORIGIN_TYPE,
+                callback     = self._event_received)
+        except Exception:
+            self._stop()
+            raise
+
+    def _stop(self):
+        try:
+            if self._event_subscriber is not None:
+                self._destroy_event_subscriber(self._event_subscriber)
+        finally:
+            self._event_subscriber = None
+            self._callbacks.clear()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.test.benchmark_oms_access
+@file    mi/platform/driver/rsn/test/benchmark_oms_access.py
+@author  Ronald Ronquillo
+@brief   Measure the monitoring cycle time of many platforms with OmsAccess.
+
+Runs one monitoring cycle, every platform concurrently requesting its
+attribute values, against an OMS with a fixed latency per round trip.
+The cycle is timed with one client per platform, the way the drivers
+used to call the OMS, and with a shared OmsAccess batching the requests.
+
+The OMS is a fake_oms.FakeOms answering for any platform, or with --simulator the
+embedded CIOMSSimulator (which needs the ion package); either is wrapped
+in a LatencyOmsClient which sleeps for the latency on every round trip
+and takes multi calls like an xmlrpclib.ServerProxy.  Like the OMS XML/RPC
+server, it serves one round trip at a time.
+
+USAGE:
+    $ bin/python -m mi.platform.driver.rsn.test.benchmark_oms_access [platforms [latency]] [--simulator]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import sys
+import time
+
+import gevent
+
+from mi.platform.driver.rsn.oms_access import OmsAccess
+from mi.platform.driver.rsn.test.fake_oms import FakeOms, LatencyOmsClient, ATTRS
+
+DEFAULT_PLATFORMS = 40
+DEFAULT_LATENCY = 0.05
+
+
+def run_cycle(clients, platform_ids):
+    """
+    @param clients  platform id -> client used by the platform
+    @retval (seconds elapsed, {platform_id: attribute values})
+    """
+    start = time.time()
+    jobs = dict((platform_id, gevent.spawn(clients[platform_id].attr.get_platform_attribute_values,
+                                           platform_id, ATTRS))
+                for platform_id in platform_ids)
+    gevent.joinall(jobs.values(), raise_error=True)
+    return time.time() - start, dict((platform_id, job.value) for (platform_id, job) in jobs.iteritems())
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    use_simulator = '--simulator' in argv
+    args = [arg for arg in argv if not arg.startswith('--')]
+    n_platforms = int(args[0]) if args else DEFAULT_PLATFORMS
+    latency = float(args[1]) if len(args) > 1 else DEFAULT_LATENCY
+
+    if use_simulator:
+        from mi.platform.driver.rsn.oms_client_factory import CIOMSClientFactory
+        oms = CIOMSClientFactory.create_instance('embsimulator')
+    else:
+        oms = FakeOms()
+    platform_ids = ['platform_%d' % i for i in range(n_platforms)]
+
+    client = LatencyOmsClient(oms, latency)
+    elapsed, values = run_cycle(dict((platform_id, client) for platform_id in platform_ids), platform_ids)
+    print '%-20s %d platforms, %d round trips, %.3f secs' % \
+          ('client per platform', n_platforms, client.round_trips, elapsed)
+
+    client = LatencyOmsClient(oms, latency)
+    access = OmsAccess.acquire('benchmark', create_client=lambda uri: client,
+                               destroy_client=lambda instance: None)
+    try:
+        elapsed, batched_values = run_cycle(dict((platform_id, access) for platform_id in platform_ids),
+                                            platform_ids)
+    finally:
+        access.release()
+    print '%-20s %d platforms, %d round trips, %.3f secs' % \
+          ('shared OmsAccess', n_platforms, client.round_trips, elapsed)
+
+    if batched_values != values:
+        print 'results differ'
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.test.fake_oms
+@file    mi/platform/driver/rsn/test/fake_oms.py
+@author  Ronald Ronquillo
+@brief   OMS test doubles for the OmsAccess tests and benchmark.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+from gevent import sleep
+from gevent.coros import Semaphore
+
+from mi.platform.driver.rsn.oms_client import CIOMSClient
+
+# attributes requested of the platforms, with the time to get values from
+ATTRS = [('input_voltage|0', 3590000000.0), ('input_bus_current|0', 3590000000.0)]
+
+
+class FakeOms(CIOMSClient):
+    """
+    OMS answering attribute value requests for any platform.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def ping(self):
+        return "PONG"
+
+    def get_platform_attribute_values(self, platform_id, attrs):
+        self.calls += 1
+        if platform_id.startswith('bad'):
+            raise ValueError("bad platform %s" % platform_id)
+        return {platform_id: dict((attr_id, [(1.0, from_time)]) for (attr_id, from_time) in attrs)}
+
+
+class _LatencyHandler(object):
+    def __init__(self, client, handler):
+        self._client = client
+        self._handler = handler
+
+    def __getattr__(self, method):
+        def call(*args):
+            if self._handler == 'system' and method == 'multicall':
+                return self._client.multicall(*args)
+            self._client.round_trip()
+            return getattr(getattr(self._client.oms, self._handler), method)(*args)
+        return call
+
+
+class LatencyOmsClient(object):
+    """
+    Client to an OMS taking latency seconds per round trip and serving one
+    round trip at a time.  Like an xmlrpclib.ServerProxy it takes multi
+    calls, which take one round trip.
+    """
+
+    def __init__(self, oms, latency):
+        """
+        @param oms      CIOMSClient implementing the calls
+        @param latency  seconds per round trip
+        """
+        self.oms = oms
+        self.latency = latency
+        self.round_trips = 0
+        self._server = Semaphore()
+
+    def __getattr__(self, handler):
+        if handler.startswith('_'):
+            raise AttributeError(handler)
+        return _LatencyHandler(self, handler)
+
+    def round_trip(self):
+        with self._server:
+            self.round_trips += 1
+            sleep(self.latency)
+
+    def multicall(self, calls):
+        """
+        system.multicall, results are [value] or a fault dict as xmlrpclib.MultiCall expects
+        """
+        self.round_trip()
+        results = []
+        for call in calls:
+            (handler, method) = call['methodName'].split('.')
+            try:
+                results.append([getattr(getattr(self.oms, handler), method)(*call['params'])])
+            except Exception as e:
+                results.append({'faultCode': 1, 'faultString': str(e)})
+        return results
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.test.test_attr_cache
+@file    mi/platform/driver/rsn/test/test_attr_cache.py
+@author  Ronald Ronquillo
+@brief   Test cases for the attribute value cache.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import math
+import time
+import xmlrpclib
+
+from pyon.util.unit_test import IonUnitTestCase
+from nose.plugins.attrib import attr
+
+from mi.platform.driver.rsn.attr_cache import AttributeValueCache
+from mi.platform.driver.rsn.oms_client import CIOMSClient
+from mi.platform.driver.rsn.oms_client_factory import CIOMSClientFactory
+from mi.platform.responses import InvalidResponse
+
+# seconds from 1900-01-01 to 1970-01-01
+NTP_DELTA = 2208988800
+ATTR_IDS = ['input_voltage|0', 'input_bus_current|0']
+
+
+class SampledOms(CIOMSClient):
+    """
+    OMS with one sample per second of every attribute, up to now.
+    """
+
+    def __init__(self, now):
+        self.now = now
+        self.calls = []
+
+    def get_platform_attribute_values(self, platform_id, attrs):
+        self.calls.append(attrs)
+        values = {}
+        for (attr_id, from_time) in attrs:
+            if attr_id.startswith('bad'):
+                values[attr_id] = InvalidResponse.ATTRIBUTE_ID
+            else:
+                values[attr_id] = [(ts * 10.0, float(ts))
+                                   for ts in range(int(math.ceil(from_time)), int(self.now) + 1)]
+        return {platform_id: values}
+
+
+class CountingFetch(object):
+    """
+    Fetches attribute values of a platform, counting calls and the bytes
+    of the XML/RPC responses.
+    """
+
+    def __init__(self, oms, platform_id):
+        self.oms = oms
+        self.platform_id = platform_id
+        self.calls = 0
+        self.bytes = 0
+
+    def __call__(self, attrs):
+        self.calls += 1
+        response = self.oms.attr.get_platform_attribute_values(self.platform_id, attrs)
+        self.bytes += len(xmlrpclib.dumps((response,), methodresponse=True))
+        return response[self.platform_id]
+
+
+@attr('UNIT', group='sa')
+class TestAttributeValueCache(IonUnitTestCase):
+
+    def setUp(self):
+        self.oms = SampledOms(1000.0)
+        self.fetch = CountingFetch(self.oms, 'platform')
+
+    def direct(self, attrs):
+        return self.oms.get_platform_attribute_values('platform', attrs)['platform']
+
+    def test_incremental(self):
+        """
+        Later requests of a window only fetch the new samples
+        """
+        cache = AttributeValueCache(max_age=0)
+        attrs = [(attr_id, 900.0) for attr_id in ATTR_IDS]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+
+        self.oms.now = 1010.0
+        del self.oms.calls[:]
+        attrs = [(attr_id, 950.5) for attr_id in ATTR_IDS]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+        self.assertEqual(self.oms.calls[0], [(attr_id, 1000.0) for attr_id in ATTR_IDS])
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+        # older than what the cache holds
+        attrs = [(ATTR_IDS[0], 800.0)]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+        self.assertEqual(cache.misses, 3)
+
+    def test_max_age(self):
+        """
+        Windows held by the cache are served without fetching within max_age
+        """
+        cache = AttributeValueCache(max_age=60)
+        attrs = [(attr_id, 900.0) for attr_id in ATTR_IDS]
+        cache.get_attribute_values(attrs, self.fetch)
+        attrs = [(ATTR_IDS[1], 990.0)]
+        expected = self.direct(attrs)
+        self.oms.now = 1010.0
+        values = cache.get_attribute_values(attrs, self.fetch)
+        self.assertEqual(values, expected)
+        self.assertEqual(values[ATTR_IDS[1]][-1][1], 1000.0)
+        self.assertEqual(self.fetch.calls, 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_size(self):
+        """
+        Buffers keep at most size samples, windows they no longer hold are fetched
+        """
+        cache = AttributeValueCache(size=50, max_age=0)
+        attrs = [(ATTR_IDS[0], 900.0)]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+        self.assertEqual(cache.misses, 1)
+
+        attrs = [(ATTR_IDS[0], 960.0)]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+        self.assertEqual(cache.hits, 1)
+
+        self.oms.now = 1030.0
+        attrs = [(ATTR_IDS[0], 960.0)]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+        self.assertEqual(cache.hits, 2)
+        attrs = [(ATTR_IDS[0], 970.0)]
+        self.assertEqual(cache.get_attribute_values(attrs, self.fetch), self.direct(attrs))
+        self.assertEqual(cache.misses, 2)
+
+    def test_invalid_attribute(self):
+        cache = AttributeValueCache(max_age=0)
+        attrs = [('bad_attr', 900.0), (ATTR_IDS[0], 900.0)]
+        for i in range(2):
+            values = cache.get_attribute_values(attrs, self.fetch)
+            self.assertEqual(values, self.direct(attrs))
+        self.assertEqual(values['bad_attr'], InvalidResponse.ATTRIBUTE_ID)
+        self.assertEqual(cache.misses, 3)
+
+    def test_simulator(self):
+        """
+        Monitoring cycles against the CIOMSSimulator take fewer calls and
+        bytes with the cache
+        """
+        oms = CIOMSClientFactory.create_instance('embsimulator')
+        try:
+            platform_id = 'LJ01D'
+            from_time = time.time() + NTP_DELTA - 30
+            attrs = [(attr_id, from_time) for attr_id in ATTR_IDS]
+            direct = CountingFetch(oms, platform_id)
+            cached = CountingFetch(oms, platform_id)
+            cache = AttributeValueCache(max_age=0.5)
+
+            for cycle in range(4):
+                # two monitors of the platform asking for the same window
+                for monitor in range(2):
+                    direct(attrs)
+                    values = cache.get_attribute_values(attrs, cached)
+                    self.assertEqual(sorted(values.keys()), sorted(ATTR_IDS))
+                time.sleep(0.6)
+
+            self.assertEqual(direct.calls, 8)
+            self.assertEqual(cached.calls, 4)
+            self.assertLess(cached.bytes, direct.bytes)
+        finally:
+            CIOMSClientFactory.destroy_instance(oms)
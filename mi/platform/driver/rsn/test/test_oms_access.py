@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.test.test_oms_access
+@file    mi/platform/driver/rsn/test/test_oms_access.py
+@author  Ronald Ronquillo
+@brief   Test cases for the shared OMS access.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import xmlrpclib
+
+import gevent
+
+from pyon.util.unit_test import IonUnitTestCase
+from nose.plugins.attrib import attr
+
+from mi.platform.driver.rsn.oms_access import OmsAccess
+from mi.platform.driver.rsn.test.fake_oms import FakeOms, LatencyOmsClient, ATTRS
+
+
+@attr('UNIT', group='sa')
+class TestOmsAccess(IonUnitTestCase):
+
+    def setUp(self):
+        self.created = []
+        self.destroyed = []
+
+    def create_client(self, uri):
+        self.created.append(self.client)
+        return self.client
+
+    def destroy_client(self, client):
+        self.destroyed.append(client)
+
+    def acquire(self, **kwargs):
+        return OmsAccess.acquire('test_oms', create_client=self.create_client,
+                                 destroy_client=self.destroy_client, **kwargs)
+
+    def request_all(self, access, platform_ids):
+        jobs = [gevent.spawn(access.attr.get_platform_attribute_values, platform_id, ATTRS)
+                for platform_id in platform_ids]
+        gevent.joinall(jobs)
+        return jobs
+
+    def test_batch(self):
+        """
+        Concurrent requests of many platforms take one round trip
+        """
+        self.client = LatencyOmsClient(FakeOms(), 0.01)
+        access = self.acquire()
+        platform_ids = ['platform_%d' % i for i in range(20)] + ['bad_platform']
+        jobs = self.request_all(access, platform_ids)
+        self.assertEqual(self.client.round_trips, 1)
+
+        for (platform_id, job) in zip(platform_ids[:-1], jobs[:-1]):
+            self.assertTrue(job.successful())
+            self.assertEqual(job.value.keys(), [platform_id])
+        # the failed call only fails its own request
+        self.assertIsInstance(jobs[-1].exception, xmlrpclib.Fault)
+
+        access.release()
+        self.assertEqual(self.destroyed, [self.client])
+
+    def test_max_batch(self):
+        self.client = LatencyOmsClient(FakeOms(), 0.01)
+        access = self.acquire(max_batch=8)
+        jobs = self.request_all(access, ['platform_%d' % i for i in range(20)])
+        self.assertTrue(all(job.successful() for job in jobs))
+        self.assertEqual(self.client.round_trips, 3)
+        access.release()
+
+    def test_embedded(self):
+        """
+        An in process OMS is called directly, and is shared by all callers
+        """
+        self.client = FakeOms()
+        access = self.acquire()
+        jobs = self.request_all(access, ['platform_%d' % i for i in range(5)])
+        self.assertTrue(all(job.successful() for job in jobs))
+        self.assertEqual(self.client.calls, 5)
+
+        jobs = [gevent.spawn(access.hello.ping) for i in range(5)]
+        gevent.joinall(jobs)
+        self.assertEqual([job.value for job in jobs], ["PONG"] * 5)
+        self.assertEqual(len(self.created), 1)
+        access.release()
+
+    def test_shared(self):
+        """
+        Drivers using the same URI share one instance until the last release
+        """
+        self.client = FakeOms()
+        access = self.acquire()
+        self.assertIs(self.acquire(), access)
+        access.release()
+        self.assertEqual(access.hello.ping(), "PONG")
+        self.assertEqual(self.destroyed, [])
+        access.release()
+        self.assertEqual(self.destroyed, [self.client])
+        other = self.acquire()
+        self.assertIsNot(other, access)
+        other.release()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.driver.rsn.test.test_oms_event_hub
+@file    mi/platform/driver/rsn/test/test_oms_event_hub.py
+@author  Ronald Ronquillo
+@brief   Test cases for the shared OMS event ingest.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+from pyon.util.unit_test import IonUnitTestCase
+from nose.plugins.attrib import attr
+
+from mi.platform.driver.rsn.oms_access import OmsAccess
+from mi.platform.driver.rsn.oms_event_hub import OmsEventHub
+from mi.platform.driver.rsn.test.fake_oms import FakeOms
+
+URL = 'http://localhost:5000/ion-service/oms_event'
+
+
+class Event(object):
+    def __init__(self, origin, event):
+        self.origin = origin
+        self.event = event
+
+
+class EventOms(FakeOms):
+    """
+    OMS keeping event listener registrations. Test events are relayed to
+    the event subscribers, as the gateway does with the events posted to
+    the listener URL.
+    """
+
+    def __init__(self):
+        FakeOms.__init__(self)
+        self.listeners = []
+        self.registrations = 0
+        self.subscribers = []
+
+    def register_event_listener(self, url):
+        self.registrations += 1
+        self.listeners.append(url)
+        return {url: 1}
+
+    def get_registered_event_listeners(self):
+        return list(self.listeners)
+
+    def generate_test_event(self, event):
+        if self.listeners:
+            for subscriber in self.subscribers:
+                if subscriber['origin'] in (None, event['platform_id']):
+                    subscriber['callback'](Event(event['platform_id'], event))
+        return True
+
+
+@attr('UNIT', group='sa')
+class TestOmsEventHub(IonUnitTestCase):
+
+    def setUp(self):
+        self.oms = EventOms()
+        self.access = OmsAccess.acquire('test_oms', create_client=lambda uri: self.oms,
+                                        destroy_client=lambda client: None)
+        self.addCleanup(self.access.release)
+
+    def create_event_subscriber(self, origin=None, **kwargs):
+        subscriber = dict(kwargs, origin=origin)
+        self.oms.subscribers.append(subscriber)
+        return subscriber
+
+    def destroy_event_subscriber(self, subscriber):
+        self.oms.subscribers.remove(subscriber)
+
+    def acquire(self):
+        return OmsEventHub.acquire(self.access, URL, self.create_event_subscriber,
+                                   self.destroy_event_subscriber)
+
+    def test_burst(self):
+        """
+        Drivers of many platforms share one registration and subscriber, a
+        burst of events is handed to the drivers of their platforms
+        """
+        platform_ids = ['platform_%d' % i for i in range(100)]
+        received = dict((platform_id, []) for platform_id in platform_ids)
+        hubs = []
+        for platform_id in platform_ids:
+            hub = self.acquire()
+            hub.subscribe(platform_id, received[platform_id].append)
+            hubs.append(hub)
+        self.assertTrue(all(hub is hubs[0] for hub in hubs))
+        self.assertEqual(self.oms.registrations, 1)
+        self.assertEqual(len(self.oms.subscribers), 1)
+
+        for i in range(5000):
+            self.oms.generate_test_event({'platform_id': platform_ids[i % 100], 'message': i})
+        # events of platforms without driver are dropped
+        self.oms.generate_test_event({'platform_id': 'other_platform', 'message': -1})
+
+        for (i, platform_id) in enumerate(platform_ids):
+            self.assertEqual([evt.event['message'] for evt in received[platform_id]],
+                             range(i, 5000, 100))
+
+        for (platform_id, hub) in zip(platform_ids, hubs):
+            hub.unsubscribe(platform_id, received[platform_id].append)
+            hub.release()
+        self.assertEqual(self.oms.subscribers, [])
+
+        # the listener is left registered for the drivers of other processes
+        self.assertEqual(self.oms.listeners, [URL])
+        hub = self.acquire()
+        self.assertIsNot(hub, hubs[0])
+        self.assertEqual(self.oms.registrations, 1)
+        hub.release()
+
+    def test_callback_error(self):
+        hub = self.acquire()
+        received = []
+
+        def fail(evt):
+            raise ValueError(evt.origin)
+        hub.subscribe('platform', fail)
+        hub.subscribe('platform', received.append)
+        self.oms.generate_test_event({'platform_id': 'platform'})
+        self.assertEqual(len(received), 1)
+        hub.release()
+
+    def test_already_registered(self):
+        """
+        A listener registered by someone else is left registered
+        """
+        self.oms.register_event_listener(URL)
+        hub = self.acquire()
+        self.assertEqual(self.oms.registrations, 1)
+        hub.release()
+        self.assertEqual(self.oms.listeners, [URL])
+        other = self.acquire()
+        self.assertIsNot(other, hub)
+        other.release()
@@ -11,6 +11,9 @@ __author__ = 'Carlos Rueda'
 __license__ = 'Apache 2.0'
 
 
+import hashlib
+
+
 class BaseNode(object):
     """
     A convenient base class for the components of a platform network.
@@ -25,6 +28,19 @@ class BaseNode(object):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    @property
+    def checksum(self):
+        """
+        Structural hash of this node: nodes with equal checksums compare
+        equal with diff. Definitions are not expected to be modified in
+        place once added to a network.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+def _checksum(*parts):
+    return hashlib.sha1(repr(parts)).hexdigest()
+
 
 class AttrNode(BaseNode):
     """
@@ -76,6 +92,10 @@ class AttrNode(BaseNode):
     def writable(self):
         return self.defn.get('read_write', '').lower().find("write") >= 0
 
+    @property
+    def checksum(self):
+        return _checksum(self.attr_id, sorted(self.defn.iteritems()))
+
     def diff(self, other):
         if self.attr_id != other.attr_id:
             return "Attribute IDs are different: %r != %r" % (
@@ -100,6 +120,8 @@ class PortNode(BaseNode):
         BaseNode.__init__(self)
         self._port_id = str(port_id)
         self._instrument_ids = []
+        # PlatformNode this port was added to
+        self._pnode = None
 
     def __repr__(self):
         return "PortNode{port_id=%r, instrument_ids=%r}" % (
@@ -121,12 +143,22 @@ class PortNode(BaseNode):
             raise Exception('duplicate instrument_id=%r for port_id=%r' % (
                             instrument_id, self.port_id))
         self._instrument_ids.append(instrument_id)
+        self._changed()
 
     def remove_instrument_id(self, instrument_id):
         if instrument_id not in self._instrument_ids:
             raise Exception('no such instrument_id=%r in port_id=%r' % (
                             instrument_id, self.port_id))
         self._instrument_ids.remove(instrument_id)
+        self._changed()
+
+    def _changed(self):
+        if self._pnode is not None:
+            self._pnode._changed()
+
+    @property
+    def checksum(self):
+        return _checksum(self.port_id, sorted(set(self.instrument_ids)))
 
     def diff(self, other):
         """
@@ -211,6 +243,8 @@ class PlatformNode(BaseNode):
     self._parent = None | PlatformNode
     self._instruments = { instrument_id: InstrumentNode, ...}
     self._CFG = dict
+    self._ndef = None | NetworkDefinition indexing the ports and attributes
+    self._checksum = None | cached checksum of the subtree
 
     The _CFG element included for convenience to capture the provided
     configuration dict in PlatformAgent. See
@@ -228,19 +262,48 @@ class PlatformNode(BaseNode):
         self._parent = None
         self._instruments = {}
         self._CFG = CFG
+        self._ndef = None
+        self._checksum = None
 
     def set_name(self, name):
         self._name = name
+        self._changed()
 
     def add_port(self, port):
         if port.port_id in self._ports:
             raise Exception('%s: duplicate port ID' % port.port_id)
         self._ports[port.port_id] = port
+        port._pnode = self
+        if self._ndef is not None:
+            self._ndef.ports[(self.platform_id, port.port_id)] = port
+        self._changed()
 
     def add_attribute(self, attr):
         if attr.attr_id in self._attrs:
             raise Exception('%s: duplicate attribute ID' % attr.attr_id)
         self._attrs[attr.attr_id] = attr
+        if self._ndef is not None:
+            self._ndef.attrs[(self.platform_id, attr.attr_id)] = attr
+        self._changed()
+
+    def _changed(self):
+        """
+        Invalidates the checksum of this node and of its ancestors.
+        """
+        pn = self
+        while pn is not None and pn._checksum is not None:
+            pn._checksum = None
+            pn = pn._parent
+
+    @property
+    def checksum(self):
+        if self._checksum is None:
+            self._checksum = _checksum(
+                self.platform_id, self.name,
+                [attr.checksum for (_, attr) in sorted(self.attrs.iteritems())],
+                [port.checksum for (_, port) in sorted(self.ports.iteritems())],
+                [pn.checksum for (_, pn) in sorted(self.subplatforms.iteritems())])
+        return self._checksum
 
     @property
     def platform_id(self):
@@ -278,6 +341,7 @@ class PlatformNode(BaseNode):
             raise Exception('%s: duplicate subplatform ID' % pn.platform_id)
         self._subplatforms[pn.platform_id] = pn
         pn._parent = self
+        self._changed()
 
     @property
     def instruments(self):
@@ -334,6 +398,10 @@ class PlatformNode(BaseNode):
             return "platform parents are different: %r != %r" % (
                 self.parent.platform_id, other.parent.platform_id)
 
+        # same checksum, nothing different in the whole subtree:
+        if self.checksum == other.checksum:
+            return None
+
         # compare attributes:
         attr_ids = set(self.attrs.iterkeys())
         other_attr_ids = set(other.attrs.iterkeys())
@@ -387,6 +455,8 @@ class NetworkDefinition(BaseNode):
     def __init__(self):
         BaseNode.__init__(self)
         self._pnodes = {}
+        self._ports = {}
+        self._attrs = {}
 
         # _dummy_root is a dummy PlatformNode having as children the actual roots in
         # the network.
@@ -401,6 +471,40 @@ class NetworkDefinition(BaseNode):
         """
         return self._pnodes
 
+    @property
+    def ports(self):
+        """
+        Returns a dict of all PortNodes of the PlatformNodes created with
+        create_platform_node.
+
+        @return {(platform_id, port_id) : PortNode} map
+        """
+        return self._ports
+
+    @property
+    def attrs(self):
+        """
+        Returns a dict of all AttrNodes of the PlatformNodes created with
+        create_platform_node.
+
+        @return {(platform_id, attr_id) : AttrNode} map
+        """
+        return self._attrs
+
+    def create_platform_node(self, platform_id, CFG=None):
+        """
+        Creates a PlatformNode indexed in this network definition, its ports
+        and attributes are indexed as they are added.
+
+        @param platform_id  ID of the new platform, not already in pnodes
+        @param CFG          see PlatformNode
+        @return the new PlatformNode
+        """
+        pn = PlatformNode(platform_id, CFG)
+        pn._ndef = self
+        self._pnodes[platform_id] = pn
+        return pn
+
     @property
     def root(self):
         """
@@ -20,8 +20,12 @@ from mi.platform.util.network import InstrumentNode
 from mi.platform.util.network import NetworkDefinition
 
 import yaml
+import hashlib
 from collections import OrderedDict
 
+# number of parsed network definitions kept by deserialize_network_definition
+COMPILED_CACHE_SIZE = 8
+
 
 class NetworkDefinitionException(Exception):
     def __init__(self, msg=''):
@@ -34,10 +38,36 @@ class NetworkUtil(object):
     Various utilities including creation of PlatformNode and NetworkDefinition objects.
     """
 
+    # sha1 of a serialization -> parsed YAML, most recently used last
+    _compiled = OrderedDict()
+
+    @staticmethod
+    def _compile(ser):
+        """
+        Parses a serialization, reusing the result of a previous parse of
+        the same serialization.
+
+        @param ser string or file with the serialization
+        @return the parsed YAML, not to be modified
+        """
+        if hasattr(ser, 'read'):
+            ser = ser.read()
+        key = hashlib.sha1(ser).hexdigest()
+        compiled = NetworkUtil._compiled
+        pyobj = compiled.pop(key, None)
+        if pyobj is None:
+            pyobj = yaml.load(ser)
+            while len(compiled) >= COMPILED_CACHE_SIZE:
+                compiled.popitem(last=False)
+        compiled[key] = pyobj
+        return pyobj
+
     @staticmethod
     def deserialize_network_definition(ser):
         """
         Creates a NetworkDefinition object by deserializing the given argument.
+        The parse of recently deserialized serializations is reused, only the
+        PlatformNode tree is built again.
 
         @param ser representation of the given serialization
         @return A NetworkDefinition object
@@ -53,9 +83,7 @@ class NetworkUtil(object):
 
             def create_node(platform_id):
                 _require(not platform_id in ndef.pnodes)
-                pn = PlatformNode(platform_id)
-                ndef.pnodes[platform_id] = pn
-                return pn
+                return ndef.create_platform_node(platform_id)
 
             def build_and_add_ports_to_node(ports, pn):
                 for port_info in ports:
@@ -76,8 +104,8 @@ class NetworkUtil(object):
                     attr_id = _get_attr_id(attr_defn)
                     _require('monitor_cycle_seconds' in attr_defn)
                     _require('units' in attr_defn)
-                    if isinstance(attr_defn, OrderedDict):
-                        attr_defn = dict(attr_defn)
+                    # copy, the parsed definition is shared by later deserializations
+                    attr_defn = dict(attr_defn)
                     pn.add_attribute(AttrNode(attr_id, attr_defn))
 
             def build_node(platObj, parent_node):
@@ -98,15 +126,13 @@ class NetworkUtil(object):
                         build_node(subplat, pn)
                 return pn
 
-            ndef._pnodes = {}
-
             ndef._dummy_root = create_node(platform_id='')
 
             _require('network' in pyobj, "'network' undefined")
             for platObj in pyobj["network"]:
                 build_node(platObj, ndef._dummy_root)
 
-        pyobj = yaml.load(ser)
+        pyobj = NetworkUtil._compile(ser)
         _build_network(pyobj)
 
         return ndef
@@ -298,14 +324,11 @@ class NetworkUtil(object):
                  "Expecting device_type to be 'PlatformDevice'. Got %r" % device_type)
 
         ndef = NetworkDefinition()
-        ndef._pnodes = {}
 
         def create_platform_node(platform_id, CFG=None):
             _require(not platform_id in ndef.pnodes,
                      "create_platform_node(): platform_id %r not in ndef.pnodes" % platform_id)
-            pn = PlatformNode(platform_id, CFG)
-            ndef.pnodes[platform_id] = pn
-            return pn
+            return ndef.create_platform_node(platform_id, CFG)
 
         ndef._dummy_root = create_platform_node(platform_id='')
 
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.util.test.benchmark_network
+@file    mi/platform/util/test/benchmark_network.py
+@author  Ronald Ronquillo
+@brief   Measure deserialization, diff and lookups of a large network definition.
+
+Builds the serialization of a synthetic network of platforms, each with a
+few attributes and ports, and times:
+
+ - deserialize_network_definition, parsing the YAML and reusing the parse;
+ - diff of two equal networks and of networks differing in one leaf
+   platform, walking the whole tree the way PlatformNode.diff used to and
+   with the subtree checksums;
+ - lookup of every (platform_id, attr_id) by walking the tree from the
+   root and with the NetworkDefinition index.
+
+USAGE:
+    $ bin/python -m mi.platform.util.test.benchmark_network [platforms]
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+import sys
+import time
+
+from mi.platform.util.network_util import NetworkUtil
+from mi.platform.util.test.network_data import build_network_yaml
+
+DEFAULT_PLATFORMS = 1000
+
+
+def walk_diff(pnode, other):
+    """
+    PlatformNode.diff comparing the whole subtree, without checksums.
+    """
+    if pnode.platform_id != other.platform_id:
+        return "platform IDs are different"
+    if pnode.name != other.name:
+        return "platform names are different"
+    if set(pnode.attrs) != set(other.attrs):
+        return "attribute IDs are different"
+    for attr_id, attr in pnode.attrs.iteritems():
+        diff = attr.diff(other.attrs[attr_id])
+        if diff:
+            return diff
+    if set(pnode.ports) != set(other.ports):
+        return "port IDs are different"
+    for port_id, port in pnode.ports.iteritems():
+        diff = port.diff(other.ports[port_id])
+        if diff:
+            return diff
+    if set(pnode.subplatforms) != set(other.subplatforms):
+        return "subplatform IDs are different"
+    for platform_id, node in pnode.subplatforms.iteritems():
+        diff = walk_diff(node, other.subplatforms[platform_id])
+        if diff:
+            return diff
+    return None
+
+
+def walk_find_attr(pnode, platform_id, attr_id):
+    """
+    Finds an attribute by walking the tree from pnode.
+    """
+    if pnode.platform_id == platform_id:
+        return pnode.attrs.get(attr_id)
+    for node in pnode.subplatforms.itervalues():
+        attr = walk_find_attr(node, platform_id, attr_id)
+        if attr is not None:
+            return attr
+    return None
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    n_platforms = int(argv[0]) if argv else DEFAULT_PLATFORMS
+
+    ser = build_network_yaml(n_platforms)
+    changed_ser = build_network_yaml(n_platforms, changed=n_platforms - 1)
+
+    NetworkUtil._compiled.clear()
+    parse_secs, ndef = timed(NetworkUtil.deserialize_network_definition, ser)
+    cached_secs, ndef2 = timed(NetworkUtil.deserialize_network_definition, ser)
+    print '%-28s %.4f secs' % ('deserialize, parse', parse_secs)
+    print '%-28s %.4f secs' % ('deserialize, cached parse', cached_secs)
+
+    changed = NetworkUtil.deserialize_network_definition(changed_ser)
+    for (name, other) in (('equal', ndef2), ('one leaf changed', changed)):
+        walk_secs, walk_result = timed(walk_diff, ndef.root, other.root)
+        # checksums are computed on first use, time both diffs
+        first_secs, result = timed(ndef.diff, other)
+        diff_secs, result = timed(ndef.diff, other)
+        print '%-28s walk %.4f secs, checksum %.4f secs (%.4f first)' % (
+            'diff, %s' % name, walk_secs, diff_secs, first_secs)
+        if (walk_result is None) != (result is None):
+            print 'diff results differ'
+            return 1
+
+    keys = sorted(ndef.attrs)
+    walk_secs, found = timed(lambda: [walk_find_attr(ndef.root, p, a) for (p, a) in keys[::50]])
+    index_secs, indexed = timed(lambda: [ndef.attrs[key] for key in keys[::50]])
+    print '%-28s walk %.4f secs, index %.6f secs' % (
+        'lookup %d attributes' % len(found), walk_secs, index_secs)
+    if found != indexed:
+        print 'lookup results differ'
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
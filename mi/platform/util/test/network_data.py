@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+@package mi.platform.util.test.network_data
+@file    mi/platform/util/test/network_data.py
+@author  Ronald Ronquillo
+@brief   Synthetic network definitions for the network_util tests and benchmark.
+"""
+
+__author__ = 'Ronald Ronquillo'
+__license__ = 'Apache 2.0'
+
+FANOUT = 8
+ATTRS = 5
+PORTS = 4
+
+
+def build_network_yaml(n_platforms, fanout=FANOUT, changed=None):
+    """
+    Serialization of a network of n_platforms in a tree with the given
+    fanout, the 'units' of the attributes of the platform with the
+    changed index are different.
+    """
+    children = dict((i, []) for i in range(n_platforms))
+    for i in range(1, n_platforms):
+        children[(i - 1) // fanout].append(i)
+
+    lines = ['network:']
+
+    def add(i, indent):
+        units = 'changed' if i == changed else 'V'
+        lines.append('%s- platform_id: PLAT_%04d' % (indent, i))
+        lines.append('%s  attrs:' % indent)
+        for a in range(ATTRS):
+            lines.append('%s  - attr_id: attr_%d|0' % (indent, a))
+            lines.append('%s    monitor_cycle_seconds: 5' % indent)
+            lines.append('%s    units: %s' % (indent, units))
+        lines.append('%s  ports:' % indent)
+        for p in range(PORTS):
+            lines.append('%s  - port_id: %d' % (indent, p))
+            lines.append('%s    instruments:' % indent)
+            lines.append('%s    - instrument_id: INST_%04d_%d' % (indent, i, p))
+        if children[i]:
+            lines.append('%s  subplatforms:' % indent)
+            for child in children[i]:
+                add(child, indent + '  ')
+
+    add(0, '')
+    return '\n'.join(lines) + '\n'
@@ -19,9 +19,12 @@ __license__ = 'Apache 2.0'
 from pyon.public import log
 import logging
 import unittest
+import yaml
+from mock import patch
 
 from mi.platform.util.network_util import NetworkUtil
 from mi.platform.util.network_util import NetworkDefinitionException
+from mi.platform.util.test.network_data import build_network_yaml
 
 from pyon.util.containers import DotDict
 
@@ -245,3 +248,44 @@ class Test(IonUnitTestCase):
         for attr_name in common_attr_names:
             self.assertIn(attr_name, LJ01D.attrs)
 
+    def test_index(self):
+        ndef = NetworkUtil.deserialize_network_definition(build_network_yaml(20))
+        self.assertEqual(len(ndef.pnodes), 21)
+        self.assertEqual(len(ndef.ports), 20 * 4)
+        self.assertEqual(len(ndef.attrs), 20 * 5)
+        PLAT_0003 = ndef.pnodes['PLAT_0003']
+        self.assertIs(ndef.ports[('PLAT_0003', '1')], PLAT_0003.ports['1'])
+        self.assertIs(ndef.attrs[('PLAT_0003', 'attr_2|0')], PLAT_0003.attrs['attr_2|0'])
+        self.assertEqual(ndef.ports[('PLAT_0019', '3')].instrument_ids, ['INST_0019_3'])
+
+    def test_checksum_diff(self):
+        ser = build_network_yaml(50)
+        ndef = NetworkUtil.deserialize_network_definition(ser)
+        ndef2 = NetworkUtil.deserialize_network_definition(ser)
+        self.assertEqual(ndef.root.checksum, ndef2.root.checksum)
+        self.assertIsNone(ndef.diff(ndef2))
+
+        changed = NetworkUtil.deserialize_network_definition(build_network_yaml(50, changed=49))
+        self.assertNotEqual(ndef.root.checksum, changed.root.checksum)
+        self.assertIn("Attribute definitions are different", ndef.diff(changed))
+
+        # changes after the checksums were computed are seen:
+        ndef2.ports[('PLAT_0049', '0')].add_instrument_id('INST_X')
+        self.assertIn("instrument_ids are different", ndef.diff(ndef2))
+        ndef2.ports[('PLAT_0049', '0')].remove_instrument_id('INST_X')
+        self.assertIsNone(ndef.diff(ndef2))
+
+    def test_compiled(self):
+        """
+        The parse of a serialization is reused by later deserializations
+        """
+        ser = build_network_yaml(10)
+        NetworkUtil._compiled.clear()
+        with patch('mi.platform.util.network_util.yaml.load', wraps=yaml.load) as load:
+            ndef = NetworkUtil.deserialize_network_definition(ser)
+            ndef2 = NetworkUtil.deserialize_network_definition(ser)
+        self.assertEqual(load.call_count, 1)
+        self.assertIsNone(ndef.diff(ndef2))
+        self.assertIsNot(ndef.root, ndef2.root)
+        self.assertIsNot(ndef.attrs[('PLAT_0001', 'attr_0|0')].defn,
+                         ndef2.attrs[('PLAT_0001', 'attr_0|0')].defn)